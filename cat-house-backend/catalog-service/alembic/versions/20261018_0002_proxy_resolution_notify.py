@@ -0,0 +1,63 @@
+"""notify proxy-service of cat and permission changes
+
+Revision ID: 20261018_0002
+Revises: 20260105_0001
+Create Date: 2026-10-18 00:02:00.000000
+
+proxy-service caches installation resolution (endpoint_url, cat status,
+permission types) per (user_id, cat_id) and invalidates every entry of a cat
+on NOTIFY proxy_resolution with payload {"cat_id": ...}.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '20261018_0002'
+down_revision: Union[str, None] = '20260105_0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # cats: id is the cat; permissions: cat_id is the cat
+    op.execute("""
+        CREATE OR REPLACE FUNCTION catalog.notify_proxy_resolution()
+        RETURNS trigger AS $$
+        DECLARE
+            changed_cat_id uuid;
+        BEGIN
+            -- Separate statements: each one only references columns of its table
+            IF TG_TABLE_NAME = 'cats' THEN
+                IF TG_OP = 'DELETE' THEN
+                    changed_cat_id := OLD.id;
+                ELSE
+                    changed_cat_id := NEW.id;
+                END IF;
+            ELSIF TG_OP = 'DELETE' THEN
+                changed_cat_id := OLD.cat_id;
+            ELSE
+                changed_cat_id := NEW.cat_id;
+            END IF;
+            PERFORM pg_notify('proxy_resolution', json_build_object('cat_id', changed_cat_id)::text);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    # New cats have no installations yet: only updates and deletes matter
+    op.execute("""
+        CREATE TRIGGER trg_cats_notify_proxy
+        AFTER UPDATE OR DELETE ON catalog.cats
+        FOR EACH ROW EXECUTE FUNCTION catalog.notify_proxy_resolution()
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_permissions_notify_proxy
+        AFTER INSERT OR UPDATE OR DELETE ON catalog.permissions
+        FOR EACH ROW EXECUTE FUNCTION catalog.notify_proxy_resolution()
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_permissions_notify_proxy ON catalog.permissions")
+    op.execute("DROP TRIGGER IF EXISTS trg_cats_notify_proxy ON catalog.cats")
+    op.execute("DROP FUNCTION IF EXISTS catalog.notify_proxy_resolution()")
@@ -0,0 +1,31 @@
+"""add idempotent_actions to cats
+
+Revision ID: 20261018_0003
+Revises: 20261018_0002
+Create Date: 2026-10-18 00:03:00.000000
+
+Actions a cat declares safe to receive twice. proxy-service may send a
+second (hedged) request for them when the first is slow.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '20261018_0003'
+down_revision: Union[str, None] = '20261018_0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('cats',
+    sa.Column('idempotent_actions', postgresql.ARRAY(sa.String(length=100)), server_default='{}', nullable=False, comment='Actions safe to receive twice (proxy may hedge them)'),
+    schema='catalog'
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('cats', 'idempotent_actions', schema='catalog')
@@ -8,7 +8,7 @@ import uuid
 from typing import Optional
 
 from sqlalchemy import ForeignKey, Index, String, Text
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
 from .base import Base, BaseModel
@@ -58,6 +58,14 @@ class Cat(Base, BaseModel):
         String(20), nullable=False, comment="Cat status: draft, published, suspended"
     )
 
+    idempotent_actions: Mapped[list[str]] = mapped_column(
+        ARRAY(String(100)),
+        nullable=False,
+        default=list,
+        server_default="{}",
+        comment="Actions safe to receive twice (proxy may hedge them)",
+    )
+
     # Relationships
     # developer = relationship("User", back_populates="cats")
     # permissions = relationship("Permission", back_populates="cat", cascade="all, delete-orphan")
@@ -0,0 +1,76 @@
+"""notify proxy-service of installation changes
+
+Revision ID: 20261018_0002
+Revises: 20260105_0001
+Create Date: 2026-10-18 00:02:00.000000
+
+proxy-service caches installation resolution per (user_id, cat_id) and
+invalidates entries on NOTIFY proxy_resolution. Triggers (rather than
+application code) guarantee every write notifies, whichever client made it.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '20261018_0002'
+down_revision: Union[str, None] = '20260105_0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Payload: {"user_id": ..., "cat_id": ...} of the changed installation
+    op.execute("""
+        CREATE OR REPLACE FUNCTION installation.notify_proxy_resolution_installation()
+        RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                PERFORM pg_notify('proxy_resolution',
+                    json_build_object('user_id', OLD.user_id, 'cat_id', OLD.cat_id)::text);
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                PERFORM pg_notify('proxy_resolution',
+                    json_build_object('user_id', NEW.user_id, 'cat_id', NEW.cat_id)::text);
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_installations_notify_proxy
+        AFTER INSERT OR UPDATE OR DELETE ON installation.installations
+        FOR EACH ROW EXECUTE FUNCTION installation.notify_proxy_resolution_installation()
+    """)
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION installation.notify_proxy_resolution_permission()
+        RETURNS trigger AS $$
+        DECLARE
+            changed_installation_id uuid;
+        BEGIN
+            IF TG_OP = 'DELETE' THEN
+                changed_installation_id := OLD.installation_id;
+            ELSE
+                changed_installation_id := NEW.installation_id;
+            END IF;
+            PERFORM pg_notify('proxy_resolution',
+                json_build_object('user_id', i.user_id, 'cat_id', i.cat_id)::text)
+            FROM installation.installations i
+            WHERE i.id = changed_installation_id;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_installation_permissions_notify_proxy
+        AFTER INSERT OR UPDATE OR DELETE ON installation.installation_permissions
+        FOR EACH ROW EXECUTE FUNCTION installation.notify_proxy_resolution_permission()
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_installation_permissions_notify_proxy ON installation.installation_permissions")
+    op.execute("DROP FUNCTION IF EXISTS installation.notify_proxy_resolution_permission()")
+    op.execute("DROP TRIGGER IF EXISTS trg_installations_notify_proxy ON installation.installations")
+    op.execute("DROP FUNCTION IF EXISTS installation.notify_proxy_resolution_installation()")
@@ -0,0 +1,122 @@
+"""
+Caller authentication.
+
+The proxy verifies the user's access token itself instead of trusting an
+identity header: `Authorization: Bearer <jwt>` issued by auth-service, signed
+with the shared JWT_SECRET (HS256). The user id is the token's `sub` claim.
+
+Only HS256 is accepted; the token's `alg` header must match jwt_algorithm, so
+unsigned (`alg: none`) or re-signed tokens are rejected. `exp` is required.
+
+Without JWT_SECRET every proxied request is rejected (fail closed).
+"""
+
+import base64
+import binascii
+import hashlib
+import hmac
+import json
+import time
+from typing import Any, Optional
+from uuid import UUID
+
+from fastapi import Header, HTTPException, status
+
+from app.config import settings
+from app.logging_config import logger
+
+SUPPORTED_ALGORITHMS = {"HS256": hashlib.sha256}
+
+# Allowed clock difference between auth-service and the proxy
+CLOCK_SKEW_SECONDS = 30
+
+
+class InvalidToken(Exception):
+    """The access token is malformed, badly signed or expired."""
+
+
+def _b64decode(segment: str) -> bytes:
+    """Decode a base64url JWT segment (padding stripped)."""
+    try:
+        return base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+    except (binascii.Error, ValueError) as e:
+        raise InvalidToken("Malformed token segment") from e
+
+
+def decode_access_token(
+    token: str, secret: str, algorithm: str = "HS256", now: Optional[float] = None
+) -> dict[str, Any]:
+    """
+    Verify a JWT's signature and expiry and return its claims.
+
+    Raises:
+        InvalidToken: Malformed token, unexpected algorithm, bad signature,
+            missing/expired exp or nbf in the future
+    """
+    digest = SUPPORTED_ALGORITHMS.get(algorithm)
+    if digest is None:
+        raise ValueError(f"Unsupported JWT algorithm: {algorithm}")
+
+    parts = token.split(".")
+    if len(parts) != 3:
+        raise InvalidToken("Token must have three segments")
+    header_segment, claims_segment, signature_segment = parts
+
+    try:
+        header = json.loads(_b64decode(header_segment))
+        claims = json.loads(_b64decode(claims_segment))
+    except ValueError as e:
+        raise InvalidToken("Malformed token") from e
+    if not isinstance(header, dict) or not isinstance(claims, dict):
+        raise InvalidToken("Malformed token")
+    if header.get("alg") != algorithm:
+        raise InvalidToken(f"Unexpected token algorithm: {header.get('alg')}")
+
+    expected = hmac.new(
+        secret.encode("utf-8"), f"{header_segment}.{claims_segment}".encode("ascii"), digest
+    ).digest()
+    if not hmac.compare_digest(expected, _b64decode(signature_segment)):
+        raise InvalidToken("Invalid token signature")
+
+    now = time.time() if now is None else now
+    exp = claims.get("exp")
+    if not isinstance(exp, (int, float)):
+        raise InvalidToken("Token has no expiry")
+    if now > exp + CLOCK_SKEW_SECONDS:
+        raise InvalidToken("Token expired")
+    nbf = claims.get("nbf")
+    if isinstance(nbf, (int, float)) and now < nbf - CLOCK_SKEW_SECONDS:
+        raise InvalidToken("Token not yet valid")
+    return claims
+
+
+async def get_current_user_id(authorization: Optional[str] = Header(None)) -> UUID:
+    """
+    Authenticated user: the `sub` claim of the verified bearer token.
+
+    Raises:
+        HTTPException(401): Missing, invalid or expired token
+        HTTPException(503): JWT_SECRET is not configured
+    """
+    if not settings.jwt_secret:
+        logger.error("JWT_SECRET is not configured, rejecting proxied request")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Authentication is not configured",
+        )
+
+    unauthorized = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid or missing access token",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        raise unauthorized
+
+    try:
+        claims = decode_access_token(token.strip(), settings.jwt_secret, settings.jwt_algorithm)
+        return UUID(str(claims["sub"]))
+    except (InvalidToken, KeyError, ValueError) as e:
+        logger.warning(f"Rejected access token: {e}")
+        raise unauthorized from e
@@ -0,0 +1,178 @@
+"""
+Per-cat bulkheads with per-user fair queuing.
+
+One slow or popular cat must not take every outbound connection and
+event-loop slot, and one heavy user must not starve the others:
+
+- Each cat allows bulkhead_max_concurrent_per_cat requests in flight
+  (a slot is held until the cat's response has been streamed)
+- Further requests wait in per-user queues; a freed slot goes to the next
+  user in round-robin order, so a user with many queued requests gets one
+  slot per turn like everybody else
+- Queues are bounded per cat and per user, and waiting is bounded by
+  bulkhead_queue_timeout_seconds; rejected requests get 503
+"""
+
+import asyncio
+import time
+from collections import OrderedDict, deque
+from typing import Callable, Optional
+from uuid import UUID
+
+from app.config import settings
+from app.metrics import set_bulkhead_state, track_bulkhead_rejected, track_bulkhead_wait
+
+
+class BulkheadFull(Exception):
+    """No slot could be obtained (reason: queue_full, user_queue_full, timeout)."""
+
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class Slot:
+    """Concurrency slot of a bulkhead; release() is idempotent."""
+
+    def __init__(self, bulkhead: "Bulkhead"):
+        self._bulkhead = bulkhead
+        self._released = False
+
+    def release(self) -> None:
+        if not self._released:
+            self._released = True
+            self._bulkhead._release()
+
+
+class Bulkhead:
+    """
+    Concurrency limit of one cat with round-robin queues per user.
+
+    Args:
+        name: Cat id (metrics)
+        max_concurrent: Requests in flight
+        max_queue: Requests waiting, all users together
+        max_queue_per_user: Requests waiting per user
+        queue_timeout: Longest wait for a slot (seconds)
+        clock: Monotonic clock (seconds)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_concurrent: int,
+        max_queue: int,
+        max_queue_per_user: int,
+        queue_timeout: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.max_queue_per_user = max_queue_per_user
+        self.queue_timeout = queue_timeout
+        self.clock = clock
+        self.active = 0
+        self.queued = 0
+        # user -> waiters; iteration order is the round-robin order
+        self._queues: OrderedDict[str, deque[asyncio.Future]] = OrderedDict()
+
+    def _publish(self) -> None:
+        set_bulkhead_state(self.name, self.active, self.queued)
+
+    def _reject(self, reason: str) -> BulkheadFull:
+        track_bulkhead_rejected(self.name, reason)
+        return BulkheadFull(reason)
+
+    async def acquire(self, user_id: UUID) -> Slot:
+        """
+        Wait for a slot.
+
+        Raises:
+            BulkheadFull: Queue full for the cat or the user, or queue_timeout elapsed
+        """
+        if self.active < self.max_concurrent and self.queued == 0:
+            self.active += 1
+            self._publish()
+            track_bulkhead_wait(self.name, 0.0)
+            return Slot(self)
+
+        key = str(user_id)
+        if self.queued >= self.max_queue:
+            raise self._reject("queue_full")
+        queue = self._queues.get(key)
+        if queue is not None and len(queue) >= self.max_queue_per_user:
+            raise self._reject("user_queue_full")
+
+        future = asyncio.get_running_loop().create_future()
+        self._queues.setdefault(key, deque()).append(future)
+        self.queued += 1
+        self._publish()
+        start = self.clock()
+        try:
+            await asyncio.wait_for(asyncio.shield(future), self.queue_timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if future.done():
+                # The slot was handed over as we gave up: pass it on
+                self._release()
+            else:
+                future.cancel()
+                self._remove(key, future)
+            if isinstance(e, asyncio.TimeoutError):
+                raise self._reject("timeout")
+            raise
+        finally:
+            track_bulkhead_wait(self.name, self.clock() - start)
+        return Slot(self)
+
+    def _remove(self, key: str, future: asyncio.Future) -> None:
+        queue = self._queues.get(key)
+        if queue is None or future not in queue:
+            return
+        queue.remove(future)
+        self.queued -= 1
+        if not queue:
+            del self._queues[key]
+        self._publish()
+
+    def _release(self) -> None:
+        """Hand the slot to the next user in turn, or free it."""
+        while self._queues:
+            key, queue = next(iter(self._queues.items()))
+            future = queue.popleft()
+            self.queued -= 1
+            if queue:
+                self._queues.move_to_end(key)
+            else:
+                del self._queues[key]
+            if not future.done():
+                future.set_result(None)
+                self._publish()
+                return
+        self.active -= 1
+        self._publish()
+
+
+_bulkheads: dict[str, Bulkhead] = {}
+
+
+def get_bulkhead(cat_id: str) -> Bulkhead:
+    """Bulkhead of a cat (created on first use)."""
+    bulkhead = _bulkheads.get(cat_id)
+    if bulkhead is None:
+        bulkhead = Bulkhead(
+            cat_id,
+            max_concurrent=settings.bulkhead_max_concurrent_per_cat,
+            max_queue=settings.bulkhead_max_queue_per_cat,
+            max_queue_per_user=settings.bulkhead_max_queue_per_user,
+            queue_timeout=settings.bulkhead_queue_timeout_seconds,
+        )
+        _bulkheads[cat_id] = bulkhead
+    return bulkhead
+
+
+async def acquire_slot(cat_id: str, user_id: UUID) -> Optional[Slot]:
+    """Slot for a request to a cat (None when bulkheads are disabled)."""
+    if not settings.bulkhead_enabled:
+        return None
+    return await get_bulkhead(cat_id).acquire(user_id)
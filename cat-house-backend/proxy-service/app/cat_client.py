@@ -0,0 +1,173 @@
+"""
+Outbound HTTP client for cat endpoints.
+
+- CatClientPool: One long-lived httpx.AsyncClient per cat origin (scheme, host,
+  port) with HTTP/2 and keep-alive, so consecutive actions reuse warm TLS
+  connections instead of paying a handshake per request
+- forward_action: POST a command to a cat with the configured timeouts,
+  retrying connection failures within max_retries and the process retry budget.
+  The response is returned as soon as its headers arrive; the body is left
+  unread for the caller to stream
+
+Only failures where the request never reached the cat (connect errors and
+connect timeouts) are retried: cat actions may have side effects.
+"""
+
+import asyncio
+from typing import Any, Optional
+from uuid import UUID
+
+import httpx
+
+from app.config import settings
+from app.logging_config import logger, trace_id_var
+from app.metrics import track_proxy_retry
+from app.resolution import CatTarget
+from app.retry import RetryBudget, backoff_delay
+
+# Failures raised before the request was sent
+RETRYABLE_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout)
+
+
+def cat_origin(url: str) -> str:
+    """Connection pool key of an endpoint URL (scheme://host:port)."""
+    parsed = httpx.URL(url)
+    port = parsed.port or (443 if parsed.scheme == "https" else 80)
+    return f"{parsed.scheme}://{parsed.host}:{port}"
+
+
+class CatClientPool:
+    """
+    Long-lived HTTP clients, one per cat origin.
+
+    Args:
+        transport: Transport used by every client instead of the network (tests)
+    """
+
+    def __init__(self, transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.transport = transport
+        self._clients: dict[str, httpx.AsyncClient] = {}
+
+    def get(self, url: str) -> httpx.AsyncClient:
+        """Client for the origin of url (created on first use)."""
+        origin = cat_origin(url)
+        client = self._clients.get(origin)
+        if client is None:
+            client = httpx.AsyncClient(
+                http2=settings.http2_enabled,
+                timeout=httpx.Timeout(settings.request_timeout, connect=settings.connect_timeout),
+                limits=httpx.Limits(
+                    max_connections=settings.max_connections_per_cat,
+                    max_keepalive_connections=settings.max_keepalive_connections_per_cat,
+                    keepalive_expiry=settings.keepalive_expiry_seconds,
+                ),
+                transport=self.transport,
+                follow_redirects=False,
+            )
+            self._clients[origin] = client
+        return client
+
+    async def close(self) -> None:
+        """Close every client and its connections."""
+        clients, self._clients = list(self._clients.values()), {}
+        await asyncio.gather(*(client.aclose() for client in clients), return_exceptions=True)
+
+
+_client_pool: Optional[CatClientPool] = None
+_retry_budget: Optional[RetryBudget] = None
+
+
+def get_client_pool() -> CatClientPool:
+    """Process-wide client pool."""
+    global _client_pool
+    if _client_pool is None:
+        _client_pool = CatClientPool()
+    return _client_pool
+
+
+def get_retry_budget() -> RetryBudget:
+    """Process-wide retry budget shared by all cats."""
+    global _retry_budget
+    if _retry_budget is None:
+        _retry_budget = RetryBudget(
+            ratio=settings.retry_budget_ratio,
+            min_per_second=settings.retry_budget_min_per_second,
+            window_seconds=settings.retry_budget_window_seconds,
+        )
+    return _retry_budget
+
+
+async def close_client_pool() -> None:
+    """Close the process-wide client pool (application shutdown)."""
+    global _client_pool
+    if _client_pool is not None:
+        await _client_pool.close()
+        _client_pool = None
+
+
+def forward_headers(target: CatTarget) -> dict[str, str]:
+    """Headers sent to the cat: trace id, installation context and service key."""
+    headers = {
+        "X-Trace-ID": trace_id_var.get(),
+        "X-Cat-Installation-ID": str(target.installation_id),
+        "X-Cat-Permissions": ",".join(target.permissions),
+    }
+    if target.service_key:
+        headers["X-Service-Key"] = target.service_key
+    return headers
+
+
+async def forward_action(
+    target: CatTarget,
+    user_id: UUID,
+    action: str,
+    payload: dict[str, Any],
+    extra_headers: Optional[dict[str, str]] = None,
+) -> httpx.Response:
+    """
+    POST a command to the cat endpoint.
+
+    Args:
+        target: Resolved installation and endpoint
+        user_id: Authenticated Cat House user
+        action: Cat action name
+        payload: Action parameters
+        extra_headers: Additional request headers (e.g. If-None-Match)
+
+    Returns:
+        httpx.Response: The cat's response (any status) with an unread body.
+            The caller must close it (aclose) after streaming.
+
+    Raises:
+        httpx.TimeoutException: The cat did not answer within request_timeout
+        httpx.TransportError: The cat could not be reached (after retries)
+    """
+    client = get_client_pool().get(target.endpoint_url)
+    budget = get_retry_budget()
+    command = {"action": action, "user_id": str(user_id), "payload": payload}
+    headers = {**forward_headers(target), **(extra_headers or {})}
+    request = client.build_request("POST", target.endpoint_url, json=command, headers=headers)
+
+    budget.record_request()
+    attempt = 0
+    while True:
+        try:
+            return await client.send(request, stream=True)
+        except RETRYABLE_ERRORS as e:
+            if attempt >= settings.max_retries:
+                raise
+            if not budget.try_acquire():
+                track_proxy_retry(str(target.cat_id), "budget_exhausted")
+                logger.warning(
+                    f"Retry budget exhausted for cat {target.cat_id}",
+                    extra={"cat_id": str(target.cat_id), "error": type(e).__name__},
+                )
+                raise
+            attempt += 1
+            track_proxy_retry(str(target.cat_id), type(e).__name__)
+            delay = backoff_delay(attempt, settings.retry_backoff_base_seconds, settings.retry_backoff_max_seconds)
+            logger.warning(
+                f"Retrying cat {target.cat_id} (attempt {attempt}/{settings.max_retries})",
+                extra={"cat_id": str(target.cat_id), "error": type(e).__name__, "delay_seconds": round(delay, 3)},
+            )
+            await asyncio.sleep(delay)
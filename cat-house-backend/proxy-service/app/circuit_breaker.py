@@ -0,0 +1,197 @@
+"""
+Per-cat circuit breakers.
+
+A dead or overloaded cat endpoint otherwise makes every request to it wait up
+to request_timeout, holding coroutines and sockets that healthy cats need.
+Each cat gets a breaker:
+
+- closed: Requests flow; outcomes of the last circuit_window_size calls are
+  kept. The breaker opens when at least circuit_min_calls were seen and the
+  error rate or the slow call rate reaches its threshold
+- open: Requests are rejected immediately for circuit_open_seconds
+- half_open: One probe at a time, at most one per probe interval, is let
+  through. circuit_half_open_success_threshold successful probes close the
+  breaker; a failed probe opens it again
+
+Failures are transport errors, timeouts and 5xx responses. 4xx responses
+are the caller's problem and count as successes.
+
+allow_request() returns an Admission that the caller hands back to record()
+or release(). Outcomes of requests admitted before the breaker last changed
+state are ignored, so a slow call admitted while closed cannot be taken for
+the half-open probe's result.
+"""
+
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from app.config import settings
+from app.logging_config import logger
+from app.metrics import set_circuit_state
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+@dataclass(frozen=True)
+class Admission:
+    """A request let through by allow_request() (generation = breaker state it was admitted in)."""
+
+    generation: int
+    probe: bool
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for one cat endpoint.
+
+    Args:
+        name: Cat id (logs and metrics)
+        window_size: Number of recent calls evaluated
+        min_calls: Calls required before the breaker may open
+        error_rate_threshold: Failure ratio that opens the breaker
+        slow_call_seconds: Calls slower than this count as slow
+        slow_call_rate_threshold: Slow call ratio that opens the breaker
+        open_seconds: Time rejected before probing
+        probe_interval_seconds: Minimum time between half-open probes
+        success_threshold: Successful probes required to close
+        clock: Monotonic clock (seconds)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        window_size: int = 20,
+        min_calls: int = 10,
+        error_rate_threshold: float = 0.5,
+        slow_call_seconds: float = 5.0,
+        slow_call_rate_threshold: float = 0.8,
+        open_seconds: float = 30.0,
+        probe_interval_seconds: float = 5.0,
+        success_threshold: int = 3,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.min_calls = min_calls
+        self.error_rate_threshold = error_rate_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate_threshold = slow_call_rate_threshold
+        self.open_seconds = open_seconds
+        self.probe_interval_seconds = probe_interval_seconds
+        self.success_threshold = success_threshold
+        self.clock = clock
+
+        self.state = CLOSED
+        # Incremented on every transition; identifies the state an Admission belongs to
+        self._generation = 0
+        # (failed, slow) per call
+        self._calls: deque[tuple[bool, bool]] = deque(maxlen=window_size)
+        self._opened_at = 0.0
+        self._last_probe_at: Optional[float] = None
+        self._probe_in_flight = False
+        self._probe_successes = 0
+        set_circuit_state(name, self.state)
+
+    def _transition(self, state: str) -> None:
+        previous, self.state = self.state, state
+        self._generation += 1
+        self._calls.clear()
+        self._probe_in_flight = False
+        self._probe_successes = 0
+        if state == OPEN:
+            self._opened_at = self.clock()
+        elif state == HALF_OPEN:
+            self._last_probe_at = None
+        set_circuit_state(self.name, state)
+        log = logger.info if state == CLOSED else logger.warning
+        log(
+            f"Circuit breaker for cat {self.name}: {previous} -> {state}",
+            extra={"cat_id": self.name, "circuit_state": state},
+        )
+
+    def allow_request(self) -> Optional[Admission]:
+        """Admit a request now, or None to reject it without calling the cat."""
+        if self.state == OPEN:
+            if self.clock() - self._opened_at < self.open_seconds:
+                return None
+            self._transition(HALF_OPEN)
+
+        if self.state == HALF_OPEN:
+            now = self.clock()
+            if self._probe_in_flight:
+                return None
+            if self._last_probe_at is not None and now - self._last_probe_at < self.probe_interval_seconds:
+                return None
+            self._probe_in_flight = True
+            self._last_probe_at = now
+            return Admission(self._generation, probe=True)
+        return Admission(self._generation, probe=False)
+
+    def retry_after(self) -> int:
+        """Seconds until the breaker lets a request through again (Retry-After)."""
+        now = self.clock()
+        if self.state == OPEN:
+            remaining = self.open_seconds - (now - self._opened_at)
+        elif self.state == HALF_OPEN and self._last_probe_at is not None:
+            remaining = self.probe_interval_seconds - (now - self._last_probe_at)
+        else:
+            remaining = 0
+        return max(1, int(remaining + 0.999))
+
+    def release(self, admission: Admission) -> None:
+        """Forget an admitted request that ended without an outcome (cancelled)."""
+        if admission.probe and admission.generation == self._generation:
+            self._probe_in_flight = False
+
+    def record(self, admission: Admission, success: bool, duration: float) -> None:
+        """Record the outcome of an admitted request (ignored if admitted in an earlier state)."""
+        if admission.generation != self._generation:
+            return
+
+        if self.state == HALF_OPEN:
+            self._probe_in_flight = False
+            if not success:
+                self._transition(OPEN)
+                return
+            self._probe_successes += 1
+            if self._probe_successes >= self.success_threshold:
+                self._transition(CLOSED)
+            return
+
+        if self.state != CLOSED:
+            return
+        self._calls.append((not success, duration >= self.slow_call_seconds))
+        if len(self._calls) < self.min_calls:
+            return
+        failures = sum(1 for failed, _ in self._calls if failed)
+        slow = sum(1 for _, is_slow in self._calls if is_slow)
+        if (
+            failures / len(self._calls) >= self.error_rate_threshold
+            or slow / len(self._calls) >= self.slow_call_rate_threshold
+        ):
+            self._transition(OPEN)
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+
+
+def get_circuit_breaker(cat_id: str) -> CircuitBreaker:
+    """Breaker of a cat (created closed on first use)."""
+    breaker = _breakers.get(cat_id)
+    if breaker is None:
+        breaker = CircuitBreaker(
+            cat_id,
+            window_size=settings.circuit_window_size,
+            min_calls=settings.circuit_min_calls,
+            error_rate_threshold=settings.circuit_error_rate_threshold,
+            slow_call_seconds=settings.circuit_slow_call_seconds,
+            slow_call_rate_threshold=settings.circuit_slow_call_rate_threshold,
+            open_seconds=settings.circuit_open_seconds,
+            probe_interval_seconds=settings.circuit_probe_interval_seconds,
+            success_threshold=settings.circuit_half_open_success_threshold,
+        )
+        _breakers[cat_id] = breaker
+    return breaker
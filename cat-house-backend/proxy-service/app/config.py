@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Optional
 
 from pydantic import field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -23,12 +23,74 @@ class Settings(BaseSettings):
     pool_size: int = 1
     max_overflow: int = 0
 
+    # Caller authentication: access tokens issued by auth-service
+    # (requests are rejected while JWT_SECRET is unset)
+    jwt_secret: Optional[str] = None
+    jwt_algorithm: str = "HS256"
+
     # CORS
     allowed_origins: List[str] = ["https://app.gamificator.click"]
 
     # Request configuration
     request_timeout: int = 30
     max_retries: int = 3
+    connect_timeout: float = 5.0
+
+    # Body limits: requests are read up to the limit, responses are streamed
+    max_request_body_bytes: int = 1_048_576
+    max_response_body_bytes: int = 104_857_600
+
+    # Outbound connection pooling (one long-lived client per cat origin)
+    http2_enabled: bool = True
+    max_connections_per_cat: int = 100
+    max_keepalive_connections_per_cat: int = 20
+    keepalive_expiry_seconds: float = 30.0
+
+    # Retry budget: retries allowed per window = min + ratio * requests
+    retry_budget_ratio: float = 0.1
+    retry_budget_min_per_second: float = 1.0
+    retry_budget_window_seconds: int = 10
+    retry_backoff_base_seconds: float = 0.05
+    retry_backoff_max_seconds: float = 1.0
+
+    # Installation resolution cache (invalidated by NOTIFY proxy_resolution).
+    # LISTEN needs a direct (non-pooler) endpoint: a transaction pooler accepts
+    # LISTEN but never delivers notifications. Without it the cache stays inactive.
+    resolution_cache_enabled: bool = True
+    listen_database_url: Optional[str] = None
+    resolution_cache_ttl_seconds: float = 300.0
+    resolution_cache_max_entries: int = 10000
+
+    # Response cache (cat actions the cat marks cacheable with Cache-Control)
+    response_cache_enabled: bool = True
+    response_cache_max_bytes: int = 33_554_432
+    response_cache_max_entry_bytes: int = 1_048_576
+
+    # Hedged requests (actions in catalog.cats.idempotent_actions)
+    hedging_enabled: bool = True
+    hedge_percentile: float = 0.95
+    hedge_min_samples: int = 20
+    hedge_latency_window: int = 200
+    hedge_budget_ratio: float = 0.05
+    hedge_budget_window_seconds: int = 10
+
+    # Per-cat bulkheads (must stay below max_connections_per_cat)
+    bulkhead_enabled: bool = True
+    bulkhead_max_concurrent_per_cat: int = 20
+    bulkhead_max_queue_per_cat: int = 100
+    bulkhead_max_queue_per_user: int = 10
+    bulkhead_queue_timeout_seconds: float = 5.0
+
+    # Per-cat circuit breakers
+    circuit_breaker_enabled: bool = True
+    circuit_window_size: int = 20
+    circuit_min_calls: int = 10
+    circuit_error_rate_threshold: float = 0.5
+    circuit_slow_call_seconds: float = 5.0
+    circuit_slow_call_rate_threshold: float = 0.8
+    circuit_open_seconds: float = 30.0
+    circuit_probe_interval_seconds: float = 5.0
+    circuit_half_open_success_threshold: int = 3
 
     @field_validator("database_url")
     @classmethod
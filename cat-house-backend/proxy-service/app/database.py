@@ -2,10 +2,15 @@
 
 Connection Allocation (proxy-service):
 - pool_size=1, max_overflow=0 (max 1 connection, read-only)
+- 1 dedicated LISTEN connection for resolution cache invalidation
+  (when resolution_cache_enabled and LISTEN_DATABASE_URL is set; it must be a
+  direct endpoint, not the pooled DATABASE_URL)
 """
 
 from typing import AsyncGenerator
 
+import asyncpg
+
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from .config import settings
@@ -52,6 +57,17 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+async def connect_listener() -> asyncpg.Connection:
+    """Open the dedicated LISTEN connection on LISTEN_DATABASE_URL (outside the pool, idle between notifications)."""
+    if not settings.listen_database_url:
+        raise RuntimeError("LISTEN_DATABASE_URL is not set")
+    return await asyncpg.connect(
+        settings.listen_database_url.replace("postgresql+asyncpg://", "postgresql://", 1),
+        ssl="require",
+        server_settings={"application_name": "cat-house-proxy-service-listener"},
+    )
+
+
 async def close_db():
     """Close database connections gracefully."""
     await engine.dispose()
@@ -0,0 +1,161 @@
+"""
+Hedged requests for idempotent cat actions.
+
+Tail latency of third-party cat endpoints is what users feel. For actions
+the cat lists in catalog.cats.idempotent_actions, a second identical
+request is sent when the first has not answered within that cat's
+observed p95 latency; whichever response arrives first is used and the
+other request is cancelled. A 5xx response is held while the other request
+is still pending and only returned once neither request can do better.
+
+- Latency is tracked per cat over the last hedge_latency_window attempts
+  (time to response headers); no hedging before hedge_min_samples
+- Hedges are capped by a budget: at most hedge_budget_ratio extra requests
+  (5% by default) over a sliding window
+"""
+
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Awaitable, Callable, Optional
+
+import httpx
+
+from app.config import settings
+from app.metrics import track_hedge
+from app.retry import RetryBudget
+
+
+class LatencyTracker:
+    """
+    Recent response latencies of one cat.
+
+    Args:
+        window: Number of recent samples kept
+        min_samples: Samples required before percentile() answers
+    """
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self.min_samples = min_samples
+        self._samples: deque[float] = deque(maxlen=window)
+
+    def record(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """q-th percentile (0..1) of recent latencies, None with too few samples."""
+        if len(self._samples) < self.min_samples:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+
+_trackers: dict[str, LatencyTracker] = {}
+_hedge_budget: Optional[RetryBudget] = None
+# Responses of losing requests being closed (referenced until done)
+_closing: set[asyncio.Task] = set()
+
+
+def get_latency_tracker(cat_id: str) -> LatencyTracker:
+    """Latency tracker of a cat (created on first use)."""
+    tracker = _trackers.get(cat_id)
+    if tracker is None:
+        tracker = LatencyTracker(settings.hedge_latency_window, settings.hedge_min_samples)
+        _trackers[cat_id] = tracker
+    return tracker
+
+
+def get_hedge_budget() -> RetryBudget:
+    """Process-wide hedge budget (hedge_budget_ratio of hedgeable requests)."""
+    global _hedge_budget
+    if _hedge_budget is None:
+        _hedge_budget = RetryBudget(
+            ratio=settings.hedge_budget_ratio,
+            min_per_second=0,
+            window_seconds=settings.hedge_budget_window_seconds,
+        )
+    return _hedge_budget
+
+
+def _close_unused(task: asyncio.Task) -> None:
+    """Close the response of a losing request that completed anyway."""
+    if not task.cancelled() and task.exception() is None:
+        closing = asyncio.ensure_future(task.result().aclose())
+        _closing.add(closing)
+        closing.add_done_callback(_closing.discard)
+
+
+async def send_with_hedging(
+    cat_id: str,
+    send: Callable[[], Awaitable[httpx.Response]],
+    idempotent: bool,
+) -> httpx.Response:
+    """
+    Send a cat request, hedging it after the cat's p95 when idempotent.
+
+    Args:
+        cat_id: Cat (latency tracking, metrics)
+        send: Coroutine factory sending one request
+        idempotent: Whether the action may be sent twice
+
+    Returns:
+        httpx.Response: First non-5xx response received, else the first 5xx
+
+    Raises:
+        The error of the last request when every request failed
+    """
+    tracker = get_latency_tracker(cat_id)
+
+    async def timed_send() -> httpx.Response:
+        start = time.perf_counter()
+        response = await send()
+        tracker.record(time.perf_counter() - start)
+        return response
+
+    delay = tracker.percentile(settings.hedge_percentile)
+    if not (settings.hedging_enabled and idempotent and delay is not None):
+        return await timed_send()
+
+    budget = get_hedge_budget()
+    budget.record_request()
+    primary = asyncio.create_task(timed_send())
+    pending = {primary}
+    winner: Optional[asyncio.Task] = None
+    try:
+        done, _ = await asyncio.wait(pending, timeout=delay)
+        if not done:
+            if budget.try_acquire():
+                track_hedge(cat_id, "sent")
+                pending.add(asyncio.create_task(timed_send()))
+            else:
+                track_hedge(cat_id, "budget_exhausted")
+
+        error: Optional[BaseException] = None
+        # First 5xx response, used only once no other request is pending
+        fallback: Optional[asyncio.Task] = None
+        while pending and winner is None:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is not None:
+                    error = task.exception()
+                elif winner is None and task.result().status_code < 500:
+                    winner = task
+                elif fallback is None:
+                    fallback = task
+                else:
+                    _close_unused(task)
+
+        if winner is None:
+            winner = fallback
+        elif fallback is not None:
+            _close_unused(fallback)
+        if winner is None:
+            raise error
+        if winner is not primary:
+            track_hedge(cat_id, "won")
+        return winner.result()
+    finally:
+        for task in pending:
+            task.cancel()
+            task.add_done_callback(_close_unused)
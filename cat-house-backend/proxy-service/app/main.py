@@ -6,7 +6,10 @@ from fastapi.middleware.cors import CORSMiddleware
 from app.config import settings
 from app.logging_config import logger, setup_logging
 from app.middleware import correlation_id_middleware, metrics_middleware
-from app.routers import health, metrics
+from app.cat_client import close_client_pool
+from app.database import close_db
+from app.resolution import start_resolution_listener, stop_resolution_listener
+from app.routers import health, metrics, proxy
 from app.metrics import set_service_health
 
 # Setup logging on startup
@@ -22,12 +25,16 @@ async def lifespan(app: FastAPI):
 
     # Set service health to healthy
     set_service_health(True)
+    start_resolution_listener()
 
     yield
 
     # Shutdown
     logger.info(f"Shutting down {settings.service_display_name}")
     set_service_health(False)
+    await stop_resolution_listener()
+    await close_client_pool()
+    await close_db()
 
 
 app = FastAPI(
@@ -55,6 +62,7 @@ app.add_middleware(
 # Include routers
 app.include_router(health.router, prefix="/api/v1/proxy", tags=["health"])
 app.include_router(metrics.router, prefix="/api/v1/proxy", tags=["metrics"])
+app.include_router(proxy.router, prefix="/api/v1/proxy", tags=["proxy"])
 
 if __name__ == "__main__":
     import uvicorn
@@ -2,6 +2,8 @@
 Prometheus metrics module for tracking HTTP requests, database operations, and business events.
 """
 
+from typing import Optional
+
 from prometheus_client import Counter, Histogram, Gauge, REGISTRY
 from app.config import settings
 
@@ -52,6 +54,95 @@ business_events_total = Counter(
     registry=REGISTRY,
 )
 
+# Proxy (outbound cat request) metrics
+proxy_requests_total = Counter(
+    "proxy_requests_total",
+    "Total proxied cat actions by outcome",
+    ["cat_id", "status", "service"],
+    registry=REGISTRY,
+)
+
+proxy_upstream_duration_seconds = Histogram(
+    "proxy_upstream_duration_seconds",
+    "Cat endpoint response time in seconds (including retries)",
+    ["cat_id", "service"],
+    buckets=[0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0],
+    registry=REGISTRY,
+)
+
+proxy_retries_total = Counter(
+    "proxy_retries_total",
+    "Retries of cat requests by reason (budget_exhausted = retry denied)",
+    ["cat_id", "reason", "service"],
+    registry=REGISTRY,
+)
+
+proxy_resolution_cache_total = Counter(
+    "proxy_resolution_cache_total",
+    "Installation resolution cache lookups by result (hit, miss)",
+    ["result", "service"],
+    registry=REGISTRY,
+)
+
+proxy_response_cache_total = Counter(
+    "proxy_response_cache_total",
+    "Response cache lookups by result (hit, stale, revalidated, miss)",
+    ["cat_id", "result", "service"],
+    registry=REGISTRY,
+)
+
+proxy_response_cache_bytes = Gauge(
+    "proxy_response_cache_bytes",
+    "Memory held by the response cache in bytes",
+    ["service"],
+    registry=REGISTRY,
+)
+
+proxy_hedged_requests_total = Counter(
+    "proxy_hedged_requests_total",
+    "Hedged cat requests by outcome (sent, won, budget_exhausted)",
+    ["cat_id", "outcome", "service"],
+    registry=REGISTRY,
+)
+
+proxy_bulkhead_active = Gauge(
+    "proxy_bulkhead_active",
+    "Requests in flight per cat",
+    ["cat_id", "service"],
+    registry=REGISTRY,
+)
+
+proxy_bulkhead_queue_depth = Gauge(
+    "proxy_bulkhead_queue_depth",
+    "Requests waiting for a slot per cat",
+    ["cat_id", "service"],
+    registry=REGISTRY,
+)
+
+proxy_bulkhead_wait_seconds = Histogram(
+    "proxy_bulkhead_wait_seconds",
+    "Time waited for a cat slot in seconds",
+    ["cat_id", "service"],
+    buckets=[0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0],
+    registry=REGISTRY,
+)
+
+proxy_bulkhead_rejected_total = Counter(
+    "proxy_bulkhead_rejected_total",
+    "Requests rejected by a cat bulkhead by reason (queue_full, user_queue_full, timeout)",
+    ["cat_id", "reason", "service"],
+    registry=REGISTRY,
+)
+
+proxy_circuit_breaker_state = Gauge(
+    "proxy_circuit_breaker_state",
+    "Cat circuit breaker state (0=closed, 1=half_open, 2=open)",
+    ["cat_id", "service"],
+    registry=REGISTRY,
+)
+
+CIRCUIT_STATE_VALUES = {"closed": 0, "half_open": 1, "open": 2}
+
 # Service health
 service_health_status = Gauge(
     "service_health_status",
@@ -91,6 +182,81 @@ def track_db_query(operation: str, duration: float):
     ).observe(duration)
 
 
+def track_proxy_request(cat_id: str, status: str, duration: Optional[float] = None):
+    """Track a proxied action (status = upstream HTTP status or error kind).
+
+    duration is None when the cat was not called (e.g. circuit open).
+    """
+    proxy_requests_total.labels(
+        cat_id=cat_id, status=status, service=settings.service_name
+    ).inc()
+
+    if duration is not None:
+        proxy_upstream_duration_seconds.labels(
+            cat_id=cat_id, service=settings.service_name
+        ).observe(duration)
+
+
+def track_proxy_retry(cat_id: str, reason: str):
+    """Track a retry (or a retry denied by the budget) of a cat request."""
+    proxy_retries_total.labels(
+        cat_id=cat_id, reason=reason, service=settings.service_name
+    ).inc()
+
+
+def track_resolution_cache(result: str):
+    """Track an installation resolution cache lookup (hit or miss)."""
+    proxy_resolution_cache_total.labels(
+        result=result, service=settings.service_name
+    ).inc()
+
+
+def track_response_cache(cat_id: str, result: str):
+    """Track a response cache lookup (hit, stale, revalidated, miss)."""
+    proxy_response_cache_total.labels(
+        cat_id=cat_id, result=result, service=settings.service_name
+    ).inc()
+
+
+def set_response_cache_bytes(size: int):
+    """Set the memory held by the response cache."""
+    proxy_response_cache_bytes.labels(service=settings.service_name).set(size)
+
+
+def track_hedge(cat_id: str, outcome: str):
+    """Track a hedged request (sent, won, budget_exhausted)."""
+    proxy_hedged_requests_total.labels(
+        cat_id=cat_id, outcome=outcome, service=settings.service_name
+    ).inc()
+
+
+def set_bulkhead_state(cat_id: str, active: int, queued: int):
+    """Set a cat's requests in flight and queue depth."""
+    proxy_bulkhead_active.labels(cat_id=cat_id, service=settings.service_name).set(active)
+    proxy_bulkhead_queue_depth.labels(cat_id=cat_id, service=settings.service_name).set(queued)
+
+
+def track_bulkhead_wait(cat_id: str, duration: float):
+    """Track time waited for a cat slot."""
+    proxy_bulkhead_wait_seconds.labels(
+        cat_id=cat_id, service=settings.service_name
+    ).observe(duration)
+
+
+def track_bulkhead_rejected(cat_id: str, reason: str):
+    """Track a request rejected by a cat bulkhead."""
+    proxy_bulkhead_rejected_total.labels(
+        cat_id=cat_id, reason=reason, service=settings.service_name
+    ).inc()
+
+
+def set_circuit_state(cat_id: str, state: str):
+    """Set a cat's circuit breaker state (closed, half_open, open)."""
+    proxy_circuit_breaker_state.labels(
+        cat_id=cat_id, service=settings.service_name
+    ).set(CIRCUIT_STATE_VALUES[state])
+
+
 def set_service_health(healthy: bool):
     """Set service health status."""
     service_health_status.labels(service=settings.service_name).set(1 if healthy else 0)
@@ -0,0 +1,149 @@
+"""
+Installation resolution for proxied cat actions.
+
+Resolves a user's active installation of a cat, the cat's endpoint_url and
+the permissions granted to the installation in one read-only query over the
+installation and catalog schemas.
+
+The query runs in its own short session so the proxy's single database
+connection (pool_size=1) is returned before the cat is called, instead of
+being held for the duration of the upstream request. Results are cached
+per (user_id, cat_id) (see app/resolution_cache.py).
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Optional
+from uuid import UUID
+
+from sqlalchemy import text
+
+from app.config import settings
+from app.database import AsyncSessionLocal, connect_listener
+from app.logging_config import logger
+from app.resolution_cache import ResolutionCache, ResolutionInvalidationListener
+
+# Installation config field holding the service key sent to the cat (X-Service-Key)
+SERVICE_KEY_CONFIG_FIELD = "service_key"
+
+RESOLVE_TARGET_SQL = text(
+    """
+    SELECT i.id AS installation_id,
+           c.endpoint_url,
+           c.status AS cat_status,
+           c.idempotent_actions,
+           i.config,
+           COALESCE(
+               array_agg(p.permission_type ORDER BY p.permission_type)
+                   FILTER (WHERE ip.granted AND p.permission_type IS NOT NULL),
+               '{}'
+           ) AS permissions
+    FROM installation.installations i
+    JOIN catalog.cats c ON c.id = i.cat_id
+    LEFT JOIN installation.installation_permissions ip ON ip.installation_id = i.id
+    LEFT JOIN catalog.permissions p ON p.id = ip.permission_id
+    WHERE i.user_id = :user_id AND i.cat_id = :cat_id AND i.status = 'active'
+    GROUP BY i.id, c.id
+    """
+)
+
+
+@dataclass(frozen=True)
+class CatTarget:
+    """Where and with which grants a user's cat action is forwarded."""
+
+    installation_id: UUID
+    cat_id: UUID
+    endpoint_url: str
+    cat_status: str
+    permissions: tuple[str, ...] = ()
+    service_key: Optional[str] = field(default=None, repr=False)
+    # Actions the cat declares safe to receive twice (hedging)
+    idempotent_actions: frozenset[str] = frozenset()
+
+    @property
+    def available(self) -> bool:
+        """Whether the cat is published (draft and suspended cats are not proxied)."""
+        return self.cat_status == "published"
+
+
+async def fetch_cat_target(user_id: UUID, cat_id: UUID) -> Optional[CatTarget]:
+    """
+    Query the user's active installation of a cat.
+
+    Returns:
+        CatTarget, or None when the user has no active installation of the cat
+    """
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(RESOLVE_TARGET_SQL, {"user_id": user_id, "cat_id": cat_id})
+        row = result.mappings().first()
+    if row is None:
+        return None
+
+    config: dict[str, Any] = row["config"] or {}
+    return CatTarget(
+        installation_id=row["installation_id"],
+        cat_id=cat_id,
+        endpoint_url=row["endpoint_url"],
+        cat_status=row["cat_status"],
+        permissions=tuple(row["permissions"]),
+        service_key=config.get(SERVICE_KEY_CONFIG_FIELD),
+        idempotent_actions=frozenset(row["idempotent_actions"] or ()),
+    )
+
+
+_resolution_cache: Optional[ResolutionCache] = None
+_listener: Optional[ResolutionInvalidationListener] = None
+
+
+def get_resolution_cache() -> ResolutionCache:
+    """Process-wide resolution cache."""
+    global _resolution_cache
+    if _resolution_cache is None:
+        _resolution_cache = ResolutionCache(
+            fetch_cat_target,
+            ttl_seconds=settings.resolution_cache_ttl_seconds,
+            max_entries=settings.resolution_cache_max_entries,
+        )
+    return _resolution_cache
+
+
+async def resolve_cat_target(user_id: UUID, cat_id: UUID) -> Optional[CatTarget]:
+    """
+    Resolve the user's active installation of a cat (cached).
+
+    Returns:
+        CatTarget, or None when the user has no active installation of the cat
+    """
+    if not settings.resolution_cache_enabled:
+        return await fetch_cat_target(user_id, cat_id)
+    return await get_resolution_cache().get(user_id, cat_id)
+
+
+def start_resolution_listener() -> None:
+    """
+    Start listening for invalidations (application startup).
+
+    Requires LISTEN_DATABASE_URL on a direct endpoint: LISTEN through the
+    transaction pooler receives no notifications. Without it the listener is
+    not started and the cache stays inactive (every lookup queries the database).
+    """
+    global _listener
+    if not settings.resolution_cache_enabled or _listener is not None:
+        return
+    url = settings.listen_database_url
+    if not url or "-pooler" in url:
+        logger.warning(
+            "Resolution cache inactive: LISTEN_DATABASE_URL must be set to a direct (non-pooler) endpoint",
+            extra={"listen_database_url_set": bool(url)},
+        )
+        return
+    _listener = ResolutionInvalidationListener(get_resolution_cache(), connect_listener)
+    _listener.start()
+
+
+async def stop_resolution_listener() -> None:
+    """Stop listening for invalidations (application shutdown)."""
+    global _listener
+    if _listener is not None:
+        await _listener.stop()
+        _listener = None
@@ -0,0 +1,207 @@
+"""
+In-process cache of installation resolution, invalidated by PostgreSQL NOTIFY.
+
+The proxy database pool has a single connection (pool_size=1), so a lookup
+per proxied request serializes every request on it. Resolved targets (and
+"not installed" results) are cached per (user_id, cat_id):
+
+- Triggers on installation.installations / installation_permissions send
+  NOTIFY proxy_resolution {"user_id", "cat_id"}; triggers on catalog.cats /
+  permissions send {"cat_id"} (every entry of the cat is dropped)
+- A dedicated LISTEN connection (outside the SQLAlchemy pool, on the direct
+  LISTEN_DATABASE_URL endpoint) receives them
+- Entries are only cached while LISTEN is connected; on disconnect the
+  cache is cleared and lookups go to the database until it reconnects
+- resolution_cache_ttl_seconds bounds staleness if a notification is lost
+- Concurrent misses for the same key share one query
+"""
+
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional
+from uuid import UUID
+
+import asyncpg
+
+from app.logging_config import logger
+from app.metrics import track_resolution_cache
+
+NOTIFY_CHANNEL = "proxy_resolution"
+
+CacheKey = tuple[UUID, UUID]
+
+
+class ResolutionCache:
+    """
+    LRU + TTL cache of resolution results keyed by (user_id, cat_id).
+
+    Args:
+        loader: Coroutine resolving a key from the database
+        ttl_seconds: Maximum age of an entry
+        max_entries: Least recently used entries are evicted beyond this
+        clock: Monotonic clock (seconds)
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[UUID, UUID], Awaitable[Any]],
+        ttl_seconds: float = 300.0,
+        max_entries: int = 10_000,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.loader = loader
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.clock = clock
+        # Set by the NOTIFY listener: nothing is cached unless invalidation works
+        self.active = False
+        self._entries: OrderedDict[CacheKey, tuple[float, Any]] = OrderedDict()
+        self._inflight: dict[CacheKey, asyncio.Task] = {}
+        # Bumped on every invalidation; loads that raced one are not stored
+        self._generation = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, user_id: UUID, cat_id: UUID) -> Any:
+        """Cached value of (user_id, cat_id), loading it on a miss."""
+        key = (user_id, cat_id)
+        if self.active:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > self.clock():
+                self._entries.move_to_end(key)
+                track_resolution_cache("hit")
+                return entry[1]
+        track_resolution_cache("miss")
+
+        # The load runs in its own task: a cancelled caller does not fail the others
+        load = self._inflight.get(key)
+        if load is None:
+            load = asyncio.create_task(self._load(key, self._generation))
+            load.add_done_callback(_consume_exception)
+            self._inflight[key] = load
+        return await asyncio.shield(load)
+
+    async def _load(self, key: CacheKey, generation: int) -> Any:
+        try:
+            value = await self.loader(*key)
+        finally:
+            del self._inflight[key]
+        if self.active and generation == self._generation:
+            self._store(key, value)
+        return value
+
+    def _store(self, key: CacheKey, value: Any) -> None:
+        self._entries[key] = (self.clock() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: Optional[UUID] = None, cat_id: Optional[UUID] = None) -> None:
+        """Drop one entry (user_id and cat_id), every entry of a cat (cat_id) or all entries."""
+        self._generation += 1
+        if user_id is not None and cat_id is not None:
+            self._entries.pop((user_id, cat_id), None)
+        elif cat_id is not None:
+            for key in [key for key in self._entries if key[1] == cat_id]:
+                del self._entries[key]
+        else:
+            self._entries.clear()
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        self.invalidate()
+
+    def handle_notification(self, payload: str) -> None:
+        """Apply a proxy_resolution NOTIFY payload (unreadable payloads clear the cache)."""
+        try:
+            data = json.loads(payload)
+            user_id = UUID(data["user_id"]) if data.get("user_id") else None
+            cat_id = UUID(data["cat_id"])
+        except (ValueError, KeyError, TypeError):
+            logger.warning("Unreadable resolution invalidation, clearing cache", extra={"payload": payload})
+            self.clear()
+            return
+        self.invalidate(user_id=user_id, cat_id=cat_id)
+
+
+def _consume_exception(task: asyncio.Task) -> None:
+    """Mark a load failure as retrieved when every caller was cancelled."""
+    if not task.cancelled():
+        task.exception()
+
+
+class ResolutionInvalidationListener:
+    """
+    Keep a LISTEN proxy_resolution connection open and feed it to the cache.
+
+    Args:
+        cache: Cache to invalidate (activated while listening)
+        connect: Coroutine opening the dedicated asyncpg connection
+        max_backoff_seconds: Upper bound of the reconnect delay
+    """
+
+    def __init__(
+        self,
+        cache: ResolutionCache,
+        connect: Callable[[], Awaitable[asyncpg.Connection]],
+        max_backoff_seconds: float = 30.0,
+    ):
+        self.cache = cache
+        self.connect = connect
+        self.max_backoff_seconds = max_backoff_seconds
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Start listening in the background."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop listening and deactivate the cache."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def _on_notify(self, connection, pid, channel, payload) -> None:
+        self.cache.handle_notification(payload)
+
+    async def _run(self) -> None:
+        delay = 1.0
+        while True:
+            connection = None
+            try:
+                connection = await self.connect()
+                lost = asyncio.Event()
+                connection.add_termination_listener(lambda _: lost.set())
+                await connection.add_listener(NOTIFY_CHANNEL, self._on_notify)
+                # Changes made while not listening were missed
+                self.cache.clear()
+                self.cache.active = True
+                delay = 1.0
+                logger.info("Listening for resolution invalidations", extra={"channel": NOTIFY_CHANNEL})
+                await lost.wait()
+                logger.warning("Resolution invalidation connection lost")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(
+                    f"Resolution invalidation listener failed: {e}",
+                    extra={"error": type(e).__name__, "retry_in_seconds": delay},
+                )
+            finally:
+                self.cache.active = False
+                self.cache.clear()
+                if connection is not None and not connection.is_closed():
+                    try:
+                        await connection.close(timeout=5)
+                    except Exception:
+                        connection.terminate()
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_backoff_seconds)
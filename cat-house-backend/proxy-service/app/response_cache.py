@@ -0,0 +1,224 @@
+"""
+Response cache for cat actions, driven by the cat's Cache-Control and ETag.
+
+Every cat action is a POST, so only the cat knows which actions are reads:
+a 200 response is stored when the cat marks it cacheable (Cache-Control
+max-age, or no-cache with an ETag) and not no-store.
+
+- Key: user, installation, granted permissions, action and canonical
+  payload. A permission change therefore never serves data fetched under
+  other grants
+- Fresh (age < max-age): served from memory
+- Within stale-while-revalidate: served stale while one background request
+  refreshes the entry
+- Older (or no-cache): revalidated with If-None-Match; a 304 from the cat
+  refreshes the entry and the stored body is served
+- Memory bounded: least recently used entries are evicted beyond
+  response_cache_max_bytes; bodies over response_cache_max_entry_bytes are
+  never stored
+"""
+
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Mapping, Optional
+from uuid import UUID
+
+from app.config import settings
+from app.metrics import set_response_cache_bytes
+from app.resolution import CatTarget
+
+
+def parse_cache_control(value: Optional[str]) -> dict[str, Optional[str]]:
+    """Cache-Control directives (lowercase name -> value or None)."""
+    directives: dict[str, Optional[str]] = {}
+    for part in (value or "").split(","):
+        name, _, argument = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = argument.strip('"') if argument else None
+    return directives
+
+
+def _seconds(value: Optional[str]) -> float:
+    try:
+        return max(0.0, float(value)) if value is not None else 0.0
+    except ValueError:
+        return 0.0
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """Freshness of a stored response."""
+
+    max_age: float
+    stale_while_revalidate: float
+    no_cache: bool
+
+
+def cache_policy(headers: Mapping[str, str]) -> Optional[CachePolicy]:
+    """Policy of a cat response, or None when it must not be stored."""
+    directives = parse_cache_control(headers.get("cache-control"))
+    if "no-store" in directives:
+        return None
+    no_cache = "no-cache" in directives
+    if no_cache and not headers.get("etag"):
+        return None
+    if not no_cache and "max-age" not in directives:
+        return None
+    return CachePolicy(
+        max_age=0.0 if no_cache else _seconds(directives.get("max-age")),
+        stale_while_revalidate=0.0 if no_cache else _seconds(directives.get("stale-while-revalidate")),
+        no_cache=no_cache,
+    )
+
+
+def response_cache_key(user_id: UUID, target: CatTarget, action: str, payload: dict[str, Any]) -> str:
+    """Cache key of an action call (payload key order does not matter)."""
+    material = json.dumps(
+        [str(user_id), str(target.installation_id), sorted(target.permissions), action, payload],
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(material.encode()).hexdigest()
+
+
+def _opaque_tag(etag: str) -> str:
+    return etag.strip().removeprefix("W/")
+
+
+def etag_matches(if_none_match: Optional[str], etag: Optional[str]) -> bool:
+    """Whether a client's If-None-Match matches an ETag (weak comparison)."""
+    if not if_none_match or not etag:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return _opaque_tag(etag) in {_opaque_tag(tag) for tag in if_none_match.split(",")}
+
+
+@dataclass
+class CachedResponse:
+    """Stored cat response (body still content-encoded, as received)."""
+
+    status_code: int
+    headers: dict[str, str]
+    body: bytes
+    stored_at: float
+    policy: CachePolicy
+
+    @property
+    def etag(self) -> Optional[str]:
+        return self.headers.get("etag")
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + sum(len(k) + len(v) for k, v in self.headers.items())
+
+    def age(self, now: float) -> float:
+        return now - self.stored_at
+
+    def is_fresh(self, now: float) -> bool:
+        return not self.policy.no_cache and self.age(now) < self.policy.max_age
+
+    def is_stale_usable(self, now: float) -> bool:
+        """Past max-age but within stale-while-revalidate."""
+        return self.age(now) < self.policy.max_age + self.policy.stale_while_revalidate
+
+
+class ResponseCache:
+    """
+    Memory-bounded LRU of cat responses.
+
+    Args:
+        max_bytes: Total size of stored bodies and headers
+        max_entry_bytes: Largest response stored
+        clock: Monotonic clock (seconds)
+    """
+
+    def __init__(
+        self,
+        max_bytes: int,
+        max_entry_bytes: int,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self.clock = clock
+        self.size = 0
+        self._entries: OrderedDict[str, CachedResponse] = OrderedDict()
+        self._revalidating: set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """Stored response (fresh or not), marking it recently used."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key: str, status_code: int, headers: Mapping[str, str], body: bytes, policy: CachePolicy) -> None:
+        """Store a response, evicting least recently used entries over max_bytes."""
+        entry = CachedResponse(status_code, dict(headers), body, self.clock(), policy)
+        self.invalidate(key)
+        if entry.size > self.max_entry_bytes:
+            return
+        self._entries[key] = entry
+        self.size += entry.size
+        while self.size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.size -= evicted.size
+        set_response_cache_bytes(self.size)
+
+    def refresh(self, key: str, headers: Mapping[str, str]) -> Optional[CachedResponse]:
+        """Apply a 304 Not Modified: restart freshness with the cat's new policy."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        policy = cache_policy({**entry.headers, **{k.lower(): v for k, v in headers.items()}})
+        if policy is None:
+            self.invalidate(key)
+            return entry
+        previous_size = entry.size
+        entry.stored_at = self.clock()
+        entry.policy = policy
+        for name in ("cache-control", "etag", "last-modified"):
+            if name in headers:
+                entry.headers[name] = headers[name]
+        self.size += entry.size - previous_size
+        set_response_cache_bytes(self.size)
+        return entry
+
+    def invalidate(self, key: str) -> None:
+        """Drop a stored response."""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= entry.size
+            set_response_cache_bytes(self.size)
+
+    def begin_revalidation(self, key: str) -> bool:
+        """Claim the background refresh of an entry (False if one is running)."""
+        if key in self._revalidating:
+            return False
+        self._revalidating.add(key)
+        return True
+
+    def end_revalidation(self, key: str) -> None:
+        self._revalidating.discard(key)
+
+
+_response_cache: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> ResponseCache:
+    """Process-wide response cache."""
+    global _response_cache
+    if _response_cache is None:
+        _response_cache = ResponseCache(
+            max_bytes=settings.response_cache_max_bytes,
+            max_entry_bytes=settings.response_cache_max_entry_bytes,
+        )
+    return _response_cache
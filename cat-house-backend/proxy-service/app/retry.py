@@ -0,0 +1,70 @@
+"""
+Retry budget and backoff for outbound cat requests.
+
+A fixed per-request retry count multiplies load when a cat is struggling:
+with max_retries=3 every failing request becomes four. The budget caps
+retries across the whole process to a fraction of recent requests, so
+retries absorb transient failures but cannot amplify an outage.
+"""
+
+import random
+import time
+from collections import deque
+from typing import Callable
+
+
+class RetryBudget:
+    """
+    Allow retries while they stay within min_per_second + ratio of requests.
+
+    Requests and retries are counted in one-second buckets over a sliding
+    window of window_seconds.
+
+    Args:
+        ratio: Retries allowed per request (0.1 = 10% extra load)
+        min_per_second: Retries always allowed per second (low traffic)
+        window_seconds: Length of the sliding window
+        clock: Monotonic clock (seconds)
+    """
+
+    def __init__(
+        self,
+        ratio: float,
+        min_per_second: float,
+        window_seconds: int = 10,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.window_seconds = window_seconds
+        self.clock = clock
+        # [second, requests, retries]
+        self._buckets: deque[list[int]] = deque()
+
+    def _bucket(self) -> list[int]:
+        now = int(self.clock())
+        while self._buckets and self._buckets[0][0] <= now - self.window_seconds:
+            self._buckets.popleft()
+        if not self._buckets or self._buckets[-1][0] != now:
+            self._buckets.append([now, 0, 0])
+        return self._buckets[-1]
+
+    def record_request(self) -> None:
+        """Count a first attempt."""
+        self._bucket()[1] += 1
+
+    def try_acquire(self) -> bool:
+        """Take one retry from the budget; False when it is exhausted."""
+        bucket = self._bucket()
+        requests = sum(b[1] for b in self._buckets)
+        retries = sum(b[2] for b in self._buckets)
+        allowed = self.min_per_second * self.window_seconds + self.ratio * requests
+        if retries + 1 > allowed:
+            return False
+        bucket[2] += 1
+        return True
+
+
+def backoff_delay(attempt: int, base: float, maximum: float) -> float:
+    """Exponential backoff with full jitter for retry number attempt (1-based)."""
+    return random.uniform(0, min(maximum, base * 2 ** (attempt - 1)))
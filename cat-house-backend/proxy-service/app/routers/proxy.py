@@ -0,0 +1,419 @@
+"""
+Cat action proxy.
+
+POST /{cat_id}/action resolves the caller's active installation of the cat,
+forwards the action to the cat's endpoint_url and relays the cat's response.
+
+The caller is identified by the `sub` claim of their bearer access token,
+verified here (app/auth.py); identity headers sent by clients are ignored.
+
+Proxy memory per request is bounded regardless of body sizes:
+- The request body is read chunk by chunk and rejected (413) as soon as it
+  exceeds the limit; it is then wrapped in the command envelope for the cat
+- The cat's response is streamed to the client chunk by chunk. Each chunk
+  is only read from the cat once the client has accepted the previous one
+  (the ASGI send waits on the socket), so a slow client slows the cat
+  download instead of growing a buffer. Responses over
+  max_response_body_bytes are rejected (502) or, when the size is only
+  known while streaming, aborted
+
+Responses the cat marks cacheable are kept in the response cache
+(app/response_cache.py) and replayed without calling the cat.
+"""
+
+import asyncio
+import time
+from functools import partial
+from typing import Any, AsyncIterator, Callable, Mapping, Optional
+from uuid import UUID
+
+import httpx
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response, status
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field, ValidationError
+from starlette.background import BackgroundTask
+
+from app.auth import get_current_user_id
+from app.bulkhead import BulkheadFull, Slot, acquire_slot
+from app.cat_client import forward_action
+from app.circuit_breaker import get_circuit_breaker
+from app.config import settings
+from app.hedging import send_with_hedging
+from app.logging_config import logger
+from app.metrics import track_proxy_request, track_response_cache
+from app.resolution import CatTarget, resolve_cat_target
+from app.response_cache import (
+    CachedResponse,
+    ResponseCache,
+    cache_policy,
+    etag_matches,
+    get_response_cache,
+    parse_cache_control,
+    response_cache_key,
+)
+
+router = APIRouter()
+
+# Cat response headers relayed to the client (hop-by-hop headers are not)
+RELAYED_RESPONSE_HEADERS = (
+    "content-type",
+    "content-length",
+    "content-encoding",
+    "content-disposition",
+    "cache-control",
+    "etag",
+    "last-modified",
+)
+
+# Response cache outcome header (HIT, STALE, REVALIDATED, MISS)
+CACHE_STATUS_HEADER = "X-Proxy-Cache"
+
+# Background revalidations (referenced until done)
+_background_tasks: set[asyncio.Task] = set()
+
+
+class ProxyActionRequest(BaseModel):
+    """Action to forward to a cat."""
+
+    action: str = Field(..., min_length=1, max_length=100)
+    payload: dict[str, Any] = Field(default_factory=dict)
+
+
+class ResponseTooLarge(Exception):
+    """Cat response exceeded max_response_body_bytes while streaming."""
+
+
+async def read_action_request(request: Request) -> ProxyActionRequest:
+    """Read and validate the action body, rejecting it once over max_request_body_bytes."""
+    limit = settings.max_request_body_bytes
+    too_large = HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"Request body exceeds {limit} bytes",
+    )
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > limit:
+        raise too_large
+
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > limit:
+            raise too_large
+
+    try:
+        return ProxyActionRequest.model_validate_json(bytes(body))
+    except ValidationError as e:
+        raise RequestValidationError(e.errors())
+
+
+async def stream_body(
+    upstream: httpx.Response,
+    cat_id: UUID,
+    action: str,
+    capture: Optional[Callable[[bytes], None]] = None,
+    capture_limit: int = 0,
+    on_close: Optional[Callable[[], None]] = None,
+) -> AsyncIterator[bytes]:
+    """
+    Relay the cat's body as received (still encoded), enforcing max_response_body_bytes.
+
+    capture receives the complete body once streamed if it is at most
+    capture_limit bytes (response cache). on_close runs once the cat
+    response is closed (bulkhead slot release).
+    """
+    limit = settings.max_response_body_bytes
+    sent = 0
+    captured: Optional[list[bytes]] = [] if capture is not None else None
+    try:
+        async for chunk in upstream.aiter_raw():
+            sent += len(chunk)
+            if sent > limit:
+                logger.error(
+                    f"Cat {cat_id} response exceeded {limit} bytes, aborting",
+                    extra={"cat_id": str(cat_id), "action": action},
+                )
+                raise ResponseTooLarge(f"Cat response exceeded {limit} bytes")
+            if captured is not None:
+                if sent <= capture_limit:
+                    captured.append(chunk)
+                else:
+                    captured = None
+            yield chunk
+    except httpx.TransportError as e:
+        logger.error(
+            f"Cat {cat_id} response interrupted",
+            extra={"cat_id": str(cat_id), "action": action, "error": type(e).__name__, "bytes_sent": sent},
+        )
+        raise
+    finally:
+        await upstream.aclose()
+        if on_close is not None:
+            on_close()
+    if captured is not None:
+        capture(b"".join(captured))
+
+
+def relayed_headers(headers: Mapping[str, str]) -> dict[str, str]:
+    """Cat response headers passed on to the client."""
+    return {name: headers[name] for name in RELAYED_RESPONSE_HEADERS if name in headers}
+
+
+async def call_cat(
+    target: CatTarget,
+    user_id: UUID,
+    request: ProxyActionRequest,
+    extra_headers: Optional[dict[str, str]] = None,
+) -> httpx.Response:
+    """
+    Send an action through the cat's circuit breaker and map failures to HTTP errors.
+
+    Idempotent actions are hedged after the cat's p95 latency (app/hedging.py).
+
+    Returns:
+        httpx.Response: The cat's response with an unread body
+
+    Raises:
+        HTTPException: 503 (circuit open), 504 (timeout), 502 (unreachable)
+    """
+    cat_id = target.cat_id
+    breaker = get_circuit_breaker(str(cat_id)) if settings.circuit_breaker_enabled else None
+    admission = breaker.allow_request() if breaker is not None else None
+    if breaker is not None and admission is None:
+        track_proxy_request(str(cat_id), "circuit_open")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Cat is temporarily unavailable",
+            headers={"Retry-After": str(breaker.retry_after())},
+        )
+
+    start_time = time.perf_counter()
+    success: Optional[bool] = None
+    try:
+        upstream = await send_with_hedging(
+            str(cat_id),
+            partial(forward_action, target, user_id, request.action, request.payload, extra_headers),
+            idempotent=request.action in target.idempotent_actions,
+        )
+        success = upstream.status_code < 500
+    except httpx.TimeoutException:
+        success = False
+        track_proxy_request(str(cat_id), "timeout", time.perf_counter() - start_time)
+        logger.warning(f"Cat {cat_id} timed out", extra={"cat_id": str(cat_id), "action": request.action})
+        raise HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail="Cat did not respond in time")
+    except httpx.TransportError as e:
+        success = False
+        track_proxy_request(str(cat_id), "unreachable", time.perf_counter() - start_time)
+        logger.error(
+            f"Cat {cat_id} unreachable",
+            extra={"cat_id": str(cat_id), "action": request.action, "error": type(e).__name__},
+        )
+        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail="Cat is unreachable")
+    finally:
+        if breaker is not None and admission is not None:
+            if success is None:
+                breaker.release(admission)
+            else:
+                breaker.record(admission, success, time.perf_counter() - start_time)
+
+    # Time to response headers: the body is streamed afterwards
+    duration = time.perf_counter() - start_time
+    track_proxy_request(str(cat_id), str(upstream.status_code), duration)
+    logger.info(
+        f"Proxied {request.action} to cat {cat_id}: {upstream.status_code}",
+        extra={
+            "cat_id": str(cat_id),
+            "action": request.action,
+            "upstream_status": upstream.status_code,
+            "upstream_ms": round(duration * 1000, 2),
+        },
+    )
+    return upstream
+
+
+def cached_response(
+    entry: CachedResponse,
+    result: str,
+    if_none_match: Optional[str],
+    now: float,
+) -> Response:
+    """Serve a stored cat response (304 when the client already has it)."""
+    headers = {**entry.headers, "Age": str(int(entry.age(now))), CACHE_STATUS_HEADER: result}
+    if etag_matches(if_none_match, entry.etag):
+        headers.pop("content-length", None)
+        headers.pop("content-encoding", None)
+        headers.pop("content-type", None)
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=entry.body, status_code=entry.status_code, headers=headers)
+
+
+async def revalidate_in_background(
+    cache: ResponseCache,
+    key: str,
+    target: CatTarget,
+    user_id: UUID,
+    request: ProxyActionRequest,
+    etag: Optional[str],
+) -> None:
+    """Refresh a stale entry served under stale-while-revalidate."""
+    slot: Optional[Slot] = None
+    try:
+        slot = await acquire_slot(str(target.cat_id), user_id)
+        upstream = await call_cat(target, user_id, request, {"If-None-Match": etag} if etag else None)
+        try:
+            policy = cache_policy(upstream.headers)
+            if upstream.status_code == status.HTTP_304_NOT_MODIFIED:
+                cache.refresh(key, upstream.headers)
+            elif upstream.status_code == status.HTTP_200_OK and policy is not None:
+                body = bytearray()
+                async for chunk in upstream.aiter_raw():
+                    body += chunk
+                    if len(body) > cache.max_entry_bytes:
+                        cache.invalidate(key)
+                        return
+                cache.put(key, upstream.status_code, relayed_headers(upstream.headers), bytes(body), policy)
+            else:
+                cache.invalidate(key)
+        finally:
+            await upstream.aclose()
+    except (HTTPException, BulkheadFull) as e:
+        # Keep serving the stale entry until it leaves the stale window
+        logger.warning(
+            f"Background revalidation of cat {target.cat_id} failed: {getattr(e, 'detail', e)}",
+            extra={"cat_id": str(target.cat_id), "action": request.action},
+        )
+    finally:
+        if slot is not None:
+            slot.release()
+        cache.end_revalidation(key)
+
+
+@router.post(
+    "/{cat_id}/action",
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": ProxyActionRequest.model_json_schema()}},
+        }
+    },
+)
+async def proxy_action(
+    cat_id: UUID,
+    request: ProxyActionRequest = Depends(read_action_request),
+    user_id: UUID = Depends(get_current_user_id),
+    cache_control: Optional[str] = Header(None),
+    if_none_match: Optional[str] = Header(None),
+):
+    """
+    Forward an action to an installed cat.
+
+    Streams the cat's status code, body and content headers unchanged.
+    Responses the cat marks cacheable are served from the response cache
+    (X-Proxy-Cache: HIT, STALE, REVALIDATED or MISS). Send
+    Cache-Control: no-cache to bypass stored responses.
+
+    Raises:
+        413: The request body exceeds max_request_body_bytes
+        404: The user has no active installation of the cat
+        503: The cat is not published, its circuit breaker is open, or its
+            bulkhead has no slot for the request (Retry-After)
+        504: The cat did not answer within request_timeout
+        502: The cat could not be reached, or its response exceeds max_response_body_bytes
+    """
+    target = await resolve_cat_target(user_id, cat_id)
+    if target is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Cat not installed")
+    if not target.available:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Cat is not available")
+
+    cache = get_response_cache() if settings.response_cache_enabled else None
+    key: Optional[str] = None
+    cached: Optional[CachedResponse] = None
+    if cache is not None:
+        key = response_cache_key(user_id, target, request.action, request.payload)
+        if "no-cache" not in parse_cache_control(cache_control):
+            cached = cache.get(key)
+        if cached is not None:
+            now = cache.clock()
+            if cached.is_fresh(now):
+                track_response_cache(str(cat_id), "hit")
+                return cached_response(cached, "HIT", if_none_match, now)
+            if cached.is_stale_usable(now):
+                if cache.begin_revalidation(key):
+                    task = asyncio.create_task(
+                        revalidate_in_background(cache, key, target, user_id, request, cached.etag)
+                    )
+                    _background_tasks.add(task)
+                    task.add_done_callback(_background_tasks.discard)
+                track_response_cache(str(cat_id), "stale")
+                return cached_response(cached, "STALE", if_none_match, now)
+
+    try:
+        slot = await acquire_slot(str(cat_id), user_id)
+    except BulkheadFull as e:
+        track_proxy_request(str(cat_id), "bulkhead_rejected")
+        logger.warning(
+            f"Cat {cat_id} bulkhead rejected request: {e.reason}",
+            extra={"cat_id": str(cat_id), "action": request.action, "reason": e.reason},
+        )
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Cat is busy",
+            headers={"Retry-After": "1"},
+        )
+    release_slot = slot.release if slot is not None else None
+
+    conditional = {"If-None-Match": cached.etag} if cached is not None and cached.etag else None
+    try:
+        upstream = await call_cat(target, user_id, request, conditional)
+    except BaseException:
+        if release_slot is not None:
+            release_slot()
+        raise
+
+    async def finish() -> None:
+        """Close the cat response and free the bulkhead slot."""
+        await upstream.aclose()
+        if release_slot is not None:
+            release_slot()
+
+    if cache is not None and cached is not None and upstream.status_code == status.HTTP_304_NOT_MODIFIED:
+        await finish()
+        refreshed = cache.refresh(key, upstream.headers) or cached
+        track_response_cache(str(cat_id), "revalidated")
+        return cached_response(refreshed, "REVALIDATED", if_none_match, cache.clock())
+
+    content_length = upstream.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > settings.max_response_body_bytes:
+        await finish()
+        logger.error(
+            f"Cat {cat_id} response of {content_length} bytes exceeds limit",
+            extra={"cat_id": str(cat_id), "action": request.action},
+        )
+        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail="Cat response is too large")
+
+    headers = relayed_headers(upstream.headers)
+    capture: Optional[Callable[[bytes], None]] = None
+    if cache is not None:
+        policy = cache_policy(upstream.headers)
+        if upstream.status_code == status.HTTP_200_OK and policy is not None:
+            track_response_cache(str(cat_id), "miss")
+            capture = partial(cache.put, key, upstream.status_code, dict(headers), policy=policy)
+            headers[CACHE_STATUS_HEADER] = "MISS"
+        elif cached is not None:
+            cache.invalidate(key)
+
+    return StreamingResponse(
+        stream_body(
+            upstream,
+            cat_id,
+            request.action,
+            capture,
+            cache.max_entry_bytes if cache is not None else 0,
+            on_close=release_slot,
+        ),
+        status_code=upstream.status_code,
+        headers=headers,
+        # Closes the cat response if the client disconnects before streaming starts
+        background=BackgroundTask(finish),
+    )
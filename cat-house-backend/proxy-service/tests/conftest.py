@@ -0,0 +1,20 @@
+from uuid import uuid4
+
+from app.resolution import CatTarget
+
+CAT_ID = uuid4()
+ENDPOINT = "https://cat.example.com/execute"
+
+
+def make_target(**overrides) -> CatTarget:
+    """Resolved published cat target; keyword arguments override any field."""
+    values = dict(
+        installation_id=uuid4(),
+        cat_id=CAT_ID,
+        endpoint_url=ENDPOINT,
+        cat_status="published",
+        permissions=("tasks:read", "tasks:write"),
+        service_key="sk_test",
+    )
+    values.update(overrides)
+    return CatTarget(**values)
@@ -0,0 +1,77 @@
+import base64
+import hashlib
+import hmac
+import json
+import time
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+
+from app import auth
+from app.auth import InvalidToken, decode_access_token, get_current_user_id
+
+SECRET = "test-jwt-secret"
+
+
+def _segment(data: dict) -> str:
+    return base64.urlsafe_b64encode(json.dumps(data).encode()).rstrip(b"=").decode()
+
+
+def make_token(sub, secret: str = SECRET, alg: str = "HS256", **claims) -> str:
+    """Sign an access token the way auth-service does (HS256)."""
+    claims = {"sub": str(sub), "exp": int(time.time()) + 3600, **claims}
+    signing_input = f"{_segment({'alg': alg, 'typ': 'JWT'})}.{_segment(claims)}"
+    signature = hmac.new(secret.encode(), signing_input.encode(), hashlib.sha256).digest()
+    return f"{signing_input}.{base64.urlsafe_b64encode(signature).rstrip(b'=').decode()}"
+
+
+@pytest.fixture
+def secret(monkeypatch):
+    monkeypatch.setattr(auth.settings, "jwt_secret", SECRET)
+
+
+def test_valid_token_returns_claims():
+    user_id = uuid4()
+    assert decode_access_token(make_token(user_id), SECRET)["sub"] == str(user_id)
+
+
+@pytest.mark.parametrize(
+    "token",
+    [
+        make_token(uuid4(), secret="other-secret"),
+        make_token(uuid4(), alg="none"),
+        make_token(uuid4(), exp=int(time.time()) - 3600),
+        make_token(uuid4(), exp=None),
+        make_token(uuid4(), nbf=int(time.time()) + 3600),
+        "not-a-token",
+        "a.b.c",
+    ],
+    ids=["bad-signature", "alg-none", "expired", "no-exp", "not-yet-valid", "one-segment", "garbage"],
+)
+def test_invalid_tokens_rejected(token):
+    with pytest.raises(InvalidToken):
+        decode_access_token(token, SECRET)
+
+
+@pytest.mark.asyncio
+async def test_user_id_from_bearer_token(secret):
+    user_id = uuid4()
+    assert await get_current_user_id(f"Bearer {make_token(user_id)}") == user_id
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("authorization", [None, "", make_token(uuid4()), "Bearer ", "Basic abc"])
+async def test_missing_bearer_token_rejected(secret, authorization):
+    with pytest.raises(HTTPException) as exc_info:
+        await get_current_user_id(authorization)
+    assert exc_info.value.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_rejects_requests_without_secret(monkeypatch):
+    """Test the proxy fails closed while JWT_SECRET is unset"""
+    monkeypatch.setattr(auth.settings, "jwt_secret", None)
+    with pytest.raises(HTTPException) as exc_info:
+        await get_current_user_id(f"Bearer {make_token(uuid4())}")
+    assert exc_info.value.status_code == 503
@@ -0,0 +1,129 @@
+import asyncio
+from uuid import uuid4
+
+import pytest
+from prometheus_client import REGISTRY
+
+from app.bulkhead import Bulkhead, BulkheadFull
+
+ALICE = uuid4()
+BOB = uuid4()
+
+
+def make_bulkhead(**overrides) -> Bulkhead:
+    values = dict(name="cat-bh", max_concurrent=1, max_queue=10, max_queue_per_user=5, queue_timeout=1.0)
+    values.update(overrides)
+    return Bulkhead(**values)
+
+
+def gauge(name: str, cat_id: str = "cat-bh") -> float:
+    return REGISTRY.get_sample_value(name, {"cat_id": cat_id, "service": "proxy-service"})
+
+
+@pytest.mark.asyncio
+async def test_limits_concurrency():
+    bulkhead = make_bulkhead(max_concurrent=2)
+    first = await bulkhead.acquire(ALICE)
+    await bulkhead.acquire(BOB)
+
+    waiter = asyncio.create_task(bulkhead.acquire(ALICE))
+    await asyncio.sleep(0)
+    assert not waiter.done()
+    assert bulkhead.queued == 1
+    assert gauge("proxy_bulkhead_queue_depth") == 1
+    assert gauge("proxy_bulkhead_active") == 2
+
+    first.release()
+    await waiter
+    assert bulkhead.active == 2
+    assert bulkhead.queued == 0
+
+
+@pytest.mark.asyncio
+async def test_round_robin_between_users():
+    """Test a user with many queued requests does not starve another user"""
+    bulkhead = make_bulkhead()
+    slot = await bulkhead.acquire(ALICE)
+    order = []
+
+    async def request(user, label):
+        held = await bulkhead.acquire(user)
+        order.append(label)
+        held.release()
+
+    tasks = [asyncio.create_task(request(ALICE, f"alice-{i}")) for i in range(3)]
+    await asyncio.sleep(0)
+    tasks.append(asyncio.create_task(request(BOB, "bob-0")))
+    await asyncio.sleep(0)
+
+    slot.release()
+    await asyncio.gather(*tasks)
+
+    assert order == ["alice-0", "bob-0", "alice-1", "alice-2"]
+    assert bulkhead.active == 0
+
+
+@pytest.mark.asyncio
+async def test_queue_limits():
+    bulkhead = make_bulkhead(max_queue=2, max_queue_per_user=1)
+    await bulkhead.acquire(ALICE)
+    waiters = [asyncio.create_task(bulkhead.acquire(ALICE))]
+    await asyncio.sleep(0)
+
+    with pytest.raises(BulkheadFull) as per_user:
+        await bulkhead.acquire(ALICE)
+    assert per_user.value.reason == "user_queue_full"
+
+    waiters.append(asyncio.create_task(bulkhead.acquire(BOB)))
+    await asyncio.sleep(0)
+    with pytest.raises(BulkheadFull) as full:
+        await bulkhead.acquire(uuid4())
+    assert full.value.reason == "queue_full"
+
+    for waiter in waiters:
+        waiter.cancel()
+    await asyncio.gather(*waiters, return_exceptions=True)
+    assert bulkhead.queued == 0
+
+
+@pytest.mark.asyncio
+async def test_queue_timeout():
+    bulkhead = make_bulkhead(queue_timeout=0.01)
+    await bulkhead.acquire(ALICE)
+
+    with pytest.raises(BulkheadFull) as timed_out:
+        await bulkhead.acquire(BOB)
+
+    assert timed_out.value.reason == "timeout"
+    assert bulkhead.queued == 0
+    before = REGISTRY.get_sample_value(
+        "proxy_bulkhead_rejected_total", {"cat_id": "cat-bh", "reason": "timeout", "service": "proxy-service"}
+    )
+    assert before >= 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_leaves_queue():
+    bulkhead = make_bulkhead()
+    slot = await bulkhead.acquire(ALICE)
+    waiter = asyncio.create_task(bulkhead.acquire(BOB))
+    await asyncio.sleep(0)
+
+    waiter.cancel()
+    await asyncio.gather(waiter, return_exceptions=True)
+    slot.release()
+
+    assert bulkhead.queued == 0
+    assert bulkhead.active == 0
+
+
+@pytest.mark.asyncio
+async def test_release_is_idempotent():
+    bulkhead = make_bulkhead(max_concurrent=2)
+    slot = await bulkhead.acquire(ALICE)
+    await bulkhead.acquire(BOB)
+
+    slot.release()
+    slot.release()
+
+    assert bulkhead.active == 1
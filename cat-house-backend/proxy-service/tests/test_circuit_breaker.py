@@ -0,0 +1,150 @@
+import pytest
+from prometheus_client import REGISTRY
+
+from app.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def breaker(clock):
+    return CircuitBreaker(
+        "cat-1",
+        window_size=10,
+        min_calls=4,
+        error_rate_threshold=0.5,
+        slow_call_seconds=2.0,
+        slow_call_rate_threshold=0.75,
+        open_seconds=30,
+        probe_interval_seconds=5,
+        success_threshold=2,
+        clock=clock,
+    )
+
+
+def call(breaker: CircuitBreaker, success: bool, duration: float = 0.1) -> None:
+    """Send one admitted request and record its outcome."""
+    admission = breaker.allow_request()
+    assert admission is not None
+    breaker.record(admission, success, duration)
+
+
+def state_gauge(cat_id: str) -> float:
+    return REGISTRY.get_sample_value(
+        "proxy_circuit_breaker_state", {"cat_id": cat_id, "service": "proxy-service"}
+    )
+
+
+def test_opens_on_error_rate(breaker):
+    """Test the breaker opens once min_calls are seen and half of them failed"""
+    call(breaker, False)
+    call(breaker, False)
+    call(breaker, True)
+    assert breaker.state == CLOSED
+
+    call(breaker, True)
+    assert breaker.state == OPEN
+    assert breaker.allow_request() is None
+    assert state_gauge("cat-1") == 2
+
+
+def test_opens_on_slow_calls(breaker):
+    """Test successful but slow calls open the breaker"""
+    for _ in range(3):
+        call(breaker, True, 2.5)
+    call(breaker, True)
+
+    assert breaker.state == OPEN
+
+
+def test_client_errors_do_not_open(breaker):
+    """Test a healthy cat stays closed"""
+    for _ in range(10):
+        call(breaker, True)
+
+    assert breaker.state == CLOSED
+    assert breaker.allow_request() is not None
+
+
+def test_half_open_probes_rate_limited(breaker, clock):
+    """Test half-open lets one probe through per interval"""
+    for _ in range(4):
+        call(breaker, False)
+    assert breaker.retry_after() == 30
+
+    clock.now += 30
+    probe = breaker.allow_request()
+    assert probe is not None and probe.probe
+    assert breaker.state == HALF_OPEN
+    assert state_gauge("cat-1") == 1
+    # Probe in flight
+    assert breaker.allow_request() is None
+
+    breaker.record(probe, True, 0.1)
+    # Next probe only after the interval
+    assert breaker.allow_request() is None
+    assert breaker.retry_after() == 5
+    clock.now += 5
+    call(breaker, True)
+
+    assert breaker.state == CLOSED
+    assert state_gauge("cat-1") == 0
+
+
+def test_failed_probe_reopens(breaker, clock):
+    for _ in range(4):
+        call(breaker, False)
+    clock.now += 30
+
+    call(breaker, False)
+
+    assert breaker.state == OPEN
+    assert breaker.allow_request() is None
+
+
+def test_cancelled_probe_released(breaker, clock):
+    """Test a probe that never completed does not block half-open forever"""
+    for _ in range(4):
+        call(breaker, False)
+    clock.now += 30
+    probe = breaker.allow_request()
+    assert probe is not None
+
+    breaker.release(probe)
+    clock.now += 5
+
+    assert breaker.allow_request() is not None
+
+
+def test_stale_outcome_not_taken_for_probe(breaker, clock):
+    """Test a request admitted while closed cannot decide the half-open probe"""
+    slow = breaker.allow_request()
+    for _ in range(4):
+        call(breaker, False)
+    clock.now += 30
+    probe = breaker.allow_request()
+    assert breaker.state == HALF_OPEN
+
+    # The request admitted while closed fails after the probe was sent
+    breaker.record(slow, False, 40.0)
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow_request() is None
+
+    breaker.release(slow)
+    assert breaker.allow_request() is None
+
+    breaker.record(probe, True, 0.1)
+    clock.now += 5
+    call(breaker, True)
+    assert breaker.state == CLOSED
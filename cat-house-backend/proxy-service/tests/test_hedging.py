@@ -0,0 +1,175 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app import hedging
+from app.hedging import LatencyTracker, send_with_hedging
+from app.retry import RetryBudget
+
+CAT_ID = "cat-hedge"
+
+
+class SlowCat:
+    """Cat whose n-th request answers after delays[n] seconds."""
+
+    def __init__(self, delays: list[float]):
+        self.delays = delays
+        self.started = 0
+        self.cancelled = 0
+
+    async def send(self) -> httpx.Response:
+        attempt = self.started
+        self.started += 1
+        try:
+            await asyncio.sleep(self.delays[attempt])
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return httpx.Response(200, json={"attempt": attempt})
+
+
+@pytest.fixture
+def warmed(monkeypatch):
+    """Cat latency history with a p95 of 50ms and a generous hedge budget."""
+    tracker = LatencyTracker(window=100, min_samples=20)
+    for _ in range(95):
+        tracker.record(0.01)
+    for _ in range(5):
+        tracker.record(0.05)
+    monkeypatch.setattr(hedging, "_trackers", {CAT_ID: tracker})
+    monkeypatch.setattr(hedging, "_hedge_budget", RetryBudget(ratio=1.0, min_per_second=0))
+    return tracker
+
+
+def test_percentile():
+    tracker = LatencyTracker(window=100, min_samples=10)
+    for value in range(1, 101):
+        tracker.record(value / 100)
+
+    assert tracker.percentile(0.95) == 0.95
+    assert tracker.percentile(0.5) == 0.5
+    assert LatencyTracker(min_samples=10).percentile(0.95) is None
+
+
+@pytest.mark.asyncio
+async def test_fast_response_not_hedged(warmed):
+    cat = SlowCat([0.0])
+
+    response = await send_with_hedging(CAT_ID, cat.send, idempotent=True)
+
+    assert response.json() == {"attempt": 0}
+    assert cat.started == 1
+
+
+@pytest.mark.asyncio
+async def test_slow_response_hedged_and_loser_cancelled(warmed):
+    """Test a second request after p95 wins and the first is cancelled"""
+    cat = SlowCat([1.0, 0.0])
+
+    response = await send_with_hedging(CAT_ID, cat.send, idempotent=True)
+    await asyncio.sleep(0)
+
+    assert response.json() == {"attempt": 1}
+    assert cat.started == 2
+    assert cat.cancelled == 1
+
+
+@pytest.mark.asyncio
+async def test_primary_still_wins_after_hedge(warmed):
+    cat = SlowCat([0.08, 1.0])
+
+    response = await send_with_hedging(CAT_ID, cat.send, idempotent=True)
+    await asyncio.sleep(0)
+
+    assert response.json() == {"attempt": 0}
+    assert cat.cancelled == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_request_falls_back_to_other(warmed):
+    attempts = []
+
+    async def send():
+        attempts.append(len(attempts))
+        if len(attempts) == 1:
+            await asyncio.sleep(0.1)
+            raise httpx.ReadTimeout("timed out")
+        await asyncio.sleep(0.2)
+        return httpx.Response(200, json={"attempt": 1})
+
+    response = await send_with_hedging(CAT_ID, send, idempotent=True)
+
+    assert response.json() == {"attempt": 1}
+
+
+@pytest.mark.asyncio
+async def test_server_error_waits_for_other_request(warmed):
+    """Test a 5xx is not returned while the other request may still succeed"""
+    attempts = []
+
+    async def send():
+        attempts.append(len(attempts))
+        if len(attempts) == 1:
+            await asyncio.sleep(0.1)
+            return httpx.Response(503, json={"attempt": 0})
+        await asyncio.sleep(0.2)
+        return httpx.Response(200, json={"attempt": 1})
+
+    response = await send_with_hedging(CAT_ID, send, idempotent=True)
+
+    assert response.status_code == 200
+    assert response.json() == {"attempt": 1}
+
+
+@pytest.mark.asyncio
+async def test_server_error_returned_when_both_fail(warmed):
+    """Test the first 5xx is used once neither request succeeded"""
+    attempts = []
+
+    async def send():
+        attempt = len(attempts)
+        attempts.append(attempt)
+        if attempt == 0:
+            await asyncio.sleep(0.1)
+            return httpx.Response(502, json={"attempt": 0})
+        await asyncio.sleep(0.2)
+        raise httpx.ConnectError("refused")
+
+    response = await send_with_hedging(CAT_ID, send, idempotent=True)
+
+    assert response.status_code == 502
+    assert response.json() == {"attempt": 0}
+
+
+@pytest.mark.asyncio
+async def test_non_idempotent_never_hedged(warmed):
+    cat = SlowCat([0.1])
+
+    await send_with_hedging(CAT_ID, cat.send, idempotent=False)
+
+    assert cat.started == 1
+
+
+@pytest.mark.asyncio
+async def test_budget_caps_hedges(warmed, monkeypatch):
+    """Test hedges stop once the extra-load budget is spent"""
+    monkeypatch.setattr(hedging, "_hedge_budget", RetryBudget(ratio=0.05, min_per_second=0))
+    cat = SlowCat([0.07] * 10)
+
+    for _ in range(5):
+        await send_with_hedging(CAT_ID, cat.send, idempotent=True)
+
+    # 5 requests * 5% = 0.25 hedges: none allowed
+    assert cat.started == 5
+
+
+@pytest.mark.asyncio
+async def test_no_hedging_without_latency_history(monkeypatch):
+    monkeypatch.setattr(hedging, "_trackers", {})
+    cat = SlowCat([0.05])
+
+    await send_with_hedging(CAT_ID, cat.send, idempotent=True)
+
+    assert cat.started == 1
+    assert hedging.get_latency_tracker(CAT_ID)._samples[0] >= 0.05
@@ -0,0 +1,458 @@
+import asyncio
+import time
+from unittest.mock import AsyncMock, patch
+from uuid import uuid4
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app import auth, bulkhead, cat_client, circuit_breaker, hedging, response_cache
+from app.cat_client import CatClientPool, cat_origin
+from app.circuit_breaker import OPEN, get_circuit_breaker
+from app.main import app
+from app.response_cache import ResponseCache
+from app.retry import RetryBudget
+from tests.conftest import CAT_ID, ENDPOINT, make_target
+from tests.test_auth import SECRET, make_token
+
+USER_ID = uuid4()
+
+
+def auth_headers(user_id=USER_ID, **headers) -> dict:
+    return {"Authorization": f"Bearer {make_token(user_id)}", **headers}
+
+
+class ChunkedStream(httpx.AsyncByteStream):
+    """Response body delivered in chunks, like a network stream."""
+
+    def __init__(self, chunks: list[bytes]):
+        self.chunks = chunks
+        self.closed = False
+
+    async def __aiter__(self):
+        for chunk in self.chunks:
+            yield chunk
+
+    async def aclose(self):
+        self.closed = True
+
+
+class FakeCat:
+    """Cat endpoint behind httpx.MockTransport recording received requests."""
+
+    def __init__(self):
+        self.requests: list[httpx.Request] = []
+        self.streams: list[ChunkedStream] = []
+        self.handler = lambda request: httpx.Response(200, json={"ok": True})
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        response = self.handler(request)
+        if isinstance(response.stream, ChunkedStream):
+            stream = response.stream
+        else:
+            # Responses built from bytes are pre-read by httpx: stream them instead
+            stream = ChunkedStream([response.content])
+        self.streams.append(stream)
+        return httpx.Response(response.status_code, headers=response.headers, stream=stream)
+
+
+@pytest.fixture
+def cat(monkeypatch):
+    """Route cat requests to a FakeCat."""
+    fake = FakeCat()
+    monkeypatch.setattr(cat_client, "_client_pool", CatClientPool(transport=httpx.MockTransport(fake)))
+    monkeypatch.setattr(cat_client, "_retry_budget", RetryBudget(ratio=0.1, min_per_second=1))
+    monkeypatch.setattr(cat_client.settings, "retry_backoff_base_seconds", 0)
+    monkeypatch.setattr(circuit_breaker, "_breakers", {})
+    monkeypatch.setattr(hedging, "_trackers", {})
+    monkeypatch.setattr(hedging, "_hedge_budget", None)
+    monkeypatch.setattr(bulkhead, "_bulkheads", {})
+    return fake
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    """Fresh response cache on a controllable clock."""
+    cache = ResponseCache(max_bytes=1_048_576, max_entry_bytes=65_536, clock=Clock())
+    monkeypatch.setattr(response_cache, "_response_cache", cache)
+    return cache
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(auth.settings, "jwt_secret", SECRET)
+    with TestClient(app) as c:
+        yield c
+
+
+def post_action(client, **body):
+    return client.post(
+        f"/api/v1/proxy/{CAT_ID}/action",
+        headers=auth_headers(**{"X-Trace-ID": "trace-123"}),
+        json={"action": "list-tasks", "payload": {"status": "pending"}, **body},
+    )
+
+
+def test_action_forwarded_to_cat(client, cat):
+    """Test the command, trace id, service key and permissions reach the cat"""
+    target = make_target()
+    with patch("app.routers.proxy.resolve_cat_target", AsyncMock(return_value=target)):
+        response = post_action(client)
+
+    assert response.status_code == 200
+    assert response.json() == {"ok": True}
+    request = cat.requests[0]
+    assert str(request.url) == ENDPOINT
+    assert request.headers["X-Trace-ID"] == "trace-123"
+    assert request.headers["X-Service-Key"] == "sk_test"
+    assert request.headers["X-Cat-Permissions"] == "tasks:read,tasks:write"
+    assert request.headers["X-Cat-Installation-ID"] == str(target.installation_id)
+    assert httpx.Response(200, content=request.content).json() == {
+        "action": "list-tasks",
+        "user_id": str(USER_ID),
+        "payload": {"status": "pending"},
+    }
+
+
+def test_spoofed_user_header_rejected(client, cat):
+    """Test an X-User-ID header without a valid bearer token is not trusted"""
+    with patch("app.routers.proxy.resolve_cat_target", AsyncMock(return_value=make_target())):
+        response = client.post(
+            f"/api/v1/proxy/{CAT_ID}/action",
+            headers={"X-User-ID": str(USER_ID)},
+            json={"action": "list-tasks", "payload": {}},
+        )
+
+    assert response.status_code == 401
+    assert cat.requests == []
+
+
+def test_cat_error_status_relayed(client, cat):
+    """Test the cat's error status and body are returned unchanged"""
+    cat.handler = lambda request: httpx.Response(400, json={"detail": "bad payload"})
+    with patch("app.routers.proxy.resolve_cat_target", AsyncMock(return_value=make_target())):
+        response = post_action(client)
+
+    assert response.status_code == 400
+    assert response.json() == {"detail": "bad payload"}
+
+
+def test_not_installed_returns_404(client, cat):
+    with patch("app.routers.proxy.resolve_cat_target", AsyncMock(return_value=None)):
+        response = post_action(client)
+
+    assert response.status_code == 404
+    assert cat.requests == []
+
+
+def test_unpublished_cat_returns_503(client, cat):
+    with patch("app.routers.proxy.resolve_cat_target", AsyncMock(return_value=make_target(cat_status="suspended"))):
+        response = post_action(client)
+
+    assert response.status_code == 503
+    assert cat.requests == []
+
+
+def test_missing_token_returns_401(client, cat):
+    response = client.post(f"/api/v1/proxy/{CAT_ID}/action", json={"action": "list-tasks"})
+    assert response.status_code == 401
+    assert response.headers["www-authenticate"] == "Bearer"
+
+
+def test_connect_error_retried(client, cat):
+    """Test connection failures are retried and the request then succeeds"""
+    attempts = iter([httpx.ConnectError("refused"), None])
+
+    def flaky(request):
+        error = next(attempts)
+        if error:
+            raise error
+        return httpx.Response(200, json={"ok": True})
+
+    cat.handler = flaky
+    with patch("app.routers.proxy.resolve_cat_target", AsyncMock(return_value=make_target())):
+        response = post_action(client)
+
+    assert response.status_code == 200
+    assert len(cat.requests) == 2
+
+
+def test_unreachable_cat_returns_502(client, cat, monkeypatch):
+    """Test retries stop at max_retries and the failure maps to 502"""
+    monkeypatch.setattr(cat_client.settings, "max_retries", 2)
+
+    def refuse(request):
+        raise httpx.ConnectError("refused")
+
+    cat.handler = refuse
+    with patch("app.routers.proxy.resolve_cat_target", AsyncMock(return_value=make_target())):
+        response = post_action(client)
+
+    assert response.status_code == 502
+    assert len(cat.requests) == 3
+
+
+def test_read_timeout_not_retried(client, cat):
+    """Test a request the cat may have received is not retried"""
+    def slow(request):
+        raise httpx.ReadTimeout("timed out")
+
+    cat.handler = slow
+    with patch("app.routers.proxy.resolve_cat_target", AsyncMock(return_value=make_target())):
+        response = post_action(client)
+
+    assert response.status_code == 504
+    assert len(cat.requests) == 1
+
+
+def test_open_circuit_rejects_without_calling_cat(client, cat):
+    """Test an open breaker fails fast with 503 and Retry-After"""
+    cat.handler = lambda request: httpx.Response(502, json={"detail": "bad gateway"})
+    with patch("app.routers.proxy.resolve_cat_target", AsyncMock(return_value=make_target())):
+        for _ in range(10):
+            assert post_action(client).status_code == 502
+        response = post_action(client)
+
+    assert response.status_code == 503
+    assert int(response.headers["Retry-After"]) > 0
+    assert len(cat.requests) == 10
+    assert get_circuit_breaker(str(CAT_ID)).state == OPEN
+
+
+def test_response_streamed_in_chunks(client, cat):
+    """Test the cat's body is relayed chunk by chunk with its content headers"""
+    chunks = [b"id,title\n", b"1,first\n", b"2,second\n"]
+    cat.handler = lambda request: httpx.Response(
+        200,
+        headers={"Content-Type": "text/csv", "Content-Disposition": "attachment; filename=tasks.csv", "Connection": "keep-alive"},
+        stream=ChunkedStream(chunks),
+    )
+    with patch("app.routers.proxy.resolve_cat_target", AsyncMock(return_value=make_target())):
+        with client.stream("POST", f"/api/v1/proxy/{CAT_ID}/action", headers=auth_headers(), json={"action": "export"}) as response:
+            received = list(response.iter_raw())
+
+    assert response.status_code == 200
+    assert b"".join(received) == b"".join(chunks)
+    assert response.headers["content-type"] == "text/csv"
+    assert response.headers["content-disposition"] == "attachment; filename=tasks.csv"
+    assert "connection" not in response.headers
+    assert cat.streams[0].closed
+
+
+def test_request_body_over_limit_returns_413(client, cat, monkeypatch):
+    monkeypatch.setattr(cat_client.settings, "max_request_body_bytes", 64)
+    with patch("app.routers.proxy.resolve_cat_target", AsyncMock(return_value=make_target())):
+        response = post_action(client, payload={"notes": "x" * 100})
+
+    assert response.status_code == 413
+    assert cat.requests == []
+
+
+def test_invalid_request_body_returns_422(client, cat):
+    response = client.post(
+        f"/api/v1/proxy/{CAT_ID}/action",
+        headers=auth_headers(),
+        json={"payload": {}},
+    )
+
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["action"]
+
+
+def test_declared_response_over_limit_returns_502(client, cat, monkeypatch):
+    """Test a cat response whose Content-Length exceeds the limit is not relayed"""
+    monkeypatch.setattr(cat_client.settings, "max_response_body_bytes", 10)
+    cat.handler = lambda request: httpx.Response(200, content=b"x" * 100)
+    with patch("app.routers.proxy.resolve_cat_target", AsyncMock(return_value=make_target())):
+        response = post_action(client)
+
+    assert response.status_code == 502
+    assert cat.streams[0].closed
+
+
+def test_streamed_response_over_limit_aborted(client, cat, monkeypatch):
+    """Test a chunked response is cut off once it exceeds the limit"""
+    from app.routers.proxy import ResponseTooLarge
+
+    monkeypatch.setattr(cat_client.settings, "max_response_body_bytes", 10)
+    cat.handler = lambda request: httpx.Response(200, stream=ChunkedStream([b"x" * 8, b"x" * 8, b"x" * 8]))
+    with patch("app.routers.proxy.resolve_cat_target", AsyncMock(return_value=make_target())):
+        with pytest.raises(ResponseTooLarge):
+            post_action(client)
+
+    assert cat.streams[0].closed
+
+
+def cacheable(body: dict, cache_control: str = "max-age=60", etag: str = '"v1"'):
+    return lambda request: httpx.Response(200, json=body, headers={"Cache-Control": cache_control, "ETag": etag})
+
+
+def test_cacheable_response_served_from_cache(client, cat, cache):
+    """Test a response the cat marks cacheable is replayed without calling the cat"""
+    cat.handler = cacheable({"tasks": [1, 2]})
+    with patch("app.routers.proxy.resolve_cat_target", AsyncMock(return_value=make_target())):
+        first = post_action(client)
+        second = post_action(client)
+
+    assert first.headers["X-Proxy-Cache"] == "MISS"
+    assert second.headers["X-Proxy-Cache"] == "HIT"
+    assert second.json() == {"tasks": [1, 2]}
+    assert second.headers["etag"] == '"v1"'
+    assert len(cat.requests) == 1
+
+
+def test_cache_keyed_per_user_and_payload(client, cat, cache):
+    cat.handler = cacheable({"ok": True})
+    target = make_target()
+    with patch("app.routers.proxy.resolve_cat_target", AsyncMock(return_value=target)):
+        post_action(client)
+        post_action(client, payload={"status": "done"})
+        client.post(
+            f"/api/v1/proxy/{CAT_ID}/action",
+            headers=auth_headers(uuid4()),
+            json={"action": "list-tasks", "payload": {"status": "pending"}},
+        )
+
+    assert len(cat.requests) == 3
+
+
+def test_uncacheable_responses_not_stored(client, cat, cache):
+    cat.handler = cacheable({"ok": True}, cache_control="no-store")
+    with patch("app.routers.proxy.resolve_cat_target", AsyncMock(return_value=make_target())):
+        post_action(client)
+        response = post_action(client)
+
+    assert "X-Proxy-Cache" not in response.headers
+    assert len(cat.requests) == 2
+    assert len(cache) == 0
+
+
+def test_client_no_cache_bypasses_cache(client, cat, cache):
+    cat.handler = cacheable({"ok": True})
+    with patch("app.routers.proxy.resolve_cat_target", AsyncMock(return_value=make_target())):
+        post_action(client)
+        response = client.post(
+            f"/api/v1/proxy/{CAT_ID}/action",
+            headers=auth_headers(**{"Cache-Control": "no-cache"}),
+            json={"action": "list-tasks", "payload": {"status": "pending"}},
+        )
+
+    assert response.headers["X-Proxy-Cache"] == "MISS"
+    assert len(cat.requests) == 2
+
+
+def test_expired_entry_revalidated_with_etag(client, cat, cache):
+    """Test an expired entry is revalidated and a 304 from the cat serves the stored body"""
+    cat.handler = cacheable({"tasks": [1]})
+    with patch("app.routers.proxy.resolve_cat_target", AsyncMock(return_value=make_target())):
+        post_action(client)
+        cache.clock.now += 61
+        cat.handler = lambda request: httpx.Response(304, headers={"Cache-Control": "max-age=60", "ETag": '"v1"'})
+        response = post_action(client)
+        again = post_action(client)
+
+    assert cat.requests[1].headers["If-None-Match"] == '"v1"'
+    assert response.status_code == 200
+    assert response.headers["X-Proxy-Cache"] == "REVALIDATED"
+    assert response.json() == {"tasks": [1]}
+    assert again.headers["X-Proxy-Cache"] == "HIT"
+    assert len(cat.requests) == 2
+
+
+def test_stale_while_revalidate_refreshes_in_background(client, cat, cache):
+    """Test a stale entry is served at once while the cat is asked for a new one"""
+    cat.handler = cacheable({"version": 1}, cache_control="max-age=60, stale-while-revalidate=30")
+    with patch("app.routers.proxy.resolve_cat_target", AsyncMock(return_value=make_target())):
+        post_action(client)
+        cache.clock.now += 70
+        cat.handler = cacheable({"version": 2}, cache_control="max-age=60, stale-while-revalidate=30", etag='"v2"')
+        stale = post_action(client)
+
+        # Wait for the background revalidation to finish
+        deadline = time.monotonic() + 2
+        while (len(cat.requests) < 2 or cache._revalidating) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        fresh = post_action(client)
+
+    assert stale.headers["X-Proxy-Cache"] == "STALE"
+    assert stale.json() == {"version": 1}
+    assert int(stale.headers["Age"]) == 70
+    assert fresh.headers["X-Proxy-Cache"] == "HIT"
+    assert fresh.json() == {"version": 2}
+    assert len(cat.requests) == 2
+
+
+def test_client_etag_match_returns_304(client, cat, cache):
+    cat.handler = cacheable({"ok": True})
+    with patch("app.routers.proxy.resolve_cat_target", AsyncMock(return_value=make_target())):
+        post_action(client)
+        response = client.post(
+            f"/api/v1/proxy/{CAT_ID}/action",
+            headers=auth_headers(**{"If-None-Match": 'W/"v1"'}),
+            json={"action": "list-tasks", "payload": {"status": "pending"}},
+        )
+
+    assert response.status_code == 304
+    assert response.content == b""
+
+
+def test_bulkhead_slot_released_after_streaming(client, cat):
+    """Test the cat slot is held for the request and freed once the body is sent"""
+    with patch("app.routers.proxy.resolve_cat_target", AsyncMock(return_value=make_target())):
+        post_action(client)
+        cat.handler = lambda request: httpx.Response(502)
+        post_action(client)
+
+    cat_bulkhead = bulkhead.get_bulkhead(str(CAT_ID))
+    assert cat_bulkhead.active == 0
+    assert cat_bulkhead.queued == 0
+
+
+def test_full_bulkhead_returns_503(client, cat, monkeypatch):
+    monkeypatch.setattr(cat_client.settings, "bulkhead_max_concurrent_per_cat", 0)
+    monkeypatch.setattr(cat_client.settings, "bulkhead_max_queue_per_cat", 0)
+    with patch("app.routers.proxy.resolve_cat_target", AsyncMock(return_value=make_target())):
+        response = post_action(client)
+
+    assert response.status_code == 503
+    assert response.json()["detail"] == "Cat is busy"
+    assert response.headers["Retry-After"] == "1"
+    assert cat.requests == []
+
+
+def test_clients_shared_per_origin():
+    """Test one client per scheme, host and port"""
+    pool = CatClientPool()
+    try:
+        first = pool.get("https://cat.example.com/execute")
+        assert pool.get("https://cat.example.com:443/other") is first
+        assert pool.get("https://other.example.com/execute") is not first
+        assert cat_origin("http://cat.example.com/x") == "http://cat.example.com:80"
+    finally:
+        asyncio.run(pool.close())
+
+
+def test_retry_budget_limits_retries():
+    """Test retries are capped at min_per_second * window + ratio * requests"""
+    now = [100.0]
+    budget = RetryBudget(ratio=0.1, min_per_second=0.1, window_seconds=10, clock=lambda: now[0])
+    for _ in range(20):
+        budget.record_request()
+
+    # 0.1 * 10 + 0.1 * 20 = 3 retries
+    assert [budget.try_acquire() for _ in range(4)] == [True, True, True, False]
+
+    # The window slides: old requests and retries expire
+    now[0] += 10
+    budget.record_request()
+    assert budget.try_acquire() is True
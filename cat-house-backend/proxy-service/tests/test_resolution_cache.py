@@ -0,0 +1,267 @@
+import asyncio
+import json
+from uuid import uuid4
+
+import pytest
+
+from app import resolution
+from app.resolution_cache import NOTIFY_CHANNEL, ResolutionCache, ResolutionInvalidationListener
+
+USER_ID = uuid4()
+CAT_ID = uuid4()
+
+
+class Loader:
+    """Database stand-in counting lookups."""
+
+    def __init__(self):
+        self.calls = 0
+        self.release = None
+
+    async def __call__(self, user_id, cat_id):
+        self.calls += 1
+        if self.release is not None:
+            await self.release.wait()
+        return (user_id, cat_id, self.calls)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_cache(loader, **kwargs) -> ResolutionCache:
+    cache = ResolutionCache(loader, **kwargs)
+    cache.active = True
+    return cache
+
+
+@pytest.mark.asyncio
+async def test_hit_after_miss():
+    loader = Loader()
+    cache = make_cache(loader)
+
+    first = await cache.get(USER_ID, CAT_ID)
+    second = await cache.get(USER_ID, CAT_ID)
+
+    assert first == second
+    assert loader.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_not_cached_without_listener():
+    """Test nothing is cached while invalidations cannot be received"""
+    loader = Loader()
+    cache = make_cache(loader)
+    cache.active = False
+
+    await cache.get(USER_ID, CAT_ID)
+    await cache.get(USER_ID, CAT_ID)
+
+    assert loader.calls == 2
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_ttl_expires_entries():
+    loader = Loader()
+    clock = Clock()
+    cache = make_cache(loader, ttl_seconds=60, clock=clock)
+
+    await cache.get(USER_ID, CAT_ID)
+    clock.now += 61
+    await cache.get(USER_ID, CAT_ID)
+
+    assert loader.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_lru_eviction():
+    loader = Loader()
+    cache = make_cache(loader, max_entries=2)
+    cats = [uuid4() for _ in range(3)]
+
+    await cache.get(USER_ID, cats[0])
+    await cache.get(USER_ID, cats[1])
+    # cats[0] becomes most recently used, cats[1] is evicted
+    await cache.get(USER_ID, cats[0])
+    await cache.get(USER_ID, cats[2])
+
+    assert len(cache) == 2
+    await cache.get(USER_ID, cats[0])
+    assert loader.calls == 3
+    await cache.get(USER_ID, cats[1])
+    assert loader.calls == 4
+
+
+@pytest.mark.asyncio
+async def test_installation_notification_drops_one_entry():
+    loader = Loader()
+    cache = make_cache(loader)
+    other_user = uuid4()
+    await cache.get(USER_ID, CAT_ID)
+    await cache.get(other_user, CAT_ID)
+
+    cache.handle_notification(json.dumps({"user_id": str(USER_ID), "cat_id": str(CAT_ID)}))
+
+    assert len(cache) == 1
+    await cache.get(other_user, CAT_ID)
+    assert loader.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_catalog_notification_drops_every_entry_of_cat():
+    loader = Loader()
+    cache = make_cache(loader)
+    other_cat = uuid4()
+    await cache.get(USER_ID, CAT_ID)
+    await cache.get(uuid4(), CAT_ID)
+    await cache.get(USER_ID, other_cat)
+
+    cache.handle_notification(json.dumps({"cat_id": str(CAT_ID)}))
+
+    assert len(cache) == 1
+    await cache.get(USER_ID, other_cat)
+    assert loader.calls == 3
+
+
+@pytest.mark.asyncio
+async def test_unreadable_notification_clears_cache():
+    cache = make_cache(Loader())
+    await cache.get(USER_ID, CAT_ID)
+
+    cache.handle_notification("not json")
+
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_query():
+    loader = Loader()
+    loader.release = asyncio.Event()
+    cache = make_cache(loader)
+
+    lookups = [asyncio.create_task(cache.get(USER_ID, CAT_ID)) for _ in range(5)]
+    await asyncio.sleep(0)
+    loader.release.set()
+    results = await asyncio.gather(*lookups)
+
+    assert loader.calls == 1
+    assert len(set(results)) == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_fail_others():
+    loader = Loader()
+    loader.release = asyncio.Event()
+    cache = make_cache(loader)
+
+    first = asyncio.create_task(cache.get(USER_ID, CAT_ID))
+    second = asyncio.create_task(cache.get(USER_ID, CAT_ID))
+    await asyncio.sleep(0)
+    first.cancel()
+    loader.release.set()
+
+    assert (await second)[2] == 1
+    assert first.cancelled()
+
+
+@pytest.mark.asyncio
+async def test_load_racing_invalidation_not_stored():
+    """Test a result read before an invalidation is not cached after it"""
+    loader = Loader()
+    loader.release = asyncio.Event()
+    cache = make_cache(loader)
+
+    lookup = asyncio.create_task(cache.get(USER_ID, CAT_ID))
+    await asyncio.sleep(0)
+    cache.handle_notification(json.dumps({"user_id": str(USER_ID), "cat_id": str(CAT_ID)}))
+    loader.release.set()
+    await lookup
+
+    assert len(cache) == 0
+
+
+class FakeConnection:
+    """asyncpg connection stand-in for LISTEN."""
+
+    def __init__(self):
+        self.listeners = {}
+        self.termination_listeners = []
+        self.closed = False
+
+    def add_termination_listener(self, callback):
+        self.termination_listeners.append(callback)
+
+    async def add_listener(self, channel, callback):
+        self.listeners[channel] = callback
+
+    def notify(self, payload: str):
+        self.listeners[NOTIFY_CHANNEL](self, 1, NOTIFY_CHANNEL, payload)
+
+    def drop(self):
+        self.closed = True
+        for callback in self.termination_listeners:
+            callback(self)
+
+    def is_closed(self):
+        return self.closed
+
+    async def close(self, timeout=None):
+        self.closed = True
+
+
+@pytest.mark.asyncio
+async def test_listener_activates_and_invalidates():
+    """Test the cache is active while LISTEN is connected and cleared when it drops"""
+    connections = []
+
+    async def connect():
+        connections.append(FakeConnection())
+        return connections[-1]
+
+    cache = ResolutionCache(Loader())
+    listener = ResolutionInvalidationListener(cache, connect)
+    listener.start()
+    await asyncio.sleep(0.01)
+
+    assert cache.active is True
+    await cache.get(USER_ID, CAT_ID)
+    connections[0].notify(json.dumps({"user_id": str(USER_ID), "cat_id": str(CAT_ID)}))
+    assert len(cache) == 0
+
+    await cache.get(USER_ID, CAT_ID)
+    connections[0].drop()
+    await asyncio.sleep(0.01)
+    assert cache.active is False
+    assert len(cache) == 0
+
+    await listener.stop()
+    assert cache.active is False
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "url, started",
+    [
+        (None, False),
+        ("postgresql://u:p@ep-cat-123-pooler.eu-central-1.aws.neon.tech/db", False),
+        ("postgresql://u:p@ep-cat-123.eu-central-1.aws.neon.tech/db", True),
+    ],
+    ids=["unset", "pooler", "direct"],
+)
+async def test_listener_requires_direct_listen_url(monkeypatch, url, started):
+    """Test the cache only listens on a direct LISTEN_DATABASE_URL and stays inactive otherwise"""
+    monkeypatch.setattr(resolution.settings, "resolution_cache_enabled", True)
+    monkeypatch.setattr(resolution.settings, "listen_database_url", url)
+    monkeypatch.setattr(resolution, "_listener", None)
+    monkeypatch.setattr(resolution, "_resolution_cache", ResolutionCache(Loader()))
+    monkeypatch.setattr(ResolutionInvalidationListener, "start", lambda self: None)
+
+    resolution.start_resolution_listener()
+
+    assert (resolution._listener is not None) is started
+    assert resolution.get_resolution_cache().active is False
@@ -0,0 +1,104 @@
+from uuid import uuid4
+
+from app.response_cache import (
+    CachePolicy,
+    ResponseCache,
+    cache_policy,
+    etag_matches,
+    parse_cache_control,
+    response_cache_key,
+)
+from tests.conftest import make_target
+
+POLICY = CachePolicy(max_age=60, stale_while_revalidate=0, no_cache=False)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_parse_cache_control():
+    assert parse_cache_control('private, Max-Age=60, stale-while-revalidate="30"') == {
+        "private": None,
+        "max-age": "60",
+        "stale-while-revalidate": "30",
+    }
+    assert parse_cache_control(None) == {}
+
+
+def test_cache_policy():
+    assert cache_policy({"cache-control": "max-age=60, stale-while-revalidate=30"}) == CachePolicy(60, 30, False)
+    assert cache_policy({"cache-control": "no-cache", "etag": '"v1"'}) == CachePolicy(0, 0, True)
+    # Not marked cacheable, or explicitly not storable
+    assert cache_policy({}) is None
+    assert cache_policy({"cache-control": "no-cache"}) is None
+    assert cache_policy({"cache-control": "max-age=60, no-store"}) is None
+
+
+def test_cache_key_ignores_payload_order_and_tracks_grants():
+    user_id = uuid4()
+    target = make_target()
+
+    key = response_cache_key(user_id, target, "list-tasks", {"a": 1, "b": 2})
+
+    assert key == response_cache_key(user_id, target, "list-tasks", {"b": 2, "a": 1})
+    assert key != response_cache_key(user_id, target, "list-tasks", {"a": 1})
+    assert key != response_cache_key(uuid4(), target, "list-tasks", {"a": 1, "b": 2})
+    regranted = make_target(installation_id=target.installation_id, permissions=("tasks:read",))
+    assert key != response_cache_key(user_id, regranted, "list-tasks", {"a": 1, "b": 2})
+
+
+def test_etag_matches():
+    assert etag_matches('"a", W/"b"', '"b"')
+    assert etag_matches("*", '"b"')
+    assert not etag_matches('"a"', '"b"')
+    assert not etag_matches(None, '"b"')
+
+
+def test_freshness_windows():
+    clock = Clock()
+    cache = ResponseCache(max_bytes=10_000, max_entry_bytes=1_000, clock=clock)
+    cache.put("k", 200, {}, b"body", CachePolicy(max_age=60, stale_while_revalidate=30, no_cache=False))
+    entry = cache.get("k")
+
+    assert entry.is_fresh(clock.now + 59)
+    assert not entry.is_fresh(clock.now + 61)
+    assert entry.is_stale_usable(clock.now + 89)
+    assert not entry.is_stale_usable(clock.now + 91)
+
+
+def test_memory_bounded_lru():
+    """Test least recently used entries are evicted to stay within max_bytes"""
+    cache = ResponseCache(max_bytes=250, max_entry_bytes=200, clock=Clock())
+    cache.put("a", 200, {}, b"x" * 100, POLICY)
+    cache.put("b", 200, {}, b"x" * 100, POLICY)
+    cache.get("a")
+    cache.put("c", 200, {}, b"x" * 100, POLICY)
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.size == 200
+
+    cache.put("huge", 200, {}, b"x" * 201, POLICY)
+    assert cache.get("huge") is None
+
+
+def test_refresh_restarts_freshness():
+    clock = Clock()
+    cache = ResponseCache(max_bytes=10_000, max_entry_bytes=1_000, clock=clock)
+    cache.put("k", 200, {"cache-control": "max-age=60", "etag": '"v1"'}, b"body", POLICY)
+    clock.now += 100
+
+    entry = cache.refresh("k", {"cache-control": "max-age=120"})
+
+    assert entry.is_fresh(clock.now + 119)
+    assert entry.headers["cache-control"] == "max-age=120"
+    assert cache.size == entry.size
+
+    cache.refresh("k", {"cache-control": "no-store"})
+    assert cache.get("k") is None
+    assert cache.size == 0
@@ -0,0 +1,54 @@
+"""create_idempotency_keys_table
+
+Revision ID: 43c9f0c864b5
+Revises: fa1c1e889e66
+Create Date: 2026-10-18 11:40:02.530117
+
+Creates idempotency_keys table for Idempotency-Key support on /execute.
+Stores the first response of a write command so gateway retries are replayed
+instead of running the handler again.
+
+Table columns:
+- key_name: Service key that sent the request (keys are scoped per client)
+- idempotency_key: Value of the Idempotency-Key header
+- request_hash: SHA-256 of the command (detects key reuse with a different request)
+- response: Stored CommandResponse (NULL while the first request is in flight)
+- created_at: Timestamp when the key was claimed
+- expires_at: Replay window end (created_at + IDEMPOTENCY_TTL_SECONDS)
+
+Includes index on expires_at for purging expired keys.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '43c9f0c864b5'
+down_revision: Union[str, None] = 'fa1c1e889e66'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create idempotency_keys table and index."""
+    op.create_table(
+        'idempotency_keys',
+        sa.Column('key_name', sa.VARCHAR(length=100), nullable=False),
+        sa.Column('idempotency_key', sa.VARCHAR(length=255), nullable=False),
+        sa.Column('request_hash', sa.CHAR(length=64), nullable=False),
+        sa.Column('response', postgresql.JSONB(), nullable=True),
+        sa.Column('created_at', postgresql.TIMESTAMP(timezone=True), server_default=sa.text('NOW()'), nullable=False),
+        sa.Column('expires_at', postgresql.TIMESTAMP(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('key_name', 'idempotency_key')
+    )
+
+    op.create_index('idx_idempotency_keys_expires_at', 'idempotency_keys', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Drop idempotency_keys table and index."""
+    op.drop_index('idx_idempotency_keys_expires_at', table_name='idempotency_keys')
+    op.drop_table('idempotency_keys')
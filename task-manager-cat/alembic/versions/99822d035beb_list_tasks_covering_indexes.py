@@ -0,0 +1,64 @@
+"""list_tasks_covering_indexes
+
+Revision ID: 99822d035beb
+Revises: 4563f9b36ec4
+Create Date: 2026-10-18 16:20:44.902317
+
+Covering indexes for the list-tasks summary modes (count / exists / ids).
+
+Changes:
+- idx_tasks_user_created: (user_id, created_at DESC) INCLUDE (id, status)
+  returns mode="ids" in default order without touching the heap
+- idx_tasks_user_priority: rebuilt with INCLUDE (id, status) for
+  mode="ids" with sort="priority"
+
+mode="count" and mode="exists" are answered by idx_tasks_user_status
+(user_id, status), which already covers their filter.
+
+Index-only scans skip the heap for pages marked all-visible, so they rely
+on autovacuum keeping the visibility map current.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '99822d035beb'
+down_revision: Union[str, None] = '4563f9b36ec4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create idx_tasks_user_created and add id/status to idx_tasks_user_priority."""
+    op.create_index(
+        'idx_tasks_user_created',
+        'tasks',
+        ['user_id', sa.text('created_at DESC')],
+        unique=False,
+        postgresql_include=['id', 'status']
+    )
+
+    op.drop_index('idx_tasks_user_priority', table_name='tasks')
+    op.create_index(
+        'idx_tasks_user_priority',
+        'tasks',
+        ['user_id', sa.text('priority DESC NULLS LAST'), sa.text('created_at DESC')],
+        unique=False,
+        postgresql_include=['id', 'status']
+    )
+
+
+def downgrade() -> None:
+    """Restore idx_tasks_user_priority without included columns and drop idx_tasks_user_created."""
+    op.drop_index('idx_tasks_user_priority', table_name='tasks')
+    op.create_index(
+        'idx_tasks_user_priority',
+        'tasks',
+        ['user_id', sa.text('priority DESC NULLS LAST'), sa.text('created_at DESC')],
+        unique=False
+    )
+
+    op.drop_index('idx_tasks_user_created', table_name='tasks')
@@ -0,0 +1,89 @@
+"""commit_safe_sync_versions
+
+Revision ID: b7e3d41a9c25
+Revises: 99822d035beb
+Create Date: 2026-10-18 16:40:03.281947
+
+Makes sync-tasks cursors safe against concurrent writers and bounds
+task_tombstones.
+
+A plain nextval('task_sync_seq') is taken when the statement runs, not when
+the transaction commits: if versions 10 and 11 are taken concurrently and
+11 commits first, a client syncing in between advances past 10 and never
+receives it.
+
+Changes:
+- task_sync_version(): (writer's transaction id << 20) | (sequence & 0xFFFFF).
+  Versions are ordered by transaction id, so every write not yet committed
+  has a version >= pg_snapshot_xmin(pg_current_snapshot()) << 20 and
+  sync-tasks only returns versions below that horizon
+- tasks.sync_version / task_tombstones.sync_version default to it
+  (update_task_handler sets it explicitly)
+- task_sync_state: single row holding tombstones_pruned_through, the
+  highest sync_version removed by the purge-task-tombstones job; older
+  cursors must do a full resync
+- idx_task_tombstones_deleted_at: range scan for the purge job
+
+Existing versions come from the sequence and stay below every new version
+(checked before the defaults change), so stored client cursors keep working.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e3d41a9c25'
+down_revision: Union[str, None] = '99822d035beb'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Switch sync versions to transaction-ordered values and add task_sync_state."""
+    op.execute("""
+        CREATE FUNCTION task_sync_version() RETURNS BIGINT
+        LANGUAGE sql VOLATILE AS $$
+            SELECT (pg_current_xact_id()::text::bigint << 20) | (nextval('task_sync_seq') & 1048575)
+        $$
+    """)
+    op.execute("""
+        DO $$
+        BEGIN
+            IF (SELECT last_value FROM task_sync_seq) >= (pg_current_xact_id()::text::bigint << 20) THEN
+                RAISE EXCEPTION 'task_sync_seq is ahead of transaction-ordered sync versions';
+            END IF;
+        END
+        $$
+    """)
+    op.execute("ALTER TABLE tasks ALTER COLUMN sync_version SET DEFAULT task_sync_version()")
+    op.execute("ALTER TABLE task_tombstones ALTER COLUMN sync_version SET DEFAULT task_sync_version()")
+
+    op.create_table('task_sync_state',
+        sa.Column('id', sa.BOOLEAN(), server_default=sa.text('TRUE'), nullable=False),
+        sa.Column('tombstones_pruned_through', sa.BIGINT(), server_default=sa.text('0'), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.CheckConstraint('id', name='check_task_sync_state_single_row')
+    )
+    op.execute("INSERT INTO task_sync_state DEFAULT VALUES")
+
+    op.create_index('idx_task_tombstones_deleted_at', 'task_tombstones', ['deleted_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Restore sequence-based sync versions and drop task_sync_state."""
+    op.drop_index('idx_task_tombstones_deleted_at', table_name='task_tombstones')
+    op.drop_table('task_sync_state')
+    op.execute("ALTER TABLE task_tombstones ALTER COLUMN sync_version SET DEFAULT nextval('task_sync_seq')")
+    op.execute("ALTER TABLE tasks ALTER COLUMN sync_version SET DEFAULT nextval('task_sync_seq')")
+    # Keep versions increasing past the transaction-ordered ones already handed out
+    op.execute("""
+        SELECT setval('task_sync_seq', GREATEST(
+            (SELECT last_value FROM task_sync_seq),
+            (SELECT COALESCE(MAX(sync_version), 1) FROM tasks),
+            (SELECT COALESCE(MAX(sync_version), 1) FROM task_tombstones)
+        ))
+    """)
+    op.execute("DROP FUNCTION task_sync_version()")
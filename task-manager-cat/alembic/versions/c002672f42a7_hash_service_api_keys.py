@@ -0,0 +1,98 @@
+"""hash_service_api_keys
+
+Revision ID: c002672f42a7
+Revises: c1b586e6d7d2
+Create Date: 2026-10-18 12:20:51.337410
+
+Replaces plaintext service keys with a lookup prefix and a keyed hash.
+
+Changes:
+- key_prefix: First 16 characters of the key (e.g. 'sk_prod_a1b2c3d4'),
+  indexed for active keys so validation reads a single index page
+- key_hash: HMAC-SHA256 of the full key keyed with API_KEY_SECRET
+- api_key: Dropped after existing keys are backfilled
+
+Existing keys keep working: the backfill hashes them with the current
+API_KEY_SECRET, which must be the same secret the application runs with.
+
+Downgrade cannot recover plaintext keys: api_key is restored with the hash
+as a placeholder and every key is deactivated, so keys must be reissued.
+"""
+import hashlib
+import hmac
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.config import settings
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c002672f42a7'
+down_revision: Union[str, None] = 'c1b586e6d7d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+KEY_PREFIX_LENGTH = 16
+
+
+def upgrade() -> None:
+    """Add key_prefix/key_hash, backfill existing keys, drop api_key."""
+    # Hashes made with an empty secret could never be verified by the app
+    if not settings.api_key_secret:
+        raise RuntimeError("API_KEY_SECRET must be set to hash existing service keys")
+
+    op.add_column('service_api_keys', sa.Column('key_prefix', sa.VARCHAR(length=16), nullable=True))
+    op.add_column('service_api_keys', sa.Column('key_hash', sa.CHAR(length=64), nullable=True))
+
+    # Hash in Python so the HMAC matches app.auth.hash_service_key exactly
+    secret = settings.api_key_secret.encode("utf-8")
+    connection = op.get_bind()
+    rows = connection.execute(sa.text("SELECT id, api_key FROM service_api_keys")).fetchall()
+    for key_id, api_key in rows:
+        connection.execute(
+            sa.text("UPDATE service_api_keys SET key_prefix = :prefix, key_hash = :hash WHERE id = :id"),
+            {
+                "prefix": api_key[:KEY_PREFIX_LENGTH],
+                "hash": hmac.new(secret, api_key.encode("utf-8"), hashlib.sha256).hexdigest(),
+                "id": key_id,
+            }
+        )
+
+    op.alter_column('service_api_keys', 'key_prefix', nullable=False)
+    op.alter_column('service_api_keys', 'key_hash', nullable=False)
+    op.create_unique_constraint('service_api_keys_key_hash_key', 'service_api_keys', ['key_hash'])
+
+    op.drop_index('idx_service_api_keys_active', table_name='service_api_keys')
+    op.drop_column('service_api_keys', 'api_key')
+
+    # Partial index for active key lookups by prefix
+    op.create_index(
+        'idx_service_api_keys_active_prefix',
+        'service_api_keys',
+        ['key_prefix'],
+        unique=False,
+        postgresql_where=sa.text('active = true')
+    )
+
+
+def downgrade() -> None:
+    """Restore api_key column (keys deactivated) and drop prefix/hash."""
+    op.drop_index('idx_service_api_keys_active_prefix', table_name='service_api_keys')
+
+    op.add_column('service_api_keys', sa.Column('api_key', sa.VARCHAR(length=255), nullable=True))
+    op.execute("UPDATE service_api_keys SET api_key = key_hash, active = false")
+    op.alter_column('service_api_keys', 'api_key', nullable=False)
+    op.create_unique_constraint('service_api_keys_api_key_key', 'service_api_keys', ['api_key'])
+    op.create_index(
+        'idx_service_api_keys_active',
+        'service_api_keys',
+        ['api_key'],
+        unique=False,
+        postgresql_where=sa.text('active = true')
+    )
+
+    op.drop_constraint('service_api_keys_key_hash_key', 'service_api_keys', type_='unique')
+    op.drop_column('service_api_keys', 'key_hash')
+    op.drop_column('service_api_keys', 'key_prefix')
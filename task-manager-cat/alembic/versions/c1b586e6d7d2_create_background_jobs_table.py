@@ -0,0 +1,95 @@
+"""create_background_jobs_table
+
+Revision ID: c1b586e6d7d2
+Revises: 43c9f0c864b5
+Create Date: 2026-10-18 11:02:17.504913
+
+Creates the background_jobs table backing the Postgres job queue (app/jobs).
+
+Columns:
+- job_type: Key into app.jobs.handlers.JOB_HANDLERS
+- payload: JSON arguments passed to the job handler
+- status: queued -> running -> completed | failed (retries go back to queued)
+- attempts / max_attempts: Retry bookkeeping
+- run_at: Earliest time the job may run (used for retry backoff)
+- locked_at: When a worker claimed the job (stale locks are requeued)
+- dedupe_key: Optional key; at most one queued/running job per key
+
+Workers claim jobs with SELECT ... FOR UPDATE SKIP LOCKED using the partial
+index on queued jobs, so concurrent workers never block on each other.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c1b586e6d7d2'
+down_revision: Union[str, None] = '43c9f0c864b5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create background_jobs table with claim and dedupe indexes."""
+    op.create_table('background_jobs',
+        sa.Column('id', sa.BIGINT(), sa.Identity(always=False), nullable=False),
+        sa.Column('job_type', sa.VARCHAR(length=100), nullable=False),
+        sa.Column('payload', postgresql.JSONB(), server_default=sa.text("'{}'::jsonb"), nullable=False),
+        sa.Column('status', sa.VARCHAR(length=20), server_default=sa.text("'queued'"), nullable=False),
+        sa.Column('attempts', sa.INTEGER(), server_default=sa.text('0'), nullable=False),
+        sa.Column('max_attempts', sa.INTEGER(), server_default=sa.text('5'), nullable=False),
+        sa.Column('run_at', postgresql.TIMESTAMP(timezone=True), server_default=sa.text('NOW()'), nullable=False),
+        sa.Column('locked_at', postgresql.TIMESTAMP(timezone=True), nullable=True),
+        sa.Column('last_error', sa.TEXT(), nullable=True),
+        sa.Column('dedupe_key', sa.VARCHAR(length=255), nullable=True),
+        sa.Column('created_at', postgresql.TIMESTAMP(timezone=True), server_default=sa.text('NOW()'), nullable=False),
+        sa.Column('finished_at', postgresql.TIMESTAMP(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.CheckConstraint(
+            "status IN ('queued', 'running', 'completed', 'failed')",
+            name='check_background_jobs_status'
+        )
+    )
+    # Claim query: oldest due job among queued ones
+    op.create_index(
+        'idx_background_jobs_queued_run_at',
+        'background_jobs',
+        ['run_at'],
+        unique=False,
+        postgresql_where=sa.text("status = 'queued'")
+    )
+    # Stale lock reaper
+    op.create_index(
+        'idx_background_jobs_running_locked_at',
+        'background_jobs',
+        ['locked_at'],
+        unique=False,
+        postgresql_where=sa.text("status = 'running'")
+    )
+    # Retention purge of finished jobs
+    op.create_index(
+        'idx_background_jobs_finished_at',
+        'background_jobs',
+        ['finished_at'],
+        unique=False,
+        postgresql_where=sa.text("finished_at IS NOT NULL")
+    )
+    op.create_index(
+        'idx_background_jobs_dedupe_key',
+        'background_jobs',
+        ['dedupe_key'],
+        unique=True,
+        postgresql_where=sa.text("status IN ('queued', 'running')")
+    )
+
+
+def downgrade() -> None:
+    """Drop background_jobs table."""
+    op.drop_index('idx_background_jobs_dedupe_key', table_name='background_jobs')
+    op.drop_index('idx_background_jobs_finished_at', table_name='background_jobs')
+    op.drop_index('idx_background_jobs_running_locked_at', table_name='background_jobs')
+    op.drop_index('idx_background_jobs_queued_run_at', table_name='background_jobs')
+    op.drop_table('background_jobs')
@@ -0,0 +1,40 @@
+"""idempotency_claim_token
+
+Revision ID: e4a8c2f61d03
+Revises: b7e3d41a9c25
+Create Date: 2026-10-18 17:05:44.902316
+
+Adds idempotency_keys.claim_token so a claim can only be completed or
+released by the request that holds it.
+
+In-flight claims now expire after a short lease (IDEMPOTENCY_LEASE_SECONDS)
+instead of the full replay window, so a retry can take over the key of a
+crashed request. The token makes the stored response (written in the
+handler's transaction) and the release conditional on still owning the
+claim: a request whose claim was taken over rolls back its write.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4a8c2f61d03'
+down_revision: Union[str, None] = 'b7e3d41a9c25'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add claim_token to idempotency_keys."""
+    op.add_column(
+        'idempotency_keys',
+        sa.Column('claim_token', postgresql.UUID(), server_default=sa.text('gen_random_uuid()'), nullable=False)
+    )
+
+
+def downgrade() -> None:
+    """Drop claim_token from idempotency_keys."""
+    op.drop_column('idempotency_keys', 'claim_token')
@@ -0,0 +1,70 @@
+"""add_task_sync_tracking
+
+Revision ID: fa1c1e889e66
+Revises: 92389ddb0a57
+Create Date: 2026-10-18 09:12:40.118204
+
+Adds change tracking for the sync-tasks delta sync action.
+
+Changes:
+- task_sync_seq: Monotonic sequence shared by tasks and tombstones.
+  Every write takes the next value, so a client cursor is a single BIGINT.
+- tasks.updated_at: Timestamp of the last write (NOW() on insert/update)
+- tasks.sync_version: Sequence value of the last write
+- task_tombstones: One row per deleted task (filled by delete_task_handler)
+
+Includes (user_id, sync_version) indexes on both tables so a delta query is
+a range scan over the rows changed since the cursor.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'fa1c1e889e66'
+down_revision: Union[str, None] = '92389ddb0a57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create sync sequence, tracking columns and task_tombstones table."""
+    op.execute("CREATE SEQUENCE task_sync_seq AS BIGINT")
+
+    op.add_column(
+        'tasks',
+        sa.Column('updated_at', postgresql.TIMESTAMP(timezone=True), server_default=sa.text('NOW()'), nullable=False)
+    )
+    # Existing rows receive distinct sequence values, so cursor 0 replays everything
+    op.add_column(
+        'tasks',
+        sa.Column('sync_version', sa.BIGINT(), server_default=sa.text("nextval('task_sync_seq')"), nullable=False)
+    )
+    op.create_index('idx_tasks_user_sync_version', 'tasks', ['user_id', 'sync_version'], unique=False)
+
+    op.create_table('task_tombstones',
+        sa.Column('task_id', postgresql.UUID(), nullable=False),
+        sa.Column('user_id', sa.VARCHAR(length=255), nullable=False),
+        sa.Column('deleted_at', postgresql.TIMESTAMP(timezone=True), server_default=sa.text('NOW()'), nullable=False),
+        sa.Column('sync_version', sa.BIGINT(), server_default=sa.text("nextval('task_sync_seq')"), nullable=False),
+        sa.PrimaryKeyConstraint('task_id')
+    )
+    op.create_index(
+        'idx_task_tombstones_user_sync_version',
+        'task_tombstones',
+        ['user_id', 'sync_version'],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    """Drop task_tombstones table, tracking columns and sync sequence."""
+    op.drop_index('idx_task_tombstones_user_sync_version', table_name='task_tombstones')
+    op.drop_table('task_tombstones')
+    op.drop_index('idx_tasks_user_sync_version', table_name='tasks')
+    op.drop_column('tasks', 'sync_version')
+    op.drop_column('tasks', 'updated_at')
+    op.execute("DROP SEQUENCE task_sync_seq")
@@ -1,3 +1,8 @@
 """Task Manager API"""
 
+import time
+
 __version__ = "1.0.0"
+
+# Reference point for startup timing (import of the app package)
+IMPORT_STARTED_AT = time.perf_counter()
@@ -0,0 +1,172 @@
+"""
+Task Manager API - Admission Control
+
+Load shedding for /execute based on database pool pressure.
+
+Signals (per worker process, measured in app.database.get_db):
+    - Pool wait time: the larger of the age of the oldest request waiting
+      for a connection and a decaying average of recent acquire waits
+    - Waiters: requests currently waiting for a connection
+
+Tiers:
+    - Expensive reads (read-only actions with cost class "expensive") are
+      shed first, once wait time or waiters pass the ADMISSION_EXPENSIVE_*
+      thresholds
+    - Writes and cheap reads are shed last, at ADMISSION_MAX_*
+
+Shed requests fail fast with 503 and Retry-After instead of queueing for a
+connection. Connection acquisition itself is bounded by
+DB_ACQUIRE_TIMEOUT_SECONDS.
+"""
+
+import math
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Optional
+
+from fastapi import HTTPException, status
+
+from app.config import settings
+from app.metrics import db_pool_acquire_seconds, db_pool_waiters, requests_shed_total
+
+# Shed reasons (requests_shed_total label)
+REASON_WAIT_TIME = "wait_time"
+REASON_WAITERS = "waiters"
+REASON_ACQUIRE_TIMEOUT = "acquire_timeout"
+
+
+class PoolWaitTracker:
+    """
+    Track how long requests wait for a pool connection.
+
+    Args:
+        alpha: Weight of the newest sample in the moving average
+        decay_seconds: Time constant of the average's decay while no
+            connection is acquired (so shedding stops once the pool recovers)
+    """
+
+    def __init__(self, alpha: float = 0.2, decay_seconds: float = 1.0) -> None:
+        self.alpha = alpha
+        self.decay_seconds = decay_seconds
+        self._average = 0.0
+        self._updated_at = time.monotonic()
+        self._waiting: dict[object, float] = {}
+
+    @property
+    def waiters(self) -> int:
+        """Requests currently waiting for a connection."""
+        return len(self._waiting)
+
+    @contextmanager
+    def waiting(self) -> Iterator[None]:
+        """Mark the enclosed block as waiting for a connection."""
+        token = object()
+        started_at = time.monotonic()
+        self._waiting[token] = started_at
+        db_pool_waiters.set(len(self._waiting))
+        try:
+            yield
+        finally:
+            del self._waiting[token]
+            db_pool_waiters.set(len(self._waiting))
+            self.observe(time.monotonic() - started_at)
+
+    def observe(self, seconds: float) -> None:
+        """Record one acquire wait."""
+        now = time.monotonic()
+        self._average = self._decayed(now) * (1 - self.alpha) + seconds * self.alpha
+        self._updated_at = now
+        db_pool_acquire_seconds.observe(seconds)
+
+    def wait_seconds(self) -> float:
+        """Current pool wait estimate in seconds."""
+        now = time.monotonic()
+        # Dicts keep insertion order: the first entry is the oldest waiter
+        oldest = now - next(iter(self._waiting.values()), now)
+        return max(oldest, self._decayed(now))
+
+    def _decayed(self, now: float) -> float:
+        elapsed = max(now - self._updated_at, 0.0)
+        return self._average * math.exp(-elapsed / self.decay_seconds)
+
+
+@dataclass(frozen=True)
+class AdmissionPolicy:
+    """Shedding thresholds for the two priority tiers."""
+
+    expensive_wait_seconds: float
+    expensive_max_waiters: int
+    max_wait_seconds: float
+    max_waiters: int
+
+    def check(self, wait_seconds: float, waiters: int, shed_first: bool) -> Optional[str]:
+        """
+        Decide whether to shed a request.
+
+        Args:
+            wait_seconds: Current pool wait estimate
+            waiters: Requests waiting for a connection
+            shed_first: True for expensive reads, False for writes and cheap reads
+
+        Returns:
+            Optional[str]: Shed reason, or None to admit the request
+        """
+        wait_limit = self.expensive_wait_seconds if shed_first else self.max_wait_seconds
+        waiter_limit = self.expensive_max_waiters if shed_first else self.max_waiters
+        if wait_seconds >= wait_limit:
+            return REASON_WAIT_TIME
+        if waiters >= waiter_limit:
+            return REASON_WAITERS
+        return None
+
+
+def overloaded(action: str, reason: str) -> HTTPException:
+    """Count a shed request and build its 503 response."""
+    requests_shed_total.labels(action=action, reason=reason).inc()
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Service overloaded, retry later",
+        headers={"Retry-After": str(settings.admission_retry_after_seconds)}
+    )
+
+
+# Global tracker and policy (created on first use)
+_tracker: PoolWaitTracker | None = None
+_policy: AdmissionPolicy | None = None
+
+
+def get_pool_wait_tracker() -> PoolWaitTracker:
+    """
+    Get or create the process-wide pool wait tracker.
+
+    Returns:
+        PoolWaitTracker: Tracker fed by app.database.get_db
+    """
+    global _tracker
+
+    if _tracker is None:
+        _tracker = PoolWaitTracker()
+
+    return _tracker
+
+
+def get_admission_policy() -> AdmissionPolicy:
+    """
+    Get or create the admission policy from settings.
+
+    Returns:
+        AdmissionPolicy: Thresholds from ADMISSION_* settings
+    """
+    global _policy
+
+    if _policy is None:
+        _policy = AdmissionPolicy(
+            expensive_wait_seconds=settings.admission_expensive_wait_ms / 1000,
+            expensive_max_waiters=settings.admission_expensive_max_waiters,
+            max_wait_seconds=settings.admission_max_wait_ms / 1000,
+            max_waiters=settings.admission_max_waiters
+        )
+
+    return _policy
@@ -3,15 +3,66 @@ Task Manager API - Authentication
 
 Service API Key validation for client application authentication.
 Implements dependency injection pattern for FastAPI endpoints.
+
+Key storage:
+    Service keys are never stored in plaintext. Each row keeps a short public
+    prefix (indexed, used for lookup) and an HMAC-SHA256 of the full key keyed
+    with API_KEY_SECRET. Validation looks up the prefix and compares hashes in
+    constant time.
 """
 
+import hashlib
+import hmac
 import secrets
 
 import asyncpg
 from fastapi import Depends, Header, HTTPException, status
 
 from app.config import settings
-from app.database import get_db
+from app.database import acquire_connection, get_db_pool
+
+# Leading characters of a service key stored in clear for lookup
+# ('sk_prod_' + 8 hex chars): identifies the key in logs and admin tools
+# without revealing enough to use it
+KEY_PREFIX_LENGTH = 16
+
+
+def service_key_prefix(service_key: str) -> str:
+    """
+    Return the public lookup prefix of a service key.
+
+    Args:
+        service_key: Full service key
+
+    Returns:
+        str: First KEY_PREFIX_LENGTH characters of the key
+
+    Example:
+        >>> service_key_prefix("sk_prod_a1b2c3d4e5f6...")
+        'sk_prod_a1b2c3d4'
+    """
+    return service_key[:KEY_PREFIX_LENGTH]
+
+
+def hash_service_key(service_key: str) -> str:
+    """
+    Compute the stored hash of a service key.
+
+    Uses HMAC-SHA256 keyed with API_KEY_SECRET. Service keys carry 256 bits of
+    entropy, so a fast keyed hash is sufficient (no password-style KDF needed)
+    and keeps validation cheap on every request.
+
+    Args:
+        service_key: Full service key
+
+    Returns:
+        str: 64 character hex digest
+
+    Security Notes:
+        - Changing API_KEY_SECRET invalidates every stored key
+    """
+    secret = settings.api_key_secret.encode("utf-8")
+    return hmac.new(secret, service_key.encode("utf-8"), hashlib.sha256).hexdigest()
 
 
 def generate_service_key(environment: str) -> str:
@@ -100,19 +151,23 @@ async def validate_admin_key(
 
 async def validate_service_key(
     x_service_key: str = Header(..., alias="X-Service-Key"),
-    db: asyncpg.Connection = Depends(get_db)
+    db: asyncpg.Pool | asyncpg.Connection = Depends(get_db_pool)
 ) -> str:
     """
     Validate Service API Key from X-Service-Key header.
     
-    Checks that:
+    Looks up candidate rows by the key's public prefix (indexed), then
+    compares the HMAC of the presented key against each stored hash in
+    constant time. Checks that:
     - Service key exists in database
     - Service key is active (active = true)
     - Service key has not expired (expires_at IS NULL OR expires_at > NOW())
     
     Args:
         x_service_key: Service API key from X-Service-Key header (extracted by FastAPI)
-        db: Database connection from pool (provided by get_db dependency)
+        db: Connection pool (provided by get_db_pool dependency; a connection is
+            held only for the lookup, so requests served from the read replica
+            keep no primary connection) or an already acquired connection
     
     Returns:
         str: key_name of validated service key (for logging/monitoring)
@@ -136,17 +191,23 @@ async def validate_service_key(
     Example valid header:
         X-Service-Key: sk_dev_test_key_12345678901234567890123456789012
     """
-    result = await db.fetchrow("""
-        SELECT key_name FROM service_api_keys 
-        WHERE api_key = $1 
-        AND active = true 
+    if isinstance(db, asyncpg.Pool):
+        async with acquire_connection(db) as connection:
+            return await validate_service_key(x_service_key=x_service_key, db=connection)
+
+    candidates = await db.fetch("""
+        SELECT key_name, key_hash FROM service_api_keys
+        WHERE key_prefix = $1
+        AND active = true
         AND (expires_at IS NULL OR expires_at > NOW())
-    """, x_service_key)
+    """, service_key_prefix(x_service_key))
 
-    if not result:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid or expired service key"
-        )
+    key_hash = hash_service_key(x_service_key)
+    for candidate in candidates:
+        if secrets.compare_digest(candidate['key_hash'], key_hash):
+            return candidate['key_name']
 
-    return result['key_name']
+    raise HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid or expired service key"
+    )
@@ -0,0 +1,96 @@
+"""
+Per-process response cache for read-only commands.
+
+Caches the result of actions registered with cache_ttl_seconds > 0, keyed by
+user_id, action and payload. Successful writes invalidate every cached entry
+of the written user in this process; other worker processes serve entries up
+to their TTL, so cache TTLs must stay short (seconds).
+"""
+
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+from app.config import settings
+
+CacheKey = tuple[str, str, str]
+
+
+def cache_key(user_id: str, action: str, payload: dict) -> CacheKey:
+    """Build a cache key independent of payload key order."""
+    return user_id, action, json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+
+
+class CommandCache:
+    """
+    Bounded TTL cache with per-user invalidation.
+
+    Args:
+        max_entries: Entries kept before the least recently stored is evicted
+    """
+
+    def __init__(self, max_entries: int = 10000) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[CacheKey, tuple[float, Any]] = OrderedDict()
+        self._user_keys: dict[str, set[CacheKey]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: CacheKey) -> Optional[Any]:
+        """Return a cached value, or None if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            self._discard(key)
+            return None
+        return value
+
+    def set(self, key: CacheKey, value: Any, ttl_seconds: float) -> None:
+        """Store a value for ttl_seconds, evicting the oldest entry when full."""
+        if key in self._entries:
+            self._entries.move_to_end(key)
+        self._entries[key] = (time.monotonic() + ttl_seconds, value)
+        self._user_keys.setdefault(key[0], set()).add(key)
+        while len(self._entries) > self.max_entries:
+            self._discard(next(iter(self._entries)))
+
+    def invalidate_user(self, user_id: str) -> None:
+        """Drop every cached entry of a user."""
+        for key in self._user_keys.pop(user_id, ()):
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        self._entries.clear()
+        self._user_keys.clear()
+
+    def _discard(self, key: CacheKey) -> None:
+        self._entries.pop(key, None)
+        keys = self._user_keys.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._user_keys[key[0]]
+
+
+# Global cache (created on first use)
+_cache: CommandCache | None = None
+
+
+def get_command_cache() -> CommandCache:
+    """
+    Get or create the process-wide command cache.
+
+    Returns:
+        CommandCache: Cache sized by COMMAND_CACHE_MAX_ENTRIES
+    """
+    global _cache
+
+    if _cache is None:
+        _cache = CommandCache(max_entries=settings.command_cache_max_entries)
+
+    return _cache
@@ -1,15 +1,16 @@
 """
 Statistics command handler for Task Manager API.
 
-Implements HTTP handler for get-stats action that integrates statistics service layer
-with the universal command pattern router.
+Implements HTTP handlers for get-stats and get-stats-bulk actions that integrate
+the statistics service layer with the universal command pattern router.
 
-Handler:
+Handlers:
     - get_stats_handler: Retrieve task statistics for user
+    - get_stats_bulk_handler: Retrieve task statistics for many users at once
 
 Architecture:
     - user_id: External user ID from Cat House (already authenticated)
-    - payload: Empty dict {} for get-stats (no parameters needed)
+    - payload: Empty TaskStatsRequest (or {}) for get-stats (no parameters needed)
     - db: asyncpg database connection from pool
     - Returns: dict with statistics (wrapped in CommandResponse by router)
     - Raises: HTTPException for unexpected errors (500)
@@ -25,17 +26,20 @@ Statistics Response Schema:
     }
 """
 
-from typing import Any
+from typing import Any, Union
 
 import structlog
 from fastapi import HTTPException
+from pydantic import ValidationError
 
-from app.services.stats_service import get_task_statistics
+from app.commands.models import validate_payload
+from app.models.task import TaskStatsBulkRequest, TaskStatsRequest
+from app.services.stats_service import get_bulk_task_statistics, get_task_statistics
 
 logger = structlog.get_logger()
 
 
-async def get_stats_handler(user_id: str, payload: dict, db: Any) -> dict:
+async def get_stats_handler(user_id: str, payload: Union[TaskStatsRequest, dict], db: Any) -> dict:
     """
     Retrieve task statistics for a user.
     
@@ -44,7 +48,7 @@ async def get_stats_handler(user_id: str, payload: dict, db: Any) -> dict:
     
     Args:
         user_id: External user ID from Cat House (already authenticated)
-        payload: Empty dict {} (no parameters needed for get-stats)
+        payload: Empty TaskStatsRequest or {} (no parameters needed for get-stats)
         db: asyncpg database connection from pool
     
     Returns:
@@ -102,3 +106,45 @@ async def get_stats_handler(user_id: str, payload: dict, db: Any) -> dict:
             status_code=500,
             detail="Failed to calculate statistics"
         )
+
+
+async def get_stats_bulk_handler(user_id: str, payload: Union[TaskStatsBulkRequest, dict], db: Any) -> dict:
+    """
+    Retrieve task statistics for a list of users.
+    
+    Handler for 'get-stats-bulk' action, used by Cat House admin and leaderboard
+    views. Statistics of all requested users come from one grouped query
+    instead of one get-stats command (three queries) per user. The action is
+    registered admin_only, so the router only runs it for service keys listed
+    in ADMIN_SERVICE_KEYS.
+    
+    Args:
+        user_id: External user ID of the caller (for logging only)
+        payload: Users to report on (TaskStatsBulkRequest: user_ids)
+        db: asyncpg database connection from pool
+    
+    Returns:
+        dict: Statistics per user (same fields as get-stats) and user count
+            {"stats": {"user_123": {...}, "user_456": {...}}, "count": 2}
+    
+    Raises:
+        HTTPException(400): Missing, empty or oversized user_ids
+        HTTPException(500): Unexpected error during statistics calculation
+    """
+    try:
+        request = validate_payload(TaskStatsBulkRequest, payload)
+    except ValidationError as e:
+        logger.warning("validation_error", user_id=user_id, error=str(e))
+        raise HTTPException(status_code=400, detail=str(e))
+
+    try:
+        stats = await get_bulk_task_statistics(request.user_ids, db)
+    except Exception as e:
+        logger.error("bulk_stats_calculation_error", user_id=user_id, error=str(e))
+        raise HTTPException(
+            status_code=500,
+            detail="Failed to calculate statistics"
+        )
+
+    logger.info("bulk_stats_retrieved", user_id=user_id, user_count=len(stats))
+    return {"stats": stats, "count": len(stats)}
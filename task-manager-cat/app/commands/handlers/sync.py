@@ -0,0 +1,170 @@
+"""
+Delta sync command handler for Task Manager API.
+
+Implements HTTP handler for sync-tasks action, which returns only the tasks
+created, updated or deleted since a client-supplied cursor. Mobile clients use
+it to resync after being offline instead of downloading the full list-tasks
+result again.
+
+Handler:
+    - sync_tasks_handler: Return task changes since cursor
+
+Architecture:
+    - Every write takes a value from task_sync_version()
+      (tasks.sync_version on insert/update, task_tombstones.sync_version on delete):
+      the writer's transaction id in the high bits, task_sync_seq in the low 20
+    - The cursor is the highest sync_version the client has already seen
+    - Changes are returned in sync_version order, so the response cursor can be
+      sent back unchanged to continue paging
+    - Only versions below the snapshot horizon (pg_snapshot_xmin << 20) are
+      returned: every transaction below it has finished, and every write still
+      in flight gets a version above it, so a cursor never skips a change that
+      commits later
+    - Tombstones older than SYNC_TOMBSTONE_RETENTION_DAYS are purged by the
+      purge-task-tombstones job; cursors older than the purged versions get
+      410 and must resync from cursor 0
+
+Sync Response Schema:
+    {
+        "tasks": [TaskResponse, ...],  # Created or updated since cursor
+        "deleted_ids": ["uuid", ...],  # Deleted since cursor
+        "cursor": int,                 # Send back on the next sync-tasks call
+        "has_more": bool               # True if another page is available
+    }
+"""
+
+from typing import Any, Union
+
+import structlog
+from fastapi import HTTPException
+from pydantic import ValidationError
+
+from app.commands.models import validate_payload
+from app.models.task import TaskResponse, TaskSyncRequest
+
+logger = structlog.get_logger()
+
+
+async def sync_tasks_handler(user_id: str, payload: Union[TaskSyncRequest, dict], db: Any) -> dict:
+    """
+    Return task changes for a user since the given cursor.
+
+    Handler for 'sync-tasks' action. Reads changed tasks and tombstones using
+    the (user_id, sync_version) indexes, merges both streams in sync_version
+    order and returns at most `limit` changes.
+
+    Args:
+        user_id: External user ID from Cat House (already authenticated)
+        payload: Sync parameters (TaskSyncRequest: cursor?, limit?)
+        db: asyncpg database connection from pool
+
+    Returns:
+        dict: Changed tasks, deleted task IDs, next cursor and has_more flag
+
+    Raises:
+        HTTPException(400): Invalid cursor or limit
+        HTTPException(410): Cursor older than purged tombstones (full resync required)
+        HTTPException(500): Database error
+
+    Examples:
+        Input payload (initial sync): {}
+        Output: {"tasks": [task1, task2], "deleted_ids": [], "cursor": 2, "has_more": false}
+
+        Input payload (resync): {"cursor": 2}
+        Output: {"tasks": [task2], "deleted_ids": ["uuid1"], "cursor": 4, "has_more": false}
+    """
+    try:
+        sync_request = validate_payload(TaskSyncRequest, payload)
+    except ValidationError as e:
+        logger.warning(
+            "validation_error",
+            user_id=user_id,
+            error=str(e)
+        )
+        raise HTTPException(status_code=400, detail=str(e))
+
+    cursor = sync_request.cursor
+    limit = sync_request.limit
+
+    # Horizon computed once so both queries stop at the same version
+    state_sql = """
+        SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint << 20 AS horizon,
+               tombstones_pruned_through
+        FROM task_sync_state
+    """
+    # Fetch one extra row per source to detect whether another page exists
+    tasks_sql = """
+        SELECT * FROM tasks
+        WHERE user_id = $1 AND sync_version > $2 AND sync_version < $4
+        ORDER BY sync_version
+        LIMIT $3
+    """
+    tombstones_sql = """
+        SELECT task_id, sync_version FROM task_tombstones
+        WHERE user_id = $1 AND sync_version > $2 AND sync_version < $4
+        ORDER BY sync_version
+        LIMIT $3
+    """
+
+    try:
+        state = await db.fetchrow(state_sql)
+        if 0 < cursor < state['tombstones_pruned_through']:
+            logger.info(
+                "sync_cursor_expired",
+                user_id=user_id,
+                cursor=cursor,
+                pruned_through=state['tombstones_pruned_through']
+            )
+            raise HTTPException(
+                status_code=410,
+                detail="Sync cursor expired: deleted tasks were purged, resync from cursor 0"
+            )
+        horizon = state['horizon']
+        task_rows = await db.fetch(tasks_sql, user_id, cursor, limit + 1, horizon)
+        tombstone_rows = await db.fetch(tombstones_sql, user_id, cursor, limit + 1, horizon)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(
+            "database_error",
+            action="sync-tasks",
+            user_id=user_id,
+            error=str(e)
+        )
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+    # Merge both streams by sync_version and keep the first page
+    changes = sorted(
+        [(row['sync_version'], False, row) for row in task_rows]
+        + [(row['sync_version'], True, row) for row in tombstone_rows],
+        key=lambda change: change[0]
+    )
+    has_more = len(changes) > limit
+    changes = changes[:limit]
+
+    tasks = []
+    deleted_ids = []
+    for _, is_deleted, row in changes:
+        if is_deleted:
+            deleted_ids.append(str(row['task_id']))
+        else:
+            tasks.append(TaskResponse.model_validate(dict(row)).model_dump(mode='json'))
+
+    next_cursor = changes[-1][0] if changes else cursor
+
+    logger.info(
+        "tasks_synced",
+        user_id=user_id,
+        cursor=cursor,
+        next_cursor=next_cursor,
+        updated_count=len(tasks),
+        deleted_count=len(deleted_ids),
+        has_more=has_more
+    )
+
+    return {
+        "tasks": tasks,
+        "deleted_ids": deleted_ids,
+        "cursor": next_cursor,
+        "has_more": has_more
+    }
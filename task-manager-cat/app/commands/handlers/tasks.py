@@ -3,37 +3,77 @@ Task command handlers for Task Manager API.
 
 Implements action handlers for task CRUD operations:
 - create-task: Create a new task for user
-- list-tasks: List all tasks for user with optional status filter
+- list-tasks: List all tasks for user with optional status filter and sort,
+  or only their count, existence or ids (mode)
+- Read actions (list-tasks, get-task) accept a fields list and then select
+  and return only those columns
 
 All handlers follow universal handler signature:
-    async def handler(user_id: str, payload: dict, db) -> dict
+    async def handler(user_id: str, payload: Model | dict, db) -> dict
 
 Architecture:
     - user_id: External user ID from Cat House (already authenticated)
-    - payload: Action-specific parameters (validated by handler using Pydantic)
+    - payload: Typed payload parsed by /execute (see app/commands/models.py);
+      dicts passed by direct callers are validated with the same model
+    - status / priority: Validated as TaskStatus / TaskPriority and passed as
+      their labels, which asyncpg encodes into the task_status / task_priority
+      enum columns
     - db: asyncpg database connection from pool
     - Returns: dict response (wrapped in CommandResponse by router)
     - Raises: HTTPException for validation/business logic errors
+    - Writes publish a task_changes notification in the same statement
+      (see app/events.py), delivered to /events/tasks subscribers on commit
 """
 
-from typing import Any, Optional
-from uuid import UUID
+from collections.abc import Sequence
+from typing import Any, Optional, Union
 
 import structlog
 from fastapi import HTTPException
 from pydantic import ValidationError
-
-from app.models.task import TaskCreate, TaskResponse, TaskUpdate
+from pydantic_core import to_jsonable_python
+
+from app.commands.models import validate_payload
+from app.events import task_change_notify_sql
+from app.ids import uuid7
+from app.models.task import (
+    TaskCreate,
+    TaskGetRequest,
+    TaskIdRequest,
+    TaskListRequest,
+    TaskResponse,
+    TaskUpdateRequest,
+)
 
 logger = structlog.get_logger()
 
+# list-tasks sort option -> ORDER BY clause (matches idx_tasks_user_priority)
+LIST_ORDER_BY = {
+    "created_at": "created_at DESC",
+    "priority": "priority DESC NULLS LAST, created_at DESC",
+}
+
+
+def _select_columns(fields: Optional[Sequence[str]]) -> str:
+    """SELECT list for a sparse fieldset (names are validated TaskField literals)."""
+    return "*" if fields is None else ", ".join(fields)
+
 
-async def create_task_handler(user_id: str, payload: dict, db: Any) -> dict:
+def _serialize_task(row: Any, fields: Optional[Sequence[str]]) -> dict:
+    """Serialize a task row as a full TaskResponse, or only the requested fields."""
+    if fields is None:
+        return TaskResponse.model_validate(dict(row)).model_dump(mode='json')
+    # Sparse rows lack TaskResponse's required fields; encode them the same way
+    return to_jsonable_python({field: row[field] for field in fields})
+
+
+async def create_task_handler(user_id: str, payload: Union[TaskCreate, dict], db: Any) -> dict:
     """
     Create a new task for user.
     
-    Handler for 'create-task' action. Validates payload using TaskCreate model,
-    inserts task into database with user_id, and returns created task.
+    Handler for 'create-task' action. Takes a TaskCreate payload (dicts are
+    validated with TaskCreate), inserts task into database with user_id and a
+    time-ordered UUIDv7 id (app/ids.py), and returns created task.
     
     Args:
         user_id: External user ID from Cat House (already authenticated)
@@ -61,9 +101,9 @@ async def create_task_handler(user_id: str, payload: dict, db: Any) -> dict:
             "due_date": null
         }
     """
-    # Validate payload using TaskCreate model
+    # Validate payload using TaskCreate model (already typed when routed by /execute)
     try:
-        task_data = TaskCreate(**payload)
+        task_data = validate_payload(TaskCreate, payload)
     except ValidationError as e:
         logger.warning(
             "task_validation_error",
@@ -72,17 +112,23 @@ async def create_task_handler(user_id: str, payload: dict, db: Any) -> dict:
         )
         raise HTTPException(status_code=400, detail=str(e))
 
-    # Prepare SQL INSERT with RETURNING
-    sql = """
-        INSERT INTO tasks (user_id, title, description, status, priority, due_date)
-        VALUES ($1, $2, $3, $4, $5, $6)
-        RETURNING *
+    # Prepare SQL INSERT with RETURNING (and publish the change); the UUIDv7
+    # id appends to the primary key index instead of splitting random pages
+    sql = f"""
+        WITH created AS (
+            INSERT INTO tasks (id, user_id, title, description, status, priority, due_date)
+            VALUES ($1, $2, $3, $4, $5, $6, $7)
+            RETURNING *
+        )
+        SELECT created.*, {task_change_notify_sql('created', 'created')} AS notified
+        FROM created
     """
 
     try:
         # Execute INSERT and get created task
         row = await db.fetchrow(
             sql,
+            uuid7(),
             user_id,
             task_data.title,
             task_data.description,
@@ -116,23 +162,30 @@ async def create_task_handler(user_id: str, payload: dict, db: Any) -> dict:
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
-async def list_tasks_handler(user_id: str, payload: dict, db: Any) -> dict:
+async def list_tasks_handler(user_id: str, payload: Union[TaskListRequest, dict], db: Any) -> dict:
     """
     List all tasks for user with optional status filter.
     
     Handler for 'list-tasks' action. Queries tasks WHERE user_id = command.user_id,
-    applies optional status filter from payload, and returns array of tasks.
+    applies optional status filter from payload, and returns array of tasks
+    newest first, or most urgent first with sort="priority" (served in order
+    by idx_tasks_user_priority). With fields, only those columns are selected
+    and returned for each task. With mode, only a count, an existence flag or
+    the matching ids are returned (see _list_tasks_summary).
     
     Args:
         user_id: External user ID from Cat House (already authenticated)
-        payload: Optional filters (status?: string)
+        payload: Optional filters, sort, fields and mode
+            (TaskListRequest: status?, sort?, fields?, mode?)
         db: asyncpg database connection from pool
     
     Returns:
         dict: Response with tasks array and count
             {"tasks": [...], "count": number}
+            or, with mode: {"count": n} | {"exists": bool} | {"ids": [...], "count": n}
     
     Raises:
+        HTTPException(400): Invalid filter value
         HTTPException(500): Database error
     
     Examples:
@@ -141,41 +194,67 @@ async def list_tasks_handler(user_id: str, payload: dict, db: Any) -> dict:
         
         Input payload (with filter): {"status": "pending"}
         Output: {"tasks": [task1, task2], "count": 2}
+        
+        Input payload (by priority): {"sort": "priority"}
+        Output: {"tasks": [urgent_task, high_task, unprioritized_task], "count": 3}
+        
+        Input payload (sparse): {"fields": ["id", "title"]}
+        Output: {"tasks": [{"id": "uuid", "title": "Buy milk"}], "count": 1}
+        
+        Input payload (badge): {"status": "pending", "mode": "count"}
+        Output: {"count": 2}
     """
+    try:
+        filters = validate_payload(TaskListRequest, payload)
+    except ValidationError as e:
+        logger.warning(
+            "validation_error",
+            user_id=user_id,
+            error=str(e)
+        )
+        raise HTTPException(status_code=400, detail=str(e))
+
     # Extract optional status filter
-    status_filter: Optional[str] = payload.get('status')
+    status_filter: Optional[str] = filters.status
+
+    # Enum order of task_priority is low < medium < high < urgent
+    order_by = LIST_ORDER_BY[filters.sort]
 
-    # Build SQL query based on filters
+    # Sparse fieldset: skip unrequested columns (description is TOASTed)
+    columns = _select_columns(filters.fields)
+
+    # Build WHERE clause based on filters
     if status_filter:
-        sql = """
-            SELECT * FROM tasks 
-            WHERE user_id = $1 AND status = $2 
-            ORDER BY created_at DESC
-        """
-        query_params = (user_id, status_filter)
+        where = "user_id = $1 AND status = $2"
+        query_params: tuple[str, ...] = (user_id, status_filter)
     else:
-        sql = """
-            SELECT * FROM tasks 
-            WHERE user_id = $1 
-            ORDER BY created_at DESC
-        """
+        where = "user_id = $1"
         query_params = (user_id,)
 
+    # Summary modes return a count, a boolean or ids instead of tasks
+    if filters.mode is not None:
+        return await _list_tasks_summary(user_id, filters, where, query_params, db)
+
+    sql = f"""
+        SELECT {columns} FROM tasks 
+        WHERE {where} 
+        ORDER BY {order_by}
+    """
+
     try:
         # Execute query
         rows = await db.fetch(sql, *query_params)
 
-        # Convert rows to TaskResponse objects and then to dicts
-        tasks = [
-            TaskResponse.model_validate(dict(row)).model_dump(mode='json')
-            for row in rows
-        ]
+        # Convert rows to TaskResponse dicts (or the requested fields only)
+        tasks = [_serialize_task(row, filters.fields) for row in rows]
 
         # Log successful query
         logger.info(
             "tasks_listed",
             user_id=user_id,
             status_filter=status_filter,
+            sort=filters.sort,
+            fields=filters.fields,
             count=len(tasks)
         )
 
@@ -192,21 +271,75 @@ async def list_tasks_handler(user_id: str, payload: dict, db: Any) -> dict:
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
-async def get_task_handler(user_id: str, payload: dict, db: Any) -> dict:
+async def _list_tasks_summary(
+    user_id: str,
+    filters: TaskListRequest,
+    where: str,
+    query_params: tuple,
+    db: Any
+) -> dict:
+    """
+    Answer list-tasks in a summary mode (count, exists, ids).
+    
+    Each query reads only indexed columns, so PostgreSQL can answer it with an
+    index-only scan: count/exists via idx_tasks_user_status, ids via
+    idx_tasks_user_created / idx_tasks_user_priority (which include id).
+    
+    Returns:
+        dict: {"count": n}, {"exists": bool} or {"ids": [...], "count": n}
+    """
+    try:
+        if filters.mode == "count":
+            count = await db.fetchval(f"SELECT COUNT(*) FROM tasks WHERE {where}", *query_params)
+            result = {"count": count}
+        elif filters.mode == "exists":
+            exists = await db.fetchval(
+                f"SELECT EXISTS (SELECT 1 FROM tasks WHERE {where})", *query_params
+            )
+            result = {"exists": exists}
+        else:
+            rows = await db.fetch(
+                f"SELECT id FROM tasks WHERE {where} ORDER BY {LIST_ORDER_BY[filters.sort]}",
+                *query_params
+            )
+            ids = [str(row['id']) for row in rows]
+            result = {"ids": ids, "count": len(ids)}
+
+        logger.info(
+            "tasks_summarized",
+            user_id=user_id,
+            mode=filters.mode,
+            status_filter=filters.status
+        )
+
+        return result
+
+    except Exception as e:
+        logger.error(
+            "database_error",
+            action="list-tasks",
+            user_id=user_id,
+            mode=filters.mode,
+            error=str(e)
+        )
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+async def get_task_handler(user_id: str, payload: Union[TaskGetRequest, dict], db: Any) -> dict:
     """
     Retrieve a single task by ID.
     
     Handler for 'get-task' action. Queries task by ID without user ownership
-    check (trusts Cat House authorization). Returns complete task object or
-    404 error if task not found.
+    check (trusts Cat House authorization). Returns complete task object (or
+    only the requested fields) or 404 error if task not found.
     
     Args:
         user_id: External user ID from Cat House (for logging only)
-        payload: Task identifier (task_id: uuid)
+        payload: Task identifier and optional fields (TaskGetRequest: task_id, fields?)
         db: asyncpg database connection from pool
     
     Returns:
-        dict: Complete task object with all fields
+        dict: Task object with all fields, or with the requested fields only
     
     Raises:
         HTTPException(400): Missing or invalid task_id format
@@ -223,32 +356,21 @@ async def get_task_handler(user_id: str, payload: dict, db: Any) -> dict:
             ...
         }
     """
-    # Extract task_id from payload
-    task_id = payload.get('task_id')
-
-    # Check if task_id is provided
-    if not task_id:
-        logger.warning(
-            "validation_error",
-            user_id=user_id,
-            error="Missing required field: task_id"
-        )
-        raise HTTPException(status_code=400, detail="Missing required field: task_id")
-
-    # Validate UUID format
+    # Validate task_id and fields (already typed when routed by /execute)
     try:
-        task_id_uuid = UUID(task_id)
-    except (ValueError, TypeError):
+        request = validate_payload(TaskGetRequest, payload)
+    except ValidationError as e:
         logger.warning(
             "validation_error",
             user_id=user_id,
-            task_id=task_id,
-            error="Invalid UUID format"
+            error=str(e)
         )
-        raise HTTPException(status_code=400, detail="Invalid UUID format for task_id")
+        raise HTTPException(status_code=400, detail=str(e))
+
+    task_id_uuid = request.task_id
 
     # Query task by ID (no user ownership check - trusts Cat House)
-    sql = "SELECT * FROM tasks WHERE id = $1"
+    sql = f"SELECT {_select_columns(request.fields)} FROM tasks WHERE id = $1"
 
     try:
         row = await db.fetchrow(sql, task_id_uuid)
@@ -262,19 +384,16 @@ async def get_task_handler(user_id: str, payload: dict, db: Any) -> dict:
             )
             raise HTTPException(status_code=404, detail=f"Task not found: {task_id_uuid}")
 
-        # Convert asyncpg Row to dict and validate with TaskResponse
-        row_dict = dict(row)
-        task_response = TaskResponse.model_validate(row_dict)
-
         # Log successful retrieval
         logger.info(
             "task_retrieved",
             task_id=str(task_id_uuid),
-            user_id=user_id
+            user_id=user_id,
+            fields=request.fields
         )
 
-        # Return dict for CommandResponse wrapping
-        return task_response.model_dump(mode='json')
+        # Return TaskResponse dict (or the requested fields) for CommandResponse wrapping
+        return _serialize_task(row, request.fields)
 
     except HTTPException:
         # Re-raise HTTPException (404) without wrapping
@@ -290,7 +409,7 @@ async def get_task_handler(user_id: str, payload: dict, db: Any) -> dict:
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
-async def update_task_handler(user_id: str, payload: dict, db: Any) -> dict:
+async def update_task_handler(user_id: str, payload: Union[TaskUpdateRequest, dict], db: Any) -> dict:
     """
     Update task fields with partial update support.
     
@@ -300,9 +419,12 @@ async def update_task_handler(user_id: str, payload: dict, db: Any) -> dict:
     - Status = any other value → sets completed_at = NULL
     - Status not in payload → leaves completed_at unchanged
     
+    Every update also refreshes updated_at and takes a new sync_version so the
+    change is picked up by sync-tasks.
+    
     Args:
         user_id: External user ID from Cat House (for logging only)
-        payload: Task ID + optional update fields
+        payload: Task ID + optional update fields (TaskUpdateRequest)
             {task_id: uuid, title?, description?, status?, priority?, due_date?}
         db: asyncpg database connection from pool
     
@@ -318,54 +440,21 @@ async def update_task_handler(user_id: str, payload: dict, db: Any) -> dict:
         Input payload: {"task_id": "uuid", "status": "completed", "priority": "high"}
         Output: {updated task with completed_at timestamp set}
     """
-    # Extract and validate task_id
-    task_id = payload.get('task_id')
-
-    if not task_id:
-        logger.warning(
-            "validation_error",
-            user_id=user_id,
-            error="Missing required field: task_id"
-        )
-        raise HTTPException(status_code=400, detail="Missing required field: task_id")
-
+    # Validate task_id and update fields (already typed when routed by /execute)
     try:
-        task_id_uuid = UUID(task_id)
-    except (ValueError, TypeError):
-        logger.warning(
-            "validation_error",
-            user_id=user_id,
-            task_id=task_id,
-            error="Invalid UUID format"
-        )
-        raise HTTPException(status_code=400, detail="Invalid UUID format for task_id")
-
-    # Extract update fields (exclude task_id)
-    update_fields_dict = {k: v for k, v in payload.items() if k != 'task_id'}
-
-    # Validate update fields using TaskUpdate
-    try:
-        update_data = TaskUpdate(**update_fields_dict)
+        update_request = validate_payload(TaskUpdateRequest, payload)
     except ValidationError as e:
         logger.warning(
             "validation_error",
             user_id=user_id,
-            task_id=str(task_id_uuid),
             error=str(e)
         )
         raise HTTPException(status_code=400, detail=str(e))
 
-    # Get only non-None fields for partial update
-    update_dict = update_data.model_dump(exclude_none=True)
+    task_id_uuid = update_request.task_id
 
-    if not update_dict:
-        logger.warning(
-            "validation_error",
-            user_id=user_id,
-            task_id=str(task_id_uuid),
-            error="No fields provided for update"
-        )
-        raise HTTPException(status_code=400, detail="No fields provided for update")
+    # Get only non-None fields for partial update
+    update_dict = update_request.update_fields()
 
     # Build dynamic UPDATE query
     set_clauses = []
@@ -384,9 +473,20 @@ async def update_task_handler(user_id: str, payload: dict, db: Any) -> dict:
         else:
             set_clauses.append("completed_at = NULL")
 
-    # Build SQL with dynamic SET clause
+    # Bump change tracking so sync-tasks returns this task to other clients
+    # (task_sync_version() orders versions by transaction, see sync.py)
+    set_clauses.append("updated_at = NOW()")
+    set_clauses.append("sync_version = task_sync_version()")
+
+    # Build SQL with dynamic SET clause (and publish the change)
     set_clause = ", ".join(set_clauses)
-    sql = f"UPDATE tasks SET {set_clause} WHERE id = $1 RETURNING *"
+    sql = f"""
+        WITH updated AS (
+            UPDATE tasks SET {set_clause} WHERE id = $1 RETURNING *
+        )
+        SELECT updated.*, {task_change_notify_sql('updated', 'updated')} AS notified
+        FROM updated
+    """
 
     try:
         row = await db.fetchrow(sql, task_id_uuid, *values)
@@ -429,17 +529,17 @@ async def update_task_handler(user_id: str, payload: dict, db: Any) -> dict:
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
-async def delete_task_handler(user_id: str, payload: dict, db: Any) -> dict:
+async def delete_task_handler(user_id: str, payload: Union[TaskIdRequest, dict], db: Any) -> dict:
     """
     Delete a task by ID.
     
     Handler for 'delete-task' action. Permanently deletes task from database
-    without user ownership check (trusts Cat House authorization). Returns
-    success confirmation with deleted task ID.
+    without user ownership check (trusts Cat House authorization) and records
+    a tombstone for sync-tasks. Returns success confirmation with deleted task ID.
     
     Args:
         user_id: External user ID from Cat House (for logging only)
-        payload: Task identifier (task_id: uuid)
+        payload: Task identifier (TaskIdRequest: task_id)
         db: asyncpg database connection from pool
     
     Returns:
@@ -455,32 +555,31 @@ async def delete_task_handler(user_id: str, payload: dict, db: Any) -> dict:
         Input payload: {"task_id": "550e8400-e29b-41d4-a716-446655440000"}
         Output: {"success": true, "deleted_id": "550e8400-e29b-41d4-a716-446655440000"}
     """
-    # Extract task_id from payload
-    task_id = payload.get('task_id')
-
-    # Check if task_id is provided
-    if not task_id:
-        logger.warning(
-            "validation_error",
-            user_id=user_id,
-            error="Missing required field: task_id"
-        )
-        raise HTTPException(status_code=400, detail="Missing required field: task_id")
-
-    # Validate UUID format
+    # Validate task_id (already typed when routed by /execute)
     try:
-        task_id_uuid = UUID(task_id)
-    except (ValueError, TypeError):
+        task_id_uuid = validate_payload(TaskIdRequest, payload).task_id
+    except ValidationError as e:
         logger.warning(
             "validation_error",
             user_id=user_id,
-            task_id=task_id,
-            error="Invalid UUID format"
+            error=str(e)
         )
-        raise HTTPException(status_code=400, detail="Invalid UUID format for task_id")
+        raise HTTPException(status_code=400, detail=str(e))
 
-    # Delete task and return ID to confirm deletion
-    sql = "DELETE FROM tasks WHERE id = $1 RETURNING id"
+    # Delete task and record a tombstone in the same statement so sync-tasks
+    # can report the deletion to offline clients
+    sql = f"""
+        WITH deleted AS (
+            DELETE FROM tasks WHERE id = $1 RETURNING id, user_id
+        ), tombstone AS (
+            INSERT INTO task_tombstones (task_id, user_id)
+            SELECT id, user_id FROM deleted
+            RETURNING task_id, user_id, sync_version
+        )
+        SELECT tombstone.task_id AS id,
+               {task_change_notify_sql('tombstone', 'deleted', id_column='task_id')} AS notified
+        FROM tombstone
+    """
 
     try:
         row = await db.fetchrow(sql, task_id_uuid)
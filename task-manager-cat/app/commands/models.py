@@ -6,15 +6,35 @@ for Cat House Platform integration. All actions use these models for consistency
 and extensibility.
 
 Architecture:
-    - CommandRequest: Standardized input from Cat House
+    - CommandRequest: Standardized input from Cat House (generic dict payload)
+    - Typed commands (CreateTaskCommand, ...): Built-in actions with a typed payload
+    - Command: Discriminated union over action, parsed and validated by one
+      compiled validator; unknown or dynamically registered actions fall back
+      to CommandRequest
     - CommandResponse: Standardized output to Cat House
     - Single endpoint (POST /execute) routes to multiple action handlers
 """
 
 from datetime import datetime, timezone
-from typing import Dict, Optional
+from typing import Annotated, Any, Dict, Literal, Optional, Type, TypeVar, Union
 
-from pydantic import BaseModel, ConfigDict, Field, field_serializer
+from pydantic import BaseModel, ConfigDict, Discriminator, Field, RootModel, Tag, field_serializer
+
+from app.models.task import (
+    TaskCreate,
+    TaskGetRequest,
+    TaskIdRequest,
+    TaskListRequest,
+    TaskStatsBulkRequest,
+    TaskStatsRequest,
+    TaskSyncRequest,
+    TaskUpdateRequest,
+)
+
+PayloadModel = TypeVar("PayloadModel", bound=BaseModel)
+
+# Discriminator tag of actions without a typed command model
+GENERIC_COMMAND = "generic"
 
 
 class CommandRequest(BaseModel):
@@ -97,12 +117,161 @@ class CommandRequest(BaseModel):
                     "action": "get-stats",
                     "user_id": "user_789",
                     "payload": {}
+                },
+                {
+                    "action": "get-stats-bulk",
+                    "user_id": "admin_1",
+                    "payload": {
+                        "user_ids": ["user_123", "user_456", "user_789"]
+                    }
+                },
+                {
+                    "action": "sync-tasks",
+                    "user_id": "user_123",
+                    "payload": {
+                        "cursor": 1042
+                    }
                 }
             ]
         }
     )
 
 
+class TypedCommand(BaseModel):
+    """Envelope fields shared by the typed commands of built-in actions."""
+    user_id: str = Field(..., min_length=1, description="User ID from Cat House")
+
+
+class CreateTaskCommand(TypedCommand):
+    """create-task command."""
+    action: Literal["create-task"]
+    payload: TaskCreate
+
+
+class ListTasksCommand(TypedCommand):
+    """list-tasks command."""
+    action: Literal["list-tasks"]
+    payload: TaskListRequest = Field(default_factory=lambda: TaskListRequest.model_validate({}))
+
+
+class GetTaskCommand(TypedCommand):
+    """get-task command."""
+    action: Literal["get-task"]
+    payload: TaskGetRequest
+
+
+class UpdateTaskCommand(TypedCommand):
+    """update-task command."""
+    action: Literal["update-task"]
+    payload: TaskUpdateRequest
+
+
+class DeleteTaskCommand(TypedCommand):
+    """delete-task command."""
+    action: Literal["delete-task"]
+    payload: TaskIdRequest
+
+
+class GetStatsCommand(TypedCommand):
+    """get-stats command."""
+    action: Literal["get-stats"]
+    payload: TaskStatsRequest = Field(default_factory=TaskStatsRequest)
+
+
+class GetStatsBulkCommand(TypedCommand):
+    """get-stats-bulk command."""
+    action: Literal["get-stats-bulk"]
+    payload: TaskStatsBulkRequest
+
+
+class SyncTasksCommand(TypedCommand):
+    """sync-tasks command."""
+    action: Literal["sync-tasks"]
+    payload: TaskSyncRequest = Field(default_factory=lambda: TaskSyncRequest.model_validate({}))
+
+
+# Action name -> typed command model
+TYPED_COMMANDS: Dict[str, Type[TypedCommand]] = {
+    "create-task": CreateTaskCommand,
+    "list-tasks": ListTasksCommand,
+    "get-task": GetTaskCommand,
+    "update-task": UpdateTaskCommand,
+    "delete-task": DeleteTaskCommand,
+    "get-stats": GetStatsCommand,
+    "get-stats-bulk": GetStatsBulkCommand,
+    "sync-tasks": SyncTasksCommand,
+}
+
+AnyCommand = Union[
+    CreateTaskCommand,
+    ListTasksCommand,
+    GetTaskCommand,
+    UpdateTaskCommand,
+    DeleteTaskCommand,
+    GetStatsCommand,
+    GetStatsBulkCommand,
+    SyncTasksCommand,
+    CommandRequest,
+]
+
+
+def command_tag(value: Any) -> str:
+    """Select the command model from the action (typed model or generic fallback)."""
+    action = value.get("action") if isinstance(value, dict) else getattr(value, "action", None)
+    return action if action in TYPED_COMMANDS else GENERIC_COMMAND
+
+
+class Command(RootModel[Annotated[
+    Union[
+        Annotated[CreateTaskCommand, Tag("create-task")],
+        Annotated[ListTasksCommand, Tag("list-tasks")],
+        Annotated[GetTaskCommand, Tag("get-task")],
+        Annotated[UpdateTaskCommand, Tag("update-task")],
+        Annotated[DeleteTaskCommand, Tag("delete-task")],
+        Annotated[GetStatsCommand, Tag("get-stats")],
+        Annotated[GetStatsBulkCommand, Tag("get-stats-bulk")],
+        Annotated[SyncTasksCommand, Tag("sync-tasks")],
+        Annotated[CommandRequest, Tag(GENERIC_COMMAND)],
+    ],
+    Discriminator(command_tag)
+]]):
+    """
+    POST /execute request body.
+    
+    The action selects the model, so the envelope and the action's payload
+    are validated in one pass and handlers receive typed payloads. Validation
+    errors are reported with locations like ["body", "<action>", "payload", "title"].
+    """
+
+
+def command_payload(command: AnyCommand) -> dict:
+    """
+    Return a command's payload as sent by the client (JSON types).
+    
+    Typed payloads are dumped without defaults, so a typed command and the
+    equivalent CommandRequest produce the same dict (idempotency fingerprints
+    and cache keys do not depend on the parsing model).
+    """
+    if isinstance(command.payload, BaseModel):
+        return command.payload.model_dump(mode="json", exclude_unset=True)
+    return command.payload
+
+
+def validate_payload(model: Type[PayloadModel], payload: Union[PayloadModel, dict]) -> PayloadModel:
+    """
+    Return a typed handler payload.
+    
+    Payloads parsed by /execute are already typed and returned unchanged;
+    dicts (handlers called directly) are validated here.
+    
+    Raises:
+        ValidationError: Invalid dict payload
+    """
+    if isinstance(payload, model):
+        return payload
+    return model.model_validate(payload)
+
+
 class CommandResponse(BaseModel):
     """
     Standardized response format for all command executions.
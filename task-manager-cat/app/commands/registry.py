@@ -0,0 +1,164 @@
+"""
+Action registry for the Universal Command Pattern.
+
+Each /execute action is registered with its handler and the metadata the
+router uses to run it:
+
+    - read_only: Never writes
+    - replica_ok: Read-only action that tolerates replication lag; served
+      from the read replica when DATABASE_REPLICA_URL is configured (other
+      reads stay on the primary so clients read their own writes)
+    - admin_only: Only callers whose service key is listed in
+      ADMIN_SERVICE_KEYS may run it (e.g. cross-user reports); end-user
+      commands relayed by the Cat House proxy are rejected with 403
+    - idempotent: Write whose responses are stored and replayed for retries
+      sent with an Idempotency-Key header
+    - cost_class: COST_CHEAP (single-row / indexed lookups) or COST_EXPENSIVE
+      (scans and aggregates)
+    - statement_timeout_ms: PostgreSQL statement_timeout applied (SET LOCAL)
+      while the handler runs; exceeding it returns 504
+    - cache_ttl_seconds: Responses of read-only actions are cached per user
+      for this long (0 disables caching)
+
+Registering an action:
+    >>> registry = ActionRegistry()
+    >>> registry.register("get-task", get_task_handler, read_only=True, statement_timeout_ms=200)
+    ActionSpec(name='get-task', ...)
+"""
+
+from collections.abc import Awaitable, Iterator, MutableMapping
+from dataclasses import dataclass, replace
+from typing import Any, Callable, Optional
+
+# Type alias for command handler functions
+# (payload is the action's typed payload model, or a dict for untyped actions)
+CommandHandler = Callable[[str, Any, Any], Awaitable[dict]]
+
+# Cost classes
+COST_CHEAP = "cheap"
+COST_EXPENSIVE = "expensive"
+
+# Defaults for actions registered without metadata
+DEFAULT_STATEMENT_TIMEOUT_MS = 1000
+
+
+@dataclass(frozen=True)
+class ActionSpec:
+    """Handler and execution metadata of one /execute action."""
+
+    name: str
+    handler: CommandHandler
+    read_only: bool = False
+    replica_ok: bool = False
+    admin_only: bool = False
+    idempotent: bool = False
+    cost_class: str = COST_CHEAP
+    statement_timeout_ms: int = DEFAULT_STATEMENT_TIMEOUT_MS
+    cache_ttl_seconds: float = 0
+
+    def __post_init__(self) -> None:
+        if self.cost_class not in (COST_CHEAP, COST_EXPENSIVE):
+            raise ValueError(f"Unknown cost class for {self.name}: {self.cost_class}")
+        if self.statement_timeout_ms <= 0:
+            raise ValueError(f"statement_timeout_ms must be positive for {self.name}")
+        if self.idempotent and self.read_only:
+            raise ValueError(f"Read-only action {self.name} cannot be idempotent (nothing to replay)")
+        if self.replica_ok and not self.read_only:
+            raise ValueError(f"Only read-only actions can run on the replica: {self.name}")
+        if self.cache_ttl_seconds and not self.read_only:
+            raise ValueError(f"Only read-only actions can be cached: {self.name}")
+
+    @property
+    def cacheable(self) -> bool:
+        """Whether responses may be served from the command cache."""
+        return self.cache_ttl_seconds > 0
+
+
+class ActionRegistry:
+    """Registry mapping action names to ActionSpec."""
+
+    def __init__(self) -> None:
+        self._specs: dict[str, ActionSpec] = {}
+
+    def register(self, name: str, handler: CommandHandler, **metadata: Any) -> ActionSpec:
+        """
+        Register (or replace) an action.
+
+        Args:
+            name: Action name sent in CommandRequest.action
+            handler: async def handler(user_id, payload, db) -> dict
+            **metadata: ActionSpec fields (read_only, replica_ok, admin_only,
+                idempotent, cost_class, statement_timeout_ms, cache_ttl_seconds)
+
+        Returns:
+            ActionSpec: Registered specification
+        """
+        spec = ActionSpec(name=name, handler=handler, **metadata)
+        self._specs[name] = spec
+        return spec
+
+    def replace_handler(self, name: str, handler: CommandHandler) -> ActionSpec:
+        """
+        Swap the handler of a registered action, keeping its metadata.
+
+        Raises:
+            KeyError: If the action is not registered
+        """
+        spec = replace(self._specs[name], handler=handler)
+        self._specs[name] = spec
+        return spec
+
+    def unregister(self, name: str) -> None:
+        """Remove an action."""
+        del self._specs[name]
+
+    def get(self, name: str) -> Optional[ActionSpec]:
+        """Return the spec of an action, or None if it is unknown."""
+        return self._specs.get(name)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._specs
+
+    def __iter__(self) -> Iterator[ActionSpec]:
+        return iter(self._specs.values())
+
+    def __len__(self) -> int:
+        return len(self._specs)
+
+    @property
+    def handlers(self) -> "HandlerView":
+        """Mutable name -> handler view (ACTION_HANDLERS compatibility)."""
+        return HandlerView(self)
+
+
+class HandlerView(MutableMapping):
+    """
+    Name -> handler mapping backed by an ActionRegistry.
+
+    Assigning a handler to an existing action keeps its metadata; new actions
+    get default metadata (write, cheap, DEFAULT_STATEMENT_TIMEOUT_MS, not cached).
+    """
+
+    def __init__(self, registry: ActionRegistry) -> None:
+        self._registry = registry
+
+    def __getitem__(self, name: str) -> CommandHandler:
+        spec = self._registry.get(name)
+        if spec is None:
+            raise KeyError(name)
+        return spec.handler
+
+    def __setitem__(self, name: str, handler: CommandHandler) -> None:
+        if name in self._registry:
+            self._registry.replace_handler(name, handler)
+        else:
+            self._registry.register(name, handler)
+
+    def __delitem__(self, name: str) -> None:
+        self._registry.unregister(name)
+
+    def __iter__(self) -> Iterator[str]:
+        return (spec.name for spec in self._registry)
+
+    def __len__(self) -> int:
+        return len(self._registry)
@@ -5,19 +5,31 @@ Routes standardized command requests to appropriate action handlers.
 Single endpoint (POST /execute) dispatches to multiple handlers based on action name.
 
 Architecture:
-    - ACTION_HANDLERS: Registry mapping action names to handler functions
+    - ACTION_REGISTRY: Maps action names to handlers and execution metadata
+      (read-only, idempotent, cost class, timeout, cache TTL)
+    - ACTION_HANDLERS: Mutable name -> handler view of ACTION_REGISTRY
+    - Command: Request body parsed into the action's typed command in one pass
+      (app/commands/models.py); CommandRoute turns payload errors into 400
     - execute_command: POST /execute endpoint with authentication and routing
     - Handlers added in Epic 3.3/3.4 (create-task, list-tasks, etc.)
 """
 
-from collections.abc import Awaitable
-from typing import Any, Callable
+import asyncio
+from collections.abc import AsyncIterator, Callable, Coroutine, Sequence
+from contextlib import asynccontextmanager
+from typing import Any, Optional, TypeVar
 
+import asyncpg
 import structlog
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response, status
+from fastapi.exceptions import RequestValidationError
+from fastapi.routing import APIRoute
 
+from app.admission import get_admission_policy, get_pool_wait_tracker, overloaded
 from app.auth import validate_service_key
-from app.commands.handlers.stats import get_stats_handler
+from app.commands.cache import cache_key, get_command_cache
+from app.commands.handlers.stats import get_stats_bulk_handler, get_stats_handler
+from app.commands.handlers.sync import sync_tasks_handler
 from app.commands.handlers.tasks import (
     create_task_handler,
     delete_task_handler,
@@ -25,31 +37,274 @@ from app.commands.handlers.tasks import (
     list_tasks_handler,
     update_task_handler,
 )
-from app.commands.models import CommandRequest, CommandResponse
-from app.database import get_db
-
-# Type alias for command handler functions
-CommandHandler = Callable[[str, dict, Any], Awaitable[dict]]
+from app.commands.models import AnyCommand, Command, CommandResponse, command_payload
+from app.commands.registry import COST_EXPENSIVE, ActionRegistry, ActionSpec
+from app.config import settings
+from app.database import acquire_connection, get_db_pool, get_replica_pool, statement_timeout
+from app.idempotency import (
+    IdempotencyClaim,
+    claim_idempotency_key,
+    release_idempotency_key,
+    request_fingerprint,
+    store_idempotent_response,
+)
+from app.metrics import (
+    command_cache_lookups_total,
+    command_timeouts_total,
+    commands_cancelled_total,
+)
+from app.tracing import set_span_attributes, span, traced
 
 logger = structlog.get_logger()
 
+
+def is_payload_error(error: dict) -> bool:
+    """Whether a request validation error is inside the command payload."""
+    loc = error.get("loc", ())
+    return len(loc) >= 3 and loc[0] == "body" and loc[2] == "payload"
+
+
+def payload_error_detail(errors: Sequence[Any]) -> str:
+    """Format payload validation errors as one readable message."""
+    messages = []
+    for error in errors:
+        field = ".".join(str(part) for part in error["loc"][3:]) or "payload"
+        messages.append(f"{field}: {error['msg'].removeprefix('Value error, ')}")
+    return "; ".join(messages)
+
+
+class CommandRoute(APIRoute):
+    """
+    Route class for /execute.
+
+    The body is validated by FastAPI against Command. Errors only in the
+    payload of a well-formed command are returned as 400 with a string detail
+    (as handlers did when they validated payloads themselves); envelope
+    errors (missing action or user_id) keep FastAPI's 422 response.
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        route_handler = super().get_route_handler()
+
+        async def command_route_handler(request: Request) -> Response:
+            try:
+                return await route_handler(request)
+            except RequestValidationError as e:
+                errors = e.errors()
+                if not errors or not all(is_payload_error(error) for error in errors):
+                    raise
+                detail = payload_error_detail(errors)
+                logger.warning("validation_error", action=errors[0]["loc"][1], error=detail)
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=detail) from e
+
+        return command_route_handler
+
+
 # Create FastAPI router (no prefix - endpoint becomes /execute)
-router = APIRouter(tags=["Commands"])
-
-# Handler registry - maps action names to handler functions
-# Handlers added in Epic 3.3/3.4 (task CRUD) and Epic 4.2 (statistics)
-# Handler signature: async def handler(user_id: str, payload: dict, db: Any) -> dict
-ACTION_HANDLERS: dict[str, CommandHandler] = {
-    "create-task": create_task_handler,
-    "list-tasks": list_tasks_handler,
-    "get-task": get_task_handler,
-    "update-task": update_task_handler,
-    "delete-task": delete_task_handler,
-    "get-stats": get_stats_handler,
-}
-
-
-@router.post("/execute", response_model=CommandResponse, responses={
+router = APIRouter(tags=["Commands"], route_class=CommandRoute)
+
+# Action registry - maps action names to handlers and execution metadata
+# Handlers added in Epic 3.3/3.4 (task CRUD), Epic 4.2 (statistics) and delta sync
+# Handler signature: async def handler(user_id: str, payload: Model | dict, db: Any) -> dict
+# (built-in actions receive the typed payload of their command in app/commands/models.py)
+ACTION_REGISTRY = ActionRegistry()
+ACTION_REGISTRY.register("create-task", create_task_handler, idempotent=True, statement_timeout_ms=1000)
+ACTION_REGISTRY.register(
+    "list-tasks", list_tasks_handler, read_only=True, cost_class=COST_EXPENSIVE, statement_timeout_ms=2000
+)
+ACTION_REGISTRY.register("get-task", get_task_handler, read_only=True, statement_timeout_ms=200)
+ACTION_REGISTRY.register("update-task", update_task_handler, idempotent=True, statement_timeout_ms=1000)
+ACTION_REGISTRY.register("delete-task", delete_task_handler, idempotent=True, statement_timeout_ms=1000)
+ACTION_REGISTRY.register(
+    "get-stats", get_stats_handler, read_only=True, replica_ok=True, cost_class=COST_EXPENSIVE,
+    statement_timeout_ms=2000, cache_ttl_seconds=5
+)
+# Multi-user results are not cached: writes only invalidate the writer's entries.
+# Admin only: the payload names other users, and the Cat House proxy relays
+# end-user payloads unchanged
+ACTION_REGISTRY.register(
+    "get-stats-bulk", get_stats_bulk_handler, read_only=True, replica_ok=True, admin_only=True,
+    cost_class=COST_EXPENSIVE, statement_timeout_ms=3000
+)
+ACTION_REGISTRY.register(
+    "sync-tasks", sync_tasks_handler, read_only=True, cost_class=COST_EXPENSIVE, statement_timeout_ms=2000
+)
+
+# Name -> handler view (assigning keeps the action's metadata)
+ACTION_HANDLERS = ACTION_REGISTRY.handlers
+
+# Client-side margin over statement_timeout_ms before an action is abandoned
+# (PostgreSQL normally cancels the statement first)
+ACTION_TIMEOUT_GRACE_SECONDS = 1.0
+
+# Status logged for commands abandoned by the client (nginx convention)
+CLIENT_CLOSED_REQUEST = 499
+
+
+class ClientDisconnectedError(Exception):
+    """The HTTP client disconnected before the command finished."""
+
+
+def uses_replica(spec: ActionSpec) -> bool:
+    """Whether an action runs on the read replica instead of the primary."""
+    return spec.replica_ok and bool(settings.database_replica_url)
+
+
+@asynccontextmanager
+async def action_connection(spec: ActionSpec, db: Any) -> AsyncIterator[Any]:
+    """
+    Provide the connection an action runs on.
+
+    replica_ok actions use the read replica when DATABASE_REPLICA_URL is set
+    (db is None for them, see get_command_db); everything else, including
+    reads that must see the caller's own writes, runs on the request's
+    primary connection.
+    """
+    if uses_replica(spec):
+        async with acquire_connection(await get_replica_pool()) as connection:
+            yield connection
+    else:
+        yield db
+
+
+async def run_action(
+    spec: ActionSpec,
+    command: AnyCommand,
+    db: Any,
+    claim: Optional[IdempotencyClaim] = None
+) -> CommandResponse:
+    """
+    Run an action's handler under its statement_timeout.
+
+    The handler runs in a transaction with SET LOCAL statement_timeout, so
+    PostgreSQL cancels any statement exceeding spec.statement_timeout_ms.
+    With an Idempotency-Key claim, the response is stored in the same
+    transaction, so the write never commits without its replay record.
+    """
+    async with action_connection(spec, db) as connection:
+        async with asyncio.timeout(spec.statement_timeout_ms / 1000 + ACTION_TIMEOUT_GRACE_SECONDS):
+            async with statement_timeout(connection, spec.statement_timeout_ms):
+                with span(f"handler {command.action}", {"command.action": command.action}):
+                    result = await spec.handler(command.user_id, command.payload, connection)
+                command_response = CommandResponse(success=True, data=result, error=None)
+                if claim is not None:
+                    await store_idempotent_response(connection, claim, command_response)
+                return command_response
+
+
+async def wait_for_disconnect(request: Request) -> None:
+    """Return once the client disconnects (the request body is already read)."""
+    while True:
+        message = await request.receive()
+        if message["type"] == "http.disconnect":
+            return
+
+
+T = TypeVar("T")
+
+
+async def run_until_disconnect(request: Request, coroutine: Coroutine[Any, Any, T]) -> T:
+    """
+    Await a coroutine, cancelling it if the client disconnects first.
+
+    Cancellation reaches the in-flight asyncpg query, which asyncpg cancels on
+    the server, so abandoned commands stop holding pool connections.
+
+    Raises:
+        ClientDisconnectedError: The client went away and the coroutine was cancelled
+    """
+    task = asyncio.ensure_future(coroutine)
+    watcher = asyncio.ensure_future(wait_for_disconnect(request))
+    try:
+        await asyncio.wait({task, watcher}, return_when=asyncio.FIRST_COMPLETED)
+    except asyncio.CancelledError:
+        task.cancel()
+        raise
+    finally:
+        watcher.cancel()
+
+    if not task.done():
+        task.cancel()
+        # Wait for the rollback so the connection is clean before release
+        await asyncio.gather(task, return_exceptions=True)
+        raise ClientDisconnectedError()
+    return task.result()
+
+
+def statement_timed_out(error: BaseException) -> bool:
+    """Whether an error was caused by a timeout, even when a handler wrapped it."""
+    current: Optional[BaseException] = error
+    while current is not None:
+        if isinstance(current, (TimeoutError, asyncpg.QueryCanceledError)):
+            return True
+        current = current.__cause__ or current.__context__
+    return False
+
+
+async def requested_action(request: Request) -> tuple[Optional[str], Optional[ActionSpec]]:
+    """Action name and registry spec of an /execute body, read before validation."""
+    try:
+        # Parsed once by FastAPI for CommandRequest; Starlette caches it
+        body = await request.json()
+    except ValueError:
+        return None, None
+    action = body.get("action") if isinstance(body, dict) else None
+    if not isinstance(action, str):
+        return None, None
+    return action, ACTION_REGISTRY.get(action)
+
+
+async def admit_command(request: Request) -> None:
+    """
+    Shed /execute requests while the database pool is saturated.
+
+    Runs before any other dependency, so rejected requests never wait for a
+    connection. Expensive reads are shed at the lower ADMISSION_EXPENSIVE_*
+    thresholds; writes, cheap reads and unknown actions at ADMISSION_MAX_*.
+
+    Raises:
+        HTTPException(503): Pool wait time or waiters above the action's threshold
+    """
+    if not settings.admission_enabled:
+        return
+
+    action, spec = await requested_action(request)
+    shed_first = spec is not None and spec.read_only and spec.cost_class == COST_EXPENSIVE
+
+    tracker = get_pool_wait_tracker()
+    wait_seconds = tracker.wait_seconds()
+    reason = get_admission_policy().check(wait_seconds, tracker.waiters, shed_first)
+    if reason is not None:
+        logger.warning(
+            "command_shed",
+            action=action,
+            reason=reason,
+            pool_wait_ms=round(wait_seconds * 1000, 1),
+            pool_waiters=tracker.waiters
+        )
+        raise overloaded(spec.name if spec is not None else "unknown", reason)
+
+
+async def get_command_db(request: Request) -> AsyncIterator[Any]:
+    """
+    Primary connection of an /execute request.
+
+    Yields None for actions served from the read replica (uses_replica), so
+    they hold no primary connection while they run.
+
+    Raises:
+        HTTPException(503): No primary connection became available in time
+    """
+    _, spec = await requested_action(request)
+    if spec is not None and uses_replica(spec):
+        yield None
+        return
+
+    async with acquire_connection(await get_db_pool()) as connection:
+        yield connection
+
+
+@router.post("/execute", response_model=CommandResponse, dependencies=[Depends(admit_command)], responses={
     200: {
         "description": "Command executed successfully",
         "content": {
@@ -74,13 +329,29 @@ ACTION_HANDLERS: dict[str, CommandHandler] = {
         }
     },
     400: {
-        "description": "Unknown action or invalid payload",
+        "description": "Invalid payload for the action",
+        "content": {
+            "application/json": {
+                "example": {"detail": "title: Field required"}
+            }
+        }
+    },
+    404: {
+        "description": "Unknown action",
         "content": {
             "application/json": {
                 "example": {"detail": "Unknown action: invalid-action"}
             }
         }
     },
+    409: {
+        "description": "A request with the same Idempotency-Key is still in progress",
+        "content": {
+            "application/json": {
+                "example": {"detail": "A request with this Idempotency-Key is already in progress"}
+            }
+        }
+    },
     401: {
         "description": "Invalid or missing service key",
         "content": {
@@ -89,8 +360,32 @@ ACTION_HANDLERS: dict[str, CommandHandler] = {
             }
         }
     },
+    403: {
+        "description": "Admin-only action called without an admin service key",
+        "content": {
+            "application/json": {
+                "example": {"detail": "Action get-stats-bulk requires an admin service key"}
+            }
+        }
+    },
+    503: {
+        "description": "Database pool saturated; retry after the Retry-After delay",
+        "content": {
+            "application/json": {
+                "example": {"detail": "Service overloaded, retry later"}
+            }
+        }
+    },
+    504: {
+        "description": "The action exceeded its timeout",
+        "content": {
+            "application/json": {
+                "example": {"detail": "Command get-stats exceeded its 5000 ms timeout"}
+            }
+        }
+    },
     422: {
-        "description": "Validation error in request body",
+        "description": "Invalid command envelope (missing or empty action / user_id)",
         "content": {
             "application/json": {
                 "example": {
@@ -106,10 +401,20 @@ ACTION_HANDLERS: dict[str, CommandHandler] = {
         }
     }
 })
+@traced("execute_command")
 async def execute_command(
-    command: CommandRequest,
+    body: Command,
+    request: Request,
+    response: Response,
     key_name: str = Depends(validate_service_key),
-    db: Any = Depends(get_db)
+    db: Any = Depends(get_command_db),
+    idempotency_key: Optional[str] = Header(
+        None,
+        alias="Idempotency-Key",
+        min_length=1,
+        max_length=255,
+        description="Replay-safe retries for create-task, update-task and delete-task"
+    )
 ) -> CommandResponse:
     """
     Universal command router implementing Command Pattern for all task operations.
@@ -124,6 +429,10 @@ async def execute_command(
     - **user_id**: User identifier from Cat House JWT token
     - **payload**: Action-specific parameters (varies by action)
     
+    The body is parsed in one pass: the action selects a typed command model,
+    so each action's payload has its own schema and handlers receive typed
+    payloads. Invalid payloads are rejected with 400 before any handler runs.
+    
     ## Available Command Actions
     
     ### create-task
@@ -158,9 +467,15 @@ async def execute_command(
     
     **Payload Fields:**
     - `status` (string, optional): Filter by status (pending | in_progress | completed)
-    - `priority` (string, optional): Filter by priority (low | medium | high | urgent)
+    - `sort` (string, optional): created_at (newest first, default) | priority (urgent first,
+      tasks without priority last)
+    - `fields` (array, optional): TaskResponse fields to return, e.g. ["id", "title", "status"]
+      (only these columns are selected; default: all fields)
+    - `mode` (string, optional): count | exists | ids - return only `{"count"}`, `{"exists"}`
+      or `{"ids", "count"}` for the filtered tasks (index-only; not combinable with fields)
     
-    **Response Data:** Array of TaskResponse objects
+    **Response Data:** Array of TaskResponse objects (or the requested fields only), or the
+    mode summary
     
     **Example:**
     ```json
@@ -176,8 +491,9 @@ async def execute_command(
     
     **Payload Fields:**
     - `task_id` (string, required): UUID of the task to retrieve
+    - `fields` (array, optional): TaskResponse fields to return (default: all fields)
     
-    **Response Data:** TaskResponse object
+    **Response Data:** TaskResponse object (or the requested fields only)
     
     **Example:**
     ```json
@@ -252,11 +568,63 @@ async def execute_command(
     }
     ```
     
+    ### get-stats-bulk
+    Retrieve task statistics for many users with one grouped query (admin and
+    leaderboard views), instead of one get-stats call per user. Admin only:
+    the service key must be listed in `ADMIN_SERVICE_KEYS` (403 otherwise).
+    
+    **Payload Fields:**
+    - `user_ids` (array of strings, required): Users to report on (1-1000, duplicates ignored)
+    
+    **Response Data:**
+    - `stats` (object): user_id -> statistics object (same fields as get-stats);
+      users without tasks get zero counts
+    - `count` (int): Number of users in `stats`
+    
+    **Example:**
+    ```json
+    {
+        "action": "get-stats-bulk",
+        "user_id": "admin_1",
+        "payload": {"user_ids": ["user_123", "user_456"]}
+    }
+    ```
+    
+    ### sync-tasks
+    Retrieve only the tasks created, updated or deleted since a cursor (offline resync).
+    
+    **Payload Fields:**
+    - `cursor` (int, optional): Cursor returned by the previous sync-tasks call (default: 0 = full sync)
+    - `limit` (int, optional): Maximum number of changes per page (1-1000, default: 500)
+    
+    **Response Data:**
+    - `tasks` (array): TaskResponse objects created or updated since the cursor
+    - `deleted_ids` (array): IDs of tasks deleted since the cursor
+    - `cursor` (int): Cursor to send on the next sync-tasks call
+    - `has_more` (bool): True if more changes are available (call again with the new cursor)
+    
+    **Example:**
+    ```json
+    {
+        "action": "sync-tasks",
+        "user_id": "user_123",
+        "payload": {"cursor": 1042}
+    }
+    ```
+    
     ## Authentication
     
     All requests require a valid service API key in the `X-Service-Key` header.
     Keys are issued by Cat House administrators via `/admin/service-keys` endpoint.
     
+    ## Idempotent Retries
+    
+    Write actions (`create-task`, `update-task`, `delete-task`) accept an optional
+    `Idempotency-Key` header. The first successful response is stored for
+    `IDEMPOTENCY_TTL_SECONDS` (default 24h); retries with the same key return the
+    stored response with an `Idempotent-Replayed: true` header instead of running
+    the action again. Failed requests are not stored and can be retried.
+    
     ## Response Format
     
     All responses follow the CommandResponse structure:
@@ -267,24 +635,41 @@ async def execute_command(
     
     ## Error Handling
     
-    - **400 Bad Request**: Unknown action or invalid payload structure
+    - **400 Bad Request**: Invalid payload for the action (detail names the field)
     - **401 Unauthorized**: Missing or invalid X-Service-Key header
-    - **404 Not Found**: Resource not found (task doesn't exist or belongs to different user)
-    - **422 Unprocessable Entity**: Validation errors in request body
+    - **403 Forbidden**: Admin-only action called without an admin service key
+    - **404 Not Found**: Unknown action, or resource not found (task doesn't exist or belongs to different user)
+    - **409 Conflict**: A request with the same Idempotency-Key is still in progress
+    - **503 Service Unavailable**: Database pool saturated (load shedding); retry
+      after the `Retry-After` delay. Expensive reads are shed before writes and cheap reads
+    - **504 Gateway Timeout**: The action exceeded its registered timeout
+    - **422 Unprocessable Entity**: Invalid command envelope (action, user_id), or Idempotency-Key
+      reused with a different request
     
     Args:
-        command: CommandRequest with action, user_id, and payload
+        body: Command (typed command for built-in actions, CommandRequest otherwise)
+        request: Incoming request (watched for client disconnects)
+        response: Outgoing response (used to flag replayed responses)
         key_name: Validated service key name (from validate_service_key dependency)
-        db: Database connection pool (from get_db dependency)
+        db: Primary database connection (from get_command_db; None for replica actions)
+        idempotency_key: Optional Idempotency-Key header for write actions
     
     Returns:
         CommandResponse with success flag, data, and timestamp
     
     Raises:
+        HTTPException(400): Invalid payload for the action (raised by CommandRoute)
         HTTPException(401): Invalid service key (raised by validate_service_key)
-        HTTPException(404): Unknown action (not in ACTION_HANDLERS)
+        HTTPException(403): Admin-only action called with a non-admin service key
+        HTTPException(404): Unknown action (not in ACTION_REGISTRY)
+        HTTPException(503): Request shed under pool pressure (raised by admit_command / get_command_db)
+        HTTPException(504): Action exceeded its registered statement_timeout_ms
+        HTTPException(499): Client disconnected; the handler and its query were cancelled
         HTTPException(500): Handler execution error (wrapped in CommandResponse)
     """
+    command = body.root
+    set_span_attributes(**{"command.action": command.action, "command.user_id": command.user_id})
+
     # Log command received
     logger.info(
         "command_received",
@@ -294,7 +679,8 @@ async def execute_command(
     )
 
     # Check if action exists
-    if command.action not in ACTION_HANDLERS:
+    spec = ACTION_REGISTRY.get(command.action)
+    if spec is None:
         logger.warning(
             "unknown_action",
             action=command.action,
@@ -306,25 +692,101 @@ async def execute_command(
             detail=f"Unknown action: {command.action}"
         )
 
+    # Cross-user actions are limited to admin service keys
+    if spec.admin_only and key_name not in settings.get_admin_service_keys():
+        logger.warning(
+            "admin_action_forbidden",
+            action=command.action,
+            user_id=command.user_id,
+            key_name=key_name
+        )
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=f"Action {command.action} requires an admin service key"
+        )
+
+    # Replay stored response for retried write commands
+    claim: Optional[IdempotencyClaim] = None
+    if idempotency_key is not None and spec.idempotent:
+        outcome = await claim_idempotency_key(
+            db, key_name, idempotency_key, request_fingerprint(command)
+        )
+        if isinstance(outcome, IdempotencyClaim):
+            claim = outcome
+        else:
+            logger.info(
+                "command_replayed",
+                action=command.action,
+                user_id=command.user_id,
+                key_name=key_name,
+                idempotency_key=idempotency_key
+            )
+            response.headers["Idempotent-Replayed"] = "true"
+            return outcome
+
+    # Serve cacheable reads from the per-process command cache
+    cache_lookup_key = None
+    if spec.cacheable and settings.command_cache_enabled:
+        cache_lookup_key = cache_key(command.user_id, command.action, command_payload(command))
+        cached = get_command_cache().get(cache_lookup_key)
+        command_cache_lookups_total.labels(action=command.action, result="miss" if cached is None else "hit").inc()
+        if cached is not None:
+            logger.info(
+                "command_cache_hit",
+                action=command.action,
+                user_id=command.user_id,
+                key_name=key_name
+            )
+            return CommandResponse(success=True, data=cached, error=None)
+
     # Route to handler
     try:
-        handler = ACTION_HANDLERS[command.action]
-        result = await handler(command.user_id, command.payload, db)
+        command_response = await run_until_disconnect(request, run_action(spec, command, db, claim))
 
         logger.info(
             "command_success",
             action=command.action,
             user_id=command.user_id,
-            key_name=key_name
+            key_name=key_name,
+            cost_class=spec.cost_class
         )
 
-        return CommandResponse(success=True, data=result, error=None)
-
-    except HTTPException:
-        # Re-raise HTTP exceptions (handler validation errors)
-        raise
+    except ClientDisconnectedError:
+        logger.info(
+            "command_cancelled",
+            action=command.action,
+            user_id=command.user_id,
+            key_name=key_name,
+            reason="client_disconnected"
+        )
+        commands_cancelled_total.labels(action=command.action).inc()
+        if claim is not None:
+            # No-op if the transaction committed: its response was stored with it
+            await release_idempotency_key(db, claim)
+        raise HTTPException(status_code=CLIENT_CLOSED_REQUEST, detail="Client closed request")
 
     except Exception as e:
+        if claim is not None:
+            await release_idempotency_key(db, claim)
+
+        if statement_timed_out(e):
+            logger.warning(
+                "command_timeout",
+                action=command.action,
+                user_id=command.user_id,
+                key_name=key_name,
+                statement_timeout_ms=spec.statement_timeout_ms
+            )
+            command_timeouts_total.labels(action=command.action).inc()
+            raise HTTPException(
+                status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+                detail=f"Command {command.action} exceeded its {spec.statement_timeout_ms} ms timeout"
+            ) from e
+
+        if isinstance(e, HTTPException):
+            # Re-raise HTTP exceptions (handler validation errors)
+            raise
+
         logger.error(
             "command_failed",
             action=command.action,
@@ -333,3 +795,11 @@ async def execute_command(
             error=str(e)
         )
         return CommandResponse(success=False, data=None, error=str(e))
+
+    if cache_lookup_key is not None:
+        get_command_cache().set(cache_lookup_key, command_response.data, spec.cache_ttl_seconds)
+    elif not spec.read_only:
+        # Writes make this user's cached reads stale
+        get_command_cache().invalidate_user(command.user_id)
+
+    return command_response
@@ -0,0 +1,213 @@
+"""
+Task Manager API - Response Compression
+
+ASGI middleware compressing responses with brotli or gzip, negotiated from
+the client's Accept-Encoding header.
+
+Rules:
+    - Only complete (non-streaming) bodies of at least COMPRESSION_MIN_SIZE
+      bytes are compressed; streamed responses such as /events/tasks pass through
+    - Bodies of COMPRESSION_THREAD_MIN_SIZE bytes or more are compressed in a
+      worker thread so large list-tasks responses do not block the event loop
+    - Endpoints decorated with @skip_compression are never compressed
+    - brotli is used when the optional `brotli` package is installed and the
+      client accepts it, otherwise gzip
+"""
+
+import asyncio
+import gzip
+import time
+from collections.abc import Callable
+from typing import Any, Optional, TypeVar
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.metrics import compression_cpu_seconds, compression_ratio, compression_skipped_total
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Function attribute set by @skip_compression
+SKIP_COMPRESSION_ATTR = "__skip_compression__"
+
+# Content types that are already compressed or must not be buffered
+EXCLUDED_CONTENT_TYPES = ("text/event-stream", "image/", "video/", "audio/", "application/zip")
+
+
+def skip_compression(endpoint: F) -> F:
+    """
+    Opt an endpoint out of response compression.
+
+    Example:
+        >>> @router.get("/download")
+        ... @skip_compression
+        ... async def download(): ...
+    """
+    setattr(endpoint, SKIP_COMPRESSION_ATTR, True)
+    return endpoint
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    Pick the response encoding from an Accept-Encoding header.
+
+    Args:
+        accept_encoding: Raw header value, e.g. "gzip, deflate, br;q=0.9"
+
+    Returns:
+        Optional[str]: "br", "gzip" or None (send uncompressed)
+
+    Example:
+        >>> negotiate_encoding("gzip, br")  # with brotli installed
+        'br'
+        >>> negotiate_encoding("gzip;q=0, identity") is None
+        True
+    """
+    accepted: dict[str, float] = {}
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if coding:
+            accepted[coding] = quality
+
+    wildcard = accepted.get("*", 0.0)
+    candidates = ["br", "gzip"] if brotli is not None else ["gzip"]
+    best = max(candidates, key=lambda coding: accepted.get(coding, wildcard))
+    return best if accepted.get(best, wildcard) > 0 else None
+
+
+def compress_body(body: bytes, encoding: str, gzip_level: int = 6, brotli_quality: int = 4) -> bytes:
+    """
+    Compress a response body and record ratio and CPU time metrics.
+
+    Uses thread CPU time, so the measurement is accurate when this runs in a
+    worker thread.
+
+    Args:
+        body: Uncompressed response body
+        encoding: "br" or "gzip"
+        gzip_level: gzip compression level (1-9)
+        brotli_quality: brotli quality (0-11)
+
+    Returns:
+        bytes: Compressed body
+    """
+    start = time.thread_time()
+    if encoding == "br":
+        compressed = brotli.compress(body, quality=brotli_quality)
+    else:
+        compressed = gzip.compress(body, compresslevel=gzip_level)
+    compression_cpu_seconds.labels(encoding=encoding).observe(time.thread_time() - start)
+    compression_ratio.labels(encoding=encoding).observe(len(compressed) / len(body))
+    return compressed
+
+
+class CompressionMiddleware:
+    """
+    Compress complete HTTP responses above a size threshold.
+
+    Args:
+        app: ASGI application
+        minimum_size: Smallest body (bytes) worth compressing
+        thread_minimum_size: Bodies at least this large are compressed in a thread
+        gzip_level: gzip compression level
+        brotli_quality: brotli quality
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        thread_minimum_size: int = 262144,
+        gzip_level: int = 6,
+        brotli_quality: int = 4
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.thread_minimum_size = thread_minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Optional[Message] = None
+        passthrough = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start_message, passthrough
+
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                # Hold the headers until the body size is known
+                start_message = message
+                return
+
+            if message["type"] != "http.response.body" or start_message is None:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            reason = self._skip_reason(scope, start_message, body, message.get("more_body", False))
+            if reason is not None:
+                if reason != "small":
+                    compression_skipped_total.labels(reason=reason).inc()
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+
+            if len(body) >= self.thread_minimum_size:
+                compressed = await asyncio.to_thread(
+                    compress_body, body, encoding, self.gzip_level, self.brotli_quality
+                )
+            else:
+                compressed = compress_body(body, encoding, self.gzip_level, self.brotli_quality)
+
+            headers = MutableHeaders(raw=start_message["headers"])
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(compressed))
+            headers.add_vary_header("Accept-Encoding")
+
+            passthrough = True
+            await send(start_message)
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_wrapper)
+
+    def _skip_reason(self, scope: Scope, start_message: Message, body: bytes, more_body: bool) -> Optional[str]:
+        """Return why a response is sent uncompressed, or None to compress it."""
+        if not more_body and len(body) < self.minimum_size:
+            return "small"
+        endpoint = scope.get("endpoint")
+        if endpoint is not None and getattr(endpoint, SKIP_COMPRESSION_ATTR, False):
+            return "opt_out"
+        if more_body:
+            return "streaming"
+        headers = Headers(raw=start_message["headers"])
+        if "content-encoding" in headers:
+            return "encoded"
+        if headers.get("content-type", "").startswith(EXCLUDED_CONTENT_TYPES):
+            return "content_type"
+        return None
@@ -23,9 +23,55 @@ class Settings(BaseSettings):
         - log_level: Logging verbosity (DEBUG, INFO, WARNING, ERROR, CRITICAL)
         - port: Internal container port
         - migration_database_url: Direct PostgreSQL connection for Alembic
+        - listen_database_url: Direct (non-pooler) connection for LISTEN; defaults to
+          migration_database_url, then database_url
+        - database_replica_url: Read replica used by replica_ok (lag-tolerant) /execute actions
+        - db_pool_min_size / db_pool_max_size: asyncpg request pool size per worker
+          (set by app.server from db_connection_budget)
+        - db_connection_budget: Total connections allowed across all workers
+        - db_acquire_timeout_seconds: Longest wait for a pool connection before 503
+        - db_command_timeout_seconds: Client-side query timeout outside /execute
+          actions (actions use their registered statement_timeout_ms)
+        - web_concurrency: Worker processes started by app.server
+        - docs_enabled: Serve /docs, /redoc and /openapi.json
+        - openapi_schema_file: Pre-built schema (python -m app.openapi) served instead
+          of generating it from the routes
         - cors_origins: Comma-separated allowed origins
-        - api_key_secret: Secret for API key generation (Epic 2)
+        - api_key_secret: HMAC secret for stored service key hashes (Epic 2)
         - admin_api_key: Admin endpoint authentication (Epic 2)
+        - admin_service_keys: Comma-separated service key names allowed to run
+          admin_only /execute actions (get-stats-bulk); empty disables them
+        - task_events_heartbeat_seconds: Keepalive interval for /events/tasks streams
+        - task_events_queue_size: Buffered events per subscriber before forcing a resync
+        - idempotency_ttl_seconds: Replay window for Idempotency-Key responses on /execute
+        - idempotency_lease_seconds: How long an in-flight Idempotency-Key claim blocks
+          retries (409) before a retry may take it over
+        - jobs_worker_enabled: Run the background job worker inside the API process
+        - jobs_worker_concurrency: Jobs processed in parallel per worker process
+        - jobs_poll_interval_seconds: Idle delay between queue polls
+        - jobs_max_attempts: Default attempts before a job is marked failed
+        - jobs_retry_base_seconds: First retry delay (doubles per attempt)
+        - jobs_lock_timeout_seconds: Running jobs older than this are requeued
+        - jobs_maintenance_interval_seconds: Interval for scheduled maintenance jobs
+        - jobs_retention_days: Days completed/failed jobs are kept
+        - sync_tombstone_retention_days: Days sync-tasks tombstones are kept (older
+          cursors must do a full resync)
+        - compression_enabled: Compress responses (brotli/gzip) when the client accepts it
+        - compression_min_size: Smallest response body (bytes) that is compressed
+        - compression_thread_min_size: Bodies at least this large are compressed off the event loop
+        - compression_gzip_level: gzip level (1-9)
+        - compression_brotli_quality: brotli quality (0-11)
+        - command_cache_enabled: Cache responses of cacheable read-only actions
+        - command_cache_max_entries: Cached responses kept per worker process
+        - admission_enabled: Shed /execute requests when the pool is saturated
+        - admission_expensive_wait_ms / admission_expensive_max_waiters: Pool wait
+          and waiters at which expensive reads are shed
+        - admission_max_wait_ms / admission_max_waiters: Pool wait and waiters at
+          which every /execute request is shed
+        - admission_retry_after_seconds: Retry-After sent with 503 responses
+        - otel_enabled: Record OpenTelemetry spans and export them over OTLP
+        - otel_exporter_otlp_endpoint: OTLP gRPC collector endpoint
+        - otel_traces_sampler_ratio: Fraction of new traces recorded (0.0-1.0)
     """
 
     model_config = SettingsConfigDict(
@@ -43,13 +89,74 @@ class Settings(BaseSettings):
     # Database settings
     database_url: str  # REQUIRED - no default value
     migration_database_url: Optional[str] = None
+    listen_database_url: Optional[str] = None
+    database_replica_url: Optional[str] = None
+    db_pool_min_size: int = 2
+    db_pool_max_size: int = 10
+    db_connection_budget: Optional[int] = None
+    db_acquire_timeout_seconds: float = 5.0
+    db_command_timeout_seconds: float = 5.0
+
+    # Production server (app/server.py)
+    web_concurrency: int = 1
+
+    # API documentation (app/openapi.py)
+    docs_enabled: bool = True
+    openapi_schema_file: Optional[str] = None
 
     # CORS settings
     cors_origins: str = "http://localhost:3000"
 
     # Authentication settings (Epic 2)
-    api_key_secret: Optional[str] = None
+    api_key_secret: str  # REQUIRED - no default value
     admin_api_key: str  # REQUIRED - no default value
+    admin_service_keys: str = ""
+
+    # Live task change feed (Server-Sent Events)
+    task_events_heartbeat_seconds: int = 15
+    task_events_queue_size: int = 100
+
+    # Idempotency-Key replay window for /execute write commands (24 hours)
+    idempotency_ttl_seconds: int = 86400
+    # In-flight claims expire after this lease (longer than any write action runs)
+    idempotency_lease_seconds: int = 30
+
+    # Background job queue (app/jobs)
+    jobs_worker_enabled: bool = True
+    jobs_worker_concurrency: int = 2
+    jobs_poll_interval_seconds: float = 1.0
+    jobs_max_attempts: int = 5
+    jobs_retry_base_seconds: int = 10
+    jobs_lock_timeout_seconds: int = 300
+    jobs_maintenance_interval_seconds: int = 3600
+    jobs_retention_days: int = 7
+
+    # Delta sync (sync-tasks) tombstone retention
+    sync_tombstone_retention_days: int = 30
+
+    # Response compression (app/compression.py)
+    compression_enabled: bool = True
+    compression_min_size: int = 1024
+    compression_thread_min_size: int = 262144
+    compression_gzip_level: int = 6
+    compression_brotli_quality: int = 4
+
+    # Read-only command response cache (app/commands/cache.py)
+    command_cache_enabled: bool = True
+    command_cache_max_entries: int = 10000
+
+    # Admission control / load shedding (app/admission.py)
+    admission_enabled: bool = True
+    admission_expensive_wait_ms: float = 100
+    admission_expensive_max_waiters: int = 10
+    admission_max_wait_ms: float = 1000
+    admission_max_waiters: int = 50
+    admission_retry_after_seconds: int = 1
+
+    # Distributed tracing (app/tracing.py)
+    otel_enabled: bool = False
+    otel_exporter_otlp_endpoint: str = "http://localhost:4317"
+    otel_traces_sampler_ratio: float = 1.0
 
     @field_validator("database_url")
     @classmethod
@@ -73,6 +180,25 @@ class Settings(BaseSettings):
             )
         return v
 
+    @field_validator("api_key_secret")
+    @classmethod
+    def validate_api_key_secret(cls, v: str) -> str:
+        """
+        Reject an empty API_KEY_SECRET.
+
+        Args:
+            v: HMAC secret for stored service key hashes
+
+        Returns:
+            Validated secret
+
+        Raises:
+            ValueError: If the secret is empty (service key hashes would be unkeyed)
+        """
+        if not v:
+            raise ValueError("API_KEY_SECRET must not be empty")
+        return v
+
     def get_cors_origins_list(self) -> list[str]:
         """
         Parse comma-separated CORS origins into a list.
@@ -87,6 +213,20 @@ class Settings(BaseSettings):
         """
         return [origin.strip() for origin in self.cors_origins.split(",")]
 
+    def get_admin_service_keys(self) -> frozenset[str]:
+        """
+        Parse comma-separated admin service key names into a set.
+
+        Returns:
+            Key names allowed to run admin_only actions (empty entries dropped)
+
+        Example:
+            >>> settings = Settings(admin_service_keys="cat-house-admin, reports")
+            >>> sorted(settings.get_admin_service_keys())
+            ['cat-house-admin', 'reports']
+        """
+        return frozenset(name.strip() for name in self.admin_service_keys.split(",") if name.strip())
+
 
 # Singleton instance - import this in other modules
 settings = Settings()  # type: ignore[call-arg]
@@ -5,14 +5,22 @@ Provides asyncpg connection pool and FastAPI dependency for database access.
 Connection pool lifecycle is managed at application startup/shutdown.
 """
 
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 
 import asyncpg
+import structlog
 
+from app.admission import REASON_ACQUIRE_TIMEOUT, get_pool_wait_tracker, overloaded
 from app.config import settings
 
-# Global connection pool (initialized at application startup)
+logger = structlog.get_logger()
+
+# Global connection pools (initialized at application startup / first use)
 _pool: asyncpg.Pool | None = None
+_replica_pool: asyncpg.Pool | None = None
 
 
 async def get_db_pool() -> asyncpg.Pool:
@@ -20,9 +28,12 @@ async def get_db_pool() -> asyncpg.Pool:
     Get or create the asyncpg connection pool.
     
     Connection pool configuration:
-    - min_size=2: Minimum connections maintained in pool
-    - max_size=10: Maximum concurrent connections (suitable for development)
-    - command_timeout=60: Query timeout in seconds
+    - min_size=DB_POOL_MIN_SIZE: Minimum connections maintained in pool (default 2)
+    - max_size=DB_POOL_MAX_SIZE: Maximum concurrent connections (default 10);
+      app.server derives it from DB_CONNECTION_BUDGET when running N workers
+    - command_timeout=DB_COMMAND_TIMEOUT_SECONDS: Client-side cap for queries
+      outside /execute actions (auth, admin, idempotency); actions run under
+      their own statement_timeout (see statement_timeout())
     
     The pool should be created once at application startup and reused
     for all database operations.
@@ -46,38 +57,75 @@ async def get_db_pool() -> asyncpg.Pool:
 
         _pool = await asyncpg.create_pool(
             dsn=db_url,
-            min_size=2,
-            max_size=10,
-            command_timeout=60
+            min_size=settings.db_pool_min_size,
+            max_size=settings.db_pool_max_size,
+            command_timeout=settings.db_command_timeout_seconds
         )
 
     return _pool
 
 
+async def get_replica_pool() -> asyncpg.Pool:
+    """
+    Get or create the read replica connection pool.
+
+    Used by replica_ok /execute actions (lag-tolerant reads) when
+    DATABASE_REPLICA_URL is set, with the same sizing as the primary pool. Falls back to the primary pool when
+    no replica is configured.
+
+    Returns:
+        asyncpg.Pool: Replica (or primary) connection pool
+    """
+    global _replica_pool
+
+    if not settings.database_replica_url:
+        return await get_db_pool()
+
+    if _replica_pool is None:
+        db_url = settings.database_replica_url.replace('postgresql+asyncpg://', 'postgresql://')
+
+        _replica_pool = await asyncpg.create_pool(
+            dsn=db_url,
+            min_size=settings.db_pool_min_size,
+            max_size=settings.db_pool_max_size,
+            command_timeout=settings.db_command_timeout_seconds
+        )
+
+    return _replica_pool
+
+
 async def close_db_pool() -> None:
     """
-    Close the database connection pool.
+    Close the database connection pools.
     
     Should be called at application shutdown to gracefully close
     all database connections.
     """
-    global _pool
+    global _pool, _replica_pool
 
     if _pool is not None:
         await _pool.close()
         _pool = None
 
+    if _replica_pool is not None:
+        await _replica_pool.close()
+        _replica_pool = None
+
 
 async def get_db() -> AsyncGenerator[asyncpg.Connection, None]:
     """
     FastAPI dependency that provides a database connection from the pool.
     
     Acquires a connection from the pool for the duration of the request
-    and automatically releases it when the request completes.
+    and automatically releases it when the request completes. The wait is
+    recorded for admission control and bounded by DB_ACQUIRE_TIMEOUT_SECONDS.
     
     Yields:
         asyncpg.Connection: Database connection from pool
     
+    Raises:
+        HTTPException(503): No connection became available in time (Retry-After set)
+    
     Usage in FastAPI endpoint:
         >>> from fastapi import Depends
         >>> from app.database import get_db
@@ -87,6 +135,68 @@ async def get_db() -> AsyncGenerator[asyncpg.Connection, None]:
         ...     result = await db.fetchrow("SELECT * FROM users WHERE id = $1", user_id)
         ...     return result
     """
-    pool = await get_db_pool()
-    async with pool.acquire() as connection:
+    async with acquire_connection(await get_db_pool()) as connection:
+        yield connection
+
+
+@asynccontextmanager
+async def acquire_connection(pool: asyncpg.Pool) -> AsyncIterator[asyncpg.Connection]:
+    """
+    Hold a pool connection for the duration of a block.
+
+    The wait is recorded for admission control and bounded by
+    DB_ACQUIRE_TIMEOUT_SECONDS.
+
+    Args:
+        pool: Primary or replica pool
+
+    Yields:
+        asyncpg.Connection: Connection released back to the pool on exit
+
+    Raises:
+        HTTPException(503): No connection became available in time (Retry-After set)
+    """
+    try:
+        with get_pool_wait_tracker().waiting():
+            connection = await pool.acquire(timeout=settings.db_acquire_timeout_seconds)
+    except asyncio.TimeoutError:
+        raise overloaded("unknown", REASON_ACQUIRE_TIMEOUT)
+
+    try:
+        yield connection
+    finally:
+        await pool.release(connection)
+
+
+@asynccontextmanager
+async def statement_timeout(connection: asyncpg.Connection, timeout_ms: int) -> AsyncIterator[asyncpg.Connection]:
+    """
+    Run a block in a transaction with a local statement_timeout.
+
+    BEGIN and SET LOCAL are sent in one round trip; the setting ends with the
+    transaction, so the connection goes back to the pool unchanged (and it
+    works behind transaction-mode poolers such as the Neon pooler). PostgreSQL
+    cancels any statement running longer than timeout_ms (QueryCanceledError).
+
+    Args:
+        connection: Connection to run the block on
+        timeout_ms: statement_timeout in milliseconds
+
+    Yields:
+        asyncpg.Connection: The same connection, inside the transaction
+
+    Example:
+        >>> async with statement_timeout(db, 200) as conn:
+        ...     row = await conn.fetchrow("SELECT * FROM tasks WHERE id = $1", task_id)
+    """
+    await connection.execute(f"BEGIN; SET LOCAL statement_timeout = {int(timeout_ms)}")
+    try:
         yield connection
+    except BaseException:
+        try:
+            await connection.execute("ROLLBACK")
+        except Exception as e:
+            # Broken connection: the pool resets or discards it on release
+            logger.warning("transaction_rollback_failed", error=str(e))
+        raise
+    await connection.execute("COMMIT")
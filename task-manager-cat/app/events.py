@@ -0,0 +1,238 @@
+"""
+Task Manager API - Task Change Events
+
+Live task change feed backed by PostgreSQL LISTEN/NOTIFY.
+
+Architecture:
+    - Task handlers call pg_notify() in the same statement as each write, so a
+      notification is only delivered once the write commits
+    - One dedicated listener connection per process receives every notification
+      (it is not taken from the request pool). It must reach PostgreSQL
+      directly: a transaction-mode pooler (Neon -pooler endpoint, PgBouncer)
+      accepts LISTEN but never delivers notifications, so it connects to
+      LISTEN_DATABASE_URL, then MIGRATION_DATABASE_URL, then DATABASE_URL
+    - TaskChangeBroker fans notifications out to in-memory subscriber queues
+      keyed by user_id, so thousands of idle subscribers cost no DB connections
+    - Subscribers that fall behind, or miss events while the listener is
+      reconnecting, receive a "resync" event and should call sync-tasks
+
+Notification payload (JSON text, well below the 8000 byte NOTIFY limit):
+    {"user_id": "user_123", "task_id": "uuid", "op": "updated", "sync_version": 1057}
+"""
+
+import asyncio
+import json
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
+
+import asyncpg
+import structlog
+
+from app.config import settings
+
+logger = structlog.get_logger()
+
+# PostgreSQL NOTIFY channel used by task handlers
+TASK_CHANGES_CHANNEL = "task_changes"
+
+# Event sent to subscribers when notifications may have been lost
+RESYNC_EVENT: dict[str, Any] = {"op": "resync"}
+
+
+def task_change_notify_sql(alias: str, operation: str, id_column: str = "id") -> str:
+    """
+    Build the pg_notify() expression a handler selects alongside its write.
+
+    Args:
+        alias: CTE alias holding the written row (must expose user_id and sync_version)
+        operation: Change type sent to subscribers ('created', 'updated', 'deleted')
+        id_column: Column of the CTE holding the task ID
+
+    Returns:
+        str: SQL expression publishing the change on TASK_CHANGES_CHANNEL
+
+    Example:
+        >>> task_change_notify_sql("created", "created")  # doctest: +ELLIPSIS
+        "pg_notify('task_changes', json_build_object('user_id', created.user_id, ...)::text)"
+    """
+    return (
+        f"pg_notify('{TASK_CHANGES_CHANNEL}', json_build_object("
+        f"'user_id', {alias}.user_id, "
+        f"'task_id', {alias}.{id_column}, "
+        f"'op', '{operation}', "
+        f"'sync_version', {alias}.sync_version)::text)"
+    )
+
+
+class TaskChangeBroker:
+    """
+    Fan out task change notifications from one listener connection.
+
+    Subscribers receive change events for a single user_id through a bounded
+    asyncio.Queue. The listener connection is opened on first subscription and
+    re-established with exponential backoff if it is terminated.
+    """
+
+    def __init__(self, dsn: str, queue_size: int = 100) -> None:
+        self._dsn = dsn
+        self._queue_size = queue_size
+        self._subscribers: dict[str, set[asyncio.Queue]] = {}
+        self._connection: asyncpg.Connection | None = None
+        self._lock = asyncio.Lock()
+        self._reconnect_task: asyncio.Task | None = None
+        self._closed = False
+
+    @property
+    def subscriber_count(self) -> int:
+        """Number of active subscriptions across all users."""
+        return sum(len(queues) for queues in self._subscribers.values())
+
+    async def start(self) -> None:
+        """Open the listener connection if it is not already open."""
+        async with self._lock:
+            if self._connection is not None and not self._connection.is_closed():
+                return
+            self._closed = False
+            connection = await asyncpg.connect(dsn=self._dsn)
+            await connection.add_listener(TASK_CHANGES_CHANNEL, self._on_notification)
+            connection.add_termination_listener(self._on_termination)
+            self._connection = connection
+            logger.info("task_change_listener_started", channel=TASK_CHANGES_CHANNEL)
+
+    async def stop(self) -> None:
+        """Close the listener connection and stop reconnecting."""
+        self._closed = True
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+            self._reconnect_task = None
+        async with self._lock:
+            if self._connection is not None:
+                connection, self._connection = self._connection, None
+                if not connection.is_closed():
+                    await connection.close()
+                logger.info("task_change_listener_stopped")
+
+    @asynccontextmanager
+    async def subscribe(self, user_id: str) -> AsyncIterator[asyncio.Queue]:
+        """
+        Subscribe to task changes for a user.
+
+        Args:
+            user_id: User whose task changes should be delivered
+
+        Yields:
+            asyncio.Queue: Receives change event dicts (or RESYNC_EVENT)
+        """
+        await self.start()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self._queue_size)
+        self._subscribers.setdefault(user_id, set()).add(queue)
+        try:
+            yield queue
+        finally:
+            queues = self._subscribers.get(user_id)
+            if queues is not None:
+                queues.discard(queue)
+                if not queues:
+                    del self._subscribers[user_id]
+
+    def publish(self, user_id: str, event: dict[str, Any]) -> None:
+        """Deliver an event to every subscriber of a user without blocking."""
+        for queue in self._subscribers.get(user_id, ()):
+            self._deliver(queue, event)
+
+    def _deliver(self, queue: asyncio.Queue, event: dict[str, Any]) -> None:
+        try:
+            queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Slow consumer: drop its backlog and ask it to resync instead
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait(RESYNC_EVENT)
+
+    def _on_notification(self, connection: Any, pid: int, channel: str, payload: str) -> None:
+        try:
+            event = json.loads(payload)
+            user_id = event["user_id"]
+        except (ValueError, KeyError, TypeError):
+            logger.warning("task_change_invalid_payload", payload=payload)
+            return
+        self.publish(user_id, event)
+
+    def _on_termination(self, connection: Any) -> None:
+        if self._closed or connection is not self._connection:
+            return
+        logger.warning("task_change_listener_lost", subscribers=self.subscriber_count)
+        self._connection = None
+        self._reconnect_task = asyncio.get_running_loop().create_task(self._reconnect())
+
+    async def _reconnect(self) -> None:
+        delay = 1.0
+        while not self._closed:
+            try:
+                await self.start()
+            except (OSError, asyncpg.PostgresError) as e:
+                logger.warning("task_change_listener_reconnect_failed", error=str(e), retry_in=delay)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 30.0)
+                continue
+            # Notifications sent while disconnected are lost: everyone resyncs
+            for queues in list(self._subscribers.values()):
+                for queue in list(queues):
+                    self._deliver(queue, RESYNC_EVENT)
+            return
+
+
+def listener_database_url() -> str:
+    """
+    Connection string for the LISTEN connection.
+
+    Prefers the direct LISTEN_DATABASE_URL / MIGRATION_DATABASE_URL over the
+    pooled DATABASE_URL, and warns when only a pooler endpoint is available.
+
+    Returns:
+        str: asyncpg DSN (postgresql:// scheme)
+    """
+    url = settings.listen_database_url or settings.migration_database_url
+    if url is None:
+        url = settings.database_url
+        if "-pooler" in url:
+            logger.warning(
+                "task_change_listener_pooled_url",
+                detail="LISTEN through a transaction pooler receives no notifications; "
+                       "set LISTEN_DATABASE_URL to a direct endpoint"
+            )
+    # asyncpg doesn't accept postgresql+asyncpg:// scheme
+    return url.replace('postgresql+asyncpg://', 'postgresql://')
+
+
+# Global broker (created on first subscription)
+_broker: TaskChangeBroker | None = None
+
+
+def get_task_change_broker() -> TaskChangeBroker:
+    """
+    Get or create the process-wide task change broker.
+
+    Returns:
+        TaskChangeBroker: Broker sharing one listener connection per process
+    """
+    global _broker
+
+    if _broker is None:
+        _broker = TaskChangeBroker(listener_database_url(), queue_size=settings.task_events_queue_size)
+
+    return _broker
+
+
+async def close_task_change_broker() -> None:
+    """
+    Close the task change broker.
+
+    Should be called at application shutdown to release the listener connection.
+    """
+    global _broker
+
+    if _broker is not None:
+        await _broker.stop()
+        _broker = None
@@ -0,0 +1,187 @@
+"""
+Task Manager API - Primary Key Write Benchmark
+
+Compares random UUIDv4 keys (gen_random_uuid()) with time-ordered UUIDv7
+keys (app.ids.uuid7) for insert-heavy tables.
+
+For each key type, rows are inserted into a scratch table shaped like tasks
+(UUID primary key, user_id, title, created_at), in small transactions like
+create-task. The benchmark reports:
+    - Insert throughput (rows/s)
+    - Primary key index size (pg_relation_size of the _pkey index)
+    - WAL generated (pg_current_wal_insert_lsn before/after; n/a if not permitted)
+
+The gap widens once the primary key index no longer fits in shared_buffers,
+so use production-like row counts (--rows 1000000) for capacity decisions.
+Scratch tables are dropped afterwards.
+
+Usage:
+    python -m app.id_benchmark                     # DATABASE_URL, 50,000 rows
+    python -m app.id_benchmark --rows 1000000 --batch 50 --dsn postgresql://...
+"""
+
+import argparse
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+from uuid import UUID, uuid4
+
+import asyncpg
+
+from app.ids import uuid7
+
+# Key type -> id generator
+KEY_GENERATORS: dict[str, Callable[[], UUID]] = {
+    "uuid_v4": uuid4,
+    "uuid_v7": uuid7,
+}
+
+TABLE_PREFIX = "id_benchmark_"
+
+
+@dataclass(frozen=True)
+class KeyBenchmarkResult:
+    """Write cost of one key type."""
+
+    key_type: str
+    rows: int
+    seconds: float
+    index_bytes: int
+    wal_bytes: Optional[int]
+
+    @property
+    def rows_per_second(self) -> float:
+        """Insert throughput."""
+        return self.rows / self.seconds if self.seconds > 0 else 0.0
+
+
+async def _wal_lsn(db: Any) -> Optional[str]:
+    try:
+        return await db.fetchval("SELECT pg_current_wal_insert_lsn()::text")
+    except asyncpg.PostgresError:
+        return None
+
+
+async def benchmark_key_type(db: Any, key_type: str, rows: int, batch: int) -> KeyBenchmarkResult:
+    """
+    Insert rows with one key type into a fresh scratch table.
+
+    Args:
+        db: asyncpg connection (direct, not through a transaction pooler)
+        key_type: Key of KEY_GENERATORS
+        rows: Rows to insert
+        batch: Rows per transaction
+
+    Returns:
+        KeyBenchmarkResult: Throughput, index size and WAL volume
+    """
+    generate = KEY_GENERATORS[key_type]
+    table = f"{TABLE_PREFIX}{key_type}"
+
+    await db.execute(f"DROP TABLE IF EXISTS {table}")
+    await db.execute(f"""
+        CREATE TABLE {table} (
+            id UUID PRIMARY KEY,
+            user_id VARCHAR(255) NOT NULL,
+            title VARCHAR(500) NOT NULL,
+            created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+        )
+    """)
+    sql = f"INSERT INTO {table} (id, user_id, title) VALUES ($1, $2, $3)"
+
+    try:
+        wal_before = await _wal_lsn(db)
+        started_at = time.perf_counter()
+        for offset in range(0, rows, batch):
+            records = [
+                (generate(), f"user_{index % 1000}", f"Task {index}")
+                for index in range(offset, min(offset + batch, rows))
+            ]
+            async with db.transaction():
+                await db.executemany(sql, records)
+        seconds = time.perf_counter() - started_at
+        wal_after = await _wal_lsn(db)
+
+        index_bytes = await db.fetchval(f"SELECT pg_relation_size('{table}_pkey')")
+        wal_bytes = None
+        if wal_before is not None and wal_after is not None:
+            wal_bytes = int(await db.fetchval(
+                "SELECT pg_wal_lsn_diff($1::pg_lsn, $2::pg_lsn)", wal_after, wal_before
+            ))
+    finally:
+        await db.execute(f"DROP TABLE IF EXISTS {table}")
+
+    return KeyBenchmarkResult(
+        key_type=key_type,
+        rows=rows,
+        seconds=seconds,
+        index_bytes=index_bytes,
+        wal_bytes=wal_bytes
+    )
+
+
+async def run_benchmark(db: Any, rows: int, batch: int) -> list[KeyBenchmarkResult]:
+    """Benchmark every key type in KEY_GENERATORS on one connection."""
+    return [await benchmark_key_type(db, key_type, rows, batch) for key_type in KEY_GENERATORS]
+
+
+def _mib(value: Optional[int]) -> str:
+    return "n/a" if value is None else f"{value / (1024 * 1024):.1f} MiB"
+
+
+def format_report(results: list[KeyBenchmarkResult]) -> str:
+    """
+    Render benchmark results, with v7 relative to v4 when both are present.
+
+    Example:
+        >>> print(format_report(results))
+        key type       rows/s   pk index        WAL
+        uuid_v4       4,210.3    2.1 MiB    9.8 MiB
+        ...
+    """
+    lines = [f"{'key type':<10} {'rows/s':>12} {'pk index':>12} {'WAL':>12}"]
+    for result in results:
+        lines.append(
+            f"{result.key_type:<10} {result.rows_per_second:>12,.1f} "
+            f"{_mib(result.index_bytes):>12} {_mib(result.wal_bytes):>12}"
+        )
+
+    by_type = {result.key_type: result for result in results}
+    v4, v7 = by_type.get("uuid_v4"), by_type.get("uuid_v7")
+    if v4 is not None and v7 is not None and v4.rows_per_second and v4.index_bytes:
+        lines.append("")
+        lines.append(f"uuid_v7 throughput: {v7.rows_per_second / v4.rows_per_second:.2f}x uuid_v4")
+        lines.append(f"uuid_v7 pk index size: {v7.index_bytes / v4.index_bytes:.2f}x uuid_v4")
+        if v4.wal_bytes and v7.wal_bytes is not None:
+            lines.append(f"uuid_v7 WAL: {v7.wal_bytes / v4.wal_bytes:.2f}x uuid_v4")
+    return "\n".join(lines)
+
+
+async def _main(dsn: str, rows: int, batch: int) -> None:
+    db = await asyncpg.connect(dsn)
+    try:
+        results = await run_benchmark(db, rows, batch)
+    finally:
+        await db.close()
+    print(format_report(results))
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    """Run the benchmark and print the report."""
+    parser = argparse.ArgumentParser(description="Compare UUIDv4 and UUIDv7 primary key writes")
+    parser.add_argument("--dsn", default=None, help="PostgreSQL DSN (default: DATABASE_URL)")
+    parser.add_argument("--rows", type=int, default=50_000, help="Rows per key type")
+    parser.add_argument("--batch", type=int, default=100, help="Rows per transaction")
+    args = parser.parse_args(argv)
+
+    dsn = args.dsn
+    if dsn is None:
+        from app.config import settings
+        dsn = settings.database_url
+
+    asyncio.run(_main(dsn, args.rows, args.batch))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+"""
+Task Manager API - Idempotency Keys
+
+Replay of write commands retried with the same Idempotency-Key header.
+
+Workflow (per service key + Idempotency-Key):
+    1. claim_idempotency_key: Single statement that either claims the key
+       (new, expired, or an in-flight claim whose lease ran out) or returns the
+       stored record. In-flight claims hold a short lease
+       (IDEMPOTENCY_LEASE_SECONDS) so a crashed request frees the key quickly
+    2. Handler runs only when the key was claimed
+    3. store_idempotent_response: Saves the CommandResponse in the handler's
+       transaction (the write and its replay commit together) and extends the
+       record to IDEMPOTENCY_TTL_SECONDS
+    4. release_idempotency_key: Frees the key if the handler's transaction did
+       not commit, so the client can retry
+
+Each claim carries a claim_token: storing and releasing only touch the claim
+the request still holds, so a request whose lease was taken over rolls back
+instead of writing twice.
+
+Applies to actions registered with idempotent=True (app/commands/router.py).
+Retries within IDEMPOTENCY_TTL_SECONDS receive the stored response without
+running the handler again. Reusing a key for a different request is rejected.
+"""
+
+import hashlib
+import json
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Any, Union
+
+import structlog
+from fastapi import HTTPException, status
+
+from app.commands.models import AnyCommand, CommandResponse, command_payload
+from app.config import settings
+
+logger = structlog.get_logger()
+
+
+@dataclass(frozen=True)
+class IdempotencyClaim:
+    """Idempotency-Key claimed by the current request."""
+
+    key_name: str
+    idempotency_key: str
+    token: str
+
+
+def request_fingerprint(command: AnyCommand) -> str:
+    """
+    Compute a stable hash of a command request.
+
+    Typed and generic (CommandRequest) commands with the same content have
+    the same fingerprint.
+
+    Args:
+        command: Command request received by /execute
+
+    Returns:
+        str: 64 character SHA-256 hex digest of the canonical JSON command
+
+    Example:
+        >>> a = CommandRequest(action="create-task", user_id="u", payload={"title": "x", "priority": "high"})
+        >>> b = CommandRequest(action="create-task", user_id="u", payload={"priority": "high", "title": "x"})
+        >>> request_fingerprint(a) == request_fingerprint(b)
+        True
+    """
+    canonical = json.dumps(
+        {"action": command.action, "user_id": command.user_id, "payload": command_payload(command)},
+        sort_keys=True,
+        separators=(",", ":")
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+async def claim_idempotency_key(
+    db: Any,
+    key_name: str,
+    idempotency_key: str,
+    request_hash: str
+) -> Union[IdempotencyClaim, CommandResponse]:
+    """
+    Claim an Idempotency-Key or return the response stored for it.
+
+    The claim and the lookup run in one statement: the INSERT claims a new key
+    (or takes over an expired record or lease), otherwise the existing record
+    is returned. The claim runs in its own transaction and expires after
+    IDEMPOTENCY_LEASE_SECONDS unless the response is stored.
+
+    Args:
+        db: asyncpg database connection from pool
+        key_name: Validated service key name (keys are scoped per client)
+        idempotency_key: Value of the Idempotency-Key header
+        request_hash: Fingerprint of the current request
+
+    Returns:
+        IdempotencyClaim if the key was claimed (caller must run the handler),
+        otherwise the stored CommandResponse to replay
+
+    Raises:
+        HTTPException(409): First request with this key is still in flight
+        HTTPException(422): Key was already used for a different request
+    """
+    row = await db.fetchrow("""
+        WITH claimed AS (
+            INSERT INTO idempotency_keys (key_name, idempotency_key, request_hash, expires_at, claim_token)
+            VALUES ($1, $2, $3, NOW() + $4::interval, gen_random_uuid())
+            ON CONFLICT (key_name, idempotency_key) DO UPDATE
+                SET request_hash = EXCLUDED.request_hash,
+                    response = NULL,
+                    created_at = NOW(),
+                    expires_at = EXCLUDED.expires_at,
+                    claim_token = EXCLUDED.claim_token
+                WHERE idempotency_keys.expires_at <= NOW()
+            RETURNING claim_token
+        )
+        SELECT claim_token::text, NULL AS request_hash, NULL::text AS response FROM claimed
+        UNION ALL
+        SELECT NULL, request_hash, response::text FROM idempotency_keys
+        WHERE key_name = $1 AND idempotency_key = $2
+        AND NOT EXISTS (SELECT 1 FROM claimed)
+    """, key_name, idempotency_key, request_hash, timedelta(seconds=settings.idempotency_lease_seconds))
+
+    if row is not None and row['claim_token'] is not None:
+        return IdempotencyClaim(key_name, idempotency_key, row['claim_token'])
+
+    # No row: a concurrent request claimed the key after this statement started
+    if row is None or row['response'] is None:
+        logger.warning(
+            "idempotency_key_in_progress",
+            key_name=key_name,
+            idempotency_key=idempotency_key
+        )
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A request with this Idempotency-Key is already in progress"
+        )
+
+    if row['request_hash'] != request_hash:
+        logger.warning(
+            "idempotency_key_reused",
+            key_name=key_name,
+            idempotency_key=idempotency_key
+        )
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Idempotency-Key was already used for a different request"
+        )
+
+    return CommandResponse.model_validate(json.loads(row['response']))
+
+
+async def store_idempotent_response(db: Any, claim: IdempotencyClaim, response: CommandResponse) -> None:
+    """
+    Store the response of a claimed Idempotency-Key for replay.
+
+    Must run in the handler's transaction: the write and its stored response
+    commit (or roll back) together, so a committed write is always replayed.
+    Extends the record from the claim lease to IDEMPOTENCY_TTL_SECONDS.
+
+    Args:
+        db: asyncpg connection inside the handler's transaction
+        claim: Claim returned by claim_idempotency_key
+        response: CommandResponse returned to the client
+
+    Raises:
+        HTTPException(409): The lease expired and another request took over the
+            key; raising rolls back this request's write
+    """
+    stored = await db.fetchval("""
+        UPDATE idempotency_keys
+        SET response = $4::jsonb, expires_at = NOW() + $5::interval
+        WHERE key_name = $1 AND idempotency_key = $2 AND claim_token = $3::uuid
+        RETURNING true
+    """, claim.key_name, claim.idempotency_key, claim.token, response.model_dump_json(),
+        timedelta(seconds=settings.idempotency_ttl_seconds))
+
+    if not stored:
+        logger.warning(
+            "idempotency_claim_lost",
+            key_name=claim.key_name,
+            idempotency_key=claim.idempotency_key
+        )
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A request with this Idempotency-Key is already in progress"
+        )
+
+
+async def release_idempotency_key(db: Any, claim: IdempotencyClaim) -> None:
+    """
+    Release a claimed Idempotency-Key after a failed request.
+
+    Failures are not replayed: the client may retry with the same key. Only an
+    unfinished claim held by this request is removed, so a response committed
+    with the write (or another request's claim) is never released.
+
+    Args:
+        db: asyncpg database connection from pool (outside the handler's transaction)
+        claim: Claim returned by claim_idempotency_key
+    """
+    try:
+        await db.execute("""
+            DELETE FROM idempotency_keys
+            WHERE key_name = $1 AND idempotency_key = $2 AND claim_token = $3::uuid
+            AND response IS NULL
+        """, claim.key_name, claim.idempotency_key, claim.token)
+    except Exception as e:
+        # Claim stays until its lease expires; retries get 409 in the meantime
+        logger.error(
+            "idempotency_release_failed",
+            key_name=claim.key_name,
+            idempotency_key=claim.idempotency_key,
+            error=str(e)
+        )
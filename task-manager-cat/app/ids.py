@@ -0,0 +1,89 @@
+"""
+Task Manager API - Time-Ordered IDs
+
+UUIDv7 (RFC 9562) generation for primary keys.
+
+Random v4 ids land on random leaf pages of the primary key B-tree, so every
+insert dirties (and full-page-writes) a different page. v7 ids start with a
+millisecond timestamp: new rows append to the rightmost leaf, which keeps the
+index compact, WAL small and the hot pages cached.
+
+Layout (128 bits):
+    - unix_ts_ms (48): Milliseconds since the Unix epoch
+    - ver (4): 7
+    - rand_a (12): Counter, so ids from one process increase within a millisecond
+    - var (2): RFC 9562 variant (0b10)
+    - rand_b (62): Random
+
+v7 ids are ordinary UUIDs, so they coexist with the v4 ids of existing rows
+in the same UUID column.
+
+Usage:
+    >>> from app.ids import uuid7
+    >>> uuid7().version
+    7
+
+Benchmark (v4 vs v7 inserts): python -m app.id_benchmark --help
+"""
+
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from uuid import UUID
+
+_MAX_COUNTER = 0xFFF
+
+_lock = threading.Lock()
+_last_ms = 0
+_counter = 0
+
+
+def uuid7() -> UUID:
+    """
+    Generate a UUIDv7.
+
+    Ids generated by one process are strictly increasing: within the same
+    millisecond the 12-bit counter is incremented, and when it overflows the
+    timestamp is advanced by one millisecond.
+
+    Returns:
+        UUID: Version 7 UUID
+    """
+    global _last_ms, _counter
+
+    with _lock:
+        now_ms = time.time_ns() // 1_000_000
+        if now_ms > _last_ms:
+            _last_ms = now_ms
+            # Random start leaves room for increments within the millisecond
+            _counter = int.from_bytes(os.urandom(2), "big") & 0x7FF
+        else:
+            _counter += 1
+            if _counter > _MAX_COUNTER:
+                _last_ms += 1
+                _counter = 0
+        timestamp_ms = _last_ms
+        counter = _counter
+
+    rand_b = int.from_bytes(os.urandom(8), "big") & ((1 << 62) - 1)
+    value = (
+        (timestamp_ms & ((1 << 48) - 1)) << 80
+        | 0x7 << 76
+        | counter << 64
+        | 0b10 << 62
+        | rand_b
+    )
+    return UUID(int=value)
+
+
+def uuid7_datetime(value: UUID) -> datetime:
+    """
+    Return the creation time encoded in a UUIDv7 (millisecond precision).
+
+    Raises:
+        ValueError: value is not a version 7 UUID
+    """
+    if value.version != 7:
+        raise ValueError(f"Not a UUIDv7: {value}")
+    return datetime.fromtimestamp((value.int >> 80) / 1000, tz=timezone.utc)
@@ -0,0 +1,6 @@
+"""
+Task Manager API - Background Jobs
+
+Postgres-backed job queue (queue.py), job handler registry (handlers.py) and
+worker pool (worker.py) for work deferred out of the request path.
+"""
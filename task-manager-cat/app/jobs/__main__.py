@@ -0,0 +1,38 @@
+"""
+Standalone background job worker.
+
+Usage:
+    python -m app.jobs
+
+Runs the same worker pool as the API lifespan, for deployments that scale
+workers separately (set JOBS_WORKER_ENABLED=false on the API containers).
+Stops gracefully on SIGTERM/SIGINT.
+"""
+
+import asyncio
+import signal
+
+import structlog
+
+from app.jobs.worker import close_job_worker, get_job_worker
+
+logger = structlog.get_logger()
+
+
+async def main() -> None:
+    """Run the job worker until a termination signal is received."""
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, stop.set)
+
+    await get_job_worker().start()
+    try:
+        await stop.wait()
+    finally:
+        logger.info("job_worker_shutdown")
+        await close_job_worker()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,98 @@
+"""
+Task Manager API - Background Job Handlers
+
+Registry of job types run by the worker pool.
+
+Handler signature:
+    async def handler(payload: dict, db: Any) -> None
+
+A handler that raises is retried with backoff until max_attempts is reached.
+Handlers must be safe to run more than once (a worker may crash after the
+work is done but before the job is marked completed).
+
+Handlers:
+    - purge-idempotency-keys: Delete expired Idempotency-Key records
+    - purge-finished-jobs: Delete completed/failed jobs past retention
+    - purge-task-tombstones: Delete sync-tasks tombstones past retention
+"""
+
+from datetime import timedelta
+from typing import Any, Awaitable, Callable
+
+import structlog
+
+from app.config import settings
+
+logger = structlog.get_logger()
+
+JobHandler = Callable[[dict, Any], Awaitable[None]]
+
+
+async def purge_idempotency_keys_handler(payload: dict, db: Any) -> None:
+    """
+    Delete expired Idempotency-Key records.
+
+    Expired keys are only taken over when a client reuses them, so without
+    this job the table keeps every key ever sent.
+
+    Args:
+        payload: Unused
+        db: asyncpg database connection
+    """
+    result = await db.execute("DELETE FROM idempotency_keys WHERE expires_at <= NOW()")
+    logger.info("idempotency_keys_purged", result=result)
+
+
+async def purge_finished_jobs_handler(payload: dict, db: Any) -> None:
+    """
+    Delete completed and failed jobs older than the retention period.
+
+    Args:
+        payload: Optional {"retention_days": int} (defaults to JOBS_RETENTION_DAYS)
+        db: asyncpg database connection
+    """
+    retention_days = payload.get("retention_days", settings.jobs_retention_days)
+    result = await db.execute("""
+        DELETE FROM background_jobs
+        WHERE finished_at IS NOT NULL AND finished_at < NOW() - $1::interval
+    """, timedelta(days=retention_days))
+    logger.info("finished_jobs_purged", result=result, retention_days=retention_days)
+
+
+async def purge_task_tombstones_handler(payload: dict, db: Any) -> None:
+    """
+    Delete task tombstones older than the retention period.
+
+    Records the highest purged sync_version in task_sync_state in the same
+    statement, so sync-tasks can tell clients with an older cursor that they
+    may have missed deletions and must resync from cursor 0.
+
+    Args:
+        payload: Optional {"retention_days": int} (defaults to SYNC_TOMBSTONE_RETENTION_DAYS)
+        db: asyncpg database connection
+    """
+    retention_days = payload.get("retention_days", settings.sync_tombstone_retention_days)
+    purged = await db.fetchval("""
+        WITH purged AS (
+            DELETE FROM task_tombstones
+            WHERE deleted_at < NOW() - $1::interval
+            RETURNING sync_version
+        )
+        UPDATE task_sync_state
+        SET tombstones_pruned_through = GREATEST(
+            tombstones_pruned_through, (SELECT MAX(sync_version) FROM purged)
+        )
+        RETURNING (SELECT COUNT(*) FROM purged)
+    """, timedelta(days=retention_days))
+    logger.info("task_tombstones_purged", purged=purged, retention_days=retention_days)
+
+
+# Job type registry - maps job_type to handler function
+JOB_HANDLERS: dict[str, JobHandler] = {
+    "purge-idempotency-keys": purge_idempotency_keys_handler,
+    "purge-finished-jobs": purge_finished_jobs_handler,
+    "purge-task-tombstones": purge_task_tombstones_handler,
+}
+
+# Jobs enqueued by the worker scheduler every JOBS_MAINTENANCE_INTERVAL_SECONDS
+MAINTENANCE_JOBS = ("purge-idempotency-keys", "purge-finished-jobs", "purge-task-tombstones")
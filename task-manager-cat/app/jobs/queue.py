@@ -0,0 +1,229 @@
+"""
+Task Manager API - Background Job Queue
+
+Durable job queue stored in the background_jobs table.
+
+Functions:
+    - enqueue_job: Add a job (call with the request's connection so the job is
+      committed together with the write that needs it)
+    - claim_next_job: Lock the oldest due job with FOR UPDATE SKIP LOCKED
+    - complete_job / fail_job: Record the outcome of a claimed job (ignored
+      if the claim expired and the job was requeued meanwhile)
+    - requeue_stale_jobs: Return jobs of crashed workers to the queue
+    - count_queued_jobs: Queue depth for metrics
+
+Job lifecycle:
+    queued -> running -> completed
+                      -> queued (retry with exponential backoff)
+                      -> failed (max_attempts reached or unknown job type)
+"""
+
+import json
+from datetime import timedelta
+from typing import Any, Optional
+
+import structlog
+
+from app.config import settings
+from app.metrics import jobs_enqueued_total
+
+logger = structlog.get_logger()
+
+# Upper bound for the retry backoff delay
+MAX_RETRY_DELAY_SECONDS = 3600
+
+
+def retry_delay_seconds(attempts: int) -> int:
+    """
+    Compute the backoff delay before retrying a failed job.
+
+    Args:
+        attempts: Number of attempts made so far (1 after the first failure)
+
+    Returns:
+        int: Delay in seconds (base * 2^(attempts-1), capped at one hour)
+
+    Example:
+        >>> [retry_delay_seconds(n) for n in (1, 2, 3)]  # base 10s
+        [10, 20, 40]
+    """
+    delay = settings.jobs_retry_base_seconds * 2 ** max(attempts - 1, 0)
+    return min(delay, MAX_RETRY_DELAY_SECONDS)
+
+
+async def enqueue_job(
+    db: Any,
+    job_type: str,
+    payload: Optional[dict] = None,
+    *,
+    delay_seconds: int = 0,
+    dedupe_key: Optional[str] = None,
+    max_attempts: Optional[int] = None
+) -> Optional[int]:
+    """
+    Add a job to the queue.
+
+    Args:
+        db: asyncpg connection (use the handler's connection to enqueue in the
+            same transaction as the write)
+        job_type: Registered job type (see app.jobs.handlers.JOB_HANDLERS)
+        payload: JSON-serializable job arguments
+        delay_seconds: Run no earlier than this many seconds from now
+        dedupe_key: Skip the insert if a queued/running job has the same key
+        max_attempts: Override settings.jobs_max_attempts
+
+    Returns:
+        Optional[int]: New job ID, or None if deduplicated
+
+    Example:
+        >>> await enqueue_job(db, "purge-idempotency-keys", dedupe_key="purge-idempotency-keys")
+        42
+    """
+    job_id = await db.fetchval("""
+        INSERT INTO background_jobs (job_type, payload, run_at, dedupe_key, max_attempts)
+        VALUES ($1, $2::jsonb, NOW() + $3::interval, $4, $5)
+        ON CONFLICT (dedupe_key) WHERE status IN ('queued', 'running') DO NOTHING
+        RETURNING id
+    """,
+        job_type,
+        json.dumps(payload or {}),
+        timedelta(seconds=delay_seconds),
+        dedupe_key,
+        max_attempts or settings.jobs_max_attempts
+    )
+
+    if job_id is None:
+        logger.debug("job_deduplicated", job_type=job_type, dedupe_key=dedupe_key)
+        return None
+
+    jobs_enqueued_total.labels(job_type=job_type).inc()
+    logger.info("job_enqueued", job_id=job_id, job_type=job_type, delay_seconds=delay_seconds)
+    return job_id
+
+
+async def claim_next_job(db: Any) -> Optional[dict]:
+    """
+    Claim the oldest due job.
+
+    SKIP LOCKED lets concurrent workers claim different rows without waiting
+    on each other. The claim commits immediately, so the job handler does not
+    run inside a long transaction.
+
+    Args:
+        db: asyncpg database connection
+
+    Returns:
+        Optional[dict]: Claimed job (id, job_type, payload, attempts,
+        max_attempts, lag_seconds) or None if no job is due
+    """
+    row = await db.fetchrow("""
+        UPDATE background_jobs
+        SET status = 'running', attempts = attempts + 1, locked_at = NOW()
+        WHERE id = (
+            SELECT id FROM background_jobs
+            WHERE status = 'queued' AND run_at <= NOW()
+            ORDER BY run_at
+            LIMIT 1
+            FOR UPDATE SKIP LOCKED
+        )
+        RETURNING id, job_type, payload::text AS payload, attempts, max_attempts,
+                  EXTRACT(EPOCH FROM NOW() - run_at)::float8 AS lag_seconds
+    """)
+
+    if row is None:
+        return None
+
+    job = dict(row)
+    job['payload'] = json.loads(job['payload'])
+    return job
+
+
+def updated_rows(result: str) -> int:
+    """Row count of an asyncpg command tag, e.g. "UPDATE 3" -> 3."""
+    return int(result.split()[-1])
+
+
+async def complete_job(db: Any, job: dict) -> bool:
+    """
+    Mark a claimed job as completed.
+
+    The update only applies while the job is still running under this claim
+    (status 'running' with the same attempts count). A run that outlived its
+    lock was requeued by requeue_stale_jobs, and its outcome must not
+    overwrite the state of the run that took over.
+
+    Args:
+        db: asyncpg database connection
+        job: Job returned by claim_next_job
+
+    Returns:
+        bool: False if the claim had expired and nothing was recorded
+    """
+    result = await db.execute("""
+        UPDATE background_jobs
+        SET status = 'completed', locked_at = NULL, last_error = NULL, finished_at = NOW()
+        WHERE id = $1 AND status = 'running' AND attempts = $2
+    """, job['id'], job['attempts'])
+    return updated_rows(result) > 0
+
+
+async def fail_job(db: Any, job: dict, error: str, *, retry: bool = True) -> Optional[bool]:
+    """
+    Record a failed job execution.
+
+    Like complete_job, only applies while the job is still held by this claim.
+
+    Args:
+        db: asyncpg database connection
+        job: Job returned by claim_next_job
+        error: Error message stored in last_error
+        retry: False to fail permanently regardless of attempts left
+
+    Returns:
+        Optional[bool]: True if the job was requeued for another attempt,
+        False if it failed permanently, None if the claim had expired and
+        nothing was recorded
+    """
+    if retry and job['attempts'] < job['max_attempts']:
+        result = await db.execute("""
+            UPDATE background_jobs
+            SET status = 'queued', locked_at = NULL, last_error = $3,
+                run_at = NOW() + $4::interval
+            WHERE id = $1 AND status = 'running' AND attempts = $2
+        """, job['id'], job['attempts'], error, timedelta(seconds=retry_delay_seconds(job['attempts'])))
+        return True if updated_rows(result) else None
+
+    result = await db.execute("""
+        UPDATE background_jobs
+        SET status = 'failed', locked_at = NULL, last_error = $3, finished_at = NOW()
+        WHERE id = $1 AND status = 'running' AND attempts = $2
+    """, job['id'], job['attempts'], error)
+    return False if updated_rows(result) else None
+
+
+async def requeue_stale_jobs(db: Any) -> int:
+    """
+    Return running jobs whose worker stopped responding to the queue.
+
+    A job still running after JOBS_LOCK_TIMEOUT_SECONDS is assumed to belong
+    to a crashed worker. The attempt already counted stays counted.
+
+    Returns:
+        int: Number of jobs requeued
+    """
+    result = await db.execute("""
+        UPDATE background_jobs
+        SET status = 'queued', locked_at = NULL, run_at = NOW(),
+            last_error = 'Worker lock expired'
+        WHERE status = 'running' AND locked_at < NOW() - $1::interval
+    """, timedelta(seconds=settings.jobs_lock_timeout_seconds))
+
+    requeued = updated_rows(result)
+    if requeued:
+        logger.warning("stale_jobs_requeued", count=requeued)
+    return requeued
+
+
+async def count_queued_jobs(db: Any) -> int:
+    """Count jobs waiting to run."""
+    return await db.fetchval("SELECT COUNT(*) FROM background_jobs WHERE status = 'queued'")
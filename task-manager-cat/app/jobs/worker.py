@@ -0,0 +1,253 @@
+"""
+Task Manager API - Background Job Worker
+
+Worker pool that runs queued jobs outside the request path.
+
+Architecture:
+    - JOBS_WORKER_CONCURRENCY loops each claim one job at a time with
+      FOR UPDATE SKIP LOCKED; several processes can run workers safely
+    - The worker has its own small connection pool, so jobs never take
+      connections from the /execute request pool
+    - A scheduler loop requeues jobs of crashed workers, enqueues maintenance
+      jobs and samples the queue depth gauge
+    - Handlers are cancelled after JOBS_LOCK_TIMEOUT_SECONDS; the outcome of
+      a run whose job was requeued meanwhile is discarded
+    - Runs inside the API process (JOBS_WORKER_ENABLED) or standalone with
+      `python -m app.jobs`
+"""
+
+import asyncio
+import time
+
+import asyncpg
+import structlog
+
+from app.config import settings
+from app.jobs.handlers import JOB_HANDLERS, MAINTENANCE_JOBS
+from app.jobs.queue import (
+    claim_next_job,
+    complete_job,
+    count_queued_jobs,
+    enqueue_job,
+    fail_job,
+    requeue_stale_jobs,
+)
+from app.metrics import job_queue_lag_seconds, jobs_queued, track_job_processed
+
+logger = structlog.get_logger()
+
+
+class JobWorker:
+    """
+    Pool of asyncio loops processing background jobs.
+
+    Idle loops poll the queue every poll_interval seconds. On stop, loops
+    finish their current job (up to shutdown_timeout) before exiting; jobs
+    interrupted after that are requeued once their lock expires.
+    """
+
+    def __init__(
+        self,
+        dsn: str,
+        concurrency: int = 2,
+        poll_interval: float = 1.0,
+        maintenance_interval: float = 3600,
+        shutdown_timeout: float = 30
+    ) -> None:
+        self._dsn = dsn
+        self._concurrency = concurrency
+        self._poll_interval = poll_interval
+        self._maintenance_interval = maintenance_interval
+        self._shutdown_timeout = shutdown_timeout
+        self._pool: asyncpg.Pool | None = None
+        self._tasks: list[asyncio.Task] = []
+        self._stopping = asyncio.Event()
+
+    @property
+    def running(self) -> bool:
+        """True while worker loops are active."""
+        return bool(self._tasks)
+
+    async def start(self) -> None:
+        """Create the worker connection pool and start the worker loops."""
+        if self._tasks:
+            return
+        self._stopping.clear()
+        # min_size=0: no connection is opened until the first poll
+        self._pool = await asyncpg.create_pool(
+            dsn=self._dsn,
+            min_size=0,
+            max_size=self._concurrency + 1
+        )
+        self._tasks = [
+            asyncio.create_task(self._worker_loop(index))
+            for index in range(self._concurrency)
+        ]
+        self._tasks.append(asyncio.create_task(self._scheduler_loop()))
+        logger.info("job_worker_started", concurrency=self._concurrency)
+
+    async def stop(self) -> None:
+        """Stop the worker loops and close the worker connection pool."""
+        self._stopping.set()
+        if self._tasks:
+            _, pending = await asyncio.wait(self._tasks, timeout=self._shutdown_timeout)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            self._tasks = []
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+        logger.info("job_worker_stopped")
+
+    def _require_pool(self) -> asyncpg.Pool:
+        """Connection pool of a started worker."""
+        if self._pool is None:
+            raise RuntimeError("JobWorker is not started")
+        return self._pool
+
+    async def run_once(self) -> bool:
+        """
+        Claim and run a single job.
+
+        Returns:
+            bool: True if a job was processed, False if the queue was empty
+        """
+        async with self._require_pool().acquire() as db:
+            job = await claim_next_job(db)
+            if job is None:
+                return False
+
+            job_type = job['job_type']
+            job_queue_lag_seconds.labels(job_type=job_type).observe(max(job['lag_seconds'], 0.0))
+
+            handler = JOB_HANDLERS.get(job_type)
+            if handler is None:
+                await fail_job(db, job, f"Unknown job type: {job_type}", retry=False)
+                track_job_processed(job_type, "failed", 0.0)
+                logger.error("job_unknown_type", job_id=job['id'], job_type=job_type)
+                return True
+
+            start = time.perf_counter()
+            try:
+                # Past the lock timeout the job is requeued for another worker
+                async with asyncio.timeout(settings.jobs_lock_timeout_seconds):
+                    await handler(job['payload'], db)
+            except Exception as e:
+                duration = time.perf_counter() - start
+                if isinstance(e, TimeoutError):
+                    error = f"Job exceeded JOBS_LOCK_TIMEOUT_SECONDS ({settings.jobs_lock_timeout_seconds}s)"
+                else:
+                    error = str(e)
+                retried = await fail_job(db, job, error)
+                if retried is None:
+                    self._log_expired_claim(job, duration)
+                    return True
+                track_job_processed(job_type, "retried" if retried else "failed", duration)
+                logger.error(
+                    "job_failed",
+                    job_id=job['id'],
+                    job_type=job_type,
+                    attempts=job['attempts'],
+                    will_retry=retried,
+                    error=error
+                )
+                return True
+
+            duration = time.perf_counter() - start
+            if not await complete_job(db, job):
+                self._log_expired_claim(job, duration)
+                return True
+            track_job_processed(job_type, "completed", duration)
+            logger.info("job_completed", job_id=job['id'], job_type=job_type, duration=duration)
+            return True
+
+    @staticmethod
+    def _log_expired_claim(job: dict, duration: float) -> None:
+        """Log the discarded outcome of a run that outlived its lock."""
+        logger.warning(
+            "job_claim_expired",
+            job_id=job['id'],
+            job_type=job['job_type'],
+            attempts=job['attempts'],
+            duration=duration
+        )
+
+    async def run_maintenance(self) -> None:
+        """Requeue stale jobs, enqueue maintenance jobs and sample queue depth."""
+        async with self._require_pool().acquire() as db:
+            await requeue_stale_jobs(db)
+            for job_type in MAINTENANCE_JOBS:
+                # dedupe_key: one pending run across all worker processes
+                await enqueue_job(db, job_type, dedupe_key=job_type)
+            jobs_queued.set(await count_queued_jobs(db))
+
+    async def _wait(self, timeout: float) -> None:
+        """Sleep until timeout or stop(), whichever comes first."""
+        try:
+            await asyncio.wait_for(self._stopping.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _worker_loop(self, index: int) -> None:
+        while not self._stopping.is_set():
+            try:
+                processed = await self.run_once()
+            except (OSError, asyncpg.PostgresError) as e:
+                logger.warning("job_worker_db_error", worker=index, error=str(e))
+                processed = False
+            except Exception as e:
+                # Keep the loop alive: an unexpected error must not stop job processing
+                logger.error("job_worker_error", worker=index, error=str(e), exc_info=True)
+                processed = False
+            if not processed:
+                await self._wait(self._poll_interval)
+
+    async def _scheduler_loop(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                await self.run_maintenance()
+            except (OSError, asyncpg.PostgresError) as e:
+                logger.warning("job_scheduler_db_error", error=str(e))
+            except Exception as e:
+                logger.error("job_scheduler_error", error=str(e), exc_info=True)
+            await self._wait(self._maintenance_interval)
+
+
+# Global worker (started by the application lifespan or app.jobs entry point)
+_worker: JobWorker | None = None
+
+
+def get_job_worker() -> JobWorker:
+    """
+    Get or create the process-wide job worker.
+
+    Returns:
+        JobWorker: Worker configured from JOBS_* settings
+    """
+    global _worker
+
+    if _worker is None:
+        # asyncpg doesn't accept postgresql+asyncpg:// scheme
+        db_url = settings.database_url.replace('postgresql+asyncpg://', 'postgresql://')
+        _worker = JobWorker(
+            db_url,
+            concurrency=settings.jobs_worker_concurrency,
+            poll_interval=settings.jobs_poll_interval_seconds,
+            maintenance_interval=settings.jobs_maintenance_interval_seconds
+        )
+
+    return _worker
+
+
+async def close_job_worker() -> None:
+    """
+    Stop the job worker.
+
+    Should be called at application shutdown, before the database pool closes.
+    """
+    global _worker
+
+    if _worker is not None:
+        await _worker.stop()
+        _worker = None
@@ -4,23 +4,31 @@ Task Manager API - Main Application Entry Point
 FastAPI application with structured logging, CORS middleware, and health check endpoint.
 """
 
+import time
 from contextlib import asynccontextmanager
 from datetime import datetime, timezone
 
 import structlog
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.openapi.utils import get_openapi
 
-from app import __version__
+from app import IMPORT_STARTED_AT, __version__
 from app.commands.router import router as command_router
+from app.compression import CompressionMiddleware
 from app.config import settings
 from app.database import close_db_pool
-from app.routers import admin
+from app.events import close_task_change_broker
+from app.jobs.worker import close_job_worker, get_job_worker
+from app.openapi import API_DESCRIPTION, install_openapi
+from app.routers import admin, events, metrics
+from app.startup_profile import FirstRequestTimer
+from app.tracing import TraceMiddleware, configure_tracing, shutdown_tracing
 
 # Configure structured logging
 structlog.configure(
     processors=[
+        # trace_id bound per request by TraceMiddleware
+        structlog.contextvars.merge_contextvars,
         structlog.stdlib.filter_by_level,
         structlog.stdlib.add_logger_name,
         structlog.stdlib.add_log_level,
@@ -45,8 +53,10 @@ async def lifespan(app: FastAPI):
     Lifespan context manager for FastAPI application.
     
     Handles startup and shutdown events:
-    - Startup: Log configuration
-    - Shutdown: Close database connection pool
+    - Startup: Log configuration, start OpenTelemetry export and background job
+      worker (if enabled)
+    - Shutdown: Stop job worker, close task change listener and database connection
+      pool, flush pending spans
     """
     # Startup
     logger.info(
@@ -54,67 +64,33 @@ async def lifespan(app: FastAPI):
         version="1.0.0",
         environment=settings.environment,
         log_level=settings.log_level,
+        db_pool_min_size=settings.db_pool_min_size,
+        db_pool_max_size=settings.db_pool_max_size,
+        startup_seconds=round(time.perf_counter() - IMPORT_STARTED_AT, 3),
     )
+    # Per worker process: the span export thread does not survive a fork
+    if settings.otel_enabled:
+        configure_tracing(
+            endpoint=settings.otel_exporter_otlp_endpoint,
+            sample_ratio=settings.otel_traces_sampler_ratio
+        )
+    if settings.jobs_worker_enabled:
+        await get_job_worker().start()
 
     yield
 
     # Shutdown
     logger.info("application_shutdown", message="Closing database connections")
+    await close_job_worker()
+    await close_task_change_broker()
     await close_db_pool()
+    shutdown_tracing()
 
 
 # Create FastAPI application instance with lifespan handler
 app = FastAPI(
     title="Task Manager API",
-    description="""
-## Task Manager API for Cat House Platform
-
-A specialized backend service providing task management functionality for the Cat House Platform ecosystem.
-
-### Universal Command Pattern Architecture
-
-This API implements a **Universal Command Pattern** where all task operations flow through a single endpoint (`POST /execute`). 
-Cat House Platform validates user authentication (JWT) and authorization before sending commands to this service.
-
-**Benefits:**
-- Single integration point for Cat House
-- Consistent request/response format
-- Easy to extend with new actions
-- Service-to-service authentication via API keys
-
-### Available Command Actions
-
-1. **create-task** - Create a new task for a user
-2. **list-tasks** - Retrieve all tasks for a user (with optional filtering)
-3. **get-task** - Get a specific task by ID
-4. **update-task** - Update an existing task (partial updates supported)
-5. **delete-task** - Delete a task by ID
-6. **get-stats** - Get task statistics (counts, completion rate, overdue tasks)
-
-### Authentication
-
-All protected endpoints require a **Service API Key** passed via the `X-Service-Key` header. 
-Keys are managed through admin endpoints and must be kept secure on Cat House's backend (never exposed to frontend).
-
-Public endpoints:
-- `GET /health` - Health check for load balancers
-
-Admin endpoints (require `X-Admin-Key` header):
-- `POST /admin/service-keys` - Create new service key
-- `GET /admin/service-keys` - List all service keys
-- `DELETE /admin/service-keys/{key_id}` - Revoke a service key
-
-### Cat House Integration
-
-Cat House Platform acts as the API consumer:
-1. User authenticates with Cat House (JWT token)
-2. Cat House validates user permissions
-3. Cat House sends command to Task Manager API with user_id
-4. Task Manager executes action and returns result
-5. Cat House displays result to user
-
-All commands include `user_id` for data isolation - users only see their own tasks.
-    """,
+    description=API_DESCRIPTION,
     version=__version__,
     contact={
         "name": "Cat House Platform Team",
@@ -124,9 +100,9 @@ All commands include `user_id` for data isolation - users only see their own tas
         "name": "MIT License",
         "url": "https://opensource.org/licenses/MIT"
     },
-    docs_url="/docs",
-    redoc_url="/redoc",
-    openapi_url="/openapi.json",
+    docs_url="/docs" if settings.docs_enabled else None,
+    redoc_url="/redoc" if settings.docs_enabled else None,
+    openapi_url="/openapi.json" if settings.docs_enabled else None,
     lifespan=lifespan
 )
 
@@ -134,6 +110,10 @@ All commands include `user_id` for data isolation - users only see their own tas
 app.include_router(admin.router)
 # Command router implements Universal Command Pattern (POST /execute)
 app.include_router(command_router)
+# Server-Sent Events feed of task changes (GET /events/tasks)
+app.include_router(events.router)
+# Prometheus scrape endpoint (GET /metrics)
+app.include_router(metrics.router)
 
 # CORS configuration from settings
 # Purpose: Restrict cross-origin requests to Cat House Platform origins only
@@ -142,6 +122,8 @@ app.include_router(command_router)
 # Headers:
 #   - X-Service-Key: Service authentication (custom header, triggers CORS preflight)
 #   - Content-Type: JSON payloads (application/json triggers preflight)
+#   - Idempotency-Key: Replay-safe retries for write commands on /execute
+#   - X-Trace-ID: Cat House correlation id, propagated into logs and spans
 # Methods: Limited to specific HTTP methods only (no TRACE, CONNECT, etc.)
 # Credentials: Required for authentication headers (allow_credentials=True)
 # Note: Cat House must keep service key secure on backend (never expose to frontend)
@@ -150,9 +132,26 @@ app.add_middleware(
     allow_origins=settings.get_cors_origins_list(),
     allow_credentials=True,
     allow_methods=["GET", "POST", "PATCH", "DELETE", "OPTIONS"],
-    allow_headers=["X-Service-Key", "Content-Type"],
+    allow_headers=["X-Service-Key", "Content-Type", "Idempotency-Key", "X-Trace-ID"],
 )
 
+# Response compression (brotli/gzip negotiated from Accept-Encoding)
+# Large list-tasks JSON compresses well; streamed SSE responses are never buffered
+if settings.compression_enabled:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.compression_min_size,
+        thread_minimum_size=settings.compression_thread_min_size,
+        gzip_level=settings.compression_gzip_level,
+        brotli_quality=settings.compression_brotli_quality,
+    )
+
+# Logs time_to_first_request once per process (cold-start tracking)
+app.add_middleware(FirstRequestTimer, started_at=IMPORT_STARTED_AT)
+
+# X-Trace-ID propagation and request spans (outermost, so the span covers all middleware)
+app.add_middleware(TraceMiddleware)
+
 
 @app.get("/health", status_code=200, tags=["Health"])
 async def health_check():
@@ -164,44 +163,5 @@ async def health_check():
     }
 
 
-def custom_openapi():
-    """
-    Custom OpenAPI schema generator with enhanced security documentation.
-    
-    Adds security schemes for service-to-service and admin authentication:
-    - ServiceKey: X-Service-Key header for Cat House integration
-    - AdminKey: X-Admin-Key header for key management operations
-    """
-    if app.openapi_schema:
-        return app.openapi_schema
-
-    openapi_schema = get_openapi(
-        title=app.title,
-        version=app.version,
-        description=app.description,
-        routes=app.routes,
-        contact=app.contact,
-        license_info=app.license_info,
-    )
-
-    # Add security schemes for API documentation
-    openapi_schema["components"]["securitySchemes"] = {
-        "ServiceKey": {
-            "type": "apiKey",
-            "in": "header",
-            "name": "X-Service-Key",
-            "description": "Service API key for Cat House Platform integration. Required for all /execute commands."
-        },
-        "AdminKey": {
-            "type": "apiKey",
-            "in": "header",
-            "name": "X-Admin-Key",
-            "description": "Admin key for service key management endpoints. Required for all /admin/* endpoints."
-        }
-    }
-
-    app.openapi_schema = openapi_schema
-    return app.openapi_schema
-
-
-app.openapi = custom_openapi
+# OpenAPI schema is built on first /openapi.json request (or loaded pre-built)
+install_openapi(app, schema_file=settings.openapi_schema_file)
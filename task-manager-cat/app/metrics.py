@@ -0,0 +1,117 @@
+"""
+Task Manager API - Prometheus Metrics
+
+Metric definitions shared across the application. Exposed on GET /metrics.
+"""
+
+from prometheus_client import REGISTRY, Counter, Gauge, Histogram
+
+# Background job queue metrics
+jobs_enqueued_total = Counter(
+    "task_manager_jobs_enqueued_total",
+    "Background jobs enqueued",
+    ["job_type"],
+    registry=REGISTRY,
+)
+
+jobs_processed_total = Counter(
+    "task_manager_jobs_processed_total",
+    "Background job executions by outcome (completed, retried, failed)",
+    ["job_type", "outcome"],
+    registry=REGISTRY,
+)
+
+job_duration_seconds = Histogram(
+    "task_manager_job_duration_seconds",
+    "Background job execution time in seconds",
+    ["job_type"],
+    buckets=[0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0],
+    registry=REGISTRY,
+)
+
+job_queue_lag_seconds = Histogram(
+    "task_manager_job_queue_lag_seconds",
+    "Delay between a job becoming due and a worker claiming it",
+    ["job_type"],
+    buckets=[0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0],
+    registry=REGISTRY,
+)
+
+jobs_queued = Gauge(
+    "task_manager_jobs_queued",
+    "Background jobs waiting to run (sampled by the worker scheduler)",
+    registry=REGISTRY,
+)
+
+# Response compression metrics
+compression_ratio = Histogram(
+    "task_manager_compression_ratio",
+    "Compressed size divided by original size",
+    ["encoding"],
+    buckets=[0.05, 0.1, 0.15, 0.2, 0.3, 0.4, 0.5, 0.75, 1.0],
+    registry=REGISTRY,
+)
+
+compression_cpu_seconds = Histogram(
+    "task_manager_compression_cpu_seconds",
+    "CPU time spent compressing one response body",
+    ["encoding"],
+    buckets=[0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5],
+    registry=REGISTRY,
+)
+
+compression_skipped_total = Counter(
+    "task_manager_compression_skipped_total",
+    "Responses sent uncompressed despite size, by reason (opt_out, streaming, encoded, content_type)",
+    ["reason"],
+    registry=REGISTRY,
+)
+
+# Command execution metrics
+command_cache_lookups_total = Counter(
+    "task_manager_command_cache_lookups_total",
+    "Command cache lookups for cacheable actions, by result (hit, miss)",
+    ["action", "result"],
+    registry=REGISTRY,
+)
+
+command_timeouts_total = Counter(
+    "task_manager_command_timeouts_total",
+    "Commands aborted after exceeding their registered statement timeout",
+    ["action"],
+    registry=REGISTRY,
+)
+
+commands_cancelled_total = Counter(
+    "task_manager_commands_cancelled_total",
+    "Commands cancelled because the client disconnected",
+    ["action"],
+    registry=REGISTRY,
+)
+
+# Admission control metrics
+requests_shed_total = Counter(
+    "task_manager_requests_shed_total",
+    "Requests rejected with 503 under database pool pressure, by reason (wait_time, waiters, acquire_timeout)",
+    ["action", "reason"],
+    registry=REGISTRY,
+)
+
+db_pool_acquire_seconds = Histogram(
+    "task_manager_db_pool_acquire_seconds",
+    "Time spent waiting for a request pool connection",
+    buckets=[0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0],
+    registry=REGISTRY,
+)
+
+db_pool_waiters = Gauge(
+    "task_manager_db_pool_waiters",
+    "Requests currently waiting for a request pool connection",
+    registry=REGISTRY,
+)
+
+
+def track_job_processed(job_type: str, outcome: str, duration: float) -> None:
+    """Track one background job execution."""
+    jobs_processed_total.labels(job_type=job_type, outcome=outcome).inc()
+    job_duration_seconds.labels(job_type=job_type).observe(duration)
@@ -2,16 +2,51 @@
 Task Pydantic models for Task Manager API.
 
 Defines request/response models for task CRUD operations:
+- TaskStatus / TaskPriority: Allowed values, mirroring the task_status and
+  task_priority PostgreSQL enums (labels are stored as-is)
 - TaskCreate: Request payload for create-task action
 - TaskUpdate: Request payload for update-task action (partial updates)
 - TaskResponse: API response format for all task actions
+- TaskSyncRequest: Request payload for sync-tasks action (delta sync)
+- TaskFieldsRequest: Sparse fieldset option shared by list-tasks and get-task
+- TaskListRequest: Request payload for list-tasks action (filters, summary mode)
+- TaskIdRequest: Request payload for delete-task action
+- TaskGetRequest: Request payload for get-task action (task_id + fields)
+- TaskUpdateRequest: Request payload for update-task action (task_id + TaskUpdate)
+- TaskStatsRequest: Request payload for get-stats action (no parameters)
+- TaskStatsBulkRequest: Request payload for get-stats-bulk action (many users)
 """
 
 from datetime import datetime
-from typing import Optional
+from enum import Enum
+from typing import Any, Literal, Optional
 from uuid import UUID
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
+
+# Maximum number of users per get-stats-bulk request
+STATS_BULK_MAX_USERS = 1000
+
+# Task columns selectable with the fields option (the TaskResponse fields)
+TaskField = Literal[
+    "id", "user_id", "title", "description", "status", "priority",
+    "created_at", "completed_at", "due_date", "updated_at"
+]
+
+
+class TaskStatus(str, Enum):
+    """Task status (task_status enum)."""
+    PENDING = "pending"
+    IN_PROGRESS = "in_progress"
+    COMPLETED = "completed"
+
+
+class TaskPriority(str, Enum):
+    """Task priority (task_priority enum, declared in ascending order of urgency)."""
+    LOW = "low"
+    MEDIUM = "medium"
+    HIGH = "high"
+    URGENT = "urgent"
 
 
 class TaskCreate(BaseModel):
@@ -30,11 +65,13 @@ class TaskCreate(BaseModel):
     """
     title: str = Field(..., max_length=500, description="Task title")
     description: Optional[str] = Field(None, description="Task description")
-    status: str = Field("pending", pattern="^(pending|in_progress|completed)$", description="Task status")
-    priority: Optional[str] = Field(None, pattern="^(low|medium|high|urgent)$", description="Task priority")
+    status: TaskStatus = Field(TaskStatus.PENDING, description="Task status")
+    priority: Optional[TaskPriority] = Field(None, description="Task priority")
     due_date: Optional[datetime] = Field(None, description="Task due date (UTC)")
 
     model_config = ConfigDict(
+        use_enum_values=True,
+        validate_default=True,
         json_schema_extra={
             "examples": [
                 {
@@ -70,11 +107,12 @@ class TaskUpdate(BaseModel):
     """
     title: Optional[str] = Field(None, max_length=500, description="Task title")
     description: Optional[str] = Field(None, description="Task description")
-    status: Optional[str] = Field(None, pattern="^(pending|in_progress|completed)$", description="Task status")
-    priority: Optional[str] = Field(None, pattern="^(low|medium|high|urgent)$", description="Task priority")
+    status: Optional[TaskStatus] = Field(None, description="Task status")
+    priority: Optional[TaskPriority] = Field(None, description="Task priority")
     due_date: Optional[datetime] = Field(None, description="Task due date (UTC)")
 
     model_config = ConfigDict(
+        use_enum_values=True,
         json_schema_extra={
             "examples": [
                 {
@@ -111,7 +149,8 @@ class TaskResponse(BaseModel):
             "priority": "high",
             "created_at": "2025-11-12T10:00:00Z",
             "completed_at": null,
-            "due_date": "2025-11-20T10:00:00Z"
+            "due_date": "2025-11-20T10:00:00Z",
+            "updated_at": "2025-11-12T10:00:00Z"
         }
     """
     id: UUID
@@ -123,6 +162,7 @@ class TaskResponse(BaseModel):
     created_at: datetime
     completed_at: Optional[datetime]
     due_date: Optional[datetime]
+    updated_at: Optional[datetime] = None
 
     model_config = ConfigDict(
         from_attributes=True,
@@ -137,7 +177,8 @@ class TaskResponse(BaseModel):
                     "priority": "high",
                     "created_at": "2025-11-13T10:00:00Z",
                     "completed_at": None,
-                    "due_date": "2025-11-15T10:00:00Z"
+                    "due_date": "2025-11-15T10:00:00Z",
+                    "updated_at": "2025-11-13T10:00:00Z"
                 },
                 {
                     "id": "661f9511-f39c-52e5-b827-557766551111",
@@ -148,8 +189,163 @@ class TaskResponse(BaseModel):
                     "priority": "urgent",
                     "created_at": "2025-11-10T08:00:00Z",
                     "completed_at": "2025-11-12T14:30:00Z",
-                    "due_date": "2025-11-14T09:00:00Z"
+                    "due_date": "2025-11-14T09:00:00Z",
+                    "updated_at": "2025-11-12T14:30:00Z"
                 }
             ]
         }
     )
+
+
+class TaskSyncRequest(BaseModel):
+    """
+    Request model for sync-tasks action.
+    
+    The cursor is the opaque value returned by the previous sync-tasks call.
+    Omit it (or send 0) for the initial full sync.
+    
+    Example:
+        {"cursor": 1042, "limit": 200}
+    """
+    cursor: int = Field(0, ge=0, description="Cursor returned by the previous sync (0 = full sync)")
+    limit: int = Field(500, ge=1, le=1000, description="Maximum number of changes to return")
+
+
+class TaskFieldsRequest(BaseModel):
+    """
+    Sparse fieldset option for read actions (list-tasks, get-task).
+    
+    When fields is set, only those columns are selected and returned, so list
+    views can skip the TOASTed description column. Omit it for full tasks.
+    
+    Example:
+        {"fields": ["id", "title", "status", "due_date"]}
+    """
+    fields: Optional[list[TaskField]] = Field(
+        None,
+        min_length=1,
+        description="Task fields to return (default: all fields)"
+    )
+
+    @field_validator("fields")
+    @classmethod
+    def dedupe_fields(cls, value: Optional[list[str]]) -> Optional[list[str]]:
+        """Drop repeated fields, keeping the requested order."""
+        return None if value is None else list(dict.fromkeys(value))
+
+
+class TaskListRequest(TaskFieldsRequest):
+    """
+    Request model for list-tasks action.
+    
+    sort="priority" lists the most urgent tasks first (tasks without a
+    priority last), newest first within a priority.
+    
+    mode returns a summary instead of tasks: "count" (number of matching
+    tasks), "exists" (whether any task matches) or "ids" (matching ids in sort
+    order). fields does not apply to summaries.
+    
+    Examples:
+        {"status": "pending", "sort": "priority", "fields": ["id", "title", "priority"]}
+        {"status": "pending", "mode": "count"}
+    """
+    status: Optional[TaskStatus] = Field(None, description="Filter by status")
+    sort: Literal["created_at", "priority"] = Field("created_at", description="Sort order (newest first or most urgent first)")
+    mode: Optional[Literal["count", "exists", "ids"]] = Field(
+        None,
+        description="Return only a count, an existence flag or task ids (default: tasks)"
+    )
+
+    model_config = ConfigDict(use_enum_values=True)
+
+    @model_validator(mode="after")
+    def reject_fields_with_mode(self) -> "TaskListRequest":
+        """Reject fields in summary modes, which return no task objects."""
+        if self.mode is not None and self.fields is not None:
+            raise ValueError("fields cannot be combined with mode")
+        return self
+
+
+class TaskIdRequest(BaseModel):
+    """
+    Request model for actions addressing a single task (delete-task; get-task
+    uses TaskGetRequest).
+    
+    Example:
+        {"task_id": "550e8400-e29b-41d4-a716-446655440000"}
+    """
+    task_id: UUID = Field(..., description="Task ID")
+
+    @model_validator(mode="before")
+    @classmethod
+    def require_task_id(cls, data: Any) -> Any:
+        """Reject payloads without a task_id."""
+        if isinstance(data, dict) and not data.get("task_id"):
+            raise ValueError("Missing required field: task_id")
+        return data
+
+    @field_validator("task_id", mode="before")
+    @classmethod
+    def parse_task_id(cls, value: Any) -> Any:
+        """Parse task_id strings as UUIDs."""
+        if isinstance(value, UUID):
+            return value
+        try:
+            return UUID(value)
+        except (ValueError, TypeError, AttributeError):
+            raise ValueError("Invalid UUID format for task_id")
+
+
+class TaskGetRequest(TaskFieldsRequest, TaskIdRequest):
+    """
+    Request model for get-task action.
+    
+    Example:
+        {"task_id": "550e8400-e29b-41d4-a716-446655440000", "fields": ["id", "title", "status"]}
+    """
+
+
+class TaskUpdateRequest(TaskUpdate, TaskIdRequest):
+    """
+    Request model for update-task action.
+    
+    Task ID plus the TaskUpdate fields to change; at least one field is required.
+    
+    Example:
+        {"task_id": "550e8400-e29b-41d4-a716-446655440000", "status": "completed"}
+    """
+
+    @model_validator(mode="after")
+    def require_update_fields(self) -> "TaskUpdateRequest":
+        """Reject updates that change nothing."""
+        if not self.update_fields():
+            raise ValueError("No fields provided for update")
+        return self
+
+    def update_fields(self) -> dict:
+        """Return the provided (non-None) fields to update, without task_id."""
+        return self.model_dump(exclude_none=True, exclude={"task_id"})
+
+
+class TaskStatsRequest(BaseModel):
+    """
+    Request model for get-stats action (no parameters).
+    
+    Example:
+        {}
+    """
+
+
+class TaskStatsBulkRequest(BaseModel):
+    """
+    Request model for get-stats-bulk action.
+    
+    Example:
+        {"user_ids": ["user_123", "user_456"]}
+    """
+    user_ids: list[str] = Field(
+        ...,
+        min_length=1,
+        max_length=STATS_BULK_MAX_USERS,
+        description=f"Users to return statistics for (1-{STATS_BULK_MAX_USERS})"
+    )
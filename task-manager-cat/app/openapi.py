@@ -0,0 +1,162 @@
+"""
+Task Manager API - OpenAPI Schema
+
+API description, security schemes and the OpenAPI schema builder.
+
+The schema is never built at import time: it is generated on the first
+request to /openapi.json (or /docs), or loaded from a file exported at
+build time when OPENAPI_SCHEMA_FILE is set. No endpoint other than the
+docs routes depends on it.
+
+Usage (build-time export):
+    python -m app.openapi --output openapi.json
+"""
+
+import argparse
+import json
+from pathlib import Path
+from typing import Any, Optional
+
+import structlog
+from fastapi import FastAPI
+from fastapi.openapi.utils import get_openapi
+
+logger = structlog.get_logger()
+
+API_DESCRIPTION = """## Task Manager API for Cat House Platform
+
+A specialized backend service providing task management functionality for the Cat House Platform ecosystem.
+
+### Universal Command Pattern Architecture
+
+This API implements a **Universal Command Pattern** where all task operations flow through a single endpoint (`POST /execute`). 
+Cat House Platform validates user authentication (JWT) and authorization before sending commands to this service.
+
+**Benefits:**
+- Single integration point for Cat House
+- Consistent request/response format
+- Easy to extend with new actions
+- Service-to-service authentication via API keys
+
+### Available Command Actions
+
+1. **create-task** - Create a new task for a user
+2. **list-tasks** - Retrieve all tasks for a user (with optional filtering)
+3. **get-task** - Get a specific task by ID
+4. **update-task** - Update an existing task (partial updates supported)
+5. **delete-task** - Delete a task by ID
+6. **get-stats** - Get task statistics (counts, completion rate, overdue tasks)
+7. **sync-tasks** - Get only the tasks changed or deleted since a cursor (offline resync)
+
+### Authentication
+
+All protected endpoints require a **Service API Key** passed via the `X-Service-Key` header. 
+Keys are managed through admin endpoints and must be kept secure on Cat House's backend (never exposed to frontend).
+
+Public endpoints:
+- `GET /health` - Health check for load balancers
+- `GET /metrics` - Prometheus metrics
+
+Live updates (require `X-Service-Key` header):
+- `GET /events/tasks?user_id=...` - Server-Sent Events stream of a user's task changes
+
+Admin endpoints (require `X-Admin-Key` header):
+- `POST /admin/service-keys` - Create new service key
+- `GET /admin/service-keys` - List all service keys
+- `DELETE /admin/service-keys/{key_id}` - Revoke a service key
+
+### Cat House Integration
+
+Cat House Platform acts as the API consumer:
+1. User authenticates with Cat House (JWT token)
+2. Cat House validates user permissions
+3. Cat House sends command to Task Manager API with user_id
+4. Task Manager executes action and returns result
+5. Cat House displays result to user
+
+All commands include `user_id` for data isolation - users only see their own tasks.
+"""
+
+# Security schemes for API documentation
+SECURITY_SCHEMES = {
+    "ServiceKey": {
+        "type": "apiKey",
+        "in": "header",
+        "name": "X-Service-Key",
+        "description": "Service API key for Cat House Platform integration. Required for all /execute commands."
+    },
+    "AdminKey": {
+        "type": "apiKey",
+        "in": "header",
+        "name": "X-Admin-Key",
+        "description": "Admin key for service key management endpoints. Required for all /admin/* endpoints."
+    }
+}
+
+
+def build_openapi_schema(app: FastAPI) -> dict[str, Any]:
+    """
+    Generate the OpenAPI schema with enhanced security documentation.
+
+    Adds security schemes for service-to-service and admin authentication:
+    - ServiceKey: X-Service-Key header for Cat House integration
+    - AdminKey: X-Admin-Key header for key management operations
+
+    Args:
+        app: Application whose routes are documented
+
+    Returns:
+        dict: OpenAPI schema
+    """
+    openapi_schema = get_openapi(
+        title=app.title,
+        version=app.version,
+        description=app.description,
+        routes=app.routes,
+        contact=app.contact,
+        license_info=app.license_info,
+    )
+    openapi_schema.setdefault("components", {})["securitySchemes"] = SECURITY_SCHEMES
+    return openapi_schema
+
+
+def install_openapi(app: FastAPI, schema_file: Optional[str] = None) -> None:
+    """
+    Replace app.openapi with a lazy, cached schema loader.
+
+    Args:
+        app: Application to patch
+        schema_file: Pre-built schema exported with `python -m app.openapi`;
+            generated from the routes on first use when None
+    """
+    def openapi() -> dict[str, Any]:
+        if app.openapi_schema:
+            return app.openapi_schema
+
+        schema: dict[str, Any]
+        if schema_file:
+            schema = json.loads(Path(schema_file).read_text(encoding="utf-8"))
+            logger.info("openapi_schema_loaded", schema_file=schema_file)
+        else:
+            schema = build_openapi_schema(app)
+        app.openapi_schema = schema
+        return schema
+
+    app.openapi = openapi  # type: ignore[method-assign]
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    """Export the OpenAPI schema of app.main:app to a JSON file."""
+    parser = argparse.ArgumentParser(description="Export the Task Manager OpenAPI schema")
+    parser.add_argument("--output", default="openapi.json", help="Destination file")
+    args = parser.parse_args(argv)
+
+    from app.main import app
+
+    schema = build_openapi_schema(app)
+    Path(args.output).write_text(json.dumps(schema, indent=2) + "\n", encoding="utf-8")
+    print(f"Wrote OpenAPI schema ({len(schema['paths'])} paths) to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
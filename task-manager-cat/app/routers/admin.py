@@ -10,7 +10,12 @@ from datetime import datetime, timedelta, timezone
 import asyncpg
 from fastapi import APIRouter, Depends, HTTPException, status
 
-from app.auth import generate_service_key, validate_admin_key
+from app.auth import (
+    generate_service_key,
+    hash_service_key,
+    service_key_prefix,
+    validate_admin_key,
+)
 from app.database import get_db
 from app.models.admin import (
     ServiceKeyCreateRequest,
@@ -54,7 +59,8 @@ async def create_service_key(
     
     Security:
         - Requires valid X-Admin-Key header (validated by dependency)
-        - Service key returned ONLY in creation response (store securely)
+        - Service key returned ONLY in creation response (store securely);
+          the database keeps only its prefix and HMAC
         - key_name must be unique (enforced by database constraint)
     
     Example:
@@ -84,17 +90,17 @@ async def create_service_key(
     # Generate service key
     service_key = generate_service_key(request.environment)
 
-    # Insert into database
+    # Insert into database (prefix + hash only, never the plaintext key)
     result = await db.fetchrow("""
-        INSERT INTO service_api_keys (key_name, api_key, active, created_at)
-        VALUES ($1, $2, true, NOW())
-        RETURNING id, key_name, api_key, created_at
-    """, request.key_name, service_key)
+        INSERT INTO service_api_keys (key_name, key_prefix, key_hash, active, created_at)
+        VALUES ($1, $2, $3, true, NOW())
+        RETURNING id, key_name, created_at
+    """, request.key_name, service_key_prefix(service_key), hash_service_key(service_key))
 
     return ServiceKeyCreateResponse(
         id=result['id'],
         key_name=result['key_name'],
-        service_key=result['api_key'],
+        service_key=service_key,
         created_at=result['created_at']
     )
 
@@ -152,7 +158,7 @@ async def rotate_service_key(
     """
     # Fetch current active key
     result = await db.fetchrow("""
-        SELECT api_key FROM service_api_keys
+        SELECT id, key_prefix FROM service_api_keys
         WHERE key_name = $1 AND active = true
         ORDER BY created_at DESC LIMIT 1
     """, request.key_name)
@@ -163,10 +169,8 @@ async def rotate_service_key(
             detail=f"Active service key '{request.key_name}' not found"
         )
 
-    old_key = result['api_key']
-
-    # Extract environment from old key (sk_prod_xxx or sk_dev_xxx)
-    environment = old_key.split('_')[1]
+    # Extract environment from old key prefix (sk_prod_xxx or sk_dev_xxx)
+    environment = result['key_prefix'].split('_')[1]
 
     # Generate new key
     new_key = generate_service_key(environment)
@@ -178,14 +182,14 @@ async def rotate_service_key(
     await db.execute("""
         UPDATE service_api_keys
         SET expires_at = $1
-        WHERE api_key = $2
-    """, expires_at, old_key)
+        WHERE id = $2
+    """, expires_at, result['id'])
 
     # Insert new key (no expiration)
     await db.execute("""
-        INSERT INTO service_api_keys (key_name, api_key, active, created_at)
-        VALUES ($1, $2, true, NOW())
-    """, request.key_name, new_key)
+        INSERT INTO service_api_keys (key_name, key_prefix, key_hash, active, created_at)
+        VALUES ($1, $2, $3, true, NOW())
+    """, request.key_name, service_key_prefix(new_key), hash_service_key(new_key))
 
     return ServiceKeyRotateResponse(
         new_key=new_key,
@@ -0,0 +1,145 @@
+"""
+Task Manager API - Events Router
+
+Server-Sent Events endpoint pushing task changes for a user as they happen.
+Replaces polling list-tasks: subscribers receive one event per write and call
+sync-tasks with their cursor to fetch the changed tasks.
+"""
+
+import asyncio
+import json
+from collections.abc import AsyncIterator
+from typing import Any
+
+import structlog
+from fastapi import APIRouter, Header, Query
+from fastapi.responses import StreamingResponse
+
+from app.auth import validate_service_key
+from app.compression import skip_compression
+from app.config import settings
+from app.database import get_db_pool
+from app.events import TaskChangeBroker, get_task_change_broker
+
+logger = structlog.get_logger()
+
+router = APIRouter(
+    prefix="/events",
+    tags=["Events"]
+)
+
+
+def format_sse(event: dict[str, Any]) -> str:
+    """
+    Format a task change event as a Server-Sent Events message.
+
+    The event id is the sync_version of the change. Clients should call
+    sync-tasks with the cursor of their last sync-tasks response rather than
+    an event id: a write still in flight may get a lower version.
+
+    Args:
+        event: Change event from TaskChangeBroker
+
+    Returns:
+        str: SSE message terminated by a blank line
+
+    Example:
+        >>> format_sse({"op": "created", "task_id": "uuid", "user_id": "u", "sync_version": 7})
+        'id: 7\\nevent: task.created\\ndata: {"op": "created", ...}\\n\\n'
+    """
+    lines = []
+    if event.get("sync_version") is not None:
+        lines.append(f"id: {event['sync_version']}")
+    lines.append(f"event: task.{event['op']}")
+    lines.append(f"data: {json.dumps(event)}")
+    return "\n".join(lines) + "\n\n"
+
+
+async def task_event_stream(broker: TaskChangeBroker, user_id: str) -> AsyncIterator[str]:
+    """
+    Yield SSE messages for a user's task changes until the client disconnects.
+
+    Sends a comment line every heartbeat interval so idle connections are not
+    closed by load balancers. Starlette cancels this generator on disconnect,
+    which removes the subscription.
+    """
+    async with broker.subscribe(user_id) as queue:
+        logger.info("task_events_subscribed", user_id=user_id, subscribers=broker.subscriber_count)
+        try:
+            yield "retry: 3000\n\n"
+            while True:
+                try:
+                    event = await asyncio.wait_for(
+                        queue.get(),
+                        timeout=settings.task_events_heartbeat_seconds
+                    )
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield format_sse(event)
+        finally:
+            logger.info("task_events_unsubscribed", user_id=user_id)
+
+
+@router.get(
+    "/tasks",
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "description": "Stream of task change events (text/event-stream)",
+            "content": {"text/event-stream": {}}
+        },
+        401: {"description": "Invalid or expired service key"}
+    }
+)
+@skip_compression
+async def stream_task_events(
+    user_id: str = Query(..., min_length=1, description="User ID from Cat House"),
+    x_service_key: str = Header(..., alias="X-Service-Key")
+) -> StreamingResponse:
+    """
+    Stream task changes for a user as Server-Sent Events.
+
+    Events:
+        - task.created / task.updated / task.deleted: data is
+          {"user_id", "task_id", "op", "sync_version"}; the SSE id is sync_version
+        - task.resync: events may have been missed; call sync-tasks with the
+          last cursor you stored
+
+    The service key is validated with a short-lived pool connection that is
+    released before streaming starts, so open streams hold no pool slots.
+
+    Args:
+        user_id: User whose task changes are streamed
+        x_service_key: Service API key from X-Service-Key header
+
+    Returns:
+        StreamingResponse: text/event-stream response
+
+    Raises:
+        HTTPException(401): If service key is invalid or expired
+
+    Example:
+        GET /events/tasks?user_id=user_123
+        Headers: X-Service-Key: sk_prod_...
+
+        id: 1057
+        event: task.updated
+        data: {"user_id": "user_123", "task_id": "550e8400-...", "op": "updated", "sync_version": 1057}
+    """
+    pool = await get_db_pool()
+    async with pool.acquire() as db:
+        await validate_service_key(x_service_key=x_service_key, db=db)
+
+    # Open the shared listener before streaming so connection errors surface as 5xx
+    broker = get_task_change_broker()
+    await broker.start()
+
+    return StreamingResponse(
+        task_event_stream(broker, user_id),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+        }
+    )
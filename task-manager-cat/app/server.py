@@ -0,0 +1,194 @@
+"""
+Task Manager API - Production Server Launcher
+
+Runs the API with N uvicorn worker processes (uvloop event loop, httptools
+HTTP parser) and splits a global database connection budget across them.
+
+Usage:
+    python -m app.server                  # WEB_CONCURRENCY workers on PORT
+    python -m app.server --workers 4      # override worker count
+
+Connection budgeting:
+    Every worker process opens its own asyncpg pool, plus the connections of
+    the in-process job worker and the task change listener (and a replica
+    pool of the same size when DATABASE_REPLICA_URL is set). Without a budget,
+    adding workers multiplies connections past the database limit. With
+    DB_CONNECTION_BUDGET set, each worker's request pool max_size is
+
+        (budget // workers - reserved connections per worker) // request pools
+
+    and the result is passed to the workers as DB_POOL_MAX_SIZE/DB_POOL_MIN_SIZE.
+"""
+
+import argparse
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+import structlog
+import uvicorn
+
+from app.config import settings
+
+logger = structlog.get_logger()
+
+
+@dataclass(frozen=True)
+class PoolSizing:
+    """Effective database connection sizing for one worker process."""
+
+    workers: int
+    min_size: int
+    max_size: int
+    reserved_per_worker: int
+    pools_per_worker: int = 1
+
+    @property
+    def connections_per_worker(self) -> int:
+        """Request pools plus reserved connections of one worker."""
+        return self.max_size * self.pools_per_worker + self.reserved_per_worker
+
+    @property
+    def total_connections(self) -> int:
+        """Upper bound of connections opened by all workers."""
+        return self.workers * self.connections_per_worker
+
+
+def reserved_connections_per_worker() -> int:
+    """
+    Count connections a worker opens outside the request pool.
+
+    Returns:
+        int: Task change listener (1) plus the job worker pool
+        (JOBS_WORKER_CONCURRENCY + 1) when JOBS_WORKER_ENABLED
+    """
+    reserved = 1  # TaskChangeBroker LISTEN connection
+    if settings.jobs_worker_enabled:
+        reserved += settings.jobs_worker_concurrency + 1
+    return reserved
+
+
+def compute_pool_sizing(
+    workers: int,
+    budget: Optional[int],
+    reserved_per_worker: int,
+    default_min_size: int,
+    default_max_size: int,
+    pools_per_worker: int = 1
+) -> PoolSizing:
+    """
+    Split a database connection budget across worker processes.
+
+    Args:
+        workers: Number of worker processes
+        budget: Total connections allowed for this deployment (None: no budget,
+            every worker uses default_max_size)
+        reserved_per_worker: Connections each worker opens outside the pool
+        default_min_size: Configured pool min_size (capped at max_size)
+        default_max_size: Configured pool max_size (used without a budget)
+        pools_per_worker: Request pools each worker opens with this sizing
+            (2 with a read replica pool)
+
+    Returns:
+        PoolSizing: Request pool sizing for each worker
+
+    Raises:
+        ValueError: If workers < 1 or the budget leaves no pool connection per worker
+
+    Example:
+        >>> compute_pool_sizing(4, 60, 4, 2, 10)
+        PoolSizing(workers=4, min_size=2, max_size=11, reserved_per_worker=4, pools_per_worker=1)
+
+        With a read replica each worker opens a primary and a replica pool,
+        so the connections left after the reserve are split between them:
+
+        >>> compute_pool_sizing(4, 60, 4, 2, 10, pools_per_worker=2)
+        PoolSizing(workers=4, min_size=2, max_size=5, reserved_per_worker=4, pools_per_worker=2)
+    """
+    if workers < 1:
+        raise ValueError(f"workers must be at least 1, got {workers}")
+
+    if budget is None:
+        max_size = default_max_size
+    else:
+        max_size = (budget // workers - reserved_per_worker) // pools_per_worker
+        if max_size < 1:
+            raise ValueError(
+                f"DB_CONNECTION_BUDGET={budget} is too small for {workers} workers: "
+                f"each worker reserves {reserved_per_worker} connections and needs "
+                f"at least 1 connection in each of its {pools_per_worker} pools "
+                f"({workers * (reserved_per_worker + pools_per_worker)} total)"
+            )
+
+    return PoolSizing(
+        workers=workers,
+        min_size=min(default_min_size, max_size),
+        max_size=max_size,
+        reserved_per_worker=reserved_per_worker,
+        pools_per_worker=pools_per_worker
+    )
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    """Parse launcher command line arguments."""
+    parser = argparse.ArgumentParser(description="Run the Task Manager API (production)")
+    parser.add_argument("--host", default="0.0.0.0", help="Bind address")
+    parser.add_argument("--port", type=int, default=settings.port, help="Bind port")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=settings.web_concurrency,
+        help="Worker processes (default: WEB_CONCURRENCY)"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    """Compute connection sizing, export it to the workers and start uvicorn."""
+    args = parse_args(argv)
+
+    sizing = compute_pool_sizing(
+        workers=args.workers,
+        budget=settings.db_connection_budget,
+        reserved_per_worker=reserved_connections_per_worker(),
+        default_min_size=settings.db_pool_min_size,
+        default_max_size=settings.db_pool_max_size,
+        pools_per_worker=2 if settings.database_replica_url else 1
+    )
+
+    # Worker processes re-read settings from the environment on import
+    os.environ["DB_POOL_MIN_SIZE"] = str(sizing.min_size)
+    os.environ["DB_POOL_MAX_SIZE"] = str(sizing.max_size)
+
+    logger.info(
+        "server_starting",
+        host=args.host,
+        port=args.port,
+        workers=sizing.workers,
+        db_connection_budget=settings.db_connection_budget,
+        db_pool_min_size=sizing.min_size,
+        db_pool_max_size=sizing.max_size,
+        reserved_connections_per_worker=sizing.reserved_per_worker,
+        pools_per_worker=sizing.pools_per_worker,
+        max_total_connections=sizing.total_connections
+    )
+    if settings.db_connection_budget is None:
+        logger.warning(
+            "db_connection_budget_unset",
+            message="Set DB_CONNECTION_BUDGET to cap total connections across workers",
+            max_total_connections=sizing.total_connections
+        )
+
+    uvicorn.run(
+        "app.main:app",
+        host=args.host,
+        port=args.port,
+        workers=sizing.workers,
+        loop="uvloop",
+        http="httptools",
+        log_level=settings.log_level.lower()
+    )
+
+
+if __name__ == "__main__":
+    main()
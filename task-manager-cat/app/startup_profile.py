@@ -0,0 +1,232 @@
+"""
+Task Manager API - Startup Profiling
+
+Cold-start measurements for autoscaled deployments:
+    - Import time per module (python -X importtime, run in a subprocess)
+    - Time to import app.main, to answer the first request and to build the
+      OpenAPI schema (measured in-process, no database required)
+    - FirstRequestTimer middleware logging time_to_first_request once per
+      worker process in production
+
+Usage:
+    python -m app.startup_profile            # report, 20 slowest imports
+    python -m app.startup_profile --top 50
+"""
+
+import argparse
+import asyncio
+import re
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+import structlog
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = structlog.get_logger()
+
+# "import time: self [us] | cumulative | imported package" lines on stderr
+IMPORTTIME_PATTERN = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+
+@dataclass(frozen=True)
+class ImportTiming:
+    """Import cost of one module in microseconds."""
+
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(output: str) -> list[ImportTiming]:
+    """
+    Parse `python -X importtime` stderr output.
+
+    Args:
+        output: stderr of the interpreter run with -X importtime
+
+    Returns:
+        list[ImportTiming]: One entry per imported module, in import order
+
+    Example:
+        >>> parse_importtime("import time:       120 |        450 |   app.config")
+        [ImportTiming(module='app.config', self_us=120, cumulative_us=450, depth=1)]
+    """
+    timings = []
+    for line in output.splitlines():
+        match = IMPORTTIME_PATTERN.match(line)
+        if match is None:
+            continue
+        self_us, cumulative_us, indent, module = match.groups()
+        timings.append(ImportTiming(
+            module=module,
+            self_us=int(self_us),
+            cumulative_us=int(cumulative_us),
+            depth=max(len(indent) - 1, 0) // 2
+        ))
+    return timings
+
+
+def profile_imports(module: str = "app.main") -> list[ImportTiming]:
+    """
+    Import a module in a fresh interpreter with -X importtime.
+
+    Args:
+        module: Module to import
+
+    Returns:
+        list[ImportTiming]: Per-module import timings
+
+    Raises:
+        RuntimeError: If the import fails (e.g. missing DATABASE_URL)
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+    return parse_importtime(result.stderr)
+
+
+async def _first_request(app: ASGIApp, path: str) -> int:
+    """Send one GET request straight to the ASGI app and return the status."""
+    status = 0
+    request_sent = False
+
+    async def receive() -> Message:
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        # The client never disconnects while the response is sent
+        await asyncio.Event().wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message: Message) -> None:
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    scope: Scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"localhost")],
+        "client": ("127.0.0.1", 0),
+        "server": ("localhost", 80),
+    }
+    await app(scope, receive, send)
+    return status
+
+
+def measure_cold_start(path: str = "/health") -> dict[str, float]:
+    """
+    Measure import, first request and OpenAPI generation in this process.
+
+    Must run in a fresh interpreter: app.main must not be imported yet.
+
+    Returns:
+        dict: import_seconds, first_request_seconds, openapi_seconds
+    """
+    if "app.main" in sys.modules:
+        raise RuntimeError("measure_cold_start() needs a process that has not imported app.main")
+
+    start = time.perf_counter()
+    from app.main import app
+    imported = time.perf_counter()
+
+    status = asyncio.run(_first_request(app, path))
+    if status != 200:
+        raise RuntimeError(f"GET {path} returned {status}")
+    first_request = time.perf_counter()
+
+    app.openapi()
+    openapi_built = time.perf_counter()
+
+    return {
+        "import_seconds": imported - start,
+        "first_request_seconds": first_request - imported,
+        "openapi_seconds": openapi_built - first_request,
+    }
+
+
+class FirstRequestTimer:
+    """
+    Log the time from process start to the first completed HTTP request.
+
+    After the first request the middleware is a single attribute check.
+
+    Args:
+        app: ASGI application
+        started_at: time.perf_counter() value taken at process start
+    """
+
+    def __init__(self, app: ASGIApp, started_at: float) -> None:
+        self.app = app
+        self.started_at = started_at
+        self.logged = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if self.logged or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        self.logged = True
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            logger.info(
+                "time_to_first_request",
+                seconds=round(time.perf_counter() - self.started_at, 3),
+                path=scope["path"]
+            )
+
+
+def format_report(timings: list[ImportTiming], cold_start: dict[str, float], top: int) -> str:
+    """Render the startup profile as plain text."""
+    total_us = sum(t.cumulative_us for t in timings if t.depth == 0)
+    lines = [
+        "Task Manager API - startup profile",
+        "",
+        f"import app.main (in-process):   {cold_start['import_seconds'] * 1000:8.1f} ms",
+        f"first request:                  {cold_start['first_request_seconds'] * 1000:8.1f} ms",
+        f"OpenAPI schema (lazy, /docs):   {cold_start['openapi_seconds'] * 1000:8.1f} ms",
+        f"imports measured (-X importtime): {len(timings)} modules",
+        "",
+        f"Top {top} modules by cumulative import time:",
+        f"{'cumulative ms':>14} {'self ms':>9} {'% total':>8}  module",
+    ]
+    for timing in sorted(timings, key=lambda t: t.cumulative_us, reverse=True)[:top]:
+        share = timing.cumulative_us / total_us * 100 if total_us else 0.0
+        lines.append(
+            f"{timing.cumulative_us / 1000:14.1f} {timing.self_us / 1000:9.1f} {share:7.1f}%  "
+            f"{'  ' * timing.depth}{timing.module}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    """Print the startup profiling report."""
+    parser = argparse.ArgumentParser(description="Profile Task Manager API cold start")
+    parser.add_argument("--top", type=int, default=20, help="Modules to list")
+    parser.add_argument("--path", default="/health", help="Path of the first request")
+    args = parser.parse_args(argv)
+
+    timings = profile_imports()
+    cold_start = measure_cold_start(args.path)
+    print(format_report(timings, cold_start, args.top))
+
+
+if __name__ == "__main__":
+    main()
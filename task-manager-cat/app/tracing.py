@@ -0,0 +1,276 @@
+"""
+Task Manager API - Distributed Tracing
+
+Propagates Cat House's X-Trace-ID through the service and emits OpenTelemetry
+spans exported over OTLP, so request latency can be attributed across nginx,
+the Cat House proxy and Task Manager.
+
+Trace context:
+    - X-Trace-ID is read from the request (generated when missing), echoed on
+      the response and bound to every structlog line as trace_id
+    - Cat House trace ids are UUIDs (correlation_id_middleware), i.e. 128 bits:
+      root spans reuse them as the OpenTelemetry trace id, so a collector
+      search for the X-Trace-ID finds the Task Manager spans
+    - A W3C traceparent header, when present, takes precedence as parent
+
+Spans (when OTEL_ENABLED=true):
+    - "<METHOD> <path>": Server span per HTTP request (TraceMiddleware)
+    - execute_command: POST /execute routing, cache and idempotency handling
+    - handler <action>: The action handler
+    - One span per asyncpg query (opentelemetry-instrumentation-asyncpg)
+
+OpenTelemetry packages are optional and imported only when tracing is
+enabled, so a disabled tracer adds no import time and span() is a no-op.
+"""
+
+import functools
+from collections.abc import Awaitable, Callable, Iterator, Mapping
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Optional, TypeVar
+from uuid import UUID, uuid4
+
+import structlog
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = structlog.get_logger()
+
+TRACE_ID_HEADER = "X-Trace-ID"
+TRACEPARENT_HEADER = "traceparent"
+SERVICE_NAME = "task-manager-api"
+
+F = TypeVar("F", bound=Callable[..., Awaitable[Any]])
+
+# X-Trace-ID of the request being handled
+_trace_id: ContextVar[str] = ContextVar("trace_id", default="")
+
+_tracer: Any = None
+_provider: Any = None
+_asyncpg_instrumentor: Any = None
+
+
+def current_trace_id() -> str:
+    """X-Trace-ID of the current request ("" outside requests)."""
+    return _trace_id.get()
+
+
+def tracing_enabled() -> bool:
+    """Whether spans are being recorded and exported."""
+    return _tracer is not None
+
+
+def _trace_id_int(value: str) -> Optional[int]:
+    """OpenTelemetry trace id for a UUID-shaped X-Trace-ID (None otherwise)."""
+    try:
+        trace_id = UUID(value).int
+    except ValueError:
+        return None
+    return trace_id or None
+
+
+def configure_tracing(
+    endpoint: str,
+    sample_ratio: float = 1.0,
+    service_name: str = SERVICE_NAME,
+    exporter: Any = None
+) -> bool:
+    """
+    Install the tracer provider, OTLP exporter and asyncpg instrumentation.
+
+    Args:
+        endpoint: OTLP gRPC collector endpoint (e.g. http://localhost:4317)
+        sample_ratio: Fraction of new traces recorded; sampled parents are always followed
+        service_name: service.name resource attribute
+        exporter: Span exporter to use instead of OTLP (exported synchronously; tests)
+
+    Returns:
+        bool: False when the OpenTelemetry packages are not installed
+    """
+    global _tracer, _provider, _asyncpg_instrumentor
+
+    try:
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor, SimpleSpanProcessor
+        from opentelemetry.sdk.trace.id_generator import RandomIdGenerator
+        from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+    except ImportError:
+        logger.warning("tracing_unavailable", reason="opentelemetry-sdk is not installed")
+        return False
+
+    class RequestIdGenerator(RandomIdGenerator):
+        """Use the request's X-Trace-ID as trace id of root spans."""
+
+        def generate_trace_id(self) -> int:
+            return _trace_id_int(_trace_id.get()) or super().generate_trace_id()
+
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": service_name}),
+        sampler=ParentBased(TraceIdRatioBased(sample_ratio)),
+        id_generator=RequestIdGenerator()
+    )
+    if exporter is not None:
+        provider.add_span_processor(SimpleSpanProcessor(exporter))
+    else:
+        from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
+
+        # Batched export keeps the collector round trip off the request path
+        provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter(endpoint=endpoint)))
+
+    try:
+        from opentelemetry.instrumentation.asyncpg import AsyncPGInstrumentor
+    except ImportError:
+        logger.warning("asyncpg_tracing_unavailable", reason="opentelemetry-instrumentation-asyncpg is not installed")
+    else:
+        _asyncpg_instrumentor = AsyncPGInstrumentor()
+        _asyncpg_instrumentor.instrument(tracer_provider=provider)
+
+    _provider = provider
+    _tracer = provider.get_tracer(service_name)
+    logger.info(
+        "tracing_configured",
+        endpoint=endpoint if exporter is None else None,
+        sample_ratio=sample_ratio
+    )
+    return True
+
+
+def shutdown_tracing() -> None:
+    """Flush pending spans and remove the asyncpg instrumentation."""
+    global _tracer, _provider, _asyncpg_instrumentor
+
+    if _asyncpg_instrumentor is not None:
+        _asyncpg_instrumentor.uninstrument()
+    if _provider is not None:
+        _provider.shutdown()
+    _tracer = _provider = _asyncpg_instrumentor = None
+
+
+@contextmanager
+def span(
+    name: str,
+    attributes: Optional[Mapping[str, Any]] = None,
+    *,
+    server: bool = False,
+    parent: Any = None
+) -> Iterator[Any]:
+    """
+    Record a span around a block (yields None when tracing is disabled).
+
+    Args:
+        name: Span name
+        attributes: Span attributes (dotted OpenTelemetry names); None values are dropped
+        server: Mark the span as SERVER kind (incoming requests)
+        parent: OpenTelemetry context to use as parent instead of the current span
+
+    Example:
+        >>> with span("handler list-tasks", {"command.action": "list-tasks"}):
+        ...     await handler(...)
+    """
+    if _tracer is None:
+        yield None
+        return
+
+    from opentelemetry.trace import SpanKind
+
+    with _tracer.start_as_current_span(
+        name,
+        context=parent,
+        kind=SpanKind.SERVER if server else SpanKind.INTERNAL,
+        attributes={key: value for key, value in (attributes or {}).items() if value is not None}
+    ) as current:
+        yield current
+
+
+def set_span_attributes(**attributes: Any) -> None:
+    """Add attributes to the current span (no-op when tracing is disabled)."""
+    if _tracer is None:
+        return
+
+    from opentelemetry import trace
+
+    trace.get_current_span().set_attributes(
+        {key: value for key, value in attributes.items() if value is not None}
+    )
+
+
+def traced(name: str) -> Callable[[F], F]:
+    """
+    Record a span around every call of an async function.
+
+    The wrapper keeps the signature (functools.wraps), so FastAPI endpoints
+    can be decorated below the route decorator.
+
+    Example:
+        >>> @router.post("/execute")
+        ... @traced("execute_command")
+        ... async def execute_command(...): ...
+    """
+    def decorator(function: F) -> F:
+        @functools.wraps(function)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with span(name):
+                return await function(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def _parent_context(headers: Headers) -> Any:
+    """Remote parent from a W3C traceparent header (None without one)."""
+    if _tracer is None or TRACEPARENT_HEADER not in headers:
+        return None
+
+    from opentelemetry.trace.propagation.tracecontext import TraceContextTextMapPropagator
+
+    return TraceContextTextMapPropagator().extract({TRACEPARENT_HEADER: headers[TRACEPARENT_HEADER]})
+
+
+class TraceMiddleware:
+    """
+    Bind the request's X-Trace-ID and record its server span.
+
+    The trace id is taken from X-Trace-ID (a UUID is generated when missing),
+    bound to structlog as trace_id for every log line of the request, and
+    returned in the X-Trace-ID response header.
+
+    Args:
+        app: ASGI application
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        trace_id = headers.get(TRACE_ID_HEADER) or str(uuid4())
+        token = _trace_id.set(trace_id)
+        bound = structlog.contextvars.bind_contextvars(trace_id=trace_id)
+
+        async def send_with_trace_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)[TRACE_ID_HEADER] = trace_id
+                set_span_attributes(**{"http.status_code": message["status"]})
+            await send(message)
+
+        try:
+            with span(
+                f"{scope['method']} {scope['path']}",
+                {
+                    "http.method": scope["method"],
+                    "http.target": scope["path"],
+                    "cat_house.trace_id": trace_id,
+                },
+                server=True,
+                parent=_parent_context(headers)
+            ):
+                await self.app(scope, receive, send_with_trace_id)
+        finally:
+            structlog.contextvars.reset_contextvars(**bound)
+            _trace_id.reset(token)
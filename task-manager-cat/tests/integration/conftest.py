@@ -12,7 +12,7 @@ import pytest
 import pytest_asyncio
 from httpx import ASGITransport, AsyncClient
 
-from app.auth import generate_service_key
+from app.auth import generate_service_key, hash_service_key, service_key_prefix
 from app.database import close_db_pool
 from app.main import app
 
@@ -45,12 +45,16 @@ async def test_db():
 
     # Clean up test data before test
     await conn.execute("DELETE FROM tasks WHERE user_id LIKE 'test-%'")
+    await conn.execute("DELETE FROM task_tombstones WHERE user_id LIKE 'test-%'")
+    await conn.execute("DELETE FROM idempotency_keys WHERE key_name LIKE 'test-%'")
     await conn.execute("DELETE FROM service_api_keys WHERE key_name LIKE 'test-%'")
 
     yield conn
 
     # Clean up test data after test
     await conn.execute("DELETE FROM tasks WHERE user_id LIKE 'test-%'")
+    await conn.execute("DELETE FROM task_tombstones WHERE user_id LIKE 'test-%'")
+    await conn.execute("DELETE FROM idempotency_keys WHERE key_name LIKE 'test-%'")
     await conn.execute("DELETE FROM service_api_keys WHERE key_name LIKE 'test-%'")
     await conn.close()
 
@@ -89,9 +93,9 @@ async def test_service_key(test_db):
     key = generate_service_key('dev')
     await test_db.execute(
         """
-        INSERT INTO service_api_keys (key_name, api_key, active)
-        VALUES ($1, $2, $3)
+        INSERT INTO service_api_keys (key_name, key_prefix, key_hash, active)
+        VALUES ($1, $2, $3, $4)
         """,
-        "test-client", key, True
+        "test-client", service_key_prefix(key), hash_service_key(key), True
     )
     return key
@@ -7,8 +7,10 @@ Tests admin endpoints with real database and HTTP requests.
 import asyncpg
 import pytest
 import pytest_asyncio
+from fastapi import HTTPException
 from httpx import ASGITransport, AsyncClient
 
+from app.auth import hash_service_key, validate_service_key
 from app.database import close_db_pool
 from app.main import app
 
@@ -70,7 +72,9 @@ class TestCreateServiceKey:
         )
         assert row is not None
         assert row['active'] is True
-        assert row['api_key'] == data["service_key"]
+        assert row['key_prefix'] == data["service_key"][:16]
+        assert row['key_hash'] == hash_service_key(data["service_key"])
+        assert 'api_key' not in row.keys()
         assert row['expires_at'] is None
 
     @pytest.mark.asyncio
@@ -162,16 +166,16 @@ class TestRotateServiceKey:
 
         # Verify old key has expiration set
         old_row = await test_db.fetchrow(
-            "SELECT * FROM service_api_keys WHERE api_key = $1",
-            old_key
+            "SELECT * FROM service_api_keys WHERE key_hash = $1",
+            hash_service_key(old_key)
         )
         assert old_row is not None
         assert old_row['expires_at'] is not None
 
         # Verify new key exists without expiration
         new_row = await test_db.fetchrow(
-            "SELECT * FROM service_api_keys WHERE api_key = $1",
-            data["new_key"]
+            "SELECT * FROM service_api_keys WHERE key_hash = $1",
+            hash_service_key(data["new_key"])
         )
         assert new_row is not None
         assert new_row['expires_at'] is None
@@ -252,16 +256,12 @@ class TestRotateServiceKey:
 
         # Manually set old key to expired (past date)
         await test_db.execute(
-            "UPDATE service_api_keys SET expires_at = NOW() - INTERVAL '1 day' WHERE api_key = $1",
-            old_key
+            "UPDATE service_api_keys SET expires_at = NOW() - INTERVAL '1 day' WHERE key_hash = $1",
+            hash_service_key(old_key)
         )
 
         # Verify old key no longer validates
-        result = await test_db.fetchrow("""
-            SELECT key_name FROM service_api_keys 
-            WHERE api_key = $1 
-            AND active = true 
-            AND (expires_at IS NULL OR expires_at > NOW())
-        """, old_key)
-
-        assert result is None, "Expired key should not validate"
+        with pytest.raises(HTTPException) as exc_info:
+            await validate_service_key(x_service_key=old_key, db=test_db)
+
+        assert exc_info.value.status_code == 401, "Expired key should not validate"
@@ -0,0 +1,24 @@
+"""
+Integration tests for the primary key write benchmark (app/id_benchmark.py).
+
+Runs a small benchmark against the development database.
+"""
+
+import pytest
+
+from app.id_benchmark import TABLE_PREFIX, run_benchmark
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_benchmark_reports_both_key_types(test_db):
+    """Test both key types are measured and scratch tables are removed."""
+    results = await run_benchmark(test_db, rows=500, batch=50)
+
+    assert [result.key_type for result in results] == ["uuid_v4", "uuid_v7"]
+    assert all(result.rows_per_second > 0 and result.index_bytes > 0 for result in results)
+
+    leftover = await test_db.fetchval(
+        "SELECT COUNT(*) FROM pg_tables WHERE tablename LIKE $1", f"{TABLE_PREFIX}%"
+    )
+    assert leftover == 0
@@ -0,0 +1,82 @@
+"""
+Integration tests for Idempotency-Key replay on POST /execute.
+
+Tests end-to-end retry behaviour with a real database:
+- Retried create-task returns the original task without creating a duplicate
+- Reusing a key for a different request is rejected
+- A claim left by a crashed request is taken over once its lease expires
+
+Uses real database and HTTP client from conftest.py fixtures.
+"""
+
+import pytest
+from httpx import AsyncClient
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_retried_create_task_is_not_duplicated(client: AsyncClient, test_service_key: str, test_db):
+    """Test a retried create-task replays the stored response."""
+    user_id = "test-idempotency-user-1"
+    headers = {"X-Service-Key": test_service_key, "Idempotency-Key": "test-create-1"}
+    body = {"action": "create-task", "user_id": user_id, "payload": {"title": "Buy milk"}}
+
+    # Act - Send the same request twice
+    first = await client.post("/execute", headers=headers, json=body)
+    retry = await client.post("/execute", headers=headers, json=body)
+
+    # Assert
+    assert first.status_code == 200
+    assert "Idempotent-Replayed" not in first.headers
+    assert retry.status_code == 200
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert retry.json()["data"]["id"] == first.json()["data"]["id"]
+
+    count = await test_db.fetchval("SELECT COUNT(*) FROM tasks WHERE user_id = $1", user_id)
+    assert count == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_key_reused_for_different_request_returns_422(client: AsyncClient, test_service_key: str, test_db):
+    """Test an Idempotency-Key cannot be reused with a different body."""
+    user_id = "test-idempotency-user-2"
+    headers = {"X-Service-Key": test_service_key, "Idempotency-Key": "test-create-2"}
+
+    first = await client.post("/execute", headers=headers, json={
+        "action": "create-task", "user_id": user_id, "payload": {"title": "Buy milk"}
+    })
+    reused = await client.post("/execute", headers=headers, json={
+        "action": "create-task", "user_id": user_id, "payload": {"title": "Walk the cat"}
+    })
+
+    assert first.status_code == 200
+    assert reused.status_code == 422
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_expired_lease_of_crashed_request_is_taken_over(client: AsyncClient, test_service_key: str, test_db):
+    """Test a retry runs once the lease of a claim without a response has expired."""
+    user_id = "test-idempotency-user-3"
+    headers = {"X-Service-Key": test_service_key, "Idempotency-Key": "test-create-3"}
+    body = {"action": "create-task", "user_id": user_id, "payload": {"title": "Buy milk"}}
+    key_name = "test-client"
+
+    # Arrange - A crashed request left its claim behind, lease already expired
+    await test_db.execute("""
+        INSERT INTO idempotency_keys (key_name, idempotency_key, request_hash, expires_at)
+        VALUES ($1, 'test-create-3', repeat('0', 64), NOW() - INTERVAL '1 second')
+    """, key_name)
+
+    # Act
+    retry = await client.post("/execute", headers=headers, json=body)
+
+    # Assert - The retry ran the write and its response is kept for the replay window
+    assert retry.status_code == 200
+    assert "Idempotent-Replayed" not in retry.headers
+    expires_in = await test_db.fetchval("""
+        SELECT EXTRACT(EPOCH FROM expires_at - NOW()) FROM idempotency_keys
+        WHERE key_name = $1 AND idempotency_key = 'test-create-3' AND response IS NOT NULL
+    """, key_name)
+    assert expires_in > 3600
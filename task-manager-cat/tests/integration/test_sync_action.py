@@ -0,0 +1,117 @@
+"""
+Integration tests for sync-tasks command action.
+
+Tests end-to-end delta sync through POST /execute endpoint:
+- Initial sync returns all tasks and a cursor
+- Resync returns only tasks updated since the cursor
+- Deleted tasks are reported through tombstones
+- Paging with limit/has_more
+
+Uses real database and HTTP client from conftest.py fixtures.
+"""
+
+import pytest
+from httpx import AsyncClient
+
+
+async def execute(client: AsyncClient, service_key: str, action: str, user_id: str, payload: dict) -> dict:
+    """Send a command to /execute and return the response data."""
+    response = await client.post(
+        "/execute",
+        headers={"X-Service-Key": service_key},
+        json={"action": action, "user_id": user_id, "payload": payload}
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert body["success"] is True
+    return body["data"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_sync_returns_only_changes_since_cursor(client: AsyncClient, test_service_key: str, test_db):
+    """Test resync returns updated and deleted tasks only."""
+    user_id = "test-sync-user-1"
+
+    # Arrange - Create three tasks and take an initial sync
+    created = [
+        await execute(client, test_service_key, "create-task", user_id, {"title": f"Task {i}"})
+        for i in range(3)
+    ]
+    initial = await execute(client, test_service_key, "sync-tasks", user_id, {})
+    assert len(initial["tasks"]) == 3
+    assert initial["deleted_ids"] == []
+    assert initial["has_more"] is False
+
+    # Act - Update one task, delete another, then resync from the cursor
+    await execute(client, test_service_key, "update-task", user_id, {
+        "task_id": created[0]["id"],
+        "status": "completed"
+    })
+    await execute(client, test_service_key, "delete-task", user_id, {"task_id": created[1]["id"]})
+    delta = await execute(client, test_service_key, "sync-tasks", user_id, {"cursor": initial["cursor"]})
+
+    # Assert
+    assert [task["id"] for task in delta["tasks"]] == [created[0]["id"]]
+    assert delta["tasks"][0]["status"] == "completed"
+    assert delta["deleted_ids"] == [created[1]["id"]]
+    assert delta["cursor"] > initial["cursor"]
+
+    # Nothing changed after the latest cursor
+    empty = await execute(client, test_service_key, "sync-tasks", user_id, {"cursor": delta["cursor"]})
+    assert empty == {"tasks": [], "deleted_ids": [], "cursor": delta["cursor"], "has_more": False}
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_sync_pages_with_limit(client: AsyncClient, test_service_key: str, test_db):
+    """Test paging through changes with a small limit."""
+    user_id = "test-sync-user-2"
+    for i in range(5):
+        await execute(client, test_service_key, "create-task", user_id, {"title": f"Task {i}"})
+
+    seen = []
+    cursor = 0
+    while True:
+        page = await execute(client, test_service_key, "sync-tasks", user_id, {"cursor": cursor, "limit": 2})
+        seen.extend(task["id"] for task in page["tasks"])
+        cursor = page["cursor"]
+        if not page["has_more"]:
+            break
+
+    assert len(seen) == 5
+    assert len(set(seen)) == 5
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_sync_user_isolation(client: AsyncClient, test_service_key: str, test_db):
+    """Test sync only returns the requesting user's changes."""
+    await execute(client, test_service_key, "create-task", "test-sync-user-a", {"title": "A"})
+    await execute(client, test_service_key, "create-task", "test-sync-user-b", {"title": "B"})
+
+    result = await execute(client, test_service_key, "sync-tasks", "test-sync-user-a", {})
+
+    assert [task["title"] for task in result["tasks"]] == ["A"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_sync_cursor_waits_for_in_flight_writer(client: AsyncClient, test_service_key: str, test_db):
+    """Test a write committing after a later one is not skipped by the cursor."""
+    user_id = "test-sync-user-3"
+
+    # Arrange - A slow writer takes its version first and commits last
+    slow_writer = test_db.transaction()
+    await slow_writer.start()
+    await test_db.execute("INSERT INTO tasks (user_id, title) VALUES ($1, 'Slow')", user_id)
+    await execute(client, test_service_key, "create-task", user_id, {"title": "Fast"})
+
+    # Act - Sync while the slow writer is still open, then after it commits
+    during = await execute(client, test_service_key, "sync-tasks", user_id, {})
+    await slow_writer.commit()
+    after = await execute(client, test_service_key, "sync-tasks", user_id, {"cursor": during["cursor"]})
+
+    # Assert - Nothing after the open transaction is handed out before it commits
+    assert during["tasks"] == []
+    assert sorted(task["title"] for task in after["tasks"]) == ["Fast", "Slow"]
@@ -272,6 +272,108 @@ async def test_list_tasks_with_status_filter(client: AsyncClient, test_service_k
         assert task["status"] == "pending"
 
 
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_list_tasks_sort_by_priority(client: AsyncClient, test_service_key: str, test_db):
+    """Test sort=priority returns the most urgent tasks first, unprioritized last."""
+    # Arrange - Create test tasks
+    await test_db.execute(
+        """
+        INSERT INTO tasks (user_id, title, priority)
+        VALUES 
+            ('test-user-list-sort', 'Low', 'low'),
+            ('test-user-list-sort', 'None', NULL),
+            ('test-user-list-sort', 'Urgent', 'urgent'),
+            ('test-user-list-sort', 'Medium', 'medium')
+        """
+    )
+
+    payload = {
+        "action": "list-tasks",
+        "user_id": "test-user-list-sort",
+        "payload": {"sort": "priority"}
+    }
+
+    # Act
+    response = await client.post(
+        "/execute",
+        headers={"X-Service-Key": test_service_key},
+        json=payload
+    )
+
+    # Assert
+    assert response.status_code == 200
+    titles = [task["title"] for task in response.json()["data"]["tasks"]]
+    assert titles == ["Urgent", "Medium", "Low", "None"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_list_tasks_sparse_fields(client: AsyncClient, test_service_key: str, test_db):
+    """Test fields returns only the requested columns of each task."""
+    # Arrange - Create a task with a description
+    await test_db.execute(
+        """
+        INSERT INTO tasks (user_id, title, description, status)
+        VALUES ('test-user-list-fields', 'Sparse', 'Long description', 'pending')
+        """
+    )
+
+    payload = {
+        "action": "list-tasks",
+        "user_id": "test-user-list-fields",
+        "payload": {"fields": ["id", "title", "status", "due_date"]}
+    }
+
+    # Act
+    response = await client.post(
+        "/execute",
+        headers={"X-Service-Key": test_service_key},
+        json=payload
+    )
+
+    # Assert
+    assert response.status_code == 200
+    tasks = response.json()["data"]["tasks"]
+    assert len(tasks) == 1
+    assert set(tasks[0]) == {"id", "title", "status", "due_date"}
+    assert tasks[0]["title"] == "Sparse"
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_list_tasks_summary_modes(client: AsyncClient, test_service_key: str, test_db):
+    """Test count, exists and ids modes return summaries of the filtered tasks."""
+    # Arrange - Create test tasks
+    await test_db.execute(
+        """
+        INSERT INTO tasks (user_id, title, status)
+        VALUES 
+            ('test-user-list-modes', 'Pending', 'pending'),
+            ('test-user-list-modes', 'Done', 'completed')
+        """
+    )
+
+    async def list_tasks(payload: dict) -> dict:
+        response = await client.post(
+            "/execute",
+            headers={"X-Service-Key": test_service_key},
+            json={"action": "list-tasks", "user_id": "test-user-list-modes", "payload": payload}
+        )
+        assert response.status_code == 200
+        return response.json()["data"]
+
+    # Act & Assert
+    assert await list_tasks({"mode": "count"}) == {"count": 2}
+    assert await list_tasks({"status": "in_progress", "mode": "exists"}) == {"exists": False}
+
+    ids = await list_tasks({"status": "pending", "mode": "ids"})
+    pending_id = await test_db.fetchval(
+        "SELECT id FROM tasks WHERE user_id = 'test-user-list-modes' AND status = 'pending'"
+    )
+    assert ids == {"ids": [str(pending_id)], "count": 1}
+
+
 @pytest.mark.asyncio
 @pytest.mark.integration
 async def test_list_tasks_empty_result(client: AsyncClient, test_service_key: str, test_db):
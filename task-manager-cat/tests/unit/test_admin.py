@@ -1,7 +1,7 @@
 """
 Unit tests for admin functionality.
 
-Tests service key generation and admin key validation in isolation.
+Tests service key generation, hashing and admin key validation in isolation.
 """
 
 import re
@@ -10,7 +10,12 @@ from unittest.mock import patch
 import pytest
 from fastapi import HTTPException
 
-from app.auth import generate_service_key, validate_admin_key
+from app.auth import (
+    generate_service_key,
+    hash_service_key,
+    service_key_prefix,
+    validate_admin_key,
+)
 
 
 class TestServiceKeyGeneration:
@@ -49,6 +54,33 @@ class TestServiceKeyGeneration:
         assert "Must be 'prod' or 'dev'" in str(exc_info.value)
 
 
+class TestServiceKeyHashing:
+    """Test service_key_prefix and hash_service_key functions"""
+
+    def test_prefix_keeps_environment_and_first_hex_chars(self):
+        """Verify prefix is sk_prod_ plus 8 hex chars"""
+        key = generate_service_key('prod')
+        assert service_key_prefix(key) == key[:16]
+        assert service_key_prefix(key).startswith('sk_prod_')
+
+    def test_hash_is_deterministic_hex(self):
+        """Verify hash is a stable 64 char hex digest"""
+        key = generate_service_key('dev')
+        assert hash_service_key(key) == hash_service_key(key)
+        assert re.match(r'^[0-9a-f]{64}$', hash_service_key(key))
+
+    def test_hash_depends_on_secret(self):
+        """Verify API_KEY_SECRET keys the hash"""
+        key = generate_service_key('prod')
+        with patch('app.auth.settings') as mock_settings:
+            mock_settings.api_key_secret = 'secret-one'
+            first = hash_service_key(key)
+            mock_settings.api_key_secret = 'secret-two'
+            second = hash_service_key(key)
+
+        assert first != second
+
+
 class TestAdminKeyValidation:
     """Test validate_admin_key dependency"""
 
@@ -0,0 +1,164 @@
+"""
+Unit tests for admission control (app/admission.py).
+
+Tests:
+- PoolWaitTracker waiters, oldest-waiter age and decaying average
+- AdmissionPolicy tiers (expensive reads shed before writes/cheap reads)
+- POST /execute sheds with 503 + Retry-After before acquiring a connection
+- get_db turns an acquire timeout into 503
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi import HTTPException
+
+from app import admission
+from app.admission import AdmissionPolicy, PoolWaitTracker
+from app.auth import validate_service_key
+from app.commands.router import get_command_db
+from app.database import get_db
+
+POLICY = AdmissionPolicy(
+    expensive_wait_seconds=0.1,
+    expensive_max_waiters=10,
+    max_wait_seconds=1.0,
+    max_waiters=50
+)
+
+
+@pytest.mark.unit
+class TestPoolWaitTracker:
+    """Test PoolWaitTracker."""
+
+    def test_counts_waiters_and_oldest_wait(self):
+        """Test an in-flight waiter is counted and its age reported."""
+        tracker = PoolWaitTracker()
+
+        with patch("app.admission.time.monotonic", return_value=10.0):
+            waiting = tracker.waiting()
+            waiting.__enter__()
+        with patch("app.admission.time.monotonic", return_value=10.5):
+            assert tracker.waiters == 1
+            assert tracker.wait_seconds() == pytest.approx(0.5)
+            waiting.__exit__(None, None, None)
+
+        assert tracker.waiters == 0
+
+    def test_average_decays_when_idle(self):
+        """Test the moving average fades so shedding stops once the pool recovers."""
+        tracker = PoolWaitTracker(alpha=1.0, decay_seconds=1.0)
+
+        with patch("app.admission.time.monotonic", return_value=100.0):
+            tracker.observe(0.8)
+            assert tracker.wait_seconds() == pytest.approx(0.8)
+        with patch("app.admission.time.monotonic", return_value=105.0):
+            assert tracker.wait_seconds() < 0.01
+
+
+@pytest.mark.unit
+class TestAdmissionPolicy:
+    """Test AdmissionPolicy tiers."""
+
+    def test_idle_pool_admits_everything(self):
+        """Test no request is shed without pressure."""
+        assert POLICY.check(0.0, 0, shed_first=True) is None
+        assert POLICY.check(0.0, 0, shed_first=False) is None
+
+    def test_expensive_reads_shed_first(self):
+        """Test moderate pressure sheds only expensive reads."""
+        assert POLICY.check(0.2, 0, shed_first=True) == admission.REASON_WAIT_TIME
+        assert POLICY.check(0.2, 0, shed_first=False) is None
+        assert POLICY.check(0.0, 10, shed_first=True) == admission.REASON_WAITERS
+        assert POLICY.check(0.0, 10, shed_first=False) is None
+
+    def test_everything_shed_at_max(self):
+        """Test writes and cheap reads are shed at the max thresholds."""
+        assert POLICY.check(1.0, 0, shed_first=False) == admission.REASON_WAIT_TIME
+        assert POLICY.check(0.0, 50, shed_first=False) == admission.REASON_WAITERS
+
+
+@pytest.mark.unit
+class TestExecuteAdmission:
+    """Test admission on POST /execute."""
+
+    def post(self, action: str, wait_seconds: float):
+        """Send one /execute request with the pool wait estimate forced."""
+        from fastapi.testclient import TestClient
+
+        from app.main import app
+
+        tracker = PoolWaitTracker()
+        tracker.wait_seconds = lambda: wait_seconds
+        db_requested = MagicMock()
+
+        def mock_get_db():
+            db_requested()
+            return AsyncMock()
+
+        app.dependency_overrides[validate_service_key] = lambda: "test-service"
+        app.dependency_overrides[get_command_db] = mock_get_db
+        try:
+            with patch.object(admission, "_tracker", tracker), patch.object(admission, "_policy", POLICY):
+                response = TestClient(app).post(
+                    "/execute",
+                    headers={"X-Service-Key": "sk_dev_test_key"},
+                    json={"action": action, "user_id": "user_123", "payload": {}}
+                )
+        finally:
+            app.dependency_overrides.clear()
+        return response, db_requested
+
+    def test_expensive_read_shed_with_retry_after(self):
+        """Test list-tasks is rejected before a connection is requested."""
+        response, db_requested = self.post("list-tasks", wait_seconds=0.5)
+
+        assert response.status_code == 503
+        assert response.headers["retry-after"] == "1"
+        db_requested.assert_not_called()
+
+    def test_cheap_read_admitted_under_moderate_pressure(self):
+        """Test get-task still runs when only expensive reads are shed."""
+        response, db_requested = self.post("get-task", wait_seconds=0.5)
+
+        assert response.status_code != 503
+        db_requested.assert_called_once()
+
+    def test_write_shed_at_max_wait(self):
+        """Test writes are shed once the max wait is exceeded."""
+        response, _ = self.post("create-task", wait_seconds=2.0)
+
+        assert response.status_code == 503
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestGetDbAcquireTimeout:
+    """Test get_db acquire timeout handling."""
+
+    async def test_acquire_timeout_returns_503(self):
+        """Test a pool that yields no connection in time raises 503."""
+        pool = MagicMock()
+        pool.acquire = AsyncMock(side_effect=asyncio.TimeoutError)
+
+        with patch("app.database.get_db_pool", AsyncMock(return_value=pool)):
+            with pytest.raises(HTTPException) as exc_info:
+                await get_db().__anext__()
+
+        assert exc_info.value.status_code == 503
+        assert exc_info.value.headers["Retry-After"] == "1"
+
+    async def test_connection_released_after_request(self):
+        """Test the acquired connection is returned to the pool."""
+        connection = object()
+        pool = MagicMock()
+        pool.acquire = AsyncMock(return_value=connection)
+        pool.release = AsyncMock()
+
+        with patch("app.database.get_db_pool", AsyncMock(return_value=pool)):
+            generator = get_db()
+            assert await generator.__anext__() is connection
+            await generator.aclose()
+
+        pool.release.assert_awaited_once_with(connection)
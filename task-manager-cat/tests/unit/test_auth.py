@@ -18,7 +18,7 @@ import pytest
 import pytest_asyncio
 from fastapi import HTTPException
 
-from app.auth import validate_service_key
+from app.auth import hash_service_key, service_key_prefix, validate_service_key
 from app.config import settings
 
 
@@ -43,14 +43,19 @@ async def test_db():
     await conn.close()
 
 
+async def insert_service_key(db, key_name: str, service_key: str, active: bool = True, expires_at=None):
+    """Insert a service key the way the admin endpoints store it (prefix + hash)."""
+    await db.execute("""
+        INSERT INTO service_api_keys (key_name, key_prefix, key_hash, active, expires_at)
+        VALUES ($1, $2, $3, $4, $5)
+    """, key_name, service_key_prefix(service_key), hash_service_key(service_key), active, expires_at)
+
+
 @pytest.mark.asyncio
 async def test_validate_service_key_valid(test_db):
     """Test that valid active service key returns key_name."""
     # Insert test key
-    await test_db.execute("""
-        INSERT INTO service_api_keys (key_name, api_key, active, expires_at)
-        VALUES ('test-client-valid', 'sk_test_valid_key_abc123', true, NULL)
-    """)
+    await insert_service_key(test_db, "test-client-valid", "sk_test_valid_key_abc123", active=True, expires_at=None)
 
     # Validate key
     key_name = await validate_service_key(
@@ -79,10 +84,7 @@ async def test_validate_service_key_invalid(test_db):
 async def test_validate_service_key_inactive(test_db):
     """Test that inactive service key (active=false) raises 401."""
     # Insert inactive key
-    await test_db.execute("""
-        INSERT INTO service_api_keys (key_name, api_key, active, expires_at)
-        VALUES ('test-client-inactive', 'sk_test_inactive_key_xyz789', false, NULL)
-    """)
+    await insert_service_key(test_db, "test-client-inactive", "sk_test_inactive_key_xyz789", active=False, expires_at=None)
 
     # Try to validate inactive key
     with pytest.raises(HTTPException) as exc_info:
@@ -100,10 +102,7 @@ async def test_validate_service_key_expired(test_db):
     """Test that expired service key (expires_at < NOW) raises 401."""
     # Insert expired key (expired 1 day ago)
     expired_time = datetime.now(timezone.utc) - timedelta(days=1)
-    await test_db.execute("""
-        INSERT INTO service_api_keys (key_name, api_key, active, expires_at)
-        VALUES ('test-client-expired', 'sk_test_expired_key_def456', true, $1)
-    """, expired_time)
+    await insert_service_key(test_db, "test-client-expired", "sk_test_expired_key_def456", active=True, expires_at=expired_time)
 
     # Try to validate expired key
     with pytest.raises(HTTPException) as exc_info:
@@ -121,10 +120,7 @@ async def test_validate_service_key_not_expired(test_db):
     """Test that valid key with future expiration succeeds."""
     # Insert key expiring in 30 days
     future_time = datetime.now(timezone.utc) + timedelta(days=30)
-    await test_db.execute("""
-        INSERT INTO service_api_keys (key_name, api_key, active, expires_at)
-        VALUES ('test-client-future', 'sk_test_future_key_ghi789', true, $1)
-    """, future_time)
+    await insert_service_key(test_db, "test-client-future", "sk_test_future_key_ghi789", active=True, expires_at=future_time)
 
     # Validate key with future expiration
     key_name = await validate_service_key(
@@ -139,10 +135,7 @@ async def test_validate_service_key_not_expired(test_db):
 async def test_validate_service_key_null_expiration(test_db):
     """Test that key with NULL expires_at (non-expiring) succeeds."""
     # Insert non-expiring key
-    await test_db.execute("""
-        INSERT INTO service_api_keys (key_name, api_key, active, expires_at)
-        VALUES ('test-client-permanent', 'sk_test_permanent_key_jkl012', true, NULL)
-    """)
+    await insert_service_key(test_db, "test-client-permanent", "sk_test_permanent_key_jkl012", active=True, expires_at=None)
 
     # Validate non-expiring key
     key_name = await validate_service_key(
@@ -151,3 +144,31 @@ async def test_validate_service_key_null_expiration(test_db):
     )
 
     assert key_name == "test-client-permanent"
+
+
+@pytest.mark.asyncio
+async def test_validate_service_key_same_prefix_wrong_secret(test_db):
+    """Test that a key sharing a stored key's prefix but not its hash raises 401."""
+    await insert_service_key(test_db, "test-client-prefix", "sk_test_prefix_key_mno345")
+
+    with pytest.raises(HTTPException) as exc_info:
+        await validate_service_key(
+            x_service_key="sk_test_prefix_key_mno999",
+            db=test_db
+        )
+
+    assert exc_info.value.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_service_key_not_stored_in_plaintext(test_db):
+    """Test that only the prefix and hash of a key are stored."""
+    await insert_service_key(test_db, "test-client-hashed", "sk_test_hashed_key_pqr678")
+
+    row = await test_db.fetchrow(
+        "SELECT * FROM service_api_keys WHERE key_name = 'test-client-hashed'"
+    )
+
+    assert row['key_prefix'] == "sk_test_hashed_k"
+    assert len(row['key_hash']) == 64
+    assert "sk_test_hashed_key_pqr678" not in dict(row).values()
@@ -0,0 +1,164 @@
+"""
+Unit tests for typed command parsing (app/commands/models.py).
+
+Tests:
+- Command selects the typed command model from the action
+- Unknown actions fall back to the generic CommandRequest
+- POST /execute returns 400 for payload errors and 422 for envelope errors
+- Typed and generic commands share idempotency fingerprints
+- OpenAPI publishes one payload schema per action
+"""
+
+from unittest.mock import AsyncMock
+from uuid import UUID
+
+import pytest
+from pydantic import ValidationError
+
+from app.auth import validate_service_key
+from app.commands.models import (
+    Command,
+    CommandRequest,
+    CreateTaskCommand,
+    GetTaskCommand,
+    command_payload,
+)
+from app.commands.router import ACTION_HANDLERS, get_command_db
+from app.idempotency import request_fingerprint
+from app.models.task import TaskCreate, TaskListRequest
+
+TASK_ID = "550e8400-e29b-41d4-a716-446655440000"
+
+
+@pytest.mark.unit
+class TestCommandParsing:
+    """Test the Command discriminated union."""
+
+    def test_builtin_action_parsed_into_typed_command(self):
+        """Test the payload of a built-in action is parsed with its model."""
+        command = Command.model_validate({
+            "action": "create-task",
+            "user_id": "user_123",
+            "payload": {"title": "Buy milk", "priority": "high"}
+        }).root
+
+        assert isinstance(command, CreateTaskCommand)
+        assert isinstance(command.payload, TaskCreate)
+        assert command.payload.status == "pending"
+
+    def test_task_id_parsed_as_uuid(self):
+        """Test task_id arrives in handlers as a UUID."""
+        command = Command.model_validate({
+            "action": "get-task",
+            "user_id": "user_123",
+            "payload": {"task_id": TASK_ID}
+        }).root
+
+        assert isinstance(command, GetTaskCommand)
+        assert command.payload.task_id == UUID(TASK_ID)
+
+    def test_optional_payload_defaults(self):
+        """Test actions without required parameters accept a missing payload."""
+        command = Command.model_validate({"action": "list-tasks", "user_id": "user_123"}).root
+
+        assert isinstance(command.payload, TaskListRequest)
+        assert command_payload(command) == {}
+
+    def test_unknown_action_falls_back_to_generic(self):
+        """Test actions without a typed model keep a dict payload."""
+        command = Command.model_validate({
+            "action": "custom-action",
+            "user_id": "user_123",
+            "payload": {"key": "value"}
+        }).root
+
+        assert type(command) is CommandRequest
+        assert command.payload == {"key": "value"}
+
+    def test_payload_errors_located_under_action(self):
+        """Test payload errors carry the action and field in their location."""
+        with pytest.raises(ValidationError) as exc_info:
+            Command.model_validate({"action": "create-task", "user_id": "user_123", "payload": {}})
+
+        assert exc_info.value.errors()[0]["loc"] == ("create-task", "payload", "title")
+
+    def test_fingerprint_independent_of_parsing_model(self):
+        """Test a typed command and the equivalent CommandRequest hash the same."""
+        raw = {"action": "create-task", "user_id": "user_123", "payload": {"title": "Buy milk"}}
+
+        typed = Command.model_validate(raw).root
+        generic = CommandRequest(**raw)
+
+        assert request_fingerprint(typed) == request_fingerprint(generic)
+
+
+@pytest.mark.unit
+class TestExecuteValidation:
+    """Test /execute validation responses."""
+
+    def post(self, body: dict):
+        """Send one /execute request with mocked auth and database."""
+        from fastapi.testclient import TestClient
+
+        from app.main import app
+
+        app.dependency_overrides[validate_service_key] = lambda: "test-service"
+        app.dependency_overrides[get_command_db] = lambda: AsyncMock()
+        try:
+            return TestClient(app).post("/execute", headers={"X-Service-Key": "sk_dev_test_key"}, json=body)
+        finally:
+            app.dependency_overrides.clear()
+
+    def test_invalid_payload_returns_400_before_handler(self):
+        """Test payload errors are rejected with 400 without running the handler."""
+        handler = AsyncMock(return_value={})
+        original = ACTION_HANDLERS["create-task"]
+        ACTION_HANDLERS["create-task"] = handler
+        try:
+            response = self.post({
+                "action": "create-task",
+                "user_id": "user_123",
+                "payload": {"title": "Buy milk", "status": "invalid_status"}
+            })
+        finally:
+            ACTION_HANDLERS["create-task"] = original
+
+        assert response.status_code == 400
+        assert response.json()["detail"].startswith("status:")
+        handler.assert_not_awaited()
+
+    def test_missing_task_id_returns_400(self):
+        """Test model-level payload errors keep their message."""
+        response = self.post({"action": "delete-task", "user_id": "user_123", "payload": {}})
+
+        assert response.status_code == 400
+        assert response.json()["detail"] == "payload: Missing required field: task_id"
+
+    def test_envelope_error_returns_422(self):
+        """Test a missing user_id is still reported as 422."""
+        response = self.post({"action": "get-task", "payload": {"task_id": TASK_ID}})
+
+        assert response.status_code == 422
+
+    def test_handler_receives_typed_payload(self):
+        """Test handlers of built-in actions get the parsed payload model."""
+        handler = AsyncMock(return_value={})
+        original = ACTION_HANDLERS["get-task"]
+        ACTION_HANDLERS["get-task"] = handler
+        try:
+            response = self.post({"action": "get-task", "user_id": "user_123", "payload": {"task_id": TASK_ID}})
+        finally:
+            ACTION_HANDLERS["get-task"] = original
+
+        assert response.status_code == 200
+        assert handler.await_args.args[1].task_id == UUID(TASK_ID)
+
+    def test_openapi_has_schema_per_action(self):
+        """Test the /execute request body documents each action's payload."""
+        from app.main import app
+
+        schemas = app.openapi()["components"]["schemas"]
+
+        variants = {ref["$ref"].rsplit("/", 1)[-1] for ref in schemas["Command"]["oneOf"]}
+        assert {"CreateTaskCommand", "UpdateTaskCommand", "CommandRequest"} <= variants
+        assert schemas["UpdateTaskCommand"]["properties"]["payload"]["$ref"].endswith("/TaskUpdateRequest")
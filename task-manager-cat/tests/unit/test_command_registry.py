@@ -0,0 +1,343 @@
+"""
+Unit tests for the action registry and metadata-driven routing.
+
+Tests:
+- ActionSpec validation and ActionRegistry / ACTION_HANDLERS behaviour
+- CommandCache TTL, eviction and per-user invalidation
+- POST /execute applies timeouts, caching and replica routing from metadata
+- Statement timeouts (SET LOCAL) and cancellation on client disconnect
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import asyncpg
+import pytest
+from fastapi import HTTPException
+
+from app.auth import validate_service_key
+from app.commands import cache as cache_module
+from app.commands.cache import CommandCache, cache_key
+from app.commands.registry import COST_EXPENSIVE, ActionRegistry, ActionSpec
+from app.commands.router import (
+    ACTION_HANDLERS,
+    ACTION_REGISTRY,
+    ClientDisconnectedError,
+    get_command_db,
+    run_until_disconnect,
+)
+from app.database import statement_timeout
+
+
+async def noop_handler(user_id: str, payload: dict, db) -> dict:
+    return {}
+
+
+@pytest.mark.unit
+class TestActionRegistry:
+    """Test ActionSpec and ActionRegistry."""
+
+    def test_register_defaults(self):
+        """Test actions registered without metadata are cheap, uncached writes."""
+        spec = ActionRegistry().register("noop", noop_handler)
+
+        assert spec.read_only is False
+        assert spec.idempotent is False
+        assert spec.cacheable is False
+        assert spec.statement_timeout_ms > 0
+
+    def test_invalid_metadata_rejected(self):
+        """Test inconsistent metadata fails at registration."""
+        with pytest.raises(ValueError):
+            ActionSpec(name="x", handler=noop_handler, cost_class="huge")
+        with pytest.raises(ValueError):
+            ActionSpec(name="x", handler=noop_handler, statement_timeout_ms=0)
+        with pytest.raises(ValueError):
+            ActionSpec(name="x", handler=noop_handler, cache_ttl_seconds=5)
+        with pytest.raises(ValueError):
+            ActionSpec(name="x", handler=noop_handler, read_only=True, idempotent=True)
+        with pytest.raises(ValueError):
+            ActionSpec(name="x", handler=noop_handler, replica_ok=True)
+
+    def test_handler_view_keeps_metadata(self):
+        """Test replacing a handler through ACTION_HANDLERS keeps the action's metadata."""
+        registry = ActionRegistry()
+        registry.register("report", noop_handler, read_only=True, cost_class=COST_EXPENSIVE, cache_ttl_seconds=5)
+        replacement = AsyncMock()
+
+        registry.handlers["report"] = replacement
+
+        spec = registry.get("report")
+        assert spec.handler is replacement
+        assert spec.cost_class == COST_EXPENSIVE
+        assert spec.cache_ttl_seconds == 5
+
+        del registry.handlers["report"]
+        assert "report" not in registry
+
+    def test_replace_handler_requires_registered_action(self):
+        """Test replace_handler keeps metadata and rejects unknown actions."""
+        registry = ActionRegistry()
+        registry.register("report", noop_handler, read_only=True, replica_ok=True)
+        replacement = AsyncMock()
+
+        spec = registry.replace_handler("report", replacement)
+
+        assert spec.handler is replacement
+        assert spec.replica_ok
+        with pytest.raises(KeyError):
+            registry.replace_handler("missing", replacement)
+
+    def test_builtin_action_metadata(self):
+        """Test the built-in actions declare reads, writes and caching."""
+        writes = {spec.name for spec in ACTION_REGISTRY if not spec.read_only}
+        idempotent = {spec.name for spec in ACTION_REGISTRY if spec.idempotent}
+
+        assert writes == {"create-task", "update-task", "delete-task"}
+        assert idempotent == writes
+        assert ACTION_REGISTRY.get("get-stats").cacheable
+        assert {spec.name for spec in ACTION_REGISTRY if spec.replica_ok} == {"get-stats", "get-stats-bulk"}
+        assert {spec.name for spec in ACTION_REGISTRY if spec.admin_only} == {"get-stats-bulk"}
+        assert not ACTION_REGISTRY.get("list-tasks").cacheable
+        assert set(ACTION_HANDLERS) == {spec.name for spec in ACTION_REGISTRY}
+
+
+@pytest.mark.unit
+class TestCommandCache:
+    """Test CommandCache."""
+
+    def test_payload_order_does_not_change_key(self):
+        """Test equivalent payloads share a cache key."""
+        assert cache_key("u", "get-stats", {"a": 1, "b": 2}) == cache_key("u", "get-stats", {"b": 2, "a": 1})
+
+    def test_entries_expire(self):
+        """Test entries are not returned after their TTL."""
+        cache = CommandCache()
+        key = cache_key("u", "get-stats", {})
+
+        with patch("app.commands.cache.time.monotonic", return_value=100.0):
+            cache.set(key, {"total_tasks": 1}, ttl_seconds=5)
+            assert cache.get(key) == {"total_tasks": 1}
+        with patch("app.commands.cache.time.monotonic", return_value=105.0):
+            assert cache.get(key) is None
+        assert len(cache) == 0
+
+    def test_invalidate_user(self):
+        """Test invalidation drops only the written user's entries."""
+        cache = CommandCache()
+        cache.set(cache_key("u1", "get-stats", {}), {}, 60)
+        cache.set(cache_key("u2", "get-stats", {}), {}, 60)
+
+        cache.invalidate_user("u1")
+
+        assert cache.get(cache_key("u1", "get-stats", {})) is None
+        assert cache.get(cache_key("u2", "get-stats", {})) == {}
+
+    def test_oldest_entry_evicted(self):
+        """Test the cache stays within max_entries."""
+        cache = CommandCache(max_entries=2)
+        for user_id in ("u1", "u2", "u3"):
+            cache.set(cache_key(user_id, "get-stats", {}), {}, 60)
+
+        assert len(cache) == 2
+        assert cache.get(cache_key("u1", "get-stats", {})) is None
+
+
+@pytest.mark.unit
+class TestMetadataRouting:
+    """Test POST /execute applies registry metadata."""
+
+    @pytest.fixture(autouse=True)
+    def fresh_cache(self):
+        """Give each test an empty command cache."""
+        with patch.object(cache_module, "_cache", CommandCache()):
+            yield
+
+    def post(self, action: str, db=None, user_id: str = "user_123"):
+        """Send one /execute request with mocked auth and database."""
+        from fastapi.testclient import TestClient
+
+        from app.main import app
+
+        db = db if db is not None else AsyncMock()
+
+        app.dependency_overrides[validate_service_key] = lambda: "test-service"
+        app.dependency_overrides[get_command_db] = lambda: db
+        try:
+            return TestClient(app).post(
+                "/execute",
+                headers={"X-Service-Key": "sk_dev_test_key"},
+                json={"action": action, "user_id": user_id, "payload": {}}
+            )
+        finally:
+            app.dependency_overrides.clear()
+
+    @pytest.fixture
+    def register(self):
+        """Register temporary actions and remove them afterwards."""
+        names = []
+
+        def _register(name, handler, **metadata):
+            names.append(name)
+            return ACTION_REGISTRY.register(name, handler, **metadata)
+
+        yield _register
+        for name in names:
+            ACTION_REGISTRY.unregister(name)
+
+    def test_timeout_returns_504(self, register):
+        """Test an action exceeding statement_timeout_ms is cancelled with 504."""
+        async def slow_handler(user_id, payload, db):
+            await asyncio.sleep(5)
+
+        register("test-slow", slow_handler, read_only=True, statement_timeout_ms=10)
+
+        with patch("app.commands.router.ACTION_TIMEOUT_GRACE_SECONDS", 0):
+            response = self.post("test-slow")
+
+        assert response.status_code == 504
+        assert "10 ms" in response.json()["detail"]
+
+    def test_cacheable_action_served_from_cache(self, register):
+        """Test a cacheable read runs once and is then served from cache."""
+        handler = AsyncMock(return_value={"total_tasks": 3})
+        register("test-cached", handler, read_only=True, cache_ttl_seconds=60)
+
+        first = self.post("test-cached")
+        second = self.post("test-cached")
+
+        assert first.json()["data"] == second.json()["data"] == {"total_tasks": 3}
+        handler.assert_awaited_once()
+
+    def test_write_invalidates_user_cache(self, register):
+        """Test a successful write drops the user's cached reads."""
+        read = AsyncMock(return_value={"total_tasks": 3})
+        register("test-cached", read, read_only=True, cache_ttl_seconds=60)
+        register("test-write", AsyncMock(return_value={}))
+
+        self.post("test-cached")
+        self.post("test-write")
+        self.post("test-cached")
+
+        assert read.await_count == 2
+
+    def test_replica_ok_action_uses_replica(self, register):
+        """Test only replica_ok reads run on the replica pool when configured."""
+        replica_connection = AsyncMock(name="replica")
+        primary_connection = AsyncMock(name="primary")
+        pool = MagicMock()
+        pool.acquire = AsyncMock(return_value=replica_connection)
+        pool.release = AsyncMock()
+        seen = []
+
+        async def read_handler(user_id, payload, db):
+            seen.append(db)
+            return {}
+
+        register("test-lagging-read", read_handler, read_only=True, replica_ok=True)
+        register("test-read", read_handler, read_only=True)
+        register("test-write", read_handler)
+
+        with patch("app.commands.router.settings.database_replica_url", "postgresql://replica/db"), \
+                patch("app.commands.router.get_replica_pool", AsyncMock(return_value=pool)):
+            self.post("test-lagging-read", db=primary_connection)
+            self.post("test-read", db=primary_connection)
+            self.post("test-write", db=primary_connection)
+
+        assert seen == [replica_connection, primary_connection, primary_connection]
+        pool.release.assert_awaited_once_with(replica_connection)
+
+    @pytest.mark.asyncio
+    async def test_replica_action_holds_no_primary_connection(self, register):
+        """Test get_command_db skips the primary pool for replica actions only."""
+        register("test-lagging-read", AsyncMock(), read_only=True, replica_ok=True)
+        register("test-read", AsyncMock(), read_only=True)
+        primary_connection = AsyncMock(name="primary")
+        primary_pool = MagicMock()
+        primary_pool.acquire = AsyncMock(return_value=primary_connection)
+        primary_pool.release = AsyncMock()
+
+        def request_for(action):
+            request = MagicMock()
+            request.json = AsyncMock(return_value={"action": action, "user_id": "u", "payload": {}})
+            return request
+
+        with patch("app.commands.router.settings.database_replica_url", "postgresql://replica/db"), \
+                patch("app.commands.router.get_db_pool", AsyncMock(return_value=primary_pool)):
+            assert [db async for db in get_command_db(request_for("test-lagging-read"))] == [None]
+            primary_pool.acquire.assert_not_called()
+
+            assert [db async for db in get_command_db(request_for("test-read"))] == [primary_connection]
+            primary_pool.release.assert_awaited_once_with(primary_connection)
+
+    def test_statement_timeout_applied_per_action(self, register):
+        """Test the handler runs in a transaction with the action's statement_timeout."""
+        db = AsyncMock()
+        register("test-read", AsyncMock(return_value={}), read_only=True, statement_timeout_ms=200)
+
+        self.post("test-read", db=db)
+
+        statements = [call.args[0] for call in db.execute.call_args_list]
+        assert statements == ["BEGIN; SET LOCAL statement_timeout = 200", "COMMIT"]
+
+    def test_postgres_statement_timeout_returns_504(self, register):
+        """Test a QueryCanceledError wrapped by the handler still maps to 504."""
+        async def cancelled_handler(user_id, payload, db):
+            try:
+                raise asyncpg.QueryCanceledError("canceling statement due to statement timeout")
+            except Exception:
+                raise HTTPException(status_code=500, detail="Internal server error")
+
+        register("test-cancelled", cancelled_handler, read_only=True)
+
+        response = self.post("test-cancelled")
+
+        assert response.status_code == 504
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestCancellation:
+    """Test statement_timeout() and run_until_disconnect()."""
+
+    async def test_statement_timeout_rolls_back_on_error(self):
+        """Test the transaction is rolled back when the block fails."""
+        db = AsyncMock()
+
+        with pytest.raises(RuntimeError):
+            async with statement_timeout(db, 500):
+                raise RuntimeError("boom")
+
+        assert db.execute.call_args_list[-1].args[0] == "ROLLBACK"
+
+    async def test_disconnect_cancels_command(self):
+        """Test a client disconnect cancels the running coroutine."""
+        request = MagicMock()
+        request.receive = AsyncMock(return_value={"type": "http.disconnect"})
+        cancelled = asyncio.Event()
+
+        async def long_query():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        with pytest.raises(ClientDisconnectedError):
+            await run_until_disconnect(request, long_query())
+
+        assert cancelled.is_set()
+
+    async def test_result_returned_while_connected(self):
+        """Test the coroutine result is returned when the client stays."""
+        request = MagicMock()
+
+        async def never_disconnect():
+            await asyncio.sleep(10)
+
+        request.receive = never_disconnect
+
+        async def quick():
+            return {"ok": True}
+
+        assert await run_until_disconnect(request, quick()) == {"ok": True}
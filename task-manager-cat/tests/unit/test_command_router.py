@@ -9,14 +9,14 @@ Tests command routing infrastructure without database dependencies:
 """
 
 from datetime import datetime, timezone
+from unittest.mock import AsyncMock
 
 import pytest
 from pydantic import ValidationError
 
 from app.auth import validate_service_key
 from app.commands.models import CommandRequest, CommandResponse
-from app.commands.router import ACTION_HANDLERS
-from app.database import get_db
+from app.commands.router import ACTION_HANDLERS, get_command_db
 
 
 @pytest.mark.unit
@@ -157,7 +157,7 @@ class TestCommandRouterAuthentication:
 
         # Override dependencies
         app.dependency_overrides[validate_service_key] = mock_validate_key
-        app.dependency_overrides[get_db] = mock_get_db
+        app.dependency_overrides[get_command_db] = mock_get_db
 
         try:
             client = TestClient(app)
@@ -173,6 +173,63 @@ class TestCommandRouterAuthentication:
             # Clean up overrides
             app.dependency_overrides.clear()
 
+    def test_admin_only_action_rejects_non_admin_key(self, monkeypatch):
+        """Test get-stats-bulk returns 403 for a service key not in ADMIN_SERVICE_KEYS."""
+        from fastapi.testclient import TestClient
+
+        from app.config import settings
+        from app.main import app
+
+        monkeypatch.setattr(settings, "admin_service_keys", "cat-house-admin")
+        handler = AsyncMock(return_value={"stats": {}, "count": 0})
+        original = ACTION_HANDLERS["get-stats-bulk"]
+        ACTION_HANDLERS["get-stats-bulk"] = handler
+        app.dependency_overrides[validate_service_key] = lambda: "cat-house-proxy"
+        app.dependency_overrides[get_command_db] = lambda: AsyncMock()
+
+        try:
+            client = TestClient(app)
+            response = client.post(
+                "/execute",
+                headers={"X-Service-Key": "sk_dev_test_key"},
+                json={"action": "get-stats-bulk", "user_id": "user_123", "payload": {"user_ids": ["user_456"]}}
+            )
+
+            assert response.status_code == 403
+            handler.assert_not_awaited()
+        finally:
+            ACTION_HANDLERS["get-stats-bulk"] = original
+            app.dependency_overrides.clear()
+
+    def test_admin_only_action_allows_admin_key(self, monkeypatch):
+        """Test get-stats-bulk runs for a service key listed in ADMIN_SERVICE_KEYS."""
+        from fastapi.testclient import TestClient
+
+        from app.config import settings
+        from app.main import app
+
+        monkeypatch.setattr(settings, "admin_service_keys", "cat-house-admin")
+        monkeypatch.setattr(settings, "database_replica_url", None)
+        handler = AsyncMock(return_value={"stats": {}, "count": 0})
+        original = ACTION_HANDLERS["get-stats-bulk"]
+        ACTION_HANDLERS["get-stats-bulk"] = handler
+        app.dependency_overrides[validate_service_key] = lambda: "cat-house-admin"
+        app.dependency_overrides[get_command_db] = lambda: AsyncMock()
+
+        try:
+            client = TestClient(app)
+            response = client.post(
+                "/execute",
+                headers={"X-Service-Key": "sk_dev_test_key"},
+                json={"action": "get-stats-bulk", "user_id": "admin_1", "payload": {"user_ids": ["user_456"]}}
+            )
+
+            assert response.status_code == 200
+            handler.assert_awaited_once()
+        finally:
+            ACTION_HANDLERS["get-stats-bulk"] = original
+            app.dependency_overrides.clear()
+
 
 @pytest.mark.unit
 class TestCommandRouterRouting:
@@ -192,7 +249,7 @@ class TestCommandRouterRouting:
 
         # Override dependencies
         app.dependency_overrides[validate_service_key] = mock_validate_key
-        app.dependency_overrides[get_db] = mock_get_db
+        app.dependency_overrides[get_command_db] = mock_get_db
 
         try:
             client = TestClient(app)
@@ -221,7 +278,7 @@ class TestCommandRouterRouting:
 
         # Override dependencies
         app.dependency_overrides[validate_service_key] = mock_validate_key
-        app.dependency_overrides[get_db] = mock_get_db
+        app.dependency_overrides[get_command_db] = mock_get_db
 
         try:
             client = TestClient(app)
@@ -247,7 +304,7 @@ class TestCommandRouterRouting:
             return "test-service"
 
         def mock_get_db():
-            return None
+            return AsyncMock()
 
         # Create mock handler (synchronous wrapper for TestClient)
         async def mock_handler(user_id: str, payload: dict, db):
@@ -255,7 +312,7 @@ class TestCommandRouterRouting:
 
         # Override dependencies
         app.dependency_overrides[validate_service_key] = mock_validate_key
-        app.dependency_overrides[get_db] = mock_get_db
+        app.dependency_overrides[get_command_db] = mock_get_db
 
         # Register mock handler
         ACTION_HANDLERS["test-action"] = mock_handler
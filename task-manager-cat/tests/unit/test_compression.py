@@ -0,0 +1,141 @@
+"""
+Unit tests for response compression (app/compression.py).
+
+Tests CompressionMiddleware on a minimal FastAPI app:
+- Accept-Encoding negotiation (brotli preferred, gzip fallback, q=0)
+- Size threshold, per-route opt-out and streaming passthrough
+- Large bodies compressed off the event loop
+"""
+
+import gzip
+from unittest.mock import patch
+
+import brotli
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app import compression
+from app.compression import CompressionMiddleware, negotiate_encoding, skip_compression
+
+LARGE_BODY = "task " * 1000
+
+
+def make_client(**options) -> TestClient:
+    """Build a test app with compressible, opted-out and streaming routes."""
+    app = FastAPI()
+
+    @app.get("/large")
+    async def large():
+        return PlainTextResponse(LARGE_BODY)
+
+    @app.get("/small")
+    async def small():
+        return PlainTextResponse("ok")
+
+    @app.get("/opt-out")
+    @skip_compression
+    async def opt_out():
+        return PlainTextResponse(LARGE_BODY)
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            yield LARGE_BODY
+            yield LARGE_BODY
+
+        return StreamingResponse(chunks(), media_type="text/event-stream")
+
+    app.add_middleware(CompressionMiddleware, **options)
+    return TestClient(app)
+
+
+def get_raw(client: TestClient, path: str, accept_encoding: str):
+    """GET a path and return (response, raw body) without httpx decoding it."""
+    with client.stream("GET", path, headers={"Accept-Encoding": accept_encoding}) as response:
+        raw = b"".join(response.iter_raw())
+    return response, raw
+
+
+@pytest.mark.unit
+class TestNegotiateEncoding:
+    """Test Accept-Encoding negotiation."""
+
+    def test_prefers_brotli(self):
+        """Test brotli is chosen when accepted and installed."""
+        assert negotiate_encoding("gzip, deflate, br") == "br"
+
+    def test_falls_back_to_gzip_without_brotli(self):
+        """Test gzip is used when the brotli package is unavailable."""
+        with patch.object(compression, "brotli", None):
+            assert negotiate_encoding("gzip, br") == "gzip"
+
+    def test_respects_quality_values(self):
+        """Test q=0 disables an encoding and higher q wins."""
+        assert negotiate_encoding("br;q=0, gzip") == "gzip"
+        assert negotiate_encoding("br;q=0.5, gzip;q=0.9") == "gzip"
+        assert negotiate_encoding("gzip;q=0") is None
+
+    def test_identity_only(self):
+        """Test no compression without an acceptable encoding."""
+        assert negotiate_encoding("") is None
+        assert negotiate_encoding("identity") is None
+
+
+@pytest.mark.unit
+class TestCompressionMiddleware:
+    """Test CompressionMiddleware behaviour."""
+
+    def test_large_response_is_brotli_compressed(self):
+        """Test large bodies are compressed and headers updated."""
+        response, raw = get_raw(make_client(), "/large", "br")
+
+        assert response.headers["content-encoding"] == "br"
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert int(response.headers["content-length"]) == len(raw) < len(LARGE_BODY)
+        assert brotli.decompress(raw).decode() == LARGE_BODY
+
+    def test_large_response_is_gzip_compressed(self):
+        """Test gzip is used for gzip-only clients."""
+        response, raw = get_raw(make_client(), "/large", "gzip")
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert gzip.decompress(raw).decode() == LARGE_BODY
+
+    def test_small_response_is_not_compressed(self):
+        """Test bodies below the threshold are sent as-is."""
+        response = make_client().get("/small", headers={"Accept-Encoding": "br"})
+
+        assert "content-encoding" not in response.headers
+        assert response.text == "ok"
+
+    def test_opted_out_route_is_not_compressed(self):
+        """Test @skip_compression routes are never compressed."""
+        response = make_client().get("/opt-out", headers={"Accept-Encoding": "br"})
+
+        assert "content-encoding" not in response.headers
+        assert response.text == LARGE_BODY
+
+    def test_streaming_response_passes_through(self):
+        """Test streamed bodies are not buffered or compressed."""
+        response = make_client().get("/stream", headers={"Accept-Encoding": "br"})
+
+        assert "content-encoding" not in response.headers
+        assert response.text == LARGE_BODY * 2
+
+    def test_large_body_compressed_in_thread(self):
+        """Test bodies above thread_minimum_size are compressed off the event loop."""
+        client = make_client(thread_minimum_size=len(LARGE_BODY))
+
+        with patch("app.compression.asyncio.to_thread", wraps=compression.asyncio.to_thread) as to_thread:
+            response = client.get("/large", headers={"Accept-Encoding": "br"})
+
+        assert response.headers["content-encoding"] == "br"
+        to_thread.assert_called_once()
+
+    def test_events_endpoint_opts_out(self):
+        """Test the SSE endpoint is marked to skip compression."""
+        from app.routers.events import stream_task_events
+
+        assert getattr(stream_task_events, compression.SKIP_COMPRESSION_ATTR) is True
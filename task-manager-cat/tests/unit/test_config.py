@@ -32,6 +32,22 @@ class TestSettingsValidation:
         assert "database_url" in str(error)
         assert "Field required" in str(error)
 
+    def test_settings_requires_api_key_secret(self, monkeypatch):
+        """Test that Settings initialization fails without API_KEY_SECRET"""
+        monkeypatch.delenv("API_KEY_SECRET", raising=False)
+
+        with pytest.raises(ValidationError) as exc_info:
+            Settings(_env_file=None, database_url="postgresql://host/db")
+
+        assert "api_key_secret" in str(exc_info.value)
+
+    def test_settings_rejects_empty_api_key_secret(self):
+        """Test that an empty API_KEY_SECRET is rejected"""
+        with pytest.raises(ValidationError) as exc_info:
+            Settings(_env_file=None, database_url="postgresql://host/db", api_key_secret="")
+
+        assert "API_KEY_SECRET must not be empty" in str(exc_info.value)
+
     def test_settings_validates_database_url_format_mysql(self):
         """Test that DATABASE_URL must be PostgreSQL (rejects MySQL)"""
         with pytest.raises(ValidationError) as exc_info:
@@ -0,0 +1,170 @@
+"""
+Unit tests for the live task change feed (app/events.py, app/routers/events.py).
+
+Tests notification fan-out without a database:
+- pg_notify SQL fragment used by task handlers
+- TaskChangeBroker per-user delivery, overflow and unsubscribe
+- SSE message formatting
+"""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+import app.events
+from app.events import RESYNC_EVENT, TaskChangeBroker, listener_database_url, task_change_notify_sql
+from app.routers.events import format_sse
+
+
+@pytest.fixture
+def broker():
+    """Broker whose listener connection is mocked."""
+    connection = MagicMock()
+    connection.is_closed.return_value = False
+    connection.add_listener = AsyncMock()
+    connection.close = AsyncMock()
+
+    with patch("app.events.asyncpg.connect", new=AsyncMock(return_value=connection)):
+        yield TaskChangeBroker("postgresql://test", queue_size=2)
+
+
+def notify(broker: TaskChangeBroker, event: dict) -> None:
+    """Simulate a NOTIFY delivered on the listener connection."""
+    broker._on_notification(None, 1234, "task_changes", json.dumps(event))
+
+
+@pytest.mark.unit
+def test_notify_sql_publishes_on_task_changes_channel():
+    """Test handler SQL fragment targets the task_changes channel."""
+    sql = task_change_notify_sql("updated", "updated")
+
+    assert sql.startswith("pg_notify('task_changes'")
+    assert "'user_id', updated.user_id" in sql
+    assert "'task_id', updated.id" in sql
+    assert "'op', 'updated'" in sql
+    assert "'sync_version', updated.sync_version" in sql
+
+
+@pytest.mark.unit
+def test_notify_sql_custom_id_column():
+    """Test tombstone rows can publish their task_id column."""
+    sql = task_change_notify_sql("tombstone", "deleted", id_column="task_id")
+
+    assert "'task_id', tombstone.task_id" in sql
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_broker_delivers_only_to_matching_user(broker):
+    """Test notifications are routed by user_id."""
+    async with broker.subscribe("test-user-a") as queue_a, broker.subscribe("test-user-b") as queue_b:
+        notify(broker, {"user_id": "test-user-a", "task_id": "t1", "op": "created", "sync_version": 1})
+
+        assert queue_a.get_nowait()["task_id"] == "t1"
+        assert queue_b.empty()
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_broker_shares_one_listener_connection(broker):
+    """Test many subscribers reuse a single listener connection."""
+    async with broker.subscribe("test-user-a"), broker.subscribe("test-user-a"), \
+            broker.subscribe("test-user-b"):
+        assert broker.subscriber_count == 3
+
+    assert app.events.asyncpg.connect.await_count == 1
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_broker_overflow_replaces_backlog_with_resync(broker):
+    """Test a slow subscriber gets a single resync event instead of unbounded buffering."""
+    async with broker.subscribe("test-user-a") as queue:
+        for version in range(5):
+            notify(broker, {"user_id": "test-user-a", "task_id": "t1", "op": "updated",
+                            "sync_version": version})
+
+        assert queue.get_nowait() == RESYNC_EVENT
+        # Events after the resync are delivered normally
+        assert queue.qsize() <= 1
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_broker_removes_subscription_on_exit(broker):
+    """Test leaving the context unsubscribes the queue."""
+    async with broker.subscribe("test-user-a"):
+        assert broker.subscriber_count == 1
+
+    assert broker.subscriber_count == 0
+    # Notifications without subscribers are dropped silently
+    notify(broker, {"user_id": "test-user-a", "task_id": "t1", "op": "created", "sync_version": 1})
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_broker_ignores_invalid_payload(broker):
+    """Test malformed notifications are ignored."""
+    async with broker.subscribe("test-user-a") as queue:
+        broker._on_notification(None, 1234, "task_changes", "not-json")
+        broker._on_notification(None, 1234, "task_changes", json.dumps({"op": "created"}))
+
+        assert queue.empty()
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_broker_reconnect_sends_resync(broker):
+    """Test subscribers are asked to resync after the listener reconnects."""
+    async with broker.subscribe("test-user-a") as queue:
+        broker._on_termination(broker._connection)
+        await asyncio.wait_for(broker._reconnect_task, timeout=1)
+
+        assert queue.get_nowait() == RESYNC_EVENT
+
+    await broker.stop()
+
+
+@pytest.mark.unit
+def test_listener_prefers_direct_connection():
+    """Test LISTEN never uses the pooled DATABASE_URL when a direct URL is set."""
+    settings = app.events.settings
+    with patch.multiple(
+        settings,
+        database_url="postgresql+asyncpg://u:p@db-pooler.neon.tech/tasks",
+        migration_database_url="postgresql://u:p@db.neon.tech/tasks",
+        listen_database_url=None
+    ):
+        assert listener_database_url() == "postgresql://u:p@db.neon.tech/tasks"
+
+        settings.listen_database_url = "postgresql+asyncpg://u:p@listen.neon.tech/tasks"
+        assert listener_database_url() == "postgresql://u:p@listen.neon.tech/tasks"
+
+        settings.listen_database_url = None
+        settings.migration_database_url = None
+        assert listener_database_url() == "postgresql://u:p@db-pooler.neon.tech/tasks"
+
+
+@pytest.mark.unit
+def test_format_sse_uses_sync_version_as_event_id():
+    """Test SSE message has id, event name and JSON data."""
+    event = {"user_id": "u", "task_id": "t1", "op": "updated", "sync_version": 7}
+
+    message = format_sse(event)
+
+    assert message.endswith("\n\n")
+    lines = message.strip().split("\n")
+    assert lines[0] == "id: 7"
+    assert lines[1] == "event: task.updated"
+    assert json.loads(lines[2].removeprefix("data: ")) == event
+
+
+@pytest.mark.unit
+def test_format_sse_resync_event_has_no_id():
+    """Test resync events do not move the client's Last-Event-ID."""
+    message = format_sse(RESYNC_EVENT)
+
+    assert message.startswith("event: task.resync\n")
+    assert "id:" not in message
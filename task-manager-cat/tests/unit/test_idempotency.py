@@ -0,0 +1,281 @@
+"""
+Unit tests for Idempotency-Key replay on POST /execute.
+
+Tests the idempotency helpers and the router flow with a mocked database:
+- Request fingerprints are stable across payload key order
+- Claim / replay / in-progress / key reuse outcomes
+- Handlers run once per key and failures release the claim
+"""
+
+import json
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi import HTTPException
+
+from app.auth import validate_service_key
+from app.commands.models import CommandRequest, CommandResponse
+from app.commands.router import ACTION_HANDLERS, get_command_db
+from app.config import settings
+from app.idempotency import (
+    IdempotencyClaim,
+    claim_idempotency_key,
+    release_idempotency_key,
+    request_fingerprint,
+    store_idempotent_response,
+)
+
+CLAIM = IdempotencyClaim("test-client", "key-1", "6f1c4b7e-3d2a-4f5e-9b8c-1a2b3c4d5e6f")
+
+
+def make_command(**payload) -> CommandRequest:
+    """Build a create-task command with the given payload."""
+    return CommandRequest(action="create-task", user_id="user_123", payload=payload)
+
+
+@pytest.mark.unit
+class TestRequestFingerprint:
+    """Test request_fingerprint hashing."""
+
+    def test_payload_key_order_does_not_change_fingerprint(self):
+        """Test equivalent commands hash to the same value."""
+        first = make_command(title="Buy milk", priority="high")
+        second = make_command(priority="high", title="Buy milk")
+
+        assert request_fingerprint(first) == request_fingerprint(second)
+        assert len(request_fingerprint(first)) == 64
+
+    def test_different_payload_changes_fingerprint(self):
+        """Test a different payload hashes to a different value."""
+        assert request_fingerprint(make_command(title="A")) != request_fingerprint(make_command(title="B"))
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestClaimIdempotencyKey:
+    """Test claim_idempotency_key outcomes."""
+
+    async def test_new_key_is_claimed(self):
+        """Test a new key returns the claim so the handler runs."""
+        mock_db = AsyncMock()
+        mock_db.fetchrow.return_value = {'claim_token': CLAIM.token, 'request_hash': None, 'response': None}
+
+        result = await claim_idempotency_key(mock_db, "test-client", "key-1", "a" * 64)
+
+        assert result == CLAIM
+        args = mock_db.fetchrow.call_args[0]
+        assert args[1:4] == ("test-client", "key-1", "a" * 64)
+
+    async def test_claim_holds_short_lease(self):
+        """Test an in-flight claim expires after the lease, not the replay window."""
+        mock_db = AsyncMock()
+        mock_db.fetchrow.return_value = {'claim_token': CLAIM.token, 'request_hash': None, 'response': None}
+
+        await claim_idempotency_key(mock_db, "test-client", "key-1", "a" * 64)
+
+        assert mock_db.fetchrow.call_args[0][4].total_seconds() == settings.idempotency_lease_seconds
+
+    async def test_completed_key_returns_stored_response(self):
+        """Test a retried request receives the stored response."""
+        stored = CommandResponse(success=True, data={"id": "task-1"}, error=None)
+        mock_db = AsyncMock()
+        mock_db.fetchrow.return_value = {
+            'claim_token': None,
+            'request_hash': "a" * 64,
+            'response': stored.model_dump_json()
+        }
+
+        result = await claim_idempotency_key(mock_db, "test-client", "key-1", "a" * 64)
+
+        assert result == stored
+
+    async def test_in_flight_key_returns_409(self):
+        """Test a retry while the first request is running is rejected."""
+        mock_db = AsyncMock()
+        mock_db.fetchrow.return_value = {'claim_token': None, 'request_hash': "a" * 64, 'response': None}
+
+        with pytest.raises(HTTPException) as exc_info:
+            await claim_idempotency_key(mock_db, "test-client", "key-1", "a" * 64)
+
+        assert exc_info.value.status_code == 409
+
+    async def test_concurrent_claim_returns_409(self):
+        """Test no row (key claimed concurrently) is treated as in progress."""
+        mock_db = AsyncMock()
+        mock_db.fetchrow.return_value = None
+
+        with pytest.raises(HTTPException) as exc_info:
+            await claim_idempotency_key(mock_db, "test-client", "key-1", "a" * 64)
+
+        assert exc_info.value.status_code == 409
+
+    async def test_key_reused_for_different_request_returns_422(self):
+        """Test a key cannot be reused with a different request body."""
+        stored = CommandResponse(success=True, data={}, error=None)
+        mock_db = AsyncMock()
+        mock_db.fetchrow.return_value = {
+            'claim_token': None,
+            'request_hash': "b" * 64,
+            'response': stored.model_dump_json()
+        }
+
+        with pytest.raises(HTTPException) as exc_info:
+            await claim_idempotency_key(mock_db, "test-client", "key-1", "a" * 64)
+
+        assert exc_info.value.status_code == 422
+
+    async def test_store_extends_record_to_ttl(self):
+        """Test the stored response is only written for this request's claim."""
+        mock_db = AsyncMock()
+        mock_db.fetchval.return_value = True
+
+        await store_idempotent_response(mock_db, CLAIM, CommandResponse(success=True, data={}, error=None))
+
+        sql, key_name, key, token, _, ttl = mock_db.fetchval.call_args[0]
+        assert "claim_token = $3" in sql
+        assert (key_name, key, token) == ("test-client", "key-1", CLAIM.token)
+        assert ttl.total_seconds() == settings.idempotency_ttl_seconds
+
+    async def test_store_after_lost_claim_raises(self):
+        """Test a request whose lease was taken over fails so its write rolls back."""
+        mock_db = AsyncMock()
+        mock_db.fetchval.return_value = None
+
+        with pytest.raises(HTTPException) as exc_info:
+            await store_idempotent_response(mock_db, CLAIM, CommandResponse(success=True, data={}, error=None))
+
+        assert exc_info.value.status_code == 409
+
+    async def test_release_only_deletes_own_unfinished_claim(self):
+        """Test release never removes a stored response or another request's claim."""
+        mock_db = AsyncMock()
+
+        await release_idempotency_key(mock_db, CLAIM)
+
+        sql = mock_db.execute.call_args[0][0]
+        assert "response IS NULL" in sql
+        assert "claim_token = $3" in sql
+
+
+@pytest.mark.unit
+class TestExecuteIdempotency:
+    """Test Idempotency-Key handling in POST /execute."""
+
+    def run_execute(self, mock_db, handler, headers: dict, action: str = "create-task"):
+        """Send one /execute request with a mocked db and handler."""
+        from fastapi.testclient import TestClient
+
+        from app.main import app
+
+        def mock_validate_key(x_service_key: str = None):
+            return "test-client"
+
+        def mock_get_db():
+            return mock_db
+
+        original = ACTION_HANDLERS[action]
+        app.dependency_overrides[validate_service_key] = mock_validate_key
+        app.dependency_overrides[get_command_db] = mock_get_db
+        ACTION_HANDLERS[action] = handler
+
+        try:
+            client = TestClient(app)
+            return client.post(
+                "/execute",
+                headers={"X-Service-Key": "sk_dev_test_key", **headers},
+                json={"action": action, "user_id": "user_123", "payload": {"title": "Buy milk"}}
+            )
+        finally:
+            ACTION_HANDLERS[action] = original
+            app.dependency_overrides.clear()
+
+    def test_first_request_runs_handler_and_stores_response(self):
+        """Test a claimed key runs the handler and stores its response before COMMIT."""
+        mock_db = AsyncMock()
+        mock_db.fetchrow.return_value = {'claim_token': CLAIM.token, 'request_hash': None, 'response': None}
+        handler = AsyncMock(return_value={"id": "task-1"})
+        statements = []
+        mock_db.execute.side_effect = lambda sql, *args: statements.append(sql)
+        mock_db.fetchval.side_effect = lambda sql, *args: statements.append(sql) or True
+
+        response = self.run_execute(mock_db, handler, {"Idempotency-Key": "key-1"})
+
+        assert response.status_code == 200
+        assert "Idempotent-Replayed" not in response.headers
+        handler.assert_awaited_once()
+        sql, key_name, key, token, stored, _ = mock_db.fetchval.call_args[0]
+        assert "UPDATE idempotency_keys" in sql
+        assert (key_name, key, token) == ("test-client", "key-1", CLAIM.token)
+        assert json.loads(stored) == response.json()
+        # Stored inside the handler's transaction
+        assert statements[0].startswith("BEGIN")
+        assert "UPDATE idempotency_keys" in statements[1]
+        assert statements[2] == "COMMIT"
+
+    def test_store_failure_rolls_back_write(self):
+        """Test a failed store rolls back the handler's write and releases the key."""
+        mock_db = AsyncMock()
+        mock_db.fetchrow.return_value = {'claim_token': CLAIM.token, 'request_hash': None, 'response': None}
+        mock_db.fetchval.side_effect = Exception("connection lost")
+        handler = AsyncMock(return_value={"id": "task-1"})
+
+        response = self.run_execute(mock_db, handler, {"Idempotency-Key": "key-1"})
+
+        assert response.json()["success"] is False
+        statements = [call.args[0] for call in mock_db.execute.call_args_list]
+        assert "ROLLBACK" in statements
+        assert "COMMIT" not in statements
+        assert "DELETE FROM idempotency_keys" in statements[-1]
+
+    def test_retry_replays_stored_response(self):
+        """Test a completed key replays the response without running the handler."""
+        stored = CommandResponse(success=True, data={"id": "task-1"}, error=None)
+        command = CommandRequest(action="create-task", user_id="user_123", payload={"title": "Buy milk"})
+        mock_db = AsyncMock()
+        mock_db.fetchrow.return_value = {
+            'claim_token': None,
+            'request_hash': request_fingerprint(command),
+            'response': stored.model_dump_json()
+        }
+        handler = AsyncMock(return_value={"id": "task-2"})
+
+        response = self.run_execute(mock_db, handler, {"Idempotency-Key": "key-1"})
+
+        assert response.status_code == 200
+        assert response.headers["Idempotent-Replayed"] == "true"
+        assert response.json()["data"] == {"id": "task-1"}
+        handler.assert_not_awaited()
+
+    def test_handler_error_releases_key(self):
+        """Test a failed handler releases the key so the client can retry."""
+        mock_db = AsyncMock()
+        mock_db.fetchrow.return_value = {'claim_token': CLAIM.token, 'request_hash': None, 'response': None}
+        handler = AsyncMock(side_effect=HTTPException(status_code=400, detail="Invalid payload"))
+
+        response = self.run_execute(mock_db, handler, {"Idempotency-Key": "key-1"})
+
+        assert response.status_code == 400
+        assert "DELETE FROM idempotency_keys" in mock_db.execute.call_args[0][0]
+
+    def test_without_header_no_key_is_recorded(self):
+        """Test requests without Idempotency-Key skip the idempotency table."""
+        mock_db = AsyncMock()
+        handler = AsyncMock(return_value={"id": "task-1"})
+
+        response = self.run_execute(mock_db, handler, {})
+
+        assert response.status_code == 200
+        mock_db.fetchrow.assert_not_awaited()
+        # Only the handler's transaction (BEGIN/SET LOCAL, COMMIT) runs on the connection
+        assert not any("idempotency_keys" in call.args[0] for call in mock_db.execute.call_args_list)
+
+    def test_read_actions_ignore_header(self):
+        """Test read-only actions are not recorded even with a key."""
+        mock_db = AsyncMock()
+        handler = AsyncMock(return_value={"tasks": []})
+
+        response = self.run_execute(mock_db, handler, {"Idempotency-Key": "key-1"}, action="list-tasks")
+
+        assert response.status_code == 200
+        handler.assert_awaited_once()
+        mock_db.fetchrow.assert_not_awaited()
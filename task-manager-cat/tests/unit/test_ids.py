@@ -0,0 +1,118 @@
+"""
+Unit tests for UUIDv7 ids (app/ids.py) and the key benchmark report.
+
+Tests:
+- uuid7 version/variant bits, embedded timestamp and ordering
+- Counter overflow keeps ids increasing
+- create-task inserts a UUIDv7 id
+- benchmark_key_type drops its scratch table; format_report ratios
+"""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import UUID, uuid4
+
+import pytest
+
+from app import ids
+from app.commands.handlers.tasks import create_task_handler
+from app.id_benchmark import KeyBenchmarkResult, benchmark_key_type, format_report
+from app.ids import uuid7, uuid7_datetime
+
+
+@pytest.mark.unit
+class TestUUID7:
+    """Test uuid7 generation."""
+
+    def test_version_and_variant(self):
+        """Test ids are RFC 9562 version 7 UUIDs."""
+        value = uuid7()
+
+        assert value.version == 7
+        assert value.variant == "specified in RFC 4122"
+
+    def test_embeds_creation_time(self):
+        """Test the leading 48 bits are the current Unix time in milliseconds."""
+        before = datetime.now(timezone.utc) - timedelta(milliseconds=1)
+
+        created_at = uuid7_datetime(uuid7())
+
+        assert before <= created_at <= datetime.now(timezone.utc) + timedelta(milliseconds=1)
+
+    def test_ids_strictly_increase(self):
+        """Test ids from one process sort in generation order."""
+        values = [uuid7() for _ in range(10000)]
+
+        assert values == sorted(values)
+        assert len(set(values)) == len(values)
+
+    def test_counter_overflow_advances_timestamp(self):
+        """Test more than 4096 ids in one millisecond stay ordered."""
+        with patch("app.ids.time.time_ns", return_value=1_700_000_000_000 * 1_000_000):
+            values = [uuid7() for _ in range(5000)]
+
+        assert values == sorted(values)
+        assert uuid7_datetime(values[-1]) > uuid7_datetime(values[0])
+
+    def test_datetime_rejects_other_versions(self):
+        """Test v4 ids are not mistaken for timestamps."""
+        with pytest.raises(ValueError):
+            uuid7_datetime(uuid4())
+
+    def teardown_method(self):
+        """Reset the generator state changed by patched clocks."""
+        ids._last_ms = 0
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_create_task_inserts_uuid7_id():
+    """Test create-task sends a time-ordered id instead of relying on gen_random_uuid()."""
+    mock_db = AsyncMock()
+    mock_db.fetchrow.return_value = {
+        'id': UUID('550e8400-e29b-41d4-a716-446655440000'),
+        'user_id': 'test-user-123',
+        'title': 'Test Task',
+        'description': None,
+        'status': 'pending',
+        'priority': None,
+        'created_at': datetime(2025, 11, 12, 10, 0, 0, tzinfo=timezone.utc),
+        'completed_at': None,
+        'due_date': None
+    }
+
+    await create_task_handler("test-user-123", {"title": "Test Task"}, mock_db)
+
+    sql, task_id, *_ = mock_db.fetchrow.call_args[0]
+    assert "INSERT INTO tasks (id, user_id" in sql
+    assert task_id.version == 7
+
+
+@pytest.mark.unit
+class TestKeyBenchmark:
+    """Test the v4/v7 write benchmark helpers."""
+
+    @pytest.mark.asyncio
+    async def test_scratch_table_dropped(self):
+        """Test the scratch table is created, filled in batches and dropped."""
+        db = AsyncMock()
+        db.transaction = MagicMock()
+        db.fetchval.side_effect = ["0/1000", "0/5000", 8192, 16384]
+
+        result = await benchmark_key_type(db, "uuid_v7", rows=250, batch=100)
+
+        assert db.executemany.await_count == 3
+        assert db.execute.call_args_list[-1].args[0] == "DROP TABLE IF EXISTS id_benchmark_uuid_v7"
+        assert result.index_bytes == 8192
+        assert result.wal_bytes == 16384
+
+    def test_report_compares_v7_with_v4(self):
+        """Test the report shows v7 relative to v4."""
+        report = format_report([
+            KeyBenchmarkResult("uuid_v4", rows=1000, seconds=2.0, index_bytes=4 * 1024 * 1024, wal_bytes=None),
+            KeyBenchmarkResult("uuid_v7", rows=1000, seconds=1.0, index_bytes=3 * 1024 * 1024, wal_bytes=None),
+        ])
+
+        assert "uuid_v7 throughput: 2.00x uuid_v4" in report
+        assert "uuid_v7 pk index size: 0.75x uuid_v4" in report
+        assert "n/a" in report
@@ -0,0 +1,270 @@
+"""
+Unit tests for the background job queue (app/jobs).
+
+Tests queue helpers and the worker with a mocked database:
+- Enqueue with dedupe and retry backoff
+- Worker outcomes: completed, retried, failed, unknown job type
+- Outcomes of runs whose claim expired are discarded
+- Maintenance scheduling and the /metrics endpoint
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.jobs import handlers
+from app.jobs.queue import complete_job, enqueue_job, fail_job, retry_delay_seconds
+from app.jobs.worker import JobWorker
+from app.metrics import jobs_processed_total
+
+
+def make_worker(db) -> JobWorker:
+    """Build a worker whose pool hands out the given mock connection."""
+    @asynccontextmanager
+    async def acquire():
+        yield db
+
+    worker = JobWorker("postgresql://test", concurrency=1)
+    worker._pool = MagicMock()
+    worker._pool.acquire = acquire
+    return worker
+
+
+def make_job(job_type: str = "test-job", attempts: int = 1, max_attempts: int = 3) -> dict:
+    """Build a claimed job as returned by claim_next_job."""
+    return {
+        'id': 7,
+        'job_type': job_type,
+        'payload': '{"value": 1}',
+        'attempts': attempts,
+        'max_attempts': max_attempts,
+        'lag_seconds': 0.2
+    }
+
+
+def processed(job_type: str, outcome: str) -> float:
+    """Current value of the processed jobs counter."""
+    return jobs_processed_total.labels(job_type=job_type, outcome=outcome)._value.get()
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestJobQueue:
+    """Unit tests for queue helper functions."""
+
+    async def test_enqueue_returns_job_id(self):
+        """Test enqueue inserts the job with a JSON payload."""
+        mock_db = AsyncMock()
+        mock_db.fetchval.return_value = 42
+
+        job_id = await enqueue_job(mock_db, "test-job", {"value": 1}, delay_seconds=5)
+
+        assert job_id == 42
+        args = mock_db.fetchval.call_args[0]
+        assert "INSERT INTO background_jobs" in args[0]
+        assert args[1:3] == ("test-job", '{"value": 1}')
+        assert args[3].total_seconds() == 5
+
+    async def test_enqueue_with_existing_dedupe_key_returns_none(self):
+        """Test dedupe conflict inserts nothing."""
+        mock_db = AsyncMock()
+        mock_db.fetchval.return_value = None
+
+        job_id = await enqueue_job(mock_db, "test-job", dedupe_key="test-job")
+
+        assert job_id is None
+        assert "ON CONFLICT (dedupe_key)" in mock_db.fetchval.call_args[0][0]
+
+    async def test_fail_job_requeues_with_backoff(self):
+        """Test a job with attempts left goes back to the queue."""
+        mock_db = AsyncMock()
+        mock_db.execute.return_value = "UPDATE 1"
+
+        retried = await fail_job(mock_db, make_job(attempts=2), "boom")
+
+        assert retried is True
+        sql, job_id, attempts, error, delay = mock_db.execute.call_args[0]
+        assert "status = 'queued'" in sql
+        assert (job_id, attempts, error) == (7, 2, "boom")
+        assert delay.total_seconds() == retry_delay_seconds(2)
+
+    async def test_fail_job_after_max_attempts_is_permanent(self):
+        """Test the last attempt marks the job failed."""
+        mock_db = AsyncMock()
+        mock_db.execute.return_value = "UPDATE 1"
+
+        retried = await fail_job(mock_db, make_job(attempts=3, max_attempts=3), "boom")
+
+        assert retried is False
+        assert "status = 'failed'" in mock_db.execute.call_args[0][0]
+
+    async def test_outcome_requires_current_claim(self):
+        """Test complete/fail only update a job still running under the same attempt."""
+        mock_db = AsyncMock()
+        mock_db.execute.return_value = "UPDATE 0"
+
+        assert await complete_job(mock_db, make_job(attempts=2)) is False
+        sql, job_id, attempts = mock_db.execute.call_args[0]
+        assert "status = 'running' AND attempts = $2" in sql
+        assert (job_id, attempts) == (7, 2)
+        assert await fail_job(mock_db, make_job(attempts=2), "boom") is None
+        assert await fail_job(mock_db, make_job(attempts=3, max_attempts=3), "boom") is None
+
+    async def test_retry_delay_doubles_and_is_capped(self):
+        """Test exponential backoff is bounded to one hour."""
+        assert retry_delay_seconds(2) == 2 * retry_delay_seconds(1)
+        assert retry_delay_seconds(30) == 3600
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestJobWorker:
+    """Unit tests for JobWorker.run_once and maintenance."""
+
+    async def test_empty_queue_returns_false(self):
+        """Test run_once reports an empty queue."""
+        mock_db = AsyncMock()
+        mock_db.fetchrow.return_value = None
+
+        assert await make_worker(mock_db).run_once() is False
+
+    async def test_successful_job_is_completed(self):
+        """Test handler receives the decoded payload and job is completed."""
+        mock_db = AsyncMock()
+        mock_db.fetchrow.return_value = make_job()
+        mock_db.execute.return_value = "UPDATE 1"
+        handler = AsyncMock()
+        before = processed("test-job", "completed")
+
+        with patch.dict(handlers.JOB_HANDLERS, {"test-job": handler}):
+            assert await make_worker(mock_db).run_once() is True
+
+        handler.assert_awaited_once_with({"value": 1}, mock_db)
+        assert "status = 'completed'" in mock_db.execute.call_args[0][0]
+        assert processed("test-job", "completed") == before + 1
+
+    async def test_failing_job_is_retried(self):
+        """Test handler errors requeue the job instead of crashing the worker."""
+        mock_db = AsyncMock()
+        mock_db.fetchrow.return_value = make_job(attempts=1)
+        mock_db.execute.return_value = "UPDATE 1"
+        handler = AsyncMock(side_effect=RuntimeError("boom"))
+        before = processed("test-job", "retried")
+
+        with patch.dict(handlers.JOB_HANDLERS, {"test-job": handler}):
+            assert await make_worker(mock_db).run_once() is True
+
+        sql, job_id, attempts, error, _ = mock_db.execute.call_args[0]
+        assert "status = 'queued'" in sql
+        assert error == "boom"
+        assert processed("test-job", "retried") == before + 1
+
+    async def test_stale_completion_of_requeued_job_is_ignored(self):
+        """Test a run whose job was requeued meanwhile does not record completion."""
+        mock_db = AsyncMock()
+        mock_db.fetchrow.return_value = make_job(attempts=1)
+        # requeue_stale_jobs took the job back: the guarded UPDATE matches no row
+        mock_db.execute.return_value = "UPDATE 0"
+        before = processed("test-job", "completed")
+
+        with patch.dict(handlers.JOB_HANDLERS, {"test-job": AsyncMock()}):
+            assert await make_worker(mock_db).run_once() is True
+
+        sql, job_id, attempts = mock_db.execute.call_args[0]
+        assert "status = 'running' AND attempts = $2" in sql
+        assert attempts == 1
+        assert processed("test-job", "completed") == before
+
+    async def test_handler_exceeding_lock_timeout_is_retried(self, monkeypatch):
+        """Test a handler running past JOBS_LOCK_TIMEOUT_SECONDS is cancelled and requeued."""
+        from app.config import settings
+
+        monkeypatch.setattr(settings, "jobs_lock_timeout_seconds", 0.01)
+        mock_db = AsyncMock()
+        mock_db.fetchrow.return_value = make_job(attempts=1)
+        mock_db.execute.return_value = "UPDATE 1"
+
+        async def slow_handler(payload, db):
+            await asyncio.sleep(1)
+
+        with patch.dict(handlers.JOB_HANDLERS, {"test-job": slow_handler}):
+            assert await make_worker(mock_db).run_once() is True
+
+        sql, job_id, attempts, error, _ = mock_db.execute.call_args[0]
+        assert "status = 'queued'" in sql
+        assert "JOBS_LOCK_TIMEOUT_SECONDS" in error
+
+    async def test_unknown_job_type_fails_without_retry(self):
+        """Test jobs without a registered handler are failed permanently."""
+        mock_db = AsyncMock()
+        mock_db.fetchrow.return_value = make_job(job_type="test-unknown", attempts=1)
+        mock_db.execute.return_value = "UPDATE 1"
+
+        assert await make_worker(mock_db).run_once() is True
+
+        sql, job_id, attempts, error = mock_db.execute.call_args[0]
+        assert "status = 'failed'" in sql
+        assert error == "Unknown job type: test-unknown"
+
+    async def test_maintenance_enqueues_deduplicated_jobs(self):
+        """Test scheduler enqueues each maintenance job with its dedupe key."""
+        mock_db = AsyncMock()
+        mock_db.execute.return_value = "UPDATE 0"
+        mock_db.fetchval.side_effect = [1, None, 2, 3]
+
+        await make_worker(mock_db).run_maintenance()
+
+        enqueued = [call[0] for call in mock_db.fetchval.call_args_list[:3]]
+        assert [args[1] for args in enqueued] == list(handlers.MAINTENANCE_JOBS)
+        assert [args[4] for args in enqueued] == list(handlers.MAINTENANCE_JOBS)
+        assert "status = 'running'" in mock_db.execute.call_args[0][0]
+
+    async def test_worker_loop_survives_unexpected_error(self):
+        """Test a non-database error is logged and the loop keeps polling."""
+        worker = JobWorker("postgresql://test", concurrency=1, poll_interval=0)
+        calls = []
+
+        async def run_once():
+            calls.append(1)
+            if len(calls) == 1:
+                raise ValueError("unexpected")
+            worker._stopping.set()
+            return False
+
+        worker.run_once = run_once
+        await worker._worker_loop(0)
+
+        assert len(calls) == 2
+
+    async def test_maintenance_jobs_are_registered(self):
+        """Test maintenance jobs are registered."""
+        for job_type in handlers.MAINTENANCE_JOBS:
+            assert job_type in handlers.JOB_HANDLERS
+
+    async def test_purge_task_tombstones_records_watermark(self):
+        """Test tombstone purge records the highest purged version in the same statement."""
+        mock_db = AsyncMock()
+        mock_db.fetchval.return_value = 4
+
+        await handlers.purge_task_tombstones_handler({"retention_days": 10}, mock_db)
+
+        sql, retention = mock_db.fetchval.call_args[0]
+        assert "DELETE FROM task_tombstones" in sql
+        assert "tombstones_pruned_through" in sql
+        assert retention.days == 10
+
+
+@pytest.mark.unit
+def test_metrics_endpoint_exposes_job_metrics():
+    """Test GET /metrics returns Prometheus text format."""
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    response = TestClient(app).get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "task_manager_jobs_processed_total" in response.text
@@ -0,0 +1,81 @@
+"""
+Unit tests for lazy OpenAPI schema generation (app/openapi.py).
+
+Tests:
+- The schema is not built at import time or by regular requests
+- Security schemes are added on first use and the schema is cached
+- A pre-built schema file is served instead of generating one
+"""
+
+import json
+from unittest.mock import patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app import openapi
+from app.openapi import SECURITY_SCHEMES, install_openapi
+
+
+def make_app(schema_file=None) -> FastAPI:
+    """Build a minimal app with the lazy schema loader installed."""
+    app = FastAPI(title="Test API", version="1.0.0")
+
+    @app.get("/ping")
+    async def ping():
+        return {"pong": True}
+
+    install_openapi(app, schema_file=schema_file)
+    return app
+
+
+@pytest.mark.unit
+class TestLazyOpenAPI:
+    """Test install_openapi()."""
+
+    def test_schema_not_built_by_regular_requests(self):
+        """Test serving an endpoint never generates the schema."""
+        app = make_app()
+
+        with patch.object(openapi, "get_openapi", wraps=openapi.get_openapi) as get_openapi:
+            response = TestClient(app).get("/ping")
+
+        assert response.status_code == 200
+        assert app.openapi_schema is None
+        get_openapi.assert_not_called()
+
+    def test_schema_built_once_with_security_schemes(self):
+        """Test the schema is generated on first use and then cached."""
+        app = make_app()
+        client = TestClient(app)
+
+        with patch.object(openapi, "get_openapi", wraps=openapi.get_openapi) as get_openapi:
+            first = client.get("/openapi.json").json()
+            client.get("/openapi.json")
+
+        assert first["components"]["securitySchemes"] == SECURITY_SCHEMES
+        assert "/ping" in first["paths"]
+        get_openapi.assert_called_once()
+
+    def test_prebuilt_schema_file_is_served(self, tmp_path):
+        """Test OPENAPI_SCHEMA_FILE replaces generation from the routes."""
+        schema_file = tmp_path / "openapi.json"
+        schema_file.write_text(json.dumps({"openapi": "3.1.0", "info": {"title": "Exported"}, "paths": {}}))
+        app = make_app(schema_file=str(schema_file))
+
+        with patch.object(openapi, "get_openapi") as get_openapi:
+            response = TestClient(app).get("/openapi.json")
+
+        assert response.json()["info"]["title"] == "Exported"
+        get_openapi.assert_not_called()
+
+    def test_export_cli_writes_schema(self, tmp_path):
+        """Test `python -m app.openapi --output` writes the application schema."""
+        output = tmp_path / "openapi.json"
+
+        openapi.main(["--output", str(output)])
+
+        schema = json.loads(output.read_text())
+        assert "/execute" in schema["paths"]
+        assert "Cat House Platform" in schema["info"]["description"]
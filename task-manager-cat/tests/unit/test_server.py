@@ -0,0 +1,102 @@
+"""
+Unit tests for the production server launcher (app/server.py).
+
+Tests database connection budgeting across workers and the uvicorn
+configuration passed by main().
+"""
+
+import os
+from unittest.mock import patch
+
+import pytest
+
+from app.server import compute_pool_sizing, main
+
+
+@pytest.mark.unit
+class TestComputePoolSizing:
+    """Test compute_pool_sizing budget split."""
+
+    def test_budget_split_across_workers(self):
+        """Test each worker gets its share minus reserved connections."""
+        sizing = compute_pool_sizing(
+            workers=4, budget=60, reserved_per_worker=4, default_min_size=2, default_max_size=10
+        )
+
+        assert sizing.max_size == 11
+        assert sizing.min_size == 2
+        assert sizing.total_connections <= 60
+
+    def test_min_size_capped_at_max_size(self):
+        """Test min_size never exceeds a small budgeted max_size."""
+        sizing = compute_pool_sizing(
+            workers=8, budget=40, reserved_per_worker=4, default_min_size=2, default_max_size=10
+        )
+
+        assert sizing.max_size == 1
+        assert sizing.min_size == 1
+
+    def test_without_budget_uses_configured_max_size(self):
+        """Test no budget keeps DB_POOL_MAX_SIZE for every worker."""
+        sizing = compute_pool_sizing(
+            workers=3, budget=None, reserved_per_worker=1, default_min_size=2, default_max_size=10
+        )
+
+        assert sizing.max_size == 10
+        assert sizing.total_connections == 33
+
+    def test_budget_too_small_raises(self):
+        """Test a budget leaving no pool connection fails fast."""
+        with pytest.raises(ValueError) as exc_info:
+            compute_pool_sizing(
+                workers=4, budget=16, reserved_per_worker=4, default_min_size=2, default_max_size=10
+            )
+
+        assert "DB_CONNECTION_BUDGET=16" in str(exc_info.value)
+
+    def test_budget_split_across_replica_pool(self):
+        """Test a replica pool of the same size shares the worker's budget."""
+        sizing = compute_pool_sizing(
+            workers=4, budget=60, reserved_per_worker=4, default_min_size=2, default_max_size=10,
+            pools_per_worker=2
+        )
+
+        assert sizing.max_size == 5
+        assert sizing.connections_per_worker == 14
+        assert sizing.total_connections <= 60
+
+    def test_invalid_worker_count_raises(self):
+        """Test workers must be positive."""
+        with pytest.raises(ValueError):
+            compute_pool_sizing(
+                workers=0, budget=None, reserved_per_worker=1, default_min_size=2, default_max_size=10
+            )
+
+
+@pytest.mark.unit
+def test_main_runs_uvicorn_with_budgeted_pool():
+    """Test launcher exports pool sizing and starts uvloop/httptools workers."""
+    with patch("app.server.settings") as mock_settings, \
+            patch("app.server.uvicorn.run") as mock_run, \
+            patch.dict(os.environ, {}, clear=False):
+        mock_settings.port = 8000
+        mock_settings.web_concurrency = 1
+        mock_settings.db_connection_budget = 40
+        mock_settings.db_pool_min_size = 2
+        mock_settings.db_pool_max_size = 10
+        mock_settings.database_replica_url = None
+        mock_settings.jobs_worker_enabled = True
+        mock_settings.jobs_worker_concurrency = 2
+        mock_settings.log_level = "INFO"
+
+        main(["--workers", "2"])
+
+        # 40 // 2 workers - (listener 1 + job worker 2 + 1)
+        assert os.environ["DB_POOL_MAX_SIZE"] == "16"
+        assert os.environ["DB_POOL_MIN_SIZE"] == "2"
+
+    _, kwargs = mock_run.call_args
+    assert mock_run.call_args[0][0] == "app.main:app"
+    assert kwargs["workers"] == 2
+    assert kwargs["loop"] == "uvloop"
+    assert kwargs["http"] == "httptools"
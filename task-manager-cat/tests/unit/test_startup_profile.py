@@ -0,0 +1,89 @@
+"""
+Unit tests for startup profiling (app/startup_profile.py).
+
+Tests:
+- Parsing of `python -X importtime` output
+- Report formatting
+- FirstRequestTimer logs time_to_first_request exactly once
+"""
+
+from unittest.mock import patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app import startup_profile
+from app.startup_profile import FirstRequestTimer, ImportTiming, format_report, parse_importtime
+
+IMPORTTIME_OUTPUT = """\
+import time: self [us] | cumulative | imported package
+import time:       310 |        310 |   _io
+import time:       120 |        450 | app.config
+import time:        80 |         80 |     pydantic.fields
+import time:      2000 |       2500 | app.main
+some unrelated stderr line
+"""
+
+
+@pytest.mark.unit
+class TestParseImporttime:
+    """Test parse_importtime()."""
+
+    def test_parses_modules_and_depth(self):
+        """Test each module line becomes an ImportTiming with its nesting depth."""
+        timings = parse_importtime(IMPORTTIME_OUTPUT)
+
+        assert timings == [
+            ImportTiming(module="_io", self_us=310, cumulative_us=310, depth=1),
+            ImportTiming(module="app.config", self_us=120, cumulative_us=450, depth=0),
+            ImportTiming(module="pydantic.fields", self_us=80, cumulative_us=80, depth=2),
+            ImportTiming(module="app.main", self_us=2000, cumulative_us=2500, depth=0),
+        ]
+
+    def test_ignores_header_and_other_lines(self):
+        """Test non-timing lines are skipped."""
+        assert parse_importtime("import time: self [us] | cumulative | imported package\nboom") == []
+
+
+@pytest.mark.unit
+class TestFormatReport:
+    """Test format_report()."""
+
+    def test_lists_slowest_modules_first(self):
+        """Test modules are ordered by cumulative time and limited to top N."""
+        report = format_report(
+            parse_importtime(IMPORTTIME_OUTPUT),
+            {"import_seconds": 0.9, "first_request_seconds": 0.002, "openapi_seconds": 0.012},
+            top=2
+        )
+        module_lines = report.splitlines()[-2:]
+
+        assert module_lines[0].endswith("app.main")
+        assert module_lines[1].endswith("app.config")
+        assert "900.0 ms" in report
+
+
+@pytest.mark.unit
+class TestFirstRequestTimer:
+    """Test FirstRequestTimer middleware."""
+
+    def test_logs_first_request_only(self):
+        """Test time_to_first_request is logged once per process."""
+        app = FastAPI()
+
+        @app.get("/ping")
+        async def ping():
+            return {"pong": True}
+
+        app.add_middleware(FirstRequestTimer, started_at=0.0)
+        client = TestClient(app)
+
+        with patch.object(startup_profile, "logger") as logger:
+            assert client.get("/ping").status_code == 200
+            assert client.get("/ping").status_code == 200
+
+        logger.info.assert_called_once()
+        event, = logger.info.call_args.args
+        assert event == "time_to_first_request"
+        assert logger.info.call_args.kwargs["path"] == "/ping"
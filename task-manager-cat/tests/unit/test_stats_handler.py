@@ -1,9 +1,9 @@
 """
-Unit tests for statistics command handler.
+Unit tests for statistics command handlers.
 
-Tests the get_stats_handler function in isolation using mocked service layer.
-Tests cover successful retrieval, empty payload acceptance, zero tasks edge case,
-and error handling.
+Tests the get_stats_handler and get_stats_bulk_handler functions in isolation
+using mocked service layer. Tests cover successful retrieval, empty payload
+acceptance, zero tasks edge case, payload validation and error handling.
 """
 
 from unittest.mock import AsyncMock, patch
@@ -11,7 +11,7 @@ from unittest.mock import AsyncMock, patch
 import pytest
 from fastapi import HTTPException
 
-from app.commands.handlers.stats import get_stats_handler
+from app.commands.handlers.stats import get_stats_bulk_handler, get_stats_handler
 
 
 @pytest.mark.unit
@@ -112,3 +112,40 @@ class TestGetStatsHandler:
             # Verify HTTP 500 error
             assert exc_info.value.status_code == 500
             assert exc_info.value.detail == "Failed to calculate statistics"
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestGetStatsBulkHandler:
+    """Unit tests for get_stats_bulk_handler function."""
+
+    async def test_returns_stats_per_user(self):
+        """Test statistics of all requested users are returned with a count."""
+        mock_db = AsyncMock()
+        stats = {"user-a": {"total_tasks": 1}, "user-b": {"total_tasks": 0}}
+
+        with patch("app.commands.handlers.stats.get_bulk_task_statistics", new_callable=AsyncMock) as mock_bulk:
+            mock_bulk.return_value = stats
+
+            result = await get_stats_bulk_handler("admin", {"user_ids": ["user-a", "user-b"]}, mock_db)
+
+        assert result == {"stats": stats, "count": 2}
+        mock_bulk.assert_called_once_with(["user-a", "user-b"], mock_db)
+
+    async def test_empty_user_ids_rejected(self):
+        """Test an empty user list returns 400."""
+        with pytest.raises(HTTPException) as exc_info:
+            await get_stats_bulk_handler("admin", {"user_ids": []}, AsyncMock())
+
+        assert exc_info.value.status_code == 400
+        assert "user_ids" in exc_info.value.detail
+
+    async def test_service_error_returns_500(self):
+        """Test service layer errors are wrapped in HTTPException(500)."""
+        with patch("app.commands.handlers.stats.get_bulk_task_statistics", new_callable=AsyncMock) as mock_bulk:
+            mock_bulk.side_effect = Exception("Database connection failed")
+
+            with pytest.raises(HTTPException) as exc_info:
+                await get_stats_bulk_handler("admin", {"user_ids": ["user-a"]}, AsyncMock())
+
+        assert exc_info.value.status_code == 500
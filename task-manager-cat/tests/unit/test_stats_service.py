@@ -13,6 +13,7 @@ from app.services.stats_service import (
     calculate_overdue_tasks,
     calculate_tasks_by_status,
     calculate_total_tasks,
+    get_bulk_task_statistics,
     get_task_statistics,
 )
 
@@ -340,3 +341,61 @@ async def test_get_task_statistics_mixed_scenario():
         "completion_rate": 50.0,
         "overdue_tasks": 1
     }
+
+
+# ============================================================================
+# Tests for get_bulk_task_statistics
+# ============================================================================
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_get_bulk_task_statistics_single_query():
+    """All users should be served from one grouped query, in request order"""
+    # Arrange
+    mock_db = AsyncMock()
+    mock_db.fetch.return_value = [
+        {"user_id": "user-b", "total": 4, "pending": 1, "in_progress": 1, "completed": 2, "overdue": 1},
+        {"user_id": "user-a", "total": 1, "pending": 0, "in_progress": 0, "completed": 1, "overdue": 0}
+    ]
+
+    # Act
+    result = await get_bulk_task_statistics(["user-a", "user-b", "user-a"], mock_db)
+
+    # Assert
+    mock_db.fetch.assert_called_once()
+    assert mock_db.fetch.call_args.args[1] == ["user-a", "user-b"]
+    assert "GROUP BY user_id" in mock_db.fetch.call_args.args[0]
+    assert list(result) == ["user-a", "user-b"]
+    assert result["user-b"] == {
+        "total_tasks": 4,
+        "pending_tasks": 1,
+        "in_progress_tasks": 1,
+        "completed_tasks": 2,
+        "completion_rate": 50.0,
+        "overdue_tasks": 1
+    }
+    assert result["user-a"]["completion_rate"] == 100.0
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_get_bulk_task_statistics_user_without_tasks():
+    """Users without tasks should get zero statistics"""
+    # Arrange
+    mock_db = AsyncMock()
+    mock_db.fetch.return_value = []
+
+    # Act
+    result = await get_bulk_task_statistics(["new-user"], mock_db)
+
+    # Assert
+    assert result == {
+        "new-user": {
+            "total_tasks": 0,
+            "pending_tasks": 0,
+            "in_progress_tasks": 0,
+            "completed_tasks": 0,
+            "completion_rate": 0.0,
+            "overdue_tasks": 0
+        }
+    }
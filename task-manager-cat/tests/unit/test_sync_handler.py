@@ -0,0 +1,213 @@
+"""
+Unit tests for sync-tasks command handler.
+
+Tests the sync_tasks_handler function in isolation using a mocked database.
+Tests cover cursor validation, merging of updates and tombstones, paging
+and error handling.
+"""
+
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock
+from uuid import UUID
+
+import pytest
+from fastapi import HTTPException
+
+from app.commands.handlers.sync import sync_tasks_handler
+
+
+def make_task_row(task_id: str, sync_version: int) -> dict:
+    """Build a task row as returned by asyncpg."""
+    return {
+        'id': UUID(task_id),
+        'user_id': 'test-user-123',
+        'title': f'Task {sync_version}',
+        'description': None,
+        'status': 'pending',
+        'priority': None,
+        'created_at': datetime(2025, 11, 12, 10, 0, 0, tzinfo=timezone.utc),
+        'completed_at': None,
+        'due_date': None,
+        'updated_at': datetime(2025, 11, 12, 10, 0, 0, tzinfo=timezone.utc),
+        'sync_version': sync_version
+    }
+
+
+def make_tombstone_row(task_id: str, sync_version: int) -> dict:
+    """Build a tombstone row as returned by asyncpg."""
+    return {'task_id': UUID(task_id), 'sync_version': sync_version}
+
+
+def make_db(horizon: int = 2 ** 62, pruned_through: int = 0) -> AsyncMock:
+    """Build a mocked connection returning the given sync horizon and purge watermark."""
+    mock_db = AsyncMock()
+    mock_db.fetchrow.return_value = {'horizon': horizon, 'tombstones_pruned_through': pruned_through}
+    return mock_db
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestSyncTasksHandler:
+    """Unit tests for sync_tasks_handler function."""
+
+    async def test_initial_sync_defaults_to_cursor_zero(self):
+        """Test empty payload performs a full sync from cursor 0."""
+        # Arrange
+        mock_db = make_db()
+        mock_db.fetch.side_effect = [
+            [make_task_row('550e8400-e29b-41d4-a716-446655440000', 1)],
+            []
+        ]
+
+        # Act
+        result = await sync_tasks_handler("test-user-123", {}, mock_db)
+
+        # Assert
+        assert len(result["tasks"]) == 1
+        assert result["deleted_ids"] == []
+        assert result["cursor"] == 1
+        assert result["has_more"] is False
+        # Both queries are scoped to the user and start after cursor 0
+        for call in mock_db.fetch.call_args_list:
+            assert call[0][1:3] == ("test-user-123", 0)
+
+    async def test_merges_updates_and_deletions_in_order(self):
+        """Test updates and tombstones are merged and cursor is the last version."""
+        # Arrange
+        mock_db = make_db()
+        mock_db.fetch.side_effect = [
+            [
+                make_task_row('550e8400-e29b-41d4-a716-446655440000', 11),
+                make_task_row('550e8400-e29b-41d4-a716-446655440001', 14)
+            ],
+            [make_tombstone_row('661f9511-f39c-52e5-b827-557766551111', 12)]
+        ]
+
+        # Act
+        result = await sync_tasks_handler("test-user-123", {"cursor": 10}, mock_db)
+
+        # Assert
+        assert [task["id"] for task in result["tasks"]] == [
+            '550e8400-e29b-41d4-a716-446655440000',
+            '550e8400-e29b-41d4-a716-446655440001'
+        ]
+        assert result["deleted_ids"] == ['661f9511-f39c-52e5-b827-557766551111']
+        assert result["cursor"] == 14
+        assert result["has_more"] is False
+
+    async def test_limit_truncates_page_and_sets_has_more(self):
+        """Test only `limit` changes are returned and has_more is set."""
+        # Arrange
+        mock_db = make_db()
+        mock_db.fetch.side_effect = [
+            [
+                make_task_row('550e8400-e29b-41d4-a716-446655440000', 1),
+                make_task_row('550e8400-e29b-41d4-a716-446655440001', 3)
+            ],
+            [
+                make_tombstone_row('661f9511-f39c-52e5-b827-557766551111', 2),
+                make_tombstone_row('661f9511-f39c-52e5-b827-557766551112', 4)
+            ]
+        ]
+
+        # Act
+        result = await sync_tasks_handler("test-user-123", {"limit": 2}, mock_db)
+
+        # Assert
+        assert len(result["tasks"]) == 1
+        assert result["deleted_ids"] == ['661f9511-f39c-52e5-b827-557766551111']
+        assert result["cursor"] == 2
+        assert result["has_more"] is True
+        # Each query fetches one extra row to detect the next page
+        for call in mock_db.fetch.call_args_list:
+            assert call[0][3] == 3
+
+    async def test_no_changes_returns_same_cursor(self):
+        """Test cursor is unchanged when nothing changed since it."""
+        # Arrange
+        mock_db = make_db()
+        mock_db.fetch.side_effect = [[], []]
+
+        # Act
+        result = await sync_tasks_handler("test-user-123", {"cursor": 42}, mock_db)
+
+        # Assert
+        assert result == {"tasks": [], "deleted_ids": [], "cursor": 42, "has_more": False}
+
+    async def test_queries_stop_at_snapshot_horizon(self):
+        """Test both queries exclude versions of transactions that may still commit."""
+        # Arrange
+        mock_db = make_db(horizon=5 << 20)
+        mock_db.fetch.side_effect = [[], []]
+
+        # Act
+        await sync_tasks_handler("test-user-123", {"cursor": 3}, mock_db)
+
+        # Assert
+        assert "pg_snapshot_xmin(pg_current_snapshot())" in mock_db.fetchrow.call_args[0][0]
+        for call in mock_db.fetch.call_args_list:
+            assert "sync_version < $4" in call[0][0]
+            assert call[0][4] == 5 << 20
+
+    async def test_cursor_older_than_purged_tombstones_returns_410(self):
+        """Test a cursor that may have missed purged deletions must resync."""
+        # Arrange
+        mock_db = make_db(pruned_through=100)
+
+        # Act & Assert
+        with pytest.raises(HTTPException) as exc_info:
+            await sync_tasks_handler("test-user-123", {"cursor": 99}, mock_db)
+
+        assert exc_info.value.status_code == 410
+        mock_db.fetch.assert_not_called()
+
+    async def test_full_sync_allowed_after_purge(self):
+        """Test cursor 0 and cursors at the purge watermark still sync."""
+        # Arrange
+        mock_db = make_db(pruned_through=100)
+        mock_db.fetch.side_effect = [[], [], [], []]
+
+        # Act
+        full = await sync_tasks_handler("test-user-123", {}, mock_db)
+        delta = await sync_tasks_handler("test-user-123", {"cursor": 100}, mock_db)
+
+        # Assert
+        assert full["cursor"] == 0
+        assert delta["cursor"] == 100
+
+    async def test_negative_cursor_returns_400(self):
+        """Test negative cursor is rejected before querying."""
+        # Arrange
+        mock_db = AsyncMock()
+
+        # Act & Assert
+        with pytest.raises(HTTPException) as exc_info:
+            await sync_tasks_handler("test-user-123", {"cursor": -1}, mock_db)
+
+        assert exc_info.value.status_code == 400
+        mock_db.fetch.assert_not_called()
+
+    async def test_limit_out_of_range_returns_400(self):
+        """Test limit above 1000 is rejected."""
+        # Arrange
+        mock_db = AsyncMock()
+
+        # Act & Assert
+        with pytest.raises(HTTPException) as exc_info:
+            await sync_tasks_handler("test-user-123", {"limit": 5000}, mock_db)
+
+        assert exc_info.value.status_code == 400
+        mock_db.fetch.assert_not_called()
+
+    async def test_database_error_returns_500(self):
+        """Test database errors are wrapped in HTTP 500."""
+        # Arrange
+        mock_db = make_db()
+        mock_db.fetch.side_effect = Exception("connection lost")
+
+        # Act & Assert
+        with pytest.raises(HTTPException) as exc_info:
+            await sync_tasks_handler("test-user-123", {}, mock_db)
+
+        assert exc_info.value.status_code == 500
+        assert exc_info.value.detail == "Internal server error"
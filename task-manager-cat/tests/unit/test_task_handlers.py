@@ -12,6 +12,7 @@ Test Categories:
 """
 
 from datetime import datetime, timezone
+from typing import get_args
 from unittest.mock import AsyncMock
 from uuid import UUID
 
@@ -25,6 +26,7 @@ from app.commands.handlers.tasks import (
     list_tasks_handler,
     update_task_handler,
 )
+from app.models.task import TaskField, TaskResponse
 
 
 @pytest.fixture
@@ -73,6 +75,22 @@ async def test_create_task_handler_success(mock_db, sample_task_row):
     mock_db.fetchrow.assert_called_once()
 
 
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_create_task_handler_publishes_change(mock_db, sample_task_row):
+    """Test insert publishes a task_changes notification in the same statement."""
+    # Arrange
+    mock_db.fetchrow.return_value = sample_task_row
+
+    # Act
+    await create_task_handler("test-user-123", {"title": "Test Task"}, mock_db)
+
+    # Assert
+    sql = mock_db.fetchrow.call_args[0][0]
+    assert "INSERT INTO tasks" in sql
+    assert "pg_notify('task_changes'" in sql
+
+
 @pytest.mark.unit
 @pytest.mark.asyncio
 async def test_create_task_handler_with_all_fields(mock_db):
@@ -284,6 +302,148 @@ async def test_list_tasks_handler_database_error(mock_db):
     assert "Internal server error" in exc_info.value.detail
 
 
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_list_tasks_handler_sort_by_priority(mock_db):
+    """Test sort=priority orders by the task_priority enum, urgent first."""
+    # Arrange
+    mock_db.fetch.return_value = []
+
+    # Act
+    await list_tasks_handler("test-user-123", {"status": "pending", "sort": "priority"}, mock_db)
+
+    # Assert
+    sql, *params = mock_db.fetch.call_args[0]
+    assert "ORDER BY priority DESC NULLS LAST, created_at DESC" in sql
+    assert params == ["test-user-123", "pending"]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_list_tasks_handler_invalid_filter(mock_db):
+    """Test unknown status or sort values are rejected before querying."""
+    # Act & Assert
+    with pytest.raises(HTTPException) as exc_info:
+        await list_tasks_handler("test-user-123", {"sort": "title"}, mock_db)
+
+    assert exc_info.value.status_code == 400
+    assert "sort" in exc_info.value.detail
+    mock_db.fetch.assert_not_called()
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_list_tasks_handler_sparse_fields(mock_db):
+    """Test fields selects and returns only the requested columns."""
+    # Arrange
+    mock_db.fetch.return_value = [
+        {
+            'id': UUID('550e8400-e29b-41d4-a716-446655440000'),
+            'title': 'Test Task',
+            'due_date': datetime(2025, 11, 20, 10, 0, 0, tzinfo=timezone.utc)
+        }
+    ]
+
+    # Act
+    result = await list_tasks_handler(
+        "test-user-123", {"fields": ["id", "title", "due_date", "title"]}, mock_db
+    )
+
+    # Assert
+    sql = mock_db.fetch.call_args[0][0]
+    assert "SELECT id, title, due_date FROM tasks" in sql
+    assert "description" not in sql
+    assert result["tasks"] == [
+        {
+            "id": "550e8400-e29b-41d4-a716-446655440000",
+            "title": "Test Task",
+            "due_date": "2025-11-20T10:00:00Z"
+        }
+    ]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_list_tasks_handler_unknown_field(mock_db):
+    """Test fields outside TaskResponse are rejected before querying."""
+    # Act & Assert
+    with pytest.raises(HTTPException) as exc_info:
+        await list_tasks_handler("test-user-123", {"fields": ["id", "sync_version"]}, mock_db)
+
+    assert exc_info.value.status_code == 400
+    assert "fields" in exc_info.value.detail
+    mock_db.fetch.assert_not_called()
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_list_tasks_handler_count_mode(mock_db):
+    """Test mode=count returns only the filtered count."""
+    # Arrange
+    mock_db.fetchval.return_value = 2
+
+    # Act
+    result = await list_tasks_handler("test-user-123", {"status": "pending", "mode": "count"}, mock_db)
+
+    # Assert
+    sql, *params = mock_db.fetchval.call_args[0]
+    assert sql == "SELECT COUNT(*) FROM tasks WHERE user_id = $1 AND status = $2"
+    assert params == ["test-user-123", "pending"]
+    assert result == {"count": 2}
+    mock_db.fetch.assert_not_called()
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_list_tasks_handler_exists_mode(mock_db):
+    """Test mode=exists returns a boolean without reading tasks."""
+    # Arrange
+    mock_db.fetchval.return_value = False
+
+    # Act
+    result = await list_tasks_handler("test-user-123", {"mode": "exists"}, mock_db)
+
+    # Assert
+    sql = mock_db.fetchval.call_args[0][0]
+    assert sql == "SELECT EXISTS (SELECT 1 FROM tasks WHERE user_id = $1)"
+    assert result == {"exists": False}
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_list_tasks_handler_ids_mode(mock_db):
+    """Test mode=ids returns ids in the requested sort order."""
+    # Arrange
+    mock_db.fetch.return_value = [{'id': UUID('550e8400-e29b-41d4-a716-446655440000')}]
+
+    # Act
+    result = await list_tasks_handler("test-user-123", {"mode": "ids", "sort": "priority"}, mock_db)
+
+    # Assert
+    sql = mock_db.fetch.call_args[0][0]
+    assert sql.startswith("SELECT id FROM tasks WHERE user_id = $1 ORDER BY priority DESC")
+    assert result == {"ids": ["550e8400-e29b-41d4-a716-446655440000"], "count": 1}
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_list_tasks_handler_mode_with_fields(mock_db):
+    """Test fields cannot be combined with a summary mode."""
+    # Act & Assert
+    with pytest.raises(HTTPException) as exc_info:
+        await list_tasks_handler("test-user-123", {"mode": "count", "fields": ["id"]}, mock_db)
+
+    assert exc_info.value.status_code == 400
+    assert "fields cannot be combined with mode" in exc_info.value.detail
+    mock_db.fetchval.assert_not_called()
+
+
+@pytest.mark.unit
+def test_task_fields_match_task_response():
+    """Test every TaskResponse field is selectable and nothing else."""
+    assert set(get_args(TaskField)) == set(TaskResponse.model_fields)
+
+
 # ============================================================================
 # get_task_handler Tests
 # ============================================================================
@@ -307,6 +467,23 @@ async def test_get_task_handler_success(mock_db, sample_task_row):
     mock_db.fetchrow.assert_called_once()
 
 
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_get_task_handler_sparse_fields(mock_db):
+    """Test get-task with fields returns only those fields."""
+    # Arrange
+    mock_db.fetchrow.return_value = {'title': 'Test Task', 'status': 'pending'}
+    payload = {"task_id": "550e8400-e29b-41d4-a716-446655440000", "fields": ["title", "status"]}
+
+    # Act
+    result = await get_task_handler("test-user-123", payload, mock_db)
+
+    # Assert
+    sql = mock_db.fetchrow.call_args[0][0]
+    assert sql == "SELECT title, status FROM tasks WHERE id = $1"
+    assert result == {"title": "Test Task", "status": "pending"}
+
+
 @pytest.mark.unit
 @pytest.mark.asyncio
 async def test_get_task_handler_missing_task_id(mock_db):
@@ -602,6 +779,23 @@ async def test_update_task_handler_without_status_leaves_completed_at_unchanged(
     assert "completed_at" not in call_args[0][0]
 
 
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_update_task_handler_bumps_sync_version(mock_db, sample_task_row):
+    """Test update refreshes updated_at and sync_version for sync-tasks."""
+    # Arrange
+    mock_db.fetchrow.return_value = sample_task_row
+    payload = {"task_id": "550e8400-e29b-41d4-a716-446655440000", "title": "Test Task"}
+
+    # Act
+    await update_task_handler("test-user-123", payload, mock_db)
+
+    # Assert
+    sql = mock_db.fetchrow.call_args[0][0]
+    assert "updated_at = NOW()" in sql
+    assert "sync_version = task_sync_version()" in sql
+
+
 @pytest.mark.unit
 @pytest.mark.asyncio
 async def test_update_task_handler_missing_task_id(mock_db):
@@ -728,6 +922,23 @@ async def test_delete_task_handler_success(mock_db):
     mock_db.fetchrow.assert_called_once()
 
 
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_delete_task_handler_records_tombstone(mock_db):
+    """Test deletion writes a tombstone for sync-tasks in the same statement."""
+    # Arrange
+    mock_db.fetchrow.return_value = {'id': UUID('550e8400-e29b-41d4-a716-446655440000')}
+    payload = {"task_id": "550e8400-e29b-41d4-a716-446655440000"}
+
+    # Act
+    await delete_task_handler("test-user-123", payload, mock_db)
+
+    # Assert
+    sql = mock_db.fetchrow.call_args[0][0]
+    assert "DELETE FROM tasks" in sql
+    assert "INSERT INTO task_tombstones" in sql
+
+
 @pytest.mark.unit
 @pytest.mark.asyncio
 async def test_delete_task_handler_missing_task_id(mock_db):
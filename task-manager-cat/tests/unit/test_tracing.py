@@ -0,0 +1,136 @@
+"""
+Unit tests for trace propagation (app/tracing.py).
+
+Tests:
+- X-Trace-ID is echoed (or generated) and bound to structlog per request
+- Tracing helpers are no-ops without a tracer; missing packages are tolerated
+- With the OpenTelemetry SDK installed: request, execute_command, handler
+  spans share the X-Trace-ID as trace id
+"""
+
+import sys
+from unittest.mock import AsyncMock, patch
+from uuid import UUID
+
+import pytest
+import structlog
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app import tracing
+from app.tracing import (
+    TRACE_ID_HEADER,
+    TraceMiddleware,
+    configure_tracing,
+    current_trace_id,
+    shutdown_tracing,
+    span,
+)
+
+TRACE_ID = "0af7651916cd43dd8448eb211c80319c"
+
+
+def make_client() -> TestClient:
+    """App returning the trace context seen by its endpoint."""
+    app = FastAPI()
+    app.add_middleware(TraceMiddleware)
+
+    @app.get("/trace")
+    async def trace_context():
+        return {
+            "trace_id": current_trace_id(),
+            "log_context": structlog.contextvars.get_contextvars().get("trace_id"),
+        }
+
+    return TestClient(app)
+
+
+@pytest.mark.unit
+class TestTraceMiddleware:
+    """Test X-Trace-ID propagation."""
+
+    def test_trace_id_propagated_and_echoed(self):
+        """Test the incoming X-Trace-ID is visible to handlers, logs and the response."""
+        response = make_client().get("/trace", headers={TRACE_ID_HEADER: TRACE_ID})
+
+        assert response.json() == {"trace_id": TRACE_ID, "log_context": TRACE_ID}
+        assert response.headers[TRACE_ID_HEADER] == TRACE_ID
+
+    def test_trace_id_generated_when_missing(self):
+        """Test requests without X-Trace-ID get a UUID like Cat House generates."""
+        response = make_client().get("/trace")
+
+        generated = response.headers[TRACE_ID_HEADER]
+        assert UUID(generated).version == 4
+        assert response.json()["trace_id"] == generated
+
+    def test_trace_id_reset_after_request(self):
+        """Test the trace id does not leak outside the request."""
+        make_client().get("/trace", headers={TRACE_ID_HEADER: TRACE_ID})
+
+        assert current_trace_id() == ""
+        assert "trace_id" not in structlog.contextvars.get_contextvars()
+
+
+@pytest.mark.unit
+class TestTracingDisabled:
+    """Test the helpers without a configured tracer."""
+
+    def test_span_is_noop(self):
+        """Test span() yields None when tracing is disabled."""
+        with span("handler list-tasks", {"command.action": "list-tasks"}) as current:
+            assert current is None
+
+    def test_missing_sdk_disables_tracing(self):
+        """Test configure_tracing reports False when OpenTelemetry is not installed."""
+        with patch.dict(sys.modules, {"opentelemetry.sdk.resources": None}):
+            assert configure_tracing("http://localhost:4317") is False
+
+        assert tracing.tracing_enabled() is False
+
+    def test_uuid_trace_id_maps_to_otel_trace_id(self):
+        """Test UUID-shaped ids become 128-bit trace ids and other values are ignored."""
+        assert tracing._trace_id_int(TRACE_ID) == int(TRACE_ID, 16)
+        assert tracing._trace_id_int("not-a-uuid") is None
+
+
+@pytest.mark.unit
+class TestTracingSpans:
+    """Test exported spans (requires opentelemetry-sdk)."""
+
+    @pytest.fixture
+    def exporter(self):
+        """In-memory span exporter installed for one test."""
+        in_memory = pytest.importorskip("opentelemetry.sdk.trace.export.in_memory_span_exporter")
+        exporter = in_memory.InMemorySpanExporter()
+        configure_tracing("unused", exporter=exporter)
+        yield exporter
+        shutdown_tracing()
+
+    def test_execute_spans_share_x_trace_id(self, exporter):
+        """Test request, execute_command and handler spans carry the X-Trace-ID."""
+        from app.auth import validate_service_key
+        from app.commands.router import ACTION_HANDLERS, get_command_db
+        from app.main import app
+
+        handler = AsyncMock(return_value={"tasks": [], "count": 0})
+        original = ACTION_HANDLERS["list-tasks"]
+        ACTION_HANDLERS["list-tasks"] = handler
+        app.dependency_overrides[validate_service_key] = lambda: "test-service"
+        app.dependency_overrides[get_command_db] = lambda: AsyncMock()
+        try:
+            response = TestClient(app).post(
+                "/execute",
+                headers={"X-Service-Key": "sk_dev_test_key", TRACE_ID_HEADER: TRACE_ID},
+                json={"action": "list-tasks", "user_id": "user_123", "payload": {}}
+            )
+        finally:
+            ACTION_HANDLERS["list-tasks"] = original
+            app.dependency_overrides.clear()
+
+        assert response.status_code == 200
+        spans = {span.name: span for span in exporter.get_finished_spans()}
+        assert {"POST /execute", "execute_command", "handler list-tasks"} <= set(spans)
+        assert {span.context.trace_id for span in spans.values()} == {int(TRACE_ID, 16)}
+        assert spans["execute_command"].attributes["command.action"] == "list-tasks"
+        assert spans["handler list-tasks"].parent.span_id == spans["execute_command"].context.span_id